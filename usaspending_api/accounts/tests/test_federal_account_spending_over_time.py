@@ -3,6 +3,10 @@ import json
 import pytest
 from model_mommy import mommy
 from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from usaspending_api.accounts.helpers import start_and_end_dates_from_fyq
+from usaspending_api.accounts.views.federal_accounts_v2 import SpendingOverTimeFederalAccountsViewSet
 
 
 @pytest.fixture
@@ -197,3 +201,100 @@ def test_federal_account_spending_over_time(client, financial_spending_data):
     assert specific_results[0]["time_period"] == {"fiscal_year": "2014", "quarter": "3"}
     assert specific_results[1]["outlay"] == 3000000
     assert specific_results[1]["time_period"] == {"fiscal_year": "2016", "quarter": "3"}
+
+
+def _spending_over_time(pk, payload):
+    """The route is not currently exposed, so the view is called directly"""
+    request = APIRequestFactory().post(f"/api/v2/federal_accounts/{pk}/spending_over_time", payload, format="json")
+    response = SpendingOverTimeFederalAccountsViewSet.as_view()(request, pk=pk)
+    assert response.status_code == status.HTTP_200_OK
+    return json.loads(response.content.decode("utf-8"))["results"]
+
+
+def _period(time_period, outlay=0, obligations_incurred_filtered=0, obligations_incurred_other=0, unobliged_balance=0):
+    return {
+        "outlay": outlay,
+        "obligations_incurred_filtered": obligations_incurred_filtered,
+        "obligations_incurred_other": obligations_incurred_other,
+        "unobliged_balance": unobliged_balance,
+        "time_period": time_period,
+    }
+
+
+@pytest.fixture
+def account_balances_data(db):
+    federal_account = mommy.make("accounts.FederalAccount", id=1)
+    ta1 = mommy.make(
+        "accounts.TreasuryAppropriationAccount", treasury_account_identifier=1, federal_account=federal_account
+    )
+    ta2 = mommy.make(
+        "accounts.TreasuryAppropriationAccount", treasury_account_identifier=2, federal_account=federal_account
+    )
+    ta3 = mommy.make("accounts.TreasuryAppropriationAccount", treasury_account_identifier=3, federal_account__id=2)
+
+    # Two File B records of ta1 match the same filter, which must not count its balances twice
+    object_class_111 = mommy.make("references.ObjectClass", major_object_class="10", object_class="111")
+    object_class_444 = mommy.make("references.ObjectClass", major_object_class="40", object_class="444")
+    for treasury_account, object_class in ((ta1, object_class_111), (ta1, object_class_111), (ta2, object_class_444)):
+        mommy.make(
+            "financial_activities.FinancialAccountsByProgramActivityObjectClass",
+            treasury_account=treasury_account,
+            object_class=object_class,
+        )
+
+    for treasury_account, fiscal_year, quarter, period, final_of_fy, outlay in (
+        (ta1, 2014, 4, 12, True, 300),
+        (ta1, 2016, 3, 9, True, 100),
+        (ta2, 2016, 3, 9, True, 400),
+        (ta1, 2016, 2, 6, False, 9999),
+        (ta3, 2016, 3, 9, True, 5000),
+    ):
+        mommy.make(
+            "accounts.AppropriationAccountBalances",
+            treasury_account_identifier=treasury_account,
+            reporting_period_start=start_and_end_dates_from_fyq(fiscal_year, quarter)[0],
+            reporting_period_end=start_and_end_dates_from_fyq(fiscal_year, quarter)[1],
+            submission__reporting_fiscal_year=fiscal_year,
+            submission__reporting_fiscal_quarter=quarter,
+            submission__reporting_fiscal_period=period,
+            final_of_fy=final_of_fy,
+            gross_outlay_amount_by_tas_cpe=outlay,
+            obligations_incurred_total_by_tas_cpe=outlay // 10,
+            unobligated_balance_cpe=outlay * 10,
+        )
+
+
+def test_spending_over_time_by_fiscal_year(account_balances_data):
+    assert _spending_over_time(1, {"group": "fiscal_year", "filters": {}}) == [
+        _period({"fiscal_year": "2014"}, 300, 30, 30, 3000),
+        _period({"fiscal_year": "2015"}),
+        _period({"fiscal_year": "2016"}, 500, 50, 50, 5000),
+    ]
+
+
+def test_spending_over_time_by_quarter_with_object_class_filter(account_balances_data):
+    payload = {"group": "quarter", "filters": {"object_class": [{"major_object_class": 10, "object_class": [111]}]}}
+    assert _spending_over_time(1, payload) == [
+        _period({"fiscal_year": "2014", "quarter": "4"}, 300, 30, 30, 3000),
+        _period({"fiscal_year": "2015", "quarter": "1"}),
+        _period({"fiscal_year": "2015", "quarter": "2"}),
+        _period({"fiscal_year": "2015", "quarter": "3"}),
+        _period({"fiscal_year": "2015", "quarter": "4"}),
+        _period({"fiscal_year": "2016", "quarter": "1"}),
+        _period({"fiscal_year": "2016", "quarter": "2"}),
+        _period({"fiscal_year": "2016", "quarter": "3"}, 100, 10, 50, 5000),
+    ]
+
+
+def test_spending_over_time_by_month_with_time_period_filter(account_balances_data):
+    payload = {"group": "month", "filters": {"time_period": [{"start_date": "2016-01-01", "end_date": "2016-12-31"}]}}
+    results = _spending_over_time(1, payload)
+    assert len(results) == 1 + 12 + 9
+    assert results[0] == _period({"fiscal_year": "2014", "month": "12"}, 0, 0, 30, 3000)
+    empty_months = [(2015, month) for month in range(1, 13)] + [(2016, month) for month in range(1, 9)]
+    assert results[1:-1] == [_period({"fiscal_year": str(fy), "month": str(month)}) for fy, month in empty_months]
+    assert results[-1] == _period({"fiscal_year": "2016", "month": "9"}, 500, 50, 50, 5000)
+
+
+def test_spending_over_time_without_balances(account_balances_data):
+    assert _spending_over_time(3, {"group": "fiscal_year"}) == []
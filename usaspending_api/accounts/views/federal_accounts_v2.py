@@ -1,7 +1,5 @@
-import ast
-
-from collections import OrderedDict
-from django.db.models import F, Q, Sum, OuterRef, Subquery, Func, DecimalField, Exists
+from django.db import connection
+from django.db.models import BooleanField, Case, F, Q, Sum, OuterRef, Subquery, Func, DecimalField, Exists, Value, When
 from django.utils.dateparse import parse_date
 from fiscalyear import FiscalDateTime
 from rest_framework.response import Response
@@ -10,6 +8,7 @@ from rest_framework.views import APIView
 from usaspending_api.accounts.models import AppropriationAccountBalances, FederalAccount, TreasuryAppropriationAccount
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.common.helpers.fiscal_year_helpers import fill_missing_fiscal_periods
 from usaspending_api.common.helpers.generic_helper import get_simple_pagination_metadata
 from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.financial_activities.models import FinancialAccountsByProgramActivityObjectClass
@@ -110,6 +109,27 @@ class FiscalYearSnapshotFederalAccountsViewSet(APIView):
             return Response({})
 
 
+SPENDING_OVER_TIME_MEASURES = [
+    "outlay",
+    "obligations_incurred_filtered",
+    "obligations_incurred_other",
+    "unobliged_balance",
+]
+
+# Filtered measures only sum balances matching the request's filters; the others sum all of the account's balances
+SPENDING_OVER_TIME_SQL = """
+select
+    {group_by},
+    coalesce(sum(gross_outlay_amount_by_tas_cpe) filter (where is_filtered), 0) as outlay,
+    coalesce(sum(obligations_incurred_total_by_tas_cpe) filter (where is_filtered), 0) as obligations_incurred_filtered,
+    coalesce(sum(obligations_incurred_total_by_tas_cpe), 0) as obligations_incurred_other,
+    coalesce(sum(unobligated_balance_cpe), 0) as unobliged_balance
+from ({filtered_sql}) as balances
+where {not_null}
+group by {group_by}
+"""
+
+
 class SpendingOverTimeFederalAccountsViewSet(APIView):
     """
     This route takes a federal_account DB ID and returns the data required to visualized the spending over time graphic.
@@ -117,210 +137,79 @@ class SpendingOverTimeFederalAccountsViewSet(APIView):
 
     @cache_response()
     def post(self, request, pk, format=None):
-        # create response
-        response = {"results": {}}
-
-        # get federal account id from url
         json_request = request.data
         group = json_request.get("group", None)
+        if group == "fy":
+            group = "fiscal_year"
+        elif group != "month":
+            group = "quarter"
         filters = json_request.get("filters", None)
-        if filters:
-            filters = federal_account_filter(filters, "treasury_account_identifier__program_balances__")
 
-        nested_order = ""
-        group_results = OrderedDict()  # list of time_period objects ie {"fy": "2017", "quarter": "3"} : 1000
-
-        financial_account_queryset = AppropriationAccountBalances.final_objects.filter(
+        balances = AppropriationAccountBalances.final_objects.filter(
             treasury_account_identifier__federal_account_id=int(pk)
         )
-        if group == "fy" or group == "fiscal_year":
-
-            filtered_fa = financial_account_queryset
-            if filters:
-                filtered_fa = filtered_fa.filter(filters)
-            filtered_fa = filtered_fa.annotate(
-                outlay=F("gross_outlay_amount_by_tas_cpe"),
-                obligations_incurred_filtered=F("obligations_incurred_total_by_tas_cpe"),
-            ).values(
-                "appropriation_account_balances_id",
-                "submission__reporting_fiscal_year",
-                "outlay",
-                "obligations_incurred_filtered",
-            )
-
-            unfiltered_fa = financial_account_queryset.annotate(
-                obligations_incurred_other=F("obligations_incurred_total_by_tas_cpe"),
-                unobliged_balance=F("unobligated_balance_cpe"),
-            ).values(
-                "appropriation_account_balances_id",
-                "submission__reporting_fiscal_year",
-                "obligations_incurred_other",
-                "unobliged_balance",
-            )
-
-            for trans in filtered_fa:
-                if trans["submission__reporting_fiscal_year"] is None:
-                    continue
-                fy = trans["submission__reporting_fiscal_year"]
-
-                key = {"fiscal_year": str(fy)}
-                key = str(key)
-                if key not in group_results:
-                    group_results[key] = {
-                        "outlay": trans["outlay"] if trans["outlay"] else 0,
-                        "obligations_incurred_filtered": trans["obligations_incurred_filtered"]
-                        if trans["obligations_incurred_filtered"]
-                        else 0,
-                        "obligations_incurred_other": 0,
-                        "unobliged_balance": 0,
-                    }
-                else:
-                    group_results[key] = {
-                        "outlay": group_results[key]["outlay"] + trans["outlay"]
-                        if trans["outlay"]
-                        else group_results[key]["outlay"],
-                        "obligations_incurred_filtered": group_results[key]["obligations_incurred_filtered"]
-                        + trans["obligations_incurred_filtered"]
-                        if trans["obligations_incurred_filtered"]
-                        else group_results[key]["obligations_incurred_filtered"],
-                        "obligations_incurred_other": group_results[key]["obligations_incurred_other"],
-                        "unobliged_balance": group_results[key]["unobliged_balance"],
-                    }
-
-            for trans in unfiltered_fa:
-                if trans["submission__reporting_fiscal_year"] is None:
-                    continue
-                fy = trans["submission__reporting_fiscal_year"]
-                key = {"fiscal_year": str(fy)}
-                key = str(key)
-
-                if key not in group_results:
-                    group_results[key] = {
-                        "outlay": 0,
-                        "obligations_incurred_filtered": 0,
-                        "obligations_incurred_other": trans["obligations_incurred_other"]
-                        if trans["obligations_incurred_other"]
-                        else 0,
-                        "unobliged_balance": trans["unobliged_balance"] if trans["unobliged_balance"] else 0,
-                    }
-                else:
-                    group_results[key] = {
-                        "outlay": group_results[key]["outlay"],
-                        "obligations_incurred_filtered": group_results[key]["obligations_incurred_filtered"],
-                        "obligations_incurred_other": group_results[key]["obligations_incurred_other"]
-                        + trans["obligations_incurred_other"]
-                        if trans["obligations_incurred_other"]
-                        else group_results[key]["obligations_incurred_other"],
-                        "unobliged_balance": group_results[key]["unobliged_balance"] + trans["unobliged_balance"]
-                        if trans["unobliged_balance"]
-                        else group_results[key]["unobliged_balance"],
-                    }
-
-        else:  # quarterly, take months and add them up
-            filtered_fa = financial_account_queryset
-            if filters:
-                filtered_fa = filtered_fa.filter(filters)
-            filtered_fa = filtered_fa.annotate(
-                outlay=F("gross_outlay_amount_by_tas_cpe"),
-                obligations_incurred_filtered=F("obligations_incurred_total_by_tas_cpe"),
-            ).values(
-                "appropriation_account_balances_id",
-                "submission__reporting_fiscal_year",
-                "submission__reporting_fiscal_quarter",
-                "outlay",
-                "obligations_incurred_filtered",
-            )
-
-            unfiltered_fa = financial_account_queryset.annotate(
-                obligations_incurred_other=F("obligations_incurred_total_by_tas_cpe"),
-                unobliged_balance=F("unobligated_balance_cpe"),
-            ).values(
-                "appropriation_account_balances_id",
-                "submission__reporting_fiscal_year",
-                "submission__reporting_fiscal_quarter",
-                "obligations_incurred_other",
-                "unobliged_balance",
+        is_filtered = Q()
+        if filters:
+            # Object class and program activity filters match any File B record of the treasury account
+            file_b_filters = {key: filters[key] for key in ("object_class", "program_activity") if key in filters}
+            if file_b_filters:
+                balances = balances.annotate(
+                    has_file_b=Exists(
+                        FinancialAccountsByProgramActivityObjectClass.objects.filter(
+                            federal_account_filter(file_b_filters),
+                            treasury_account_id=OuterRef("treasury_account_identifier"),
+                        )
+                    )
+                )
+                is_filtered &= Q(has_file_b=True)
+            if "time_period" in filters:
+                is_filtered &= orred_date_filter_list(filters["time_period"])
+        if is_filtered:
+            is_filtered = Case(When(is_filtered, then=Value(True)), default=Value(False), output_field=BooleanField())
+        else:
+            is_filtered = Value(True, output_field=BooleanField())
+
+        group_by = ["fiscal_year"] if group == "fiscal_year" else ["fiscal_year", group]
+        balances = balances.annotate(
+            is_filtered=is_filtered,
+            fiscal_year=F("submission__reporting_fiscal_year"),
+            quarter=F("submission__reporting_fiscal_quarter"),
+            month=F("submission__reporting_fiscal_period"),
+        ).values(
+            "fiscal_year",
+            "quarter",
+            "month",
+            "is_filtered",
+            "gross_outlay_amount_by_tas_cpe",
+            "obligations_incurred_total_by_tas_cpe",
+            "unobligated_balance_cpe",
+        )
+        filtered_sql, params = balances.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                SPENDING_OVER_TIME_SQL.format(
+                    filtered_sql=filtered_sql,
+                    group_by=", ".join(group_by),
+                    not_null=" and ".join(f"{column} is not null" for column in group_by),
+                ),
+                params,
             )
-            for trans in filtered_fa:
-                if trans["submission__reporting_fiscal_year"] is None:
-                    continue
-                fy = trans["submission__reporting_fiscal_year"]
-                fq = trans["submission__reporting_fiscal_quarter"]
-                key = {"fiscal_year": str(fy), "quarter": str(fq)}
-                key = str(key)
-                if key not in group_results:
-                    group_results[key] = {
-                        "outlay": trans["outlay"] if trans["outlay"] else 0,
-                        "obligations_incurred_filtered": trans["obligations_incurred_filtered"]
-                        if trans["obligations_incurred_filtered"]
-                        else 0,
-                        "obligations_incurred_other": 0,
-                        "unobliged_balance": 0,
-                    }
-                else:
-                    group_results[key] = {
-                        "outlay": group_results[key]["outlay"] + trans["outlay"]
-                        if trans["outlay"]
-                        else group_results[key]["outlay"],
-                        "obligations_incurred_filtered": group_results[key]["obligations_incurred_filtered"]
-                        + trans["obligations_incurred_filtered"]
-                        if trans["obligations_incurred_filtered"]
-                        else group_results[key]["obligations_incurred_filtered"],
-                        "obligations_incurred_other": group_results[key]["obligations_incurred_other"],
-                        "unobliged_balance": group_results[key]["unobliged_balance"],
-                    }
-            for trans in unfiltered_fa:
-                if trans["submission__reporting_fiscal_year"] is None:
-                    continue
-                fy = trans["submission__reporting_fiscal_year"]
-                fq = trans["submission__reporting_fiscal_quarter"]
-                key = {"fiscal_year": str(fy), "quarter": str(fq)}
-                key = str(key)
-                if key not in group_results:
-                    group_results[key] = {
-                        "outlay": 0,
-                        "obligations_incurred_filtered": 0,
-                        "obligations_incurred_other": trans["obligations_incurred_other"]
-                        if trans["obligations_incurred_other"]
-                        else 0,
-                        "unobliged_balance": trans["unobliged_balance"] if trans["unobliged_balance"] else 0,
-                    }
-                else:
-                    group_results[key] = {
-                        "outlay": group_results[key]["outlay"],
-                        "obligations_incurred_filtered": group_results[key]["obligations_incurred_filtered"],
-                        "obligations_incurred_other": group_results[key]["obligations_incurred_other"]
-                        + trans["obligations_incurred_other"]
-                        if trans["obligations_incurred_other"]
-                        else group_results[key]["obligations_incurred_other"],
-                        "unobliged_balance": group_results[key]["unobliged_balance"] + trans["unobliged_balance"]
-                        if trans["unobliged_balance"]
-                        else group_results[key]["unobliged_balance"],
-                    }
-            nested_order = "quarter"
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-        # convert result into expected format, sort by key to meet front-end specs
-        results = []
         # Expected results structure
         # [{
-        # 'time_period': {'fy': '2017', 'quarter': '3'},
-        # 	'aggregated_amount': '200000000'
+        # 'time_period': {'fiscal_year': '2017', 'quarter': '3'},
+        # 'outlay': 200000000, ...
         # }]
-        sorted_group_results = sorted(
-            group_results.items(),
-            key=lambda k: (ast.literal_eval(k[0])["fiscal_year"], int(ast.literal_eval(k[0])[nested_order]))
-            if nested_order
-            else (ast.literal_eval(k[0])["fiscal_year"]),
-        )
-
-        for key, value in sorted_group_results:
-            key_dict = ast.literal_eval(key)
-            value["time_period"] = key_dict
-            result = value
+        empty_row = {column: 0 for column in SPENDING_OVER_TIME_MEASURES}
+        results = []
+        for row in fill_missing_fiscal_periods(rows, group, empty_row):
+            result = {column: row[column] for column in SPENDING_OVER_TIME_MEASURES}
+            result["time_period"] = {period: str(row[period]) for period in group_by}
             results.append(result)
-        response["results"] = results
 
-        return Response(response)
+        return Response({"results": results})
 
 
 def filter_on(prefix, key, values):
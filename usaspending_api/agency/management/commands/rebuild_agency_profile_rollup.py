@@ -0,0 +1,50 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from usaspending_api.agency.profile_rollup import check_agency_profile_rollup, rebuild_agency_profile_rollup
+from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
+from usaspending_api.references.models import ToptierAgency
+
+
+logger = logging.getLogger("script")
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Rebuild agency_profile_rollup, which the agency profile endpoints read, for some or all toptier agencies. "
+        "Submission and transaction loads keep it current; run this to populate it or after data corrections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--toptier-codes", nargs="+", help="Toptier codes of the agencies to rebuild (default all)")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Instead of rebuilding, compare the rollup with a fresh one and fail if they differ",
+        )
+
+    def handle(self, *args, **options):
+        agencies = ToptierAgency.objects.all()
+        if options["toptier_codes"]:
+            agencies = agencies.filter(toptier_code__in=options["toptier_codes"])
+        toptier_agency_ids = list(agencies.values_list("toptier_agency_id", flat=True))
+        if not toptier_agency_ids:
+            raise CommandError("No matching toptier agencies")
+
+        if options["check"]:
+            with Timer("Check agency_profile_rollup"):
+                differences = check_agency_profile_rollup(toptier_agency_ids)
+            if differences:
+                raise CommandError(
+                    f"agency_profile_rollup is out of date for {len(differences):,} agency dimensions:\n"
+                    + "\n".join(differences)
+                )
+            logger.info(f"agency_profile_rollup is current for {len(toptier_agency_ids):,} toptier agencies")
+            return
+
+        with Timer("Rebuild agency_profile_rollup"):
+            with transaction.atomic():
+                rebuild_agency_profile_rollup(toptier_agency_ids)
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('references', '0050_naics_psc_update_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgencyProfileRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fiscal_year', models.IntegerField()),
+                ('fiscal_period', models.IntegerField(null=True)),
+                ('dimension', models.TextField()),
+                ('member_id', models.IntegerField(null=True)),
+                ('code', models.TextField(null=True)),
+                ('name', models.TextField(null=True)),
+                ('parent_id', models.IntegerField(null=True)),
+                ('parent_code', models.TextField(null=True)),
+                ('parent_name', models.TextField(null=True)),
+                ('has_activity', models.BooleanField()),
+                ('obligations_incurred', models.DecimalField(decimal_places=2, max_digits=23, null=True)),
+                ('gross_outlays', models.DecimalField(decimal_places=2, max_digits=23, null=True)),
+                ('toptier_agency', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, to='references.ToptierAgency')),
+            ],
+            options={
+                'db_table': 'agency_profile_rollup',
+                'managed': True,
+                'index_together': {('toptier_agency', 'dimension', 'fiscal_year')},
+            },
+        ),
+    ]
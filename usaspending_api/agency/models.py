@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class AgencyProfileRollup(models.Model):
+    """
+    The members of each dimension the agency profile endpoints count or list, by funding toptier agency, fiscal year
+    and fiscal period, with their obligated and gross outlay totals.  File B dimensions ("treasury_account",
+    "budget_function", "object_class" and "program_activity") come from final_of_fy File B rows and are rebuilt for an
+    agency whenever one of its submissions loads; "subtier_agency" rows (with no fiscal period or totals) record which
+    subtier agencies awarded transactions in each fiscal year.  See usaspending_api/agency/profile_rollup.py.
+    """
+
+    toptier_agency = models.ForeignKey("references.ToptierAgency", models.DO_NOTHING)
+    fiscal_year = models.IntegerField()
+    fiscal_period = models.IntegerField(null=True)
+    dimension = models.TextField()
+    member_id = models.IntegerField(null=True)
+    code = models.TextField(null=True)
+    name = models.TextField(null=True)
+    parent_id = models.IntegerField(null=True)
+    parent_code = models.TextField(null=True)
+    parent_name = models.TextField(null=True)
+    has_activity = models.BooleanField()
+    obligations_incurred = models.DecimalField(max_digits=23, decimal_places=2, null=True)
+    gross_outlays = models.DecimalField(max_digits=23, decimal_places=2, null=True)
+
+    class Meta:
+        managed = True
+        db_table = "agency_profile_rollup"
+        index_together = ("toptier_agency", "dimension", "fiscal_year")
@@ -0,0 +1,241 @@
+"""
+Maintains agency_profile_rollup (AgencyProfileRollup), which the agency profile endpoints read instead of aggregating
+File B and searching transactions on every request.
+
+File B dimensions are rebuilt for an agency as a whole once its submissions load and final_of_fy is current.  The
+subtier agencies that awarded transactions are only ever added, from the transactions of the awards a load touched;
+rebuilding them for every agency in a nightly load would mean searching all of transaction_normalized.  Deleted
+transactions can leave subtier rows behind until the next rebuild, which check_agency_profile_rollup reports.
+"""
+import logging
+
+from django.conf import settings
+from django.db import connection
+from typing import List, Sequence
+from usaspending_api.agency.models import AgencyProfileRollup
+from usaspending_api.common.helpers.date_helper import fy
+
+
+logger = logging.getLogger("script")
+
+FILE_B_DIMENSIONS = ("treasury_account", "budget_function", "object_class", "program_activity")
+SUBTIER_AGENCY_DIMENSION = "subtier_agency"
+DIMENSIONS = FILE_B_DIMENSIONS + (SUBTIER_AGENCY_DIMENSION,)
+
+ROLLUP_COLUMNS = (
+    "toptier_agency_id, fiscal_year, fiscal_period, dimension, member_id, code, name, parent_id, parent_code, "
+    "parent_name, has_activity, obligations_incurred, gross_outlays"
+)
+
+# The same test for a File B row the agency profile endpoints apply before counting or summing it
+FILE_B_ACTIVITY = (
+    "(coalesce(fabpaoc.obligations_incurred_by_program_object_class_cpe, 0) != 0 or "
+    "coalesce(fabpaoc.gross_outlay_amount_by_program_object_class_cpe, 0) != 0)"
+)
+
+# member_id, code, name, parent_id, parent_code and parent_name of each File B dimension, and any join they need
+FILE_B_MEMBERS = {
+    "treasury_account": (
+        "taa.treasury_account_identifier, taa.tas_rendering_label, taa.account_title, "
+        "fa.id, fa.federal_account_code, fa.account_title",
+        "left outer join federal_account as fa on fa.id = taa.federal_account_id",
+    ),
+    "budget_function": (
+        "null::integer, taa.budget_subfunction_code, taa.budget_subfunction_title, "
+        "null::integer, taa.budget_function_code, taa.budget_function_title",
+        "",
+    ),
+    "object_class": (
+        "oc.id, null::text, oc.object_class_name, null::integer, null::text, null::text",
+        "inner join object_class as oc on oc.id = fabpaoc.object_class_id",
+    ),
+    "program_activity": (
+        "pa.id, null::text, pa.program_activity_name, null::integer, null::text, null::text",
+        "inner join ref_program_activity as pa on pa.id = fabpaoc.program_activity_id",
+    ),
+}
+
+FILE_B_ROLLUP_SQL = """
+insert into {table} ({columns})
+select
+    taa.funding_toptier_agency_id,
+    s.reporting_fiscal_year,
+    s.reporting_fiscal_period,
+    %(dimension)s,
+    {members},
+    bool_or({activity}),
+    sum(fabpaoc.obligations_incurred_by_program_object_class_cpe) filter (where {activity}),
+    sum(fabpaoc.gross_outlay_amount_by_program_object_class_cpe) filter (where {activity})
+from
+    financial_accounts_by_program_activity_object_class as fabpaoc
+    inner join submission_attributes as s on s.submission_id = fabpaoc.submission_id
+    inner join treasury_appropriation_account as taa on taa.treasury_account_identifier = fabpaoc.treasury_account_id
+    {joins}
+where
+    fabpaoc.final_of_fy is true and
+    taa.funding_toptier_agency_id = any(%(toptier_agency_ids)s)
+group by 1, 2, 3, 5, 6, 7, 8, 9, 10
+"""
+
+SUBTIER_AGENCY_ROLLUP_SQL = """
+insert into {table} ({columns})
+select distinct
+    a.toptier_agency_id, tn.fiscal_year, null::integer, %(dimension)s, a.subtier_agency_id,
+    null::text, null::text, null::integer, null::text, null::text, true, null::numeric, null::numeric
+from
+    transaction_normalized as tn
+    inner join agency as a on a.id = tn.awarding_agency_id
+where
+    a.subtier_agency_id is not null and
+    {predicate}
+"""
+
+
+def _insert_rollup_rows(cursor, table, toptier_agency_ids, dimensions):
+    for dimension in dimensions:
+        if dimension == SUBTIER_AGENCY_DIMENSION:
+            sql = SUBTIER_AGENCY_ROLLUP_SQL.format(
+                table=table, columns=ROLLUP_COLUMNS, predicate="a.toptier_agency_id = any(%(toptier_agency_ids)s)"
+            )
+        else:
+            members, joins = FILE_B_MEMBERS[dimension]
+            sql = FILE_B_ROLLUP_SQL.format(
+                table=table, columns=ROLLUP_COLUMNS, members=members, joins=joins, activity=FILE_B_ACTIVITY
+            )
+        cursor.execute(sql, {"dimension": dimension, "toptier_agency_ids": list(toptier_agency_ids)})
+
+
+def rebuild_agency_profile_rollup(toptier_agency_ids: Sequence[int], dimensions: Sequence[str] = DIMENSIONS) -> int:
+    """Replaces the rollup rows of these toptier agencies in these dimensions; returns how many were written"""
+    toptier_agency_ids = list(toptier_agency_ids)
+    if not toptier_agency_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "delete from agency_profile_rollup where toptier_agency_id = any(%s) and dimension = any(%s)",
+            [toptier_agency_ids, list(dimensions)],
+        )
+        _insert_rollup_rows(cursor, "agency_profile_rollup", toptier_agency_ids, dimensions)
+        cursor.execute(
+            "select count(*) from agency_profile_rollup where toptier_agency_id = any(%s) and dimension = any(%s)",
+            [toptier_agency_ids, list(dimensions)],
+        )
+        row_count = cursor.fetchone()[0]
+    logger.info(f"Rebuilt {row_count:,} agency profile rollup rows for {len(toptier_agency_ids):,} toptier agencies")
+    return row_count
+
+
+def rebuild_agency_profile_rollup_for_submission(submission_id: int) -> int:
+    """Rebuilds the File B dimensions of every agency funding a treasury account in the submission's File B"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            select distinct taa.funding_toptier_agency_id
+            from financial_accounts_by_program_activity_object_class as fabpaoc
+            inner join treasury_appropriation_account as taa
+                on taa.treasury_account_identifier = fabpaoc.treasury_account_id
+            where fabpaoc.submission_id = %s and taa.funding_toptier_agency_id is not null
+            """,
+            [submission_id],
+        )
+        toptier_agency_ids = [row[0] for row in cursor.fetchall()]
+    return rebuild_agency_profile_rollup(toptier_agency_ids, FILE_B_DIMENSIONS)
+
+
+def add_awarding_subtier_agencies(award_ids: Sequence[int]) -> int:
+    """
+    Adds the subtier agencies that awarded these awards' transactions to the rollup of each toptier agency whose
+    subtier agencies have been rolled up before; returns how many rows were added
+    """
+    award_ids = list(award_ids)
+    if not award_ids:
+        return 0
+    sql = SUBTIER_AGENCY_ROLLUP_SQL.format(
+        table="agency_profile_rollup",
+        columns=ROLLUP_COLUMNS,
+        predicate="""
+            tn.award_id = any(%(award_ids)s) and
+            exists (
+                select from agency_profile_rollup as r
+                where r.toptier_agency_id = a.toptier_agency_id and r.dimension = %(dimension)s
+            ) and
+            not exists (
+                select from agency_profile_rollup as r
+                where
+                    r.toptier_agency_id = a.toptier_agency_id and
+                    r.dimension = %(dimension)s and
+                    r.fiscal_year = tn.fiscal_year and
+                    r.member_id = a.subtier_agency_id
+            )
+        """,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"dimension": SUBTIER_AGENCY_DIMENSION, "award_ids": award_ids})
+        row_count = cursor.rowcount
+    logger.info(f"Added {row_count:,} awarding subtier agencies to the agency profile rollup")
+    return row_count
+
+
+def check_agency_profile_rollup(toptier_agency_ids: Sequence[int]) -> List[str]:
+    """
+    Full consistency check: rolls these agencies up again into a temporary table and describes, per agency and
+    dimension, how many stored rows differ from it.  An empty list means the rollup is current.
+    """
+    toptier_agency_ids = list(toptier_agency_ids)
+    with connection.cursor() as cursor:
+        cursor.execute("drop table if exists temp_agency_profile_rollup")
+        cursor.execute(
+            f"create temporary table temp_agency_profile_rollup as select {ROLLUP_COLUMNS} from agency_profile_rollup "
+            f"limit 0"
+        )
+        try:
+            _insert_rollup_rows(cursor, "temp_agency_profile_rollup", toptier_agency_ids, DIMENSIONS)
+            cursor.execute(
+                f"""
+                select toptier_agency_id, dimension, count(*)
+                from (
+                    (
+                        select {ROLLUP_COLUMNS} from agency_profile_rollup where toptier_agency_id = any(%(ids)s)
+                        except
+                        select {ROLLUP_COLUMNS} from temp_agency_profile_rollup
+                    ) union all (
+                        select {ROLLUP_COLUMNS} from temp_agency_profile_rollup
+                        except
+                        select {ROLLUP_COLUMNS} from agency_profile_rollup where toptier_agency_id = any(%(ids)s)
+                    )
+                ) as differences
+                group by toptier_agency_id, dimension
+                order by toptier_agency_id, dimension
+                """,
+                {"ids": toptier_agency_ids},
+            )
+            differences = cursor.fetchall()
+        finally:
+            cursor.execute("drop table if exists temp_agency_profile_rollup")
+    return [
+        f"toptier agency {toptier_agency_id} {dimension}: {count:,} rows differ"
+        for toptier_agency_id, dimension, count in differences
+    ]
+
+
+def rollup_has_dimension(toptier_agency, dimension: str) -> bool:
+    """
+    Whether the agency profile endpoints should answer from the rollup: always, unless falling back to live queries
+    is enabled and nothing has been rolled up for this agency in this dimension.
+    """
+    if not settings.AGENCY_PROFILE_ROLLUP_LIVE_FALLBACK:
+        return True
+    return AgencyProfileRollup.objects.filter(toptier_agency=toptier_agency, dimension=dimension).exists()
+
+
+def get_awarding_subtier_agency_count(toptier_agency) -> int:
+    return (
+        AgencyProfileRollup.objects.filter(
+            toptier_agency=toptier_agency,
+            dimension=SUBTIER_AGENCY_DIMENSION,
+            fiscal_year__gte=fy(settings.API_SEARCH_MIN_DATE),
+        )
+        .values("member_id")
+        .distinct()
+        .count()
+    )
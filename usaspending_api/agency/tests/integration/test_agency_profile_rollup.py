@@ -0,0 +1,49 @@
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from usaspending_api.agency.models import AgencyProfileRollup
+
+
+ENDPOINTS = [
+    "/api/v2/agency/{code}/budget_function/",
+    "/api/v2/agency/{code}/budget_function/count/",
+    "/api/v2/agency/{code}/federal_account/",
+    "/api/v2/agency/{code}/federal_account/count/",
+    "/api/v2/agency/{code}/object_class/",
+    "/api/v2/agency/{code}/object_class/count/",
+    "/api/v2/agency/{code}/program_activity/",
+    "/api/v2/agency/{code}/program_activity/count/",
+]
+
+
+def get_responses(client):
+    return {
+        (endpoint, code, query_params): client.get(endpoint.format(code=code) + query_params).json()
+        for endpoint in ENDPOINTS
+        for code in ("007", "008", "009", "010")
+        for query_params in ("", "?fiscal_year=2017", "?fiscal_year=2019", "?filter=NAME")
+    }
+
+
+@pytest.mark.django_db
+def test_rollup_matches_live_queries(client, agency_account_data):
+    live_responses = get_responses(client)
+
+    call_command("rebuild_agency_profile_rollup")
+
+    assert AgencyProfileRollup.objects.filter(dimension="object_class").exists()
+    assert get_responses(client) == live_responses
+
+
+@pytest.mark.django_db
+def test_rollup_check(client, agency_account_data):
+    call_command("rebuild_agency_profile_rollup")
+    call_command("rebuild_agency_profile_rollup", "--check")
+
+    AgencyProfileRollup.objects.filter(dimension="program_activity").first().delete()
+    with pytest.raises(CommandError, match="program_activity: 1 rows differ"):
+        call_command("rebuild_agency_profile_rollup", "--check")
+
+    call_command("rebuild_agency_profile_rollup", "--toptier-codes", "007", "008", "009", "010")
+    call_command("rebuild_agency_profile_rollup", "--check")
@@ -4,6 +4,8 @@ from re import fullmatch
 from rest_framework.exceptions import NotFound
 from rest_framework.views import APIView
 
+from usaspending_api.agency.models import AgencyProfileRollup
+from usaspending_api.agency.profile_rollup import rollup_has_dimension
 from usaspending_api.common.data_classes import Pagination
 from usaspending_api.common.exceptions import UnprocessableEntityException
 from usaspending_api.common.helpers.date_helper import fy
@@ -57,6 +59,17 @@ class AgencyBase(APIView):
             raise NotFound(f"Agency with a toptier code of '{self.toptier_code}' does not exist")
         return toptier_agency
 
+    def profile_rollup(self, dimension):
+        """
+        This agency's agency_profile_rollup rows in a dimension for the requested fiscal year, or None when the
+        dimension hasn't been rolled up for this agency and should be queried live instead
+        """
+        if not rollup_has_dimension(self.toptier_agency, dimension):
+            return None
+        return AgencyProfileRollup.objects.filter(
+            toptier_agency=self.toptier_agency, fiscal_year=self.fiscal_year, dimension=dimension
+        )
+
     @property
     def standard_response_messages(self):
         return [get_account_data_time_period_message()] if self.fiscal_year < 2017 else []
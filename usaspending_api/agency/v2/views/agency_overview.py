@@ -1,6 +1,11 @@
 from django.conf import settings
 from django.db.models import Exists, OuterRef
 from rest_framework.response import Response
+from usaspending_api.agency.profile_rollup import (
+    SUBTIER_AGENCY_DIMENSION,
+    get_awarding_subtier_agency_count,
+    rollup_has_dimension,
+)
 from usaspending_api.agency.v2.views.agency_base import AgencyBase
 from usaspending_api.awards.models import TransactionNormalized
 from usaspending_api.common.cache_decorator import cache_response
@@ -35,6 +40,8 @@ class AgencyOverview(AgencyBase):
         )
 
     def get_subtier_agency_count(self):
+        if rollup_has_dimension(self.toptier_agency, SUBTIER_AGENCY_DIMENSION):
+            return get_awarding_subtier_agency_count(self.toptier_agency)
         return (
             SubtierAgency.objects.filter(agency__toptier_agency=self.toptier_agency)
             .annotate(
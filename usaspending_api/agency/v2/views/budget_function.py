@@ -52,6 +52,25 @@ class BudgetFunctionList(ListMixin, AgencyBase):
         )
 
     def get_budget_function_queryset(self):
+        rollup = self.profile_rollup("budget_function")
+        if rollup is not None:
+            rollup = rollup.filter(has_activity=True)
+            if self.filter is not None:
+                rollup = rollup.filter(Q(parent_name__icontains=self.filter) | Q(name__icontains=self.filter))
+            return [
+                {
+                    "treasury_account__budget_function_code": row["parent_code"],
+                    "treasury_account__budget_function_title": row["parent_name"],
+                    "treasury_account__budget_subfunction_code": row["code"],
+                    "treasury_account__budget_subfunction_title": row["name"],
+                    "obligated_amount": row["obligated_amount"],
+                    "gross_outlay_amount": row["gross_outlay_amount"],
+                }
+                for row in rollup.values("parent_code", "parent_name", "code", "name").annotate(
+                    obligated_amount=Sum("obligations_incurred"), gross_outlay_amount=Sum("gross_outlays")
+                )
+            ]
+
         filters = [
             Q(final_of_fy=True),
             Q(treasury_account__funding_toptier_agency=self.toptier_agency),
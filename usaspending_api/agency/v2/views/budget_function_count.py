@@ -1,4 +1,4 @@
-from django.db.models import Exists, OuterRef, Q
+from django.db.models import Exists, F, OuterRef, Q
 from rest_framework.request import Request
 from rest_framework.response import Response
 from typing import Any
@@ -32,6 +32,12 @@ class BudgetFunctionCount(AgencyBase):
         )
 
     def get_budget_function_queryset(self):
+        rollup = self.profile_rollup("budget_function")
+        if rollup is not None:
+            return rollup.filter(has_activity=True).values(
+                budget_function_code=F("parent_code"), budget_subfunction_code=F("code")
+            )
+
         filters = [
             Q(treasury_account_id=OuterRef("pk")),
             Q(final_of_fy=True),
@@ -29,6 +29,10 @@ class FederalAccountCount(AgencyBase):
         )
 
     def get_federal_account_count(self):
+        rollup = self.profile_rollup("treasury_account")
+        if rollup is not None:
+            return rollup.filter(has_activity=True, parent_id__isnull=False).values("parent_id").distinct().count()
+
         filters = [
             Q(treasury_account__federal_account_id=OuterRef("pk")),
             Q(final_of_fy=True),
@@ -51,6 +55,10 @@ class FederalAccountCount(AgencyBase):
         )
 
     def get_treasury_account_count(self):
+        rollup = self.profile_rollup("treasury_account")
+        if rollup is not None:
+            return rollup.values("member_id").distinct().count()
+
         return (
             TreasuryAppropriationAccount.objects.annotate(
                 include=Exists(
@@ -64,6 +64,30 @@ class FederalAccountList(ListMixin, AgencyBase):
         )
 
     def get_federal_account_list(self) -> List[dict]:
+        rollup = self.profile_rollup("treasury_account")
+        if rollup is not None:
+            rollup = rollup.filter(has_activity=True)
+            if self.filter:
+                rollup = rollup.filter(
+                    Q(name__icontains=self.filter)
+                    | Q(code__icontains=self.filter)
+                    | Q(parent_name__icontains=self.filter)
+                    | Q(parent_code__icontains=self.filter)
+                )
+            return [
+                {
+                    "treasury_account__tas_rendering_label": row["code"],
+                    "treasury_account__account_title": row["name"],
+                    "treasury_account__federal_account__account_title": row["parent_name"],
+                    "treasury_account__federal_account__federal_account_code": row["parent_code"],
+                    "obligated_amount": row["obligated_amount"],
+                    "gross_outlay_amount": row["gross_outlay_amount"],
+                }
+                for row in rollup.values("code", "name", "parent_name", "parent_code").annotate(
+                    obligated_amount=Sum("obligations_incurred"), gross_outlay_amount=Sum("gross_outlays")
+                )
+            ]
+
         filters = [
             Q(final_of_fy=True),
             Q(treasury_account__funding_toptier_agency=self.toptier_agency),
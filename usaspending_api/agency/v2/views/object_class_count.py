@@ -29,6 +29,10 @@ class ObjectClassCount(AgencyBase):
         )
 
     def get_object_class_count(self):
+        rollup = self.profile_rollup("object_class")
+        if rollup is not None:
+            return rollup.filter(has_activity=True).values("member_id").distinct().count()
+
         filters = [
             Q(object_class_id=OuterRef("pk")),
             Q(final_of_fy=True),
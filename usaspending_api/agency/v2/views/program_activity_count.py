@@ -29,6 +29,10 @@ class ProgramActivityCount(AgencyBase):
         )
 
     def get_program_activity_count(self):
+        rollup = self.profile_rollup("program_activity")
+        if rollup is not None:
+            return rollup.filter(has_activity=True).values("member_id").distinct().count()
+
         filters = [
             Q(program_activity_id=OuterRef("pk")),
             Q(final_of_fy=True),
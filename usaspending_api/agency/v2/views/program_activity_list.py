@@ -33,6 +33,19 @@ class ProgramActivityList(ListMixin, AgencyBase):
         )
 
     def get_program_activity_list(self) -> List[dict]:
+        ordering = f"{'-' if self.pagination.sort_order == 'desc' else ''}{self.pagination.sort_key}"
+        rollup = self.profile_rollup("program_activity")
+        if rollup is not None:
+            rollup = rollup.filter(has_activity=True)
+            if self.filter:
+                rollup = rollup.filter(name__icontains=self.filter)
+            return (
+                rollup.values("member_id", "name")
+                .annotate(obligated_amount=Sum("obligations_incurred"), gross_outlay_amount=Sum("gross_outlays"))
+                .order_by(ordering)
+                .values("name", "obligated_amount", "gross_outlay_amount")
+            )
+
         filters = [
             Q(financialaccountsbyprogramactivityobjectclass__final_of_fy=True),
             Q(
@@ -65,7 +78,7 @@ class ProgramActivityList(ListMixin, AgencyBase):
                     "financialaccountsbyprogramactivityobjectclass__gross_outlay_amount_by_program_object_class_cpe"
                 ),
             )
-            .order_by(f"{'-' if self.pagination.sort_order == 'desc' else ''}{self.pagination.sort_key}")
+            .order_by(ordering)
             .values("name", "obligated_amount", "gross_outlay_amount")
         )
         return queryset_results
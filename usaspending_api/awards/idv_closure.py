@@ -0,0 +1,273 @@
+"""
+Maintains idv_closure (IdvClosure) and idv_funding_rollup (IdvFundingRollup), which the IDV endpoints join instead of
+walking parent_award and matching child awards on their parent keys on every request.
+
+An award's parents are the IDVs whose piid and fpds_agency_id match its parent_award_piid and fpds_parent_agency_id,
+as in restock_parent_award.sql, but the closure follows the hierarchy to any depth.  When a load changes awards, only
+the rows of those awards and of everything beneath them (before or after the change) are recomputed, along with the
+funding rollups of every IDV above them.  File C totals also change when submissions load, so the submission loader
+refreshes the rollups above the awards its File C records are linked to, and when File C records are linked to or
+unlinked from awards, so the C to D linkage and prune_empty_awards refresh the rollups above those awards.
+"""
+import logging
+
+from django.db import connection
+from typing import List, Optional, Sequence
+
+
+logger = logging.getLogger("script")
+
+CLOSURE_COLUMNS = "ancestor_award_id, descendant_award_id, parent_award_id, depth"
+
+FUNDING_ROLLUP_COLUMNS = (
+    "award_id, total_transaction_obligated_amount, awarding_agency_count, funding_agency_count, federal_account_count"
+)
+
+# Walks up from each award matching the predicate to every IDV above it.  The path guards against cycles.
+CLOSURE_SQL = """
+with recursive ancestry (ancestor_award_id, descendant_award_id, parent_award_id, depth, path, is_idv) as (
+    select  a.id, a.id, null::bigint, 0, array[a.id], a.type like 'IDV%%'
+    from    awards as a
+    where   {predicate}
+    union all
+    select  p.id, ancestry.descendant_award_id, coalesce(ancestry.parent_award_id, p.id), ancestry.depth + 1,
+            ancestry.path || p.id, ancestry.is_idv
+    from    ancestry
+            inner join awards as c on c.id = ancestry.ancestor_award_id
+            inner join awards as p on
+                p.piid = c.parent_award_piid and
+                p.fpds_agency_id = c.fpds_parent_agency_id and
+                p.type like 'IDV%%' and
+                p.id != all(ancestry.path)
+)
+insert into {table} ({columns})
+select distinct ancestor_award_id, descendant_award_id, parent_award_id, depth
+from ancestry
+where depth > 0 or is_idv
+"""
+
+# As per direction from the product owner, agency data is to be retrieved from the File D (awards) data not File C
+# (financial_accounts_by_awards).
+FUNDING_ROLLUP_SQL = """
+insert into {table} ({columns})
+select
+    c.ancestor_award_id,
+    coalesce(sum(nullif(faba.transaction_obligated_amount, 'NaN')), 0.0),
+    count(distinct aa.toptier_agency_id),
+    count(distinct af.toptier_agency_id),
+    count(distinct taa.agency_id || '-' || taa.main_account_code)
+from
+    {closure_table} as c
+    inner join awards as ca on ca.id = c.descendant_award_id and ca.type not like 'IDV%%'
+    inner join financial_accounts_by_awards as faba on faba.award_id = ca.id
+    left outer join treasury_appropriation_account as taa on taa.treasury_account_identifier = faba.treasury_account_id
+    left outer join agency as aa on aa.id = ca.awarding_agency_id
+    left outer join agency as af on af.id = ca.funding_agency_id
+where
+    {predicate}
+group by
+    c.ancestor_award_id
+"""
+
+# The awards whose closure rows a change to these awards can affect: themselves and everything beneath them, both as
+# recorded and as their parent keys now say
+AFFECTED_AWARDS_SQL = """
+with recursive descendants (award_id, path) as (
+    select  a.id, array[a.id]
+    from    awards as a
+    where   a.id = any(%(award_ids)s)
+    union all
+    select  c.id, descendants.path || c.id
+    from    descendants
+            inner join awards as p on p.id = descendants.award_id and p.type like 'IDV%%'
+            inner join awards as c on
+                c.parent_award_piid = p.piid and
+                c.fpds_parent_agency_id = p.fpds_agency_id and
+                c.id != all(descendants.path)
+)
+insert into temp_idv_closure_awards (award_id)
+select award_id from descendants
+union
+select descendant_award_id from idv_closure where ancestor_award_id = any(%(award_ids)s)
+union
+select unnest(%(award_ids)s::bigint[])
+"""
+
+
+def rebuild_idv_closure() -> int:
+    """Replaces every closure and funding rollup row; returns how many closure rows were written"""
+    with connection.cursor() as cursor:
+        cursor.execute("delete from idv_closure")
+        cursor.execute(
+            CLOSURE_SQL.format(
+                table="idv_closure",
+                columns=CLOSURE_COLUMNS,
+                predicate="a.type like 'IDV%%' or a.parent_award_piid is not null",
+            ),
+            {},
+        )
+        row_count = cursor.rowcount
+        cursor.execute("delete from idv_funding_rollup")
+        cursor.execute(
+            FUNDING_ROLLUP_SQL.format(
+                table="idv_funding_rollup",
+                columns=FUNDING_ROLLUP_COLUMNS,
+                closure_table="idv_closure",
+                predicate="true",
+            ),
+            {},
+        )
+        rollup_count = cursor.rowcount
+    logger.info(f"Rebuilt {row_count:,} IDV closure rows and {rollup_count:,} IDV funding rollups")
+    return row_count
+
+
+def refresh_idv_closure(award_ids: Sequence[int]) -> int:
+    """
+    Recomputes the closure rows of these awards and of every award beneath them, then the funding rollups of every
+    IDV above any of them before or after; returns how many closure rows were written.  Award ids that no longer
+    exist are removed from the closure.
+    """
+    award_ids = list(award_ids)
+    if not award_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            drop table if exists temp_idv_closure_awards, temp_idv_closure_ancestors;
+            create temporary table temp_idv_closure_awards (award_id bigint primary key);
+            create temporary table temp_idv_closure_ancestors (award_id bigint primary key)
+            """
+        )
+        try:
+            cursor.execute(AFFECTED_AWARDS_SQL, {"award_ids": award_ids})
+            ancestors_sql = """
+                insert into temp_idv_closure_ancestors (award_id)
+                select distinct ancestor_award_id
+                from idv_closure
+                where descendant_award_id in (select award_id from temp_idv_closure_awards)
+                on conflict do nothing
+            """
+            cursor.execute(ancestors_sql)
+            cursor.execute(
+                "delete from idv_closure where descendant_award_id in (select award_id from temp_idv_closure_awards)"
+            )
+            cursor.execute(
+                CLOSURE_SQL.format(
+                    table="idv_closure",
+                    columns=CLOSURE_COLUMNS,
+                    predicate="a.id in (select award_id from temp_idv_closure_awards)",
+                ),
+                {},
+            )
+            row_count = cursor.rowcount
+            cursor.execute(ancestors_sql)
+            cursor.execute("select count(*) from temp_idv_closure_awards")
+            affected_count = cursor.fetchone()[0]
+            _refresh_funding_rollups(cursor, "temp_idv_closure_ancestors")
+        finally:
+            cursor.execute("drop table if exists temp_idv_closure_awards, temp_idv_closure_ancestors")
+    logger.info(f"Refreshed {row_count:,} IDV closure rows for {affected_count:,} awards")
+    return row_count
+
+
+def refresh_idv_funding_rollups(award_ids: Sequence[int]) -> int:
+    """Recomputes the funding rollups of every IDV above these awards (or that is one); returns how many were written"""
+    award_ids = list(award_ids)
+    if not award_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            drop table if exists temp_idv_funding_rollup_ancestors;
+            create temporary table temp_idv_funding_rollup_ancestors as
+            select distinct ancestor_award_id as award_id from idv_closure where descendant_award_id = any(%s)
+            """,
+            [award_ids],
+        )
+        try:
+            row_count = _refresh_funding_rollups(cursor, "temp_idv_funding_rollup_ancestors")
+        finally:
+            cursor.execute("drop table if exists temp_idv_funding_rollup_ancestors")
+    return row_count
+
+
+def _refresh_funding_rollups(cursor, ancestors_table: str) -> int:
+    predicate = f"c.ancestor_award_id in (select award_id from {ancestors_table})"
+    cursor.execute(f"delete from idv_funding_rollup where award_id in (select award_id from {ancestors_table})")
+    cursor.execute(
+        FUNDING_ROLLUP_SQL.format(
+            table="idv_funding_rollup", columns=FUNDING_ROLLUP_COLUMNS, closure_table="idv_closure", predicate=predicate
+        ),
+        {},
+    )
+    row_count = cursor.rowcount
+    logger.info(f"Refreshed {row_count:,} IDV funding rollups")
+    return row_count
+
+
+def get_file_c_award_ids(submission_id: int) -> List[int]:
+    """The awards a submission's File C records are linked to, whose IDV funding rollups depend on them"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "select distinct award_id from financial_accounts_by_awards "
+            "where submission_id = %s and award_id is not null",
+            [submission_id],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _count_differences(cursor, table: str, temp_table: str, columns: str) -> Optional[str]:
+    cursor.execute(
+        f"""
+        select count(*)
+        from (
+            (select {columns} from {table} except select {columns} from {temp_table})
+            union all
+            (select {columns} from {temp_table} except select {columns} from {table})
+        ) as differences
+        """
+    )
+    count = cursor.fetchone()[0]
+    return f"{table}: {count:,} rows differ" if count else None
+
+
+def check_idv_closure() -> List[str]:
+    """
+    Full consistency check: rebuilds the closure and funding rollups into temporary tables and describes how many
+    stored rows differ from them.  An empty list means both are current.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            drop table if exists temp_idv_closure, temp_idv_funding_rollup;
+            create temporary table temp_idv_closure as select {CLOSURE_COLUMNS} from idv_closure limit 0;
+            create temporary table temp_idv_funding_rollup as select {FUNDING_ROLLUP_COLUMNS} from idv_funding_rollup
+            limit 0
+            """
+        )
+        try:
+            cursor.execute(
+                CLOSURE_SQL.format(
+                    table="temp_idv_closure",
+                    columns=CLOSURE_COLUMNS,
+                    predicate="a.type like 'IDV%%' or a.parent_award_piid is not null",
+                ),
+                {},
+            )
+            cursor.execute(
+                FUNDING_ROLLUP_SQL.format(
+                    table="temp_idv_funding_rollup",
+                    columns=FUNDING_ROLLUP_COLUMNS,
+                    closure_table="temp_idv_closure",
+                    predicate="true",
+                ),
+                {},
+            )
+            differences = [
+                _count_differences(cursor, "idv_closure", "temp_idv_closure", CLOSURE_COLUMNS),
+                _count_differences(cursor, "idv_funding_rollup", "temp_idv_funding_rollup", FUNDING_ROLLUP_COLUMNS),
+            ]
+        finally:
+            cursor.execute("drop table if exists temp_idv_closure, temp_idv_funding_rollup")
+    return [difference for difference in differences if difference]
@@ -0,0 +1,38 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from usaspending_api.awards.idv_closure import check_idv_closure, rebuild_idv_closure
+from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
+
+
+logger = logging.getLogger("script")
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Rebuild idv_closure and idv_funding_rollup, which the IDV endpoints read.  FPDS and submission loads keep "
+        "them current; run this to populate them or after data corrections such as a full File C to D linkage."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Instead of rebuilding, compare both tables with fresh ones and fail if they differ",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            with Timer("Check idv_closure"):
+                differences = check_idv_closure()
+            if differences:
+                raise CommandError("IDV closure is out of date:\n" + "\n".join(differences))
+            logger.info("idv_closure and idv_funding_rollup are current")
+            return
+
+        with Timer("Rebuild idv_closure"):
+            with transaction.atomic():
+                rebuild_idv_closure()
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0073_auto_20200805_1511'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnlinkedFileCCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_id', models.IntegerField()),
+                ('linkage_type', models.TextField()),
+                ('unlinked_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'unlinked_file_c_count',
+                'managed': True,
+                'unique_together': {('submission_id', 'linkage_type')},
+            },
+        ),
+    ]
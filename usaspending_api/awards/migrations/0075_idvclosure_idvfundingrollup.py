@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0074_unlinkedfileccount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdvClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ancestor_award_id', models.BigIntegerField()),
+                ('descendant_award_id', models.BigIntegerField(db_index=True)),
+                ('parent_award_id', models.BigIntegerField(null=True)),
+                ('depth', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'idv_closure',
+                'managed': True,
+                'index_together': {('ancestor_award_id', 'depth')},
+            },
+        ),
+        migrations.CreateModel(
+            name='IdvFundingRollup',
+            fields=[
+                ('award_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('total_transaction_obligated_amount', models.DecimalField(decimal_places=2, max_digits=23)),
+                ('awarding_agency_count', models.IntegerField()),
+                ('funding_agency_count', models.IntegerField()),
+                ('federal_account_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'idv_funding_rollup',
+                'managed': True,
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('awards', '0075_idvclosure_idvfundingrollup'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='create index concurrently if not exists tn_keyset_action_date on transaction_normalized (award_id, action_date desc nulls last, id desc nulls last)',
+            reverse_sql='drop index concurrently if exists tn_keyset_action_date',
+        ),
+        migrations.RunSQL(
+            sql='create index concurrently if not exists tn_keyset_federal_action_obligation on transaction_normalized (award_id, federal_action_obligation desc nulls last, id desc nulls last)',
+            reverse_sql='drop index concurrently if exists tn_keyset_federal_action_obligation',
+        ),
+        migrations.RunSQL(
+            sql='create index concurrently if not exists tn_keyset_modification_number on transaction_normalized (award_id, modification_number desc nulls last, id desc nulls last)',
+            reverse_sql='drop index concurrently if exists tn_keyset_modification_number',
+        ),
+        migrations.RunSQL(
+            sql='create index concurrently if not exists tn_keyset_id on transaction_normalized (award_id, id desc nulls last)',
+            reverse_sql='drop index concurrently if exists tn_keyset_id',
+        ),
+    ]
@@ -1,6 +1,7 @@
 from usaspending_api.awards.models.award import Award
 from usaspending_api.awards.models.broker_subaward import BrokerSubaward
 from usaspending_api.awards.models.financial_accounts_by_awards import FinancialAccountsByAwards
+from usaspending_api.awards.models.idv_closure import IdvClosure, IdvFundingRollup
 from usaspending_api.awards.models.mv_covid_financial_account import CovidFinancialAccountMatview
 from usaspending_api.awards.models.parent_award import ParentAward
 from usaspending_api.awards.models.subaward import Subaward
@@ -8,16 +9,20 @@ from usaspending_api.awards.models.transaction_delta import TransactionDelta
 from usaspending_api.awards.models.transaction_fabs import TransactionFABS
 from usaspending_api.awards.models.transaction_fpds import TransactionFPDS
 from usaspending_api.awards.models.transaction_normalized import TransactionNormalized
+from usaspending_api.awards.models.unlinked_file_c_count import UnlinkedFileCCount
 
 __all__ = [
     "Award",
     "BrokerSubaward",
     "CovidFinancialAccountMatview",
     "FinancialAccountsByAwards",
+    "IdvClosure",
+    "IdvFundingRollup",
     "ParentAward",
     "Subaward",
     "TransactionDelta",
     "TransactionFABS",
     "TransactionFPDS",
     "TransactionNormalized",
+    "UnlinkedFileCCount",
 ]
@@ -0,0 +1,37 @@
+from django.db import models
+
+
+class IdvClosure(models.Model):
+    """
+    Every (IDV, award beneath it) pair in the IDV hierarchies, with how many levels apart they are.  Each IDV is also
+    paired with itself at depth 0.  parent_award_id is the descendant's own parent on the path from the ancestor.
+    Award ids are not foreign keys so pruned awards can be cleared out by the next refresh rather than beforehand.
+    See usaspending_api/awards/idv_closure.py.
+    """
+
+    ancestor_award_id = models.BigIntegerField()
+    descendant_award_id = models.BigIntegerField(db_index=True)
+    parent_award_id = models.BigIntegerField(null=True)
+    depth = models.IntegerField()
+
+    class Meta:
+        managed = True
+        db_table = "idv_closure"
+        index_together = ("ancestor_award_id", "depth")
+
+
+class IdvFundingRollup(models.Model):
+    """
+    File C totals of the contracts beneath each IDV, and the distinct awarding agencies, funding agencies and federal
+    accounts among them.  IDVs without File C records beneath them have no row.
+    """
+
+    award_id = models.BigIntegerField(primary_key=True)
+    total_transaction_obligated_amount = models.DecimalField(max_digits=23, decimal_places=2)
+    awarding_agency_count = models.IntegerField()
+    funding_agency_count = models.IntegerField()
+    federal_account_count = models.IntegerField()
+
+    class Meta:
+        managed = True
+        db_table = "idv_funding_rollup"
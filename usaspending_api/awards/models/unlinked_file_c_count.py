@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class UnlinkedFileCCount(models.Model):
+    """
+    How many of a submission's File C records the C to D linkage could not link to an award, by linkage type
+    ("contract" or "assistance").  update_c_to_d_linkages keeps these current for the submissions it touches so its
+    before and after counts don't need a scan of financial_accounts_by_awards; submissions without a row have none.
+    """
+
+    submission_id = models.IntegerField()
+    linkage_type = models.TextField()
+    unlinked_count = models.IntegerField()
+
+    class Meta:
+        managed = True
+        db_table = "unlinked_file_c_count"
+        unique_together = (("submission_id", "linkage_type"),)
@@ -946,6 +946,25 @@ def test_award_endpoint_generated_id(client, awards_and_transactions):
     assert json.loads(resp.content.decode("utf-8")) == expected_response_cont
 
 
+def test_award_summaries_endpoint(client, awards_and_transactions):
+    resp = client.post(
+        "/api/v2/awards/summaries/",
+        content_type="application/json",
+        data=json.dumps({"award_ids": ["2", "ASST_AGG_1830212.0481163_3620", "CONT_AWD_03VD_9700_SPM30012D3486_9700"]}),
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert json.loads(resp.content.decode("utf-8")) == {"results": [expected_response_cont, expected_response_asst]}
+
+    resp = client.post(
+        "/api/v2/awards/summaries/", content_type="application/json", data=json.dumps({"award_ids": ["999999"]})
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert json.loads(resp.content.decode("utf-8")) == {"results": []}
+
+    resp = client.post("/api/v2/awards/summaries/", content_type="application/json", data=json.dumps({}))
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_award_endpoint_parent_award(client, awards_and_transactions):
     # Test contract award with parent
     resp = client.get("/api/v2/awards/7/")
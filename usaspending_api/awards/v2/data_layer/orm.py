@@ -1,62 +1,222 @@
-import copy
+import json
 import logging
 
 from collections import OrderedDict
 from decimal import Decimal
-from django.db import connection
-from django.db.models import Sum, F, Subquery
-from typing import Optional
-
-from usaspending_api.awards.models import (
-    Award,
-    FinancialAccountsByAwards,
-    ParentAward,
-    TransactionFABS,
-    TransactionFPDS,
-    TransactionNormalized,
-)
+from django.core.cache import caches
+from typing import Dict, List, Optional
+
+from usaspending_api.awards.models import Award, TransactionFABS, TransactionFPDS
 from usaspending_api.awards.v2.data_layer.orm_mappers import (
     FABS_ASSISTANCE_FIELDS,
     FABS_AWARD_FIELDS,
     FPDS_AWARD_FIELDS,
     FPDS_CONTRACT_FIELDS,
+    FPDS_IDV_FIELDS,
+)
+from usaspending_api.awards.v2.data_layer.orm_utils import delete_keys_from_dict
+from usaspending_api.awards.v2.data_layer.sql import (
+    agency_details_sql,
+    award_defc_codes_sql,
+    award_defc_sql,
+    award_summary_sql,
+    cfda_info_sql,
+    code_description_sql,
+    contract_parent_award_source_sql,
+    idv_defc_codes_sql,
+    idv_parent_award_source_sql,
+    naics_hierarchy_sql,
+    parent_award_sql,
+    psc_hierarchy_sql,
+    recipient_hash_sql,
+    transaction_obligated_amount_sql,
 )
-from usaspending_api.awards.v2.data_layer.orm_utils import delete_keys_from_dict, split_mapper_into_qs
 from usaspending_api.common.helpers.business_categories_helper import get_business_category_display_names
 from usaspending_api.common.helpers.data_constants import state_code_from_name, state_name_from_code
 from usaspending_api.common.helpers.date_helper import get_date_from_datetime
 from usaspending_api.common.helpers.sql_helpers import execute_sql_to_ordered_dictionary
-from usaspending_api.common.recipient_lookups import obtain_recipient_uri
-from usaspending_api.references.models import Agency, Cfda, PSC, NAICS, SubtierAgency, DisasterEmergencyFundCode
-from usaspending_api.submissions.models import SubmissionAttributes
-from usaspending_api.awards.v2.data_layer.sql import defc_sql
+from usaspending_api.common.recipient_lookups import combine_recipient_hash_and_level, obtain_recipient_level
+from usaspending_api.common.request_instrumentation import record_cache_lookups
 
 logger = logging.getLogger("console")
 
+# Part of every cache key; bump it whenever the shape of a summary changes so documents cached by older code are
+# ignored rather than served
+AWARD_SUMMARY_VERSION = 1
+
+# Transaction columns share the summary query's rows with award columns (and the IDV mapper reuses some award
+# aliases), so they're selected under this prefix and split back out afterwards
+TRANSACTION_PREFIX = "transaction."
+
+SUMMARY_TRANSACTION_MODELS = {"assistance": TransactionFABS, "contract": TransactionFPDS, "idv": TransactionFPDS}
+SUMMARY_AWARD_FIELDS = {"assistance": FABS_AWARD_FIELDS, "contract": FPDS_AWARD_FIELDS, "idv": FPDS_AWARD_FIELDS}
+SUMMARY_TRANSACTION_FIELDS = {
+    "assistance": FABS_ASSISTANCE_FIELDS,
+    "contract": FPDS_CONTRACT_FIELDS,
+    "idv": FPDS_IDV_FIELDS,
+}
+
+
+def _code_description(table: str, code: str) -> str:
+    return code_description_sql.format(table=table, code=code)
+
+
+PSC_HIERARCHY_SQL = psc_hierarchy_sql.format(
+    toptier_code=_code_description("psc", "left(t.product_or_service_code, 1)"),
+    midtier_code=_code_description("psc", "left(t.product_or_service_code, 2)"),
+    subtier_code=_code_description("psc", "left(t.product_or_service_code, 3)"),
+    base_code=_code_description("psc", "t.product_or_service_code"),
+)
+NAICS_HIERARCHY_SQL = naics_hierarchy_sql.format(
+    toptier_code=_code_description("naics", "left(t.naics, 2)"),
+    midtier_code=_code_description("naics", "left(t.naics, 4)"),
+    base_code=_code_description("naics", "t.naics"),
+)
+
+# Values each type of summary needs beyond the award and its latest transaction, by column alias
+SUMMARY_COLUMNS = {
+    "assistance": OrderedDict(
+        [
+            ("_cfda_info", cfda_info_sql),
+            ("_transaction_obligated_amount", transaction_obligated_amount_sql),
+            ("_disaster_emergency_fund_codes", award_defc_codes_sql),
+        ]
+    ),
+    "contract": OrderedDict(
+        [
+            ("_parent_award", parent_award_sql.format(parent_award_source=contract_parent_award_source_sql)),
+            ("_psc_hierarchy", PSC_HIERARCHY_SQL),
+            ("_naics_hierarchy", NAICS_HIERARCHY_SQL),
+            ("_disaster_emergency_fund_codes", award_defc_codes_sql),
+        ]
+    ),
+    "idv": OrderedDict(
+        [
+            ("_parent_award", parent_award_sql.format(parent_award_source=idv_parent_award_source_sql)),
+            ("_psc_hierarchy", PSC_HIERARCHY_SQL),
+            ("_naics_hierarchy", NAICS_HIERARCHY_SQL),
+            ("_disaster_emergency_fund_codes", idv_defc_codes_sql),
+        ]
+    ),
+}
+
+# Values pulled from the summary row into the transaction dictionary for create_recipient_object
+RECIPIENT_COLUMNS = (
+    "_business_categories",
+    "_recipient_hash",
+    "_recipient_profile_levels",
+    "_parent_recipient_hash",
+    "_parent_recipient_profile_levels",
+)
+
+
+def get_summary_type(category: str) -> str:
+    if category in ("contract", "idv"):
+        return category
+    return "assistance"
+
+
+def award_summary_cache_key(award: dict) -> str:
+    update_date = award["update_date"].isoformat() if award["update_date"] else ""
+    return f"award_summary:{AWARD_SUMMARY_VERSION}:{award['id']}:{update_date}"
+
+
+def fetch_award_summaries(awards: List[dict]) -> List[OrderedDict]:
+    """
+    Summaries (the /api/v2/awards/<award_id>/ response) of awards given as dictionaries of their id, category and
+    update_date.  Summaries are cached under the award's id and update_date, so an award that hasn't changed since its
+    summary was built is answered from the cache.  The rest are built with one query per type of award among them
+    plus one for their File C account data, however many awards there are.
+    """
+    cache = caches["usaspending-cache"]
+    cache_keys = OrderedDict((award["id"], award_summary_cache_key(award)) for award in awards)
+    cached = cache.get_many(list(cache_keys.values()))
+    summaries = {award_id: cached[key] for award_id, key in cache_keys.items() if key in cached}
+    record_cache_lookups(hits=len(summaries), misses=len(cache_keys) - len(summaries))
+
+    award_ids_by_type = OrderedDict()
+    for award in awards:
+        if award["id"] not in summaries:
+            award_ids_by_type.setdefault(get_summary_type(award["category"]), []).append(award["id"])
+
+    if award_ids_by_type:
+        missing_award_ids = [award_id for award_ids in award_ids_by_type.values() for award_id in award_ids]
+        account_details = fetch_account_details_awards(missing_award_ids)
+        built = {}
+        for summary_type, award_ids in award_ids_by_type.items():
+            for row in fetch_award_summary_rows(award_ids, summary_type):
+                built[row["id"]] = SUMMARY_CONSTRUCTORS[summary_type](row, account_details[row["id"]])
+        cache.set_many({cache_keys[award_id]: summary for award_id, summary in built.items()})
+        summaries.update(built)
+
+    return [summaries[award["id"]] for award in awards if award["id"] in summaries]
+
+
+def fetch_award_summary_rows(award_ids: List[int], summary_type: str) -> List[OrderedDict]:
+    """
+    One row per award with everything its summary needs: the award, its latest transaction, agencies, recipient
+    hashes, business categories and the SUMMARY_COLUMNS of its type
+    """
+    transaction_model = SUMMARY_TRANSACTION_MODELS[summary_type]
+    sql = award_summary_sql.format(
+        award_columns=_select_columns(Award, SUMMARY_AWARD_FIELDS[summary_type], "a"),
+        transaction_columns=_select_columns(
+            transaction_model, SUMMARY_TRANSACTION_FIELDS[summary_type], "t", TRANSACTION_PREFIX
+        ),
+        awarding_agency_sql=agency_details_sql.format(agency_id="a.awarding_agency_id"),
+        funding_agency_sql=agency_details_sql.format(agency_id="a.funding_agency_id"),
+        recipient_sql=recipient_hash_sql.format(
+            duns="t.awardee_or_recipient_uniqu", name="t.awardee_or_recipient_legal"
+        ),
+        parent_recipient_sql=recipient_hash_sql.format(
+            duns="t.ultimate_parent_unique_ide", name="t.ultimate_parent_legal_enti"
+        ),
+        summary_columns=",\n".join(f'({sql}) as "{alias}"' for alias, sql in SUMMARY_COLUMNS[summary_type].items()),
+        transaction_table=transaction_model._meta.db_table,
+        award_ids=", ".join(str(int(award_id)) for award_id in award_ids),
+    )
+    return execute_sql_to_ordered_dictionary(sql)
+
+
+def _select_columns(model, mapper: OrderedDict, table_alias: str, prefix: str = "") -> str:
+    """Select list for a *_FIELDS mapper, aliasing each model field's column to its response field"""
+    return ",\n".join(
+        f'{table_alias}.{model._meta.get_field(field).column} as "{prefix}{alias}"' for field, alias in mapper.items()
+    )
+
+
+def _split_summary_row(row: OrderedDict, summary_type: str) -> (OrderedDict, OrderedDict):
+    """The award and latest transaction dictionaries the response is built from"""
+    award = OrderedDict((alias, row[alias]) for alias in SUMMARY_AWARD_FIELDS[summary_type].values())
+    transaction = OrderedDict(
+        (alias, row[TRANSACTION_PREFIX + alias]) for alias in SUMMARY_TRANSACTION_FIELDS[summary_type].values()
+    )
+    transaction.update((column, row[column]) for column in RECIPIENT_COLUMNS)
+    return award, transaction
+
 
-def construct_assistance_response(requested_award_dict: dict) -> OrderedDict:
+def _parse_json(value: Optional[str]):
+    return json.loads(value, parse_float=Decimal) if value is not None else None
+
+
+def construct_assistance_response(row: OrderedDict, account_data: dict) -> OrderedDict:
     """Build an Assistance Award summary object to send as an API response"""
 
-    response = OrderedDict()
-    award = fetch_award_details(requested_award_dict, FABS_AWARD_FIELDS)
-    if not award:
-        return None
+    award, transaction = _split_summary_row(row, "assistance")
 
+    response = OrderedDict()
     response.update(award)
-
-    account_data = fetch_account_details_award(award["id"])
     response.update(account_data)
-    transaction = fetch_fabs_details_by_pk(award["_trx"], FABS_ASSISTANCE_FIELDS)
 
     response["record_type"] = transaction["record_type"]
-    response["cfda_info"] = fetch_all_cfda_details(award)
-    response["transaction_obligated_amount"] = fetch_transaction_obligated_amount_by_internal_award_id(award["id"])
-    response["funding_agency"] = fetch_agency_details(response["_funding_agency"])
-    if response["funding_agency"]:
-        response["funding_agency"]["office_agency_name"] = transaction["_funding_office_name"]
-    response["awarding_agency"] = fetch_agency_details(response["_awarding_agency"])
-    if response["awarding_agency"]:
-        response["awarding_agency"]["office_agency_name"] = transaction["_awarding_office_name"]
+    response["cfda_info"] = create_cfda_objects(_parse_json(row["_cfda_info"]) or [])
+    response["transaction_obligated_amount"] = row["_transaction_obligated_amount"]
+    response["funding_agency"] = create_agency_object(
+        row["_funding_agency_details"], transaction["_funding_office_name"]
+    )
+    response["awarding_agency"] = create_agency_object(
+        row["_awarding_agency_details"], transaction["_awarding_office_name"]
+    )
     response["period_of_performance"] = OrderedDict(
         [
             ("start_date", award["_start_date"]),
@@ -68,36 +228,28 @@ def construct_assistance_response(requested_award_dict: dict) -> OrderedDict:
     response["executive_details"] = create_officers_object(award)
     response["place_of_performance"] = create_place_of_performance_object(transaction)
 
-    response["disaster_emergency_fund_codes"] = fetch_disaster_emergency_fund_codes_for_award(award["id"])
+    response["disaster_emergency_fund_codes"] = row["_disaster_emergency_fund_codes"]
 
     return delete_keys_from_dict(response)
 
 
-def construct_contract_response(requested_award_dict: dict) -> OrderedDict:
+def construct_contract_response(row: OrderedDict, account_data: dict) -> OrderedDict:
     """Build a Procurement Award summary object to send as an API response"""
 
-    response = OrderedDict()
-    award = fetch_award_details(requested_award_dict, FPDS_AWARD_FIELDS)
-    if not award:
-        return None
+    award, transaction = _split_summary_row(row, "contract")
 
+    response = OrderedDict()
     response.update(award)
-
-    account_data = fetch_account_details_award(award["id"])
     response.update(account_data)
 
-    transaction = fetch_fpds_details_by_pk(award["_trx"], FPDS_CONTRACT_FIELDS)
-
-    response["parent_award"] = fetch_contract_parent_award_details(
-        award["_parent_award_piid"], award["_fpds_parent_agency_id"]
-    )
+    response["parent_award"] = _parse_json(row["_parent_award"])
     response["latest_transaction_contract_data"] = transaction
-    response["funding_agency"] = fetch_agency_details(response["_funding_agency"])
-    if response["funding_agency"]:
-        response["funding_agency"]["office_agency_name"] = transaction["_funding_office_name"]
-    response["awarding_agency"] = fetch_agency_details(response["_awarding_agency"])
-    if response["awarding_agency"]:
-        response["awarding_agency"]["office_agency_name"] = transaction["_awarding_office_name"]
+    response["funding_agency"] = create_agency_object(
+        row["_funding_agency_details"], transaction["_funding_office_name"]
+    )
+    response["awarding_agency"] = create_agency_object(
+        row["_awarding_agency_details"], transaction["_awarding_office_name"]
+    )
     response["period_of_performance"] = OrderedDict(
         [
             ("start_date", award["_start_date"]),
@@ -109,49 +261,33 @@ def construct_contract_response(requested_award_dict: dict) -> OrderedDict:
     response["recipient"] = create_recipient_object(transaction)
     response["executive_details"] = create_officers_object(award)
     response["place_of_performance"] = create_place_of_performance_object(transaction)
-    if transaction["product_or_service_code"]:
-        response["psc_hierarchy"] = fetch_psc_hierarchy(transaction["product_or_service_code"])
-    if transaction["naics"]:
-        response["naics_hierarchy"] = fetch_naics_hierarchy(transaction["naics"])
+    if row["_psc_hierarchy"]:
+        response["psc_hierarchy"] = _parse_json(row["_psc_hierarchy"])
+    if row["_naics_hierarchy"]:
+        response["naics_hierarchy"] = _parse_json(row["_naics_hierarchy"])
 
-    response["disaster_emergency_fund_codes"] = fetch_disaster_emergency_fund_codes_for_award(award["id"])
+    response["disaster_emergency_fund_codes"] = row["_disaster_emergency_fund_codes"]
 
     return delete_keys_from_dict(response)
 
 
-def construct_idv_response(requested_award_dict: dict) -> OrderedDict:
+def construct_idv_response(row: OrderedDict, account_data: dict) -> OrderedDict:
     """Build a Procurement IDV summary object to send as an API response"""
 
-    idv_specific_award_fields = OrderedDict(
-        [
-            ("period_of_performance_star", "_start_date"),
-            ("last_modified", "_last_modified_date"),
-            ("ordering_period_end_date", "_end_date"),
-        ]
-    )
-
-    mapper = copy.deepcopy(FPDS_CONTRACT_FIELDS)
-    mapper.update(idv_specific_award_fields)
+    award, transaction = _split_summary_row(row, "idv")
 
     response = OrderedDict()
-    award = fetch_award_details(requested_award_dict, FPDS_AWARD_FIELDS)
-    if not award:
-        return None
     response.update(award)
-
-    account_data = fetch_account_details_award(award["id"])
     response.update(account_data)
 
-    transaction = fetch_fpds_details_by_pk(award["_trx"], mapper)
-
-    response["parent_award"] = fetch_idv_parent_award_details(award["generated_unique_award_id"])
+    response["parent_award"] = _parse_json(row["_parent_award"])
     response["latest_transaction_contract_data"] = transaction
-    response["funding_agency"] = fetch_agency_details(response["_funding_agency"])
-    if response["funding_agency"]:
-        response["funding_agency"]["office_agency_name"] = transaction["_funding_office_name"]
-    response["awarding_agency"] = fetch_agency_details(response["_awarding_agency"])
-    if response["awarding_agency"]:
-        response["awarding_agency"]["office_agency_name"] = transaction["_awarding_office_name"]
+    response["funding_agency"] = create_agency_object(
+        row["_funding_agency_details"], transaction["_funding_office_name"]
+    )
+    response["awarding_agency"] = create_agency_object(
+        row["_awarding_agency_details"], transaction["_awarding_office_name"]
+    )
     response["period_of_performance"] = OrderedDict(
         [
             ("start_date", award["_start_date"]),
@@ -163,22 +299,63 @@ def construct_idv_response(requested_award_dict: dict) -> OrderedDict:
     response["recipient"] = create_recipient_object(transaction)
     response["executive_details"] = create_officers_object(award)
     response["place_of_performance"] = create_place_of_performance_object(transaction)
-    if transaction["product_or_service_code"]:
-        response["psc_hierarchy"] = fetch_psc_hierarchy(transaction["product_or_service_code"])
-    if transaction["naics"]:
-        response["naics_hierarchy"] = fetch_naics_hierarchy(transaction["naics"])
+    if row["_psc_hierarchy"]:
+        response["psc_hierarchy"] = _parse_json(row["_psc_hierarchy"])
+    if row["_naics_hierarchy"]:
+        response["naics_hierarchy"] = _parse_json(row["_naics_hierarchy"])
 
-    response["disaster_emergency_fund_codes"] = fetch_disaster_emergency_fund_codes_for_idv(award["id"])
+    response["disaster_emergency_fund_codes"] = row["_disaster_emergency_fund_codes"]
 
     return delete_keys_from_dict(response)
 
 
+SUMMARY_CONSTRUCTORS = {
+    "assistance": construct_assistance_response,
+    "contract": construct_contract_response,
+    "idv": construct_idv_response,
+}
+
+
+def create_agency_object(agency_details: Optional[str], office_agency_name: Optional[str]) -> Optional[dict]:
+    agency = _parse_json(agency_details)
+    if agency:
+        agency["office_agency_name"] = office_agency_name
+    return agency
+
+
+def obtain_recipient_uri_from_hash(
+    recipient_hash: str,
+    profile_levels: Optional[List[str]],
+    recipient_name: Optional[str],
+    recipient_unique_id: Optional[str],
+    parent_recipient_unique_id: Optional[str],
+    is_parent_recipient: bool = False,
+) -> Optional[str]:
+    """obtain_recipient_uri for a recipient whose hash and profile levels were looked up by the summary query"""
+    if (is_parent_recipient and not recipient_unique_id) or not (recipient_unique_id or recipient_name):
+        return None
+
+    recipient_level = obtain_recipient_level(
+        {
+            "duns": recipient_unique_id,
+            "parent_duns": parent_recipient_unique_id,
+            "is_parent_recipient": is_parent_recipient,
+        }
+    )
+    if recipient_level in (profile_levels or []):
+        return combine_recipient_hash_and_level(recipient_hash, recipient_level)
+
+    return None
+
+
 def create_recipient_object(db_row_dict: dict) -> OrderedDict:
     return OrderedDict(
         [
             (
                 "recipient_hash",
-                obtain_recipient_uri(
+                obtain_recipient_uri_from_hash(
+                    db_row_dict["_recipient_hash"],
+                    db_row_dict["_recipient_profile_levels"],
                     db_row_dict["_recipient_name"],
                     db_row_dict["_recipient_unique_id"],
                     db_row_dict["_parent_recipient_unique_id"],
@@ -188,7 +365,9 @@ def create_recipient_object(db_row_dict: dict) -> OrderedDict:
             ("recipient_unique_id", db_row_dict["_recipient_unique_id"]),
             (
                 "parent_recipient_hash",
-                obtain_recipient_uri(
+                obtain_recipient_uri_from_hash(
+                    db_row_dict["_parent_recipient_hash"],
+                    db_row_dict["_parent_recipient_profile_levels"],
                     db_row_dict["_parent_recipient_name"],
                     db_row_dict["_parent_recipient_unique_id"],
                     None,  # parent_recipient_unique_id
@@ -197,12 +376,7 @@ def create_recipient_object(db_row_dict: dict) -> OrderedDict:
             ),
             ("parent_recipient_name", db_row_dict["_parent_recipient_name"]),
             ("parent_recipient_unique_id", db_row_dict["_parent_recipient_unique_id"]),
-            (
-                "business_categories",
-                get_business_category_display_names(
-                    fetch_business_categories_by_transaction_id(db_row_dict["_transaction_id"])
-                ),
-            ),
+            ("business_categories", get_business_category_display_names(db_row_dict["_business_categories"])),
             (
                 "location",
                 OrderedDict(
@@ -274,231 +448,26 @@ def create_officers_object(award: dict) -> dict:
     }
 
 
-def fetch_award_details(filter_q: dict, mapper_fields: OrderedDict) -> dict:
-    vals, ann = split_mapper_into_qs(mapper_fields)
-    return Award.objects.filter(**filter_q).values(*vals).annotate(**ann).first()
-
-
-def fetch_contract_parent_award_details(parent_piid: str, parent_fpds_agency: str) -> Optional[OrderedDict]:
-    parent_guai = "CONT_IDV_{}_{}".format(parent_piid or "NONE", parent_fpds_agency or "NONE")
-
-    parent_award_ids = (
-        ParentAward.objects.filter(generated_unique_award_id=parent_guai)
-        .annotate(parent_award_award_id=F("award_id"), parent_award_guai=F("generated_unique_award_id"))
-        .values("parent_award_award_id", "parent_award_guai")
-        .first()
-    )
-
-    return _fetch_parent_award_details(parent_award_ids)
-
-
-def fetch_idv_parent_award_details(guai: str) -> Optional[OrderedDict]:
-    parent_award_ids = (
-        ParentAward.objects.filter(generated_unique_award_id=guai, parent_award__isnull=False)
-        .annotate(
-            parent_award_award_id=F("parent_award__award_id"),
-            parent_award_guai=F("parent_award__generated_unique_award_id"),
-        )
-        .values("parent_award_award_id", "parent_award_guai")
-        .first()
-    )
-
-    return _fetch_parent_award_details(parent_award_ids)
-
-
-def _fetch_parent_award_details(parent_award_ids: dict) -> Optional[OrderedDict]:
-    if not parent_award_ids:
-        return None
-
-    # These are not exact query paths but instead expected aliases to allow reuse
-    parent_award_award_id = parent_award_ids["parent_award_award_id"]
-    parent_award_guai = parent_award_ids["parent_award_guai"]
-
-    parent_award = (
-        Award.objects.filter(id=parent_award_award_id)
-        .values(
-            "latest_transaction__contract_data__agency_id",
-            "latest_transaction__contract_data__idv_type_description",
-            "latest_transaction__contract_data__multiple_or_single_aw_desc",
-            "latest_transaction__contract_data__piid",
-            "latest_transaction__contract_data__type_of_idc_description",
-        )
-        .first()
-    )
-
-    if not parent_award:
-        logging.debug("Unable to find award for award id %s" % parent_award_award_id)
-        return None
-
-    parent_sub_agency = (
-        SubtierAgency.objects.filter(subtier_code=parent_award["latest_transaction__contract_data__agency_id"])
-        .values("name", "subtier_agency_id")
-        .first()
-    )
-    parent_agency = (
-        (
-            Agency.objects.filter(
-                toptier_flag=True,
-                toptier_agency_id=Subquery(
-                    Agency.objects.filter(
-                        subtier_agency_id__isnull=False, subtier_agency_id=parent_sub_agency["subtier_agency_id"]
-                    ).values("toptier_agency_id")
-                ),
-            )
-            .values("id", "toptier_agency__name")
-            .first()
-        )
-        if parent_sub_agency
-        else None
-    )
-
-    parent_object = OrderedDict(
-        [
-            ("agency_id", parent_agency["id"] if parent_agency else None),
-            ("agency_name", parent_agency["toptier_agency__name"] if parent_agency else None),
-            ("sub_agency_id", parent_award["latest_transaction__contract_data__agency_id"]),
-            ("sub_agency_name", parent_sub_agency["name"] if parent_sub_agency else None),
-            ("award_id", parent_award_award_id),
-            ("generated_unique_award_id", parent_award_guai),
-            ("idv_type_description", parent_award["latest_transaction__contract_data__idv_type_description"]),
-            (
-                "multiple_or_single_aw_desc",
-                parent_award["latest_transaction__contract_data__multiple_or_single_aw_desc"],
-            ),
-            ("piid", parent_award["latest_transaction__contract_data__piid"]),
-            ("type_of_idc_description", parent_award["latest_transaction__contract_data__type_of_idc_description"]),
-        ]
-    )
-
-    return parent_object
-
-
-def fetch_fabs_details_by_pk(primary_key: int, mapper: OrderedDict) -> dict:
-    vals, ann = split_mapper_into_qs(mapper)
-    return TransactionFABS.objects.filter(pk=primary_key).values(*vals).annotate(**ann).first()
-
-
-def fetch_fpds_details_by_pk(primary_key: int, mapper: OrderedDict) -> dict:
-    vals, ann = split_mapper_into_qs(mapper)
-    return TransactionFPDS.objects.filter(pk=primary_key).values(*vals).annotate(**ann).first()
-
-
-def fetch_latest_ec_details(award_id: int, mapper: OrderedDict, transaction_type: str) -> dict:
-    vals, ann = split_mapper_into_qs(mapper)
-    model = TransactionFPDS if transaction_type == "fpds" else TransactionFABS
-    retval = (
-        model.objects.filter(transaction__award_id=award_id, officer_1_name__isnull=False)
-        .values(*vals)
-        .annotate(**ann)
-        .order_by("-action_date")
-    )
-    return retval.first()
-
-
-def agency_has_file_c_submission(agency_id):
-    return SubmissionAttributes.objects.filter(
-        toptier_code=Subquery(Agency.objects.filter(id=agency_id).values("toptier_agency__toptier_code")[:1])
-    ).exists()
-
-
-def fetch_agency_details(agency_id: int) -> Optional[dict]:
-    values = [
-        "toptier_agency__toptier_code",
-        "toptier_agency__name",
-        "toptier_agency__abbreviation",
-        "subtier_agency__subtier_code",
-        "subtier_agency__name",
-        "subtier_agency__abbreviation",
-    ]
-    agency = Agency.objects.filter(pk=agency_id).values(*values).first()
-
-    agency_details = None
-    if agency:
-        agency_details = {
-            "id": agency_id,
-            "has_agency_page": agency_has_file_c_submission(agency_id),
-            "toptier_agency": {
-                "name": agency["toptier_agency__name"],
-                "code": agency["toptier_agency__toptier_code"],
-                "abbreviation": agency["toptier_agency__abbreviation"],
-            },
-            "subtier_agency": {
-                "name": agency["subtier_agency__name"],
-                "code": agency["subtier_agency__subtier_code"],
-                "abbreviation": agency["subtier_agency__abbreviation"],
-            },
-        }
-    return agency_details
-
-
-def fetch_business_categories_by_transaction_id(transaction_id: int) -> list:
-    tn = TransactionNormalized.objects.filter(pk=transaction_id).values("business_categories").first()
-
-    if tn:
-        return tn["business_categories"]
-    return []
-
-
-def normalize_cfda_number_format(fabs_transaction: dict) -> str:
-    """Normalize a CFDA number to 6 digits by padding 0 in case the value was truncated"""
-    cfda_number = fabs_transaction.get("cfda_number")
-    if cfda_number and len(cfda_number) < 6:
-        cfda_number += "0" * (6 - len(cfda_number))
-
-    return cfda_number
-
-
-def fetch_all_cfda_details(award: dict) -> list:
-    fabs_values = ["cfda_number", "federal_action_obligation", "non_federal_funding_amount", "total_funding_amount"]
-    queryset = TransactionFABS.objects.filter(transaction__award_id=award["id"]).values(*fabs_values)
-    cfda_dicts = {}
-    for transaction in queryset:
-        clean_cfda_number_str = normalize_cfda_number_format(transaction)
-        if cfda_dicts.get(clean_cfda_number_str):
-            cfda_dicts.update(
-                {
-                    clean_cfda_number_str: {
-                        "federal_action_obligation": cfda_dicts[clean_cfda_number_str]["federal_action_obligation"]
-                        + Decimal(transaction["federal_action_obligation"] or 0),
-                        "non_federal_funding_amount": cfda_dicts[clean_cfda_number_str]["non_federal_funding_amount"]
-                        + Decimal(transaction["non_federal_funding_amount"] or 0),
-                        "total_funding_amount": cfda_dicts[clean_cfda_number_str]["total_funding_amount"]
-                        + Decimal(transaction["total_funding_amount"] or 0),
-                    }
-                }
-            )
-        else:
-            cfda_dicts.update(
-                {
-                    clean_cfda_number_str: {
-                        "federal_action_obligation": Decimal(transaction["federal_action_obligation"] or 0),
-                        "non_federal_funding_amount": Decimal(transaction["non_federal_funding_amount"] or 0),
-                        "total_funding_amount": Decimal(transaction["total_funding_amount"] or 0),
-                    }
-                }
-            )
-
+def create_cfda_objects(cfda_totals: List[dict]) -> List[OrderedDict]:
+    """CFDA details and transaction totals for each (six character) CFDA number, largest total_funding_amount first"""
     final_cfda_objects = []
-    for cfda_number in cfda_dicts.keys():
-        details = fetch_cfda_details_using_cfda_number(cfda_number)
-        if details.get("url") == "None;":
-            details.update({"url": None})
+    for cfda in cfda_totals:
         final_cfda_objects.append(
             OrderedDict(
                 [
-                    ("applicant_eligibility", details.get("applicant_eligibility")),
-                    ("beneficiary_eligibility", details.get("beneficiary_eligibility")),
-                    ("cfda_federal_agency", details.get("federal_agency")),
-                    ("cfda_number", cfda_number),
-                    ("cfda_objectives", details.get("objectives")),
-                    ("cfda_obligations", details.get("obligations")),
-                    ("cfda_popular_name", details.get("popular_name")),
-                    ("cfda_title", details.get("program_title")),
-                    ("cfda_website", details.get("website_address")),
-                    ("federal_action_obligation_amount", cfda_dicts[cfda_number]["federal_action_obligation"]),
-                    ("non_federal_funding_amount", cfda_dicts[cfda_number]["non_federal_funding_amount"]),
-                    ("sam_website", details.get("url")),
-                    ("total_funding_amount", cfda_dicts[cfda_number]["total_funding_amount"]),
+                    ("applicant_eligibility", cfda["applicant_eligibility"]),
+                    ("beneficiary_eligibility", cfda["beneficiary_eligibility"]),
+                    ("cfda_federal_agency", cfda["federal_agency"]),
+                    ("cfda_number", cfda["cfda_number"]),
+                    ("cfda_objectives", cfda["objectives"]),
+                    ("cfda_obligations", cfda["obligations"]),
+                    ("cfda_popular_name", cfda["popular_name"]),
+                    ("cfda_title", cfda["program_title"]),
+                    ("cfda_website", cfda["website_address"]),
+                    ("federal_action_obligation_amount", Decimal(cfda["federal_action_obligation"])),
+                    ("non_federal_funding_amount", Decimal(cfda["non_federal_funding_amount"])),
+                    ("sam_website", None if cfda["url"] == "None;" else cfda["url"]),
+                    ("total_funding_amount", Decimal(cfda["total_funding_amount"])),
                 ]
             )
         )
@@ -506,161 +475,26 @@ def fetch_all_cfda_details(award: dict) -> list:
     return final_cfda_objects
 
 
-def fetch_cfda_details_using_cfda_number(cfda: str) -> dict:
-    values = [
-        "applicant_eligibility",
-        "beneficiary_eligibility",
-        "program_title",
-        "objectives",
-        "federal_agency",
-        "website_address",
-        "url",
-        "obligations",
-        "popular_name",
-    ]
-    cfda_details = Cfda.objects.filter(program_number=cfda).values(*values).first()
-
-    return cfda_details or {}
-
-
-def fetch_transaction_obligated_amount_by_internal_award_id(internal_award_id: int) -> Optional[Decimal]:
-    _sum = FinancialAccountsByAwards.objects.filter(award_id=internal_award_id).aggregate(
-        Sum("transaction_obligated_amount")
-    )
-    if _sum:
-        return _sum["transaction_obligated_amount__sum"]
-
-    return None
-
-
-def fetch_psc_hierarchy(psc_code: str) -> dict:
-    codes = [psc_code, psc_code[:2], psc_code[:1], psc_code[:3] if psc_code[0] == "A" else None]
-    toptier_code = {}
-    midtier_code = {}
-    subtier_code = {}  # only used for R&D codes which start with "A"
-    base_code = {}
-    if psc_code[0].isalpha():  # we only want to look for the toptier code for services, which start with letters
-        try:
-            psc_top = PSC.objects.get(code=codes[2])
-            toptier_code = {"code": psc_top.code, "description": psc_top.description}
-        except PSC.DoesNotExist:
-            pass
-    try:
-        psc_mid = PSC.objects.get(code=codes[1])
-        midtier_code = {"code": psc_mid.code, "description": psc_mid.description}
-    except PSC.DoesNotExist:
-        pass
-    try:
-        psc = PSC.objects.get(code=codes[0])
-        base_code = {"code": psc.code, "description": psc.description}
-    except PSC.DoesNotExist:
-        pass
-    if codes[3] is not None:  # don't bother looking for 3 digit codes unless they start with "A"
-        try:
-            psc_rd = PSC.objects.get(code=codes[3])
-            subtier_code = {"code": psc_rd.code, "description": psc_rd.description}
-        except PSC.DoesNotExist:
-            pass
-
+def fetch_account_details_awards(award_ids: List[int]) -> Dict[int, dict]:
+    """COVID-19 File C obligations and outlays of each award, by DEFC"""
     results = {
-        "toptier_code": toptier_code,
-        "midtier_code": midtier_code,
-        "subtier_code": subtier_code,
-        "base_code": base_code,
+        award_id: {
+            "total_account_outlay": 0,
+            "total_account_obligation": 0,
+            "account_outlays_by_defc": [],
+            "account_obligations_by_defc": [],
+        }
+        for award_id in award_ids
     }
-    return results
-
-
-def fetch_disaster_emergency_fund_codes_for_award(award_id):
-    return list(
-        FinancialAccountsByAwards.objects.filter(award_id=award_id, disaster_emergency_fund__isnull=False)
-        .distinct()
-        .values_list("disaster_emergency_fund__code", flat=True)
-        .order_by("disaster_emergency_fund__code")
-    )
-
-
-def fetch_disaster_emergency_fund_codes_for_idv(award_id):
-    # Get distinct DEF codes from all File C records in the hierarchy of this idv.
-    sql = f"""
-        with gather_idv_award_ids as (
-            select      award_id
-            from        parent_award
-            where       award_id = {award_id}
-            union all
-            select      cpa.award_id
-            from        parent_award ppa
-                        inner join parent_award cpa on
-                            cpa.parent_award_id = ppa.award_id
-            where       ppa.award_id = {award_id}
-        ), gather_all_award_ids as (
-            select  ca.id
-            from    gather_idv_award_ids g
-                    inner join awards pa on
-                        pa.id = g.award_id
-                    inner join awards ca on
-                        ca.parent_award_piid = pa.piid and
-                        ca.fpds_parent_agency_id = pa.fpds_agency_id
-            union   all
-            select  {award_id}
+    sql = award_defc_sql.format(award_ids=", ".join(str(int(award_id)) for award_id in award_ids))
+    for row in execute_sql_to_ordered_dictionary(sql):
+        account_details = results[row["award_id"]]
+        account_details["total_account_outlay"] += row["total_outlay"]
+        account_details["total_account_obligation"] += row["obligated_amount"]
+        account_details["account_outlays_by_defc"].append(
+            {"code": row["disaster_emergency_fund_code"], "amount": row["total_outlay"]}
+        )
+        account_details["account_obligations_by_defc"].append(
+            {"code": row["disaster_emergency_fund_code"], "amount": row["obligated_amount"]}
         )
-        select distinct
-            faba.disaster_emergency_fund_code
-        from
-            gather_all_award_ids a
-            inner join financial_accounts_by_awards faba on faba.award_id = a.id
-        where
-            faba.disaster_emergency_fund_code is not null
-        order by
-            faba.disaster_emergency_fund_code
-    """
-    with connection.cursor() as cursor:
-        cursor.execute(sql)
-        return [row[0] for row in cursor.fetchall()]
-
-
-def fetch_naics_hierarchy(naics: str) -> dict:
-    codes = [naics, naics[:4], naics[:2]]
-    toptier_code = {}
-    midtier_code = {}
-    base_code = {}
-    try:
-        toptier = NAICS.objects.get(code=codes[2])
-        toptier_code = {"code": toptier.code, "description": toptier.description}
-    except NAICS.DoesNotExist:
-        pass
-    try:
-        midtier = NAICS.objects.get(code=codes[1])
-        midtier_code = {"code": midtier.code, "description": midtier.description}
-    except NAICS.DoesNotExist:
-        pass
-    try:
-        base = NAICS.objects.get(code=codes[0])
-        base_code = {"code": base.code, "description": base.description}
-    except NAICS.DoesNotExist:
-        pass
-    results = {"toptier_code": toptier_code, "midtier_code": midtier_code, "base_code": base_code}
-    return results
-
-
-def fetch_account_details_award(award_id: int) -> dict:
-    award_id_sql = "faba.award_id = {award_id}".format(award_id=award_id)
-    results = execute_sql_to_ordered_dictionary(defc_sql.format(award_id_sql=award_id_sql))
-    outlay_by_code = []
-    obligation_by_code = []
-    total_outlay = 0
-    total_obligations = 0
-    covid_defcs = DisasterEmergencyFundCode.objects.filter(group_name="covid_19").values_list("code", flat=True)
-    for row in results:
-        if row["disaster_emergency_fund_code"] in covid_defcs:
-            total_outlay += row["total_outlay"]
-            total_obligations += row["obligated_amount"]
-        outlay_by_code.append({"code": row["disaster_emergency_fund_code"], "amount": row["total_outlay"]})
-        obligation_by_code.append({"code": row["disaster_emergency_fund_code"], "amount": row["obligated_amount"]})
-    results = {
-        "total_account_outlay": total_outlay,
-        "total_account_obligation": total_obligations,
-        "account_outlays_by_defc": outlay_by_code,
-        "account_obligations_by_defc": obligation_by_code,
-    }
     return results
@@ -235,3 +235,13 @@ FPDS_CONTRACT_FIELDS = OrderedDict(
         ("funding_office_name", "_funding_office_name"),
     ]
 )
+
+
+FPDS_IDV_FIELDS = OrderedDict(
+    [
+        *FPDS_CONTRACT_FIELDS.items(),
+        ("period_of_performance_star", "_start_date"),
+        ("last_modified", "_last_modified_date"),
+        ("ordering_period_end_date", "_end_date"),
+    ]
+)
@@ -24,3 +24,260 @@ defc_sql = """
     GROUP BY disaster_emergency_fund_code
     ORDER BY obligated_amount desc
     """
+
+# defc_sql for any number of awards at once, one row per award and DEFC
+award_defc_sql = """
+    SELECT
+        faba.award_id,
+        faba.disaster_emergency_fund_code,
+        COALESCE(sum(CASE WHEN latest_closed_period_per_fy.is_quarter IS NOT NULL THEN faba.gross_outlay_amount_by_award_cpe END), 0) AS total_outlay,
+        COALESCE(sum(faba.transaction_obligated_amount), 0) AS obligated_amount
+    FROM
+        financial_accounts_by_awards faba
+    INNER JOIN disaster_emergency_fund_code defc
+        ON defc.code = faba.disaster_emergency_fund_code
+        AND defc.group_name = 'covid_19'
+    INNER JOIN submission_attributes sa
+        ON faba.submission_id = sa.submission_id
+        AND sa.reporting_period_start >= '2020-04-01'
+    LEFT JOIN (
+        SELECT   submission_fiscal_year, is_quarter, max(submission_fiscal_month) AS submission_fiscal_month
+        FROM     dabs_submission_window_schedule
+        WHERE    submission_reveal_date < now() AND period_start_date >= '2020-04-01'
+        GROUP BY submission_fiscal_year, is_quarter
+    ) AS latest_closed_period_per_fy
+        ON latest_closed_period_per_fy.submission_fiscal_year = sa.reporting_fiscal_year
+        AND latest_closed_period_per_fy.submission_fiscal_month = sa.reporting_fiscal_period
+        AND latest_closed_period_per_fy.is_quarter = sa.quarter_format_flag
+    WHERE faba.award_id IN ({award_ids})
+    GROUP BY faba.award_id, faba.disaster_emergency_fund_code
+    ORDER BY faba.award_id, obligated_amount desc
+    """
+
+# The pieces below are assembled into a single award summary query by orm.fetch_award_summary_rows.  Everything
+# correlates to the "awards a" and "<transaction table> t" rows of that query.  JSON values are returned as text so
+# the caller can parse numbers as Decimals.
+award_summary_sql = """
+    select
+        {award_columns},
+        {transaction_columns},
+        coalesce(tn.business_categories, array[]::text[]) as "_business_categories",
+        ({awarding_agency_sql}) as "_awarding_agency_details",
+        ({funding_agency_sql}) as "_funding_agency_details",
+        recipient.recipient_hash as "_recipient_hash",
+        recipient.profile_levels as "_recipient_profile_levels",
+        parent_recipient.recipient_hash as "_parent_recipient_hash",
+        parent_recipient.profile_levels as "_parent_recipient_profile_levels",
+        {summary_columns}
+    from
+        awards a
+        left outer join {transaction_table} t on t.transaction_id = a.latest_transaction_id
+        left outer join transaction_normalized tn on tn.id = a.latest_transaction_id
+        left outer join lateral ({recipient_sql}) recipient on true
+        left outer join lateral ({parent_recipient_sql}) parent_recipient on true
+    where
+        a.id in ({award_ids})
+"""
+
+agency_details_sql = """
+    select  json_build_object(
+                'id', ag.id,
+                'has_agency_page', exists(select 1 from submission_attributes s where s.toptier_code = ta.toptier_code),
+                'toptier_agency', json_build_object(
+                    'name', ta.name, 'code', ta.toptier_code, 'abbreviation', ta.abbreviation
+                ),
+                'subtier_agency', json_build_object(
+                    'name', st.name, 'code', st.subtier_code, 'abbreviation', st.abbreviation
+                )
+            )::text
+    from    agency ag
+            inner join toptier_agency ta on ta.toptier_agency_id = ag.toptier_agency_id
+            left outer join subtier_agency st on st.subtier_agency_id = ag.subtier_agency_id
+    where   ag.id = {agency_id}
+"""
+
+# Mirrors common.recipient_lookups.obtain_recipient_uri: the hash from recipient_lookup when the DUNS is known, else
+# the one generated from the DUNS or name, along with the recipient levels that have a profile for it
+recipient_hash_sql = """
+    select  h.recipient_hash::text as recipient_hash,
+            (
+                select  array_agg(rp.recipient_level)
+                from    recipient_profile rp
+                where   rp.recipient_hash = h.recipient_hash
+            ) as profile_levels
+    from    (
+                select  coalesce(
+                            (
+                                select  rl.recipient_hash
+                                from    recipient_lookup rl
+                                where   rl.duns = nullif({duns}, '')
+                                limit   1
+                            ),
+                            md5(upper(
+                                case
+                                    when {duns} is null then 'name-' || coalesce({name}, 'None')
+                                    else 'duns-' || {duns}
+                                end
+                            ))::uuid
+                        ) as recipient_hash
+            ) as h
+"""
+
+contract_parent_award_source_sql = """
+    parent_award pa
+    where pa.generated_unique_award_id = 'CONT_IDV_'
+        || coalesce(nullif(a.parent_award_piid, ''), 'NONE') || '_'
+        || coalesce(nullif(a.fpds_parent_agency_id, ''), 'NONE')
+"""
+
+idv_parent_award_source_sql = """
+    parent_award cpa
+    inner join parent_award pa on pa.award_id = cpa.parent_award_id
+    where cpa.generated_unique_award_id = a.generated_unique_award_id
+"""
+
+parent_award_sql = """
+    select  json_build_object(
+                'agency_id', pag.id,
+                'agency_name', pag.name,
+                'sub_agency_id', pt.agency_id,
+                'sub_agency_name', psa.name,
+                'award_id', pa.award_id,
+                'generated_unique_award_id', pa.generated_unique_award_id,
+                'idv_type_description', pt.idv_type_description,
+                'multiple_or_single_aw_desc', pt.multiple_or_single_aw_desc,
+                'piid', pt.piid,
+                'type_of_idc_description', pt.type_of_idc_description
+            )::text
+    from    (select pa.award_id, pa.generated_unique_award_id from {parent_award_source} limit 1) as pa
+            inner join awards paw on paw.id = pa.award_id
+            left outer join transaction_fpds pt on pt.transaction_id = paw.latest_transaction_id
+            left outer join subtier_agency psa on psa.subtier_code = pt.agency_id
+            left outer join lateral (
+                select      tag.id, tta.name
+                from        agency tag
+                            inner join toptier_agency tta on tta.toptier_agency_id = tag.toptier_agency_id
+                where       tag.toptier_flag is true and tag.toptier_agency_id = (
+                                select  toptier_agency_id
+                                from    agency
+                                where   subtier_agency_id = psa.subtier_agency_id
+                            )
+                order by    tag.id
+                limit       1
+            ) as pag on true
+"""
+
+code_description_sql = """
+    coalesce(
+        (select json_build_object('code', code, 'description', description) from {table} where code = {code}),
+        json_build_object()
+    )
+"""
+
+psc_hierarchy_sql = """
+    case when nullif(t.product_or_service_code, '') is not null then json_build_object(
+        'toptier_code', case
+            when t.product_or_service_code ~ '^[[:alpha:]]' then {toptier_code}
+            else json_build_object()
+        end,
+        'midtier_code', {midtier_code},
+        'subtier_code', case
+            when left(t.product_or_service_code, 1) = 'A' then {subtier_code}
+            else json_build_object()
+        end,
+        'base_code', {base_code}
+    )::text end
+"""
+
+naics_hierarchy_sql = """
+    case when nullif(t.naics, '') is not null then json_build_object(
+        'toptier_code', {toptier_code},
+        'midtier_code', {midtier_code},
+        'base_code', {base_code}
+    )::text end
+"""
+
+# CFDA numbers are padded to six characters (so 12.34 becomes 12.340) before transactions are totaled by them
+cfda_info_sql = """
+    select  json_agg(
+                json_build_object(
+                    'cfda_number', c.cfda_number,
+                    'federal_action_obligation', c.federal_action_obligation::text,
+                    'non_federal_funding_amount', c.non_federal_funding_amount::text,
+                    'total_funding_amount', c.total_funding_amount::text,
+                    'applicant_eligibility', rc.applicant_eligibility,
+                    'beneficiary_eligibility', rc.beneficiary_eligibility,
+                    'federal_agency', rc.federal_agency,
+                    'objectives', rc.objectives,
+                    'obligations', rc.obligations,
+                    'popular_name', rc.popular_name,
+                    'program_title', rc.program_title,
+                    'website_address', rc.website_address,
+                    'url', rc.url
+                )
+                order by c.cfda_number
+            )::text
+    from    (
+                select      case
+                                when length(f.cfda_number) < 6 then rpad(f.cfda_number, 6, '0')
+                                else f.cfda_number
+                            end as cfda_number,
+                            coalesce(sum(f.federal_action_obligation), 0) as federal_action_obligation,
+                            coalesce(sum(f.non_federal_funding_amount), 0) as non_federal_funding_amount,
+                            coalesce(sum(nullif(f.total_funding_amount, '')::numeric), 0) as total_funding_amount
+                from        transaction_fabs f
+                            inner join transaction_normalized ftn on ftn.id = f.transaction_id
+                where       ftn.award_id = a.id
+                group by    1
+            ) as c
+            left outer join references_cfda rc on rc.program_number = c.cfda_number
+"""
+
+transaction_obligated_amount_sql = """
+    select sum(transaction_obligated_amount) from financial_accounts_by_awards where award_id = a.id
+"""
+
+award_defc_codes_sql = """
+    array(
+        select distinct disaster_emergency_fund_code
+        from            financial_accounts_by_awards
+        where           award_id = a.id and disaster_emergency_fund_code is not null
+        order by        disaster_emergency_fund_code
+    )
+"""
+
+# DEFCs from all File C records in the hierarchy of an IDV
+idv_defc_codes_sql = """
+    array(
+        with gather_idv_award_ids as (
+            select      award_id
+            from        parent_award
+            where       award_id = a.id
+            union all
+            select      cpa.award_id
+            from        parent_award ppa
+                        inner join parent_award cpa on
+                            cpa.parent_award_id = ppa.award_id
+            where       ppa.award_id = a.id
+        ), gather_all_award_ids as (
+            select  ca.id
+            from    gather_idv_award_ids g
+                    inner join awards pa on
+                        pa.id = g.award_id
+                    inner join awards ca on
+                        ca.parent_award_piid = pa.piid and
+                        ca.fpds_parent_agency_id = pa.fpds_agency_id
+            union   all
+            select  a.id
+        )
+        select distinct
+            faba.disaster_emergency_fund_code
+        from
+            gather_all_award_ids g
+            inner join financial_accounts_by_awards faba on faba.award_id = g.id
+        where
+            faba.disaster_emergency_fund_code is not null
+        order by
+            faba.disaster_emergency_fund_code
+    )
+"""
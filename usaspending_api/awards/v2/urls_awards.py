@@ -2,7 +2,7 @@ from django.conf.urls import url
 
 from usaspending_api.awards.v2.views.accounts import AwardAccountsViewSet
 from usaspending_api.awards.v2.views.funding import AwardFundingViewSet
-from usaspending_api.awards.v2.views.awards import AwardLastUpdatedViewSet, AwardRetrieveViewSet
+from usaspending_api.awards.v2.views.awards import AwardLastUpdatedViewSet, AwardRetrieveViewSet, AwardSummariesViewSet
 from usaspending_api.awards.v2.views.funding_rollup import AwardFundingRollupViewSet
 from usaspending_api.awards.v2.views.count.transaction_count import TransactionCountRetrieveViewSet
 from usaspending_api.awards.v2.views.count.subaward_count import SubawardCountRetrieveViewSet
@@ -15,6 +15,7 @@ urlpatterns = [
     url(r"^funding/$", AwardFundingViewSet.as_view()),
     url(r"^funding_rollup/$", AwardFundingRollupViewSet.as_view()),
     url(r"^last_updated", AwardLastUpdatedViewSet.as_view()),
+    url(r"^summaries/$", AwardSummariesViewSet.as_view()),
     url(r"^count/transaction/{}/$".format(award_id_regex), TransactionCountRetrieveViewSet.as_view()),
     url(r"^count/subaward/{}/$".format(award_id_regex), SubawardCountRetrieveViewSet.as_view()),
     url(r"^count/federal_account/{}/$".format(award_id_regex), FederalAccountCountRetrieveViewSet.as_view()),
@@ -7,9 +7,10 @@ from rest_framework.views import APIView
 
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.helpers.generic_helper import get_pagination
+from usaspending_api.common.helpers.keyset_pagination import KeysetPagination
 from usaspending_api.common.helpers.sql_helpers import execute_sql_to_ordered_dictionary
 from usaspending_api.common.validator.award import get_internal_or_generated_award_id_model
-from usaspending_api.common.validator.pagination import customize_pagination_with_sort_columns
+from usaspending_api.common.validator.pagination import CURSOR, customize_pagination_with_sort_columns
 from usaspending_api.common.validator.tinyshield import validate_post_request
 
 
@@ -17,10 +18,20 @@ SORTABLE_COLUMNS = {
     "federal_account": "federal_account",
     "total_transaction_obligated_amount": "total_transaction_obligated_amount",
     "agency": "funding_agency_name",
-    "account_title": "fa.account_title",
+    "account_title": "account_title",
 }
 
 
+# Together, these identify a row
+TIEBREAKER_COLUMNS = (
+    "federal_account",
+    "account_title",
+    "funding_agency_abbreviation",
+    "funding_agency_name",
+    "funding_agency_id",
+)
+
+
 DEFAULT_SORT_COLUMN = "federal_account"
 
 
@@ -52,14 +63,12 @@ ACCOUNTS_SQL = SQL(
     group by
         federal_account, fa.account_title, funding_agency_abbreviation, funding_agency_name,
         a.id
-    order by
-        {order_by} {order_direction};
 """
 )
 
 
 TINYSHIELD_MODELS = customize_pagination_with_sort_columns(list(SORTABLE_COLUMNS.keys()), DEFAULT_SORT_COLUMN)
-TINYSHIELD_MODELS.append(get_internal_or_generated_award_id_model())
+TINYSHIELD_MODELS.extend([get_internal_or_generated_award_id_model(), CURSOR])
 
 
 @validate_post_request(TINYSHIELD_MODELS)
@@ -71,26 +80,32 @@ class AwardAccountsViewSet(APIView):
     endpoint_doc = "usaspending_api/api_contracts/contracts/v2/awards/accounts.md"
 
     @staticmethod
-    def _business_logic(request_data: dict) -> list:
+    def _get_pagination(request_data: dict) -> KeysetPagination:
+        return KeysetPagination(SORTABLE_COLUMNS[request_data["sort"]], TIEBREAKER_COLUMNS, request_data["order"])
+
+    def _business_logic(self, request_data: dict) -> list:
         # By this point, our award_id has been validated and cleaned up by
         # TinyShield.  We will either have an internal award id that is an
         # integer or a generated award id that is a string.
         award_id = request_data["award_id"]
         award_id_column = "award_id" if type(award_id) is int else "generated_unique_award_id"
 
-        sql = ACCOUNTS_SQL.format(
-            award_id_column=Identifier(award_id_column),
-            award_id=Literal(award_id),
-            order_by=SQL(SORTABLE_COLUMNS[request_data["sort"]]),
-            order_direction=SQL(request_data["order"]),
-        )
+        sql = ACCOUNTS_SQL.format(award_id_column=Identifier(award_id_column), award_id=Literal(award_id))
 
-        return execute_sql_to_ordered_dictionary(sql)
+        # Offset requests count every account, so they fetch them all
+        pagination = self._get_pagination(request_data)
+        if "cursor" in request_data:
+            return execute_sql_to_ordered_dictionary(pagination.paginate_sql(sql, request_data))
+        return execute_sql_to_ordered_dictionary(pagination.order_sql(sql))
 
     @cache_response()
     def post(self, request: Request) -> Response:
         results = self._business_logic(request.data)
-        paginated_results, page_metadata = get_pagination(results, request.data["limit"], request.data["page"])
+        if "cursor" in request.data:
+            paginated_results = results[: request.data["limit"]]
+            page_metadata = self._get_pagination(request.data).page_metadata(results, request.data)
+        else:
+            paginated_results, page_metadata = get_pagination(results, request.data["limit"], request.data["page"])
         response = OrderedDict((("results", paginated_results), ("page_metadata", page_metadata)))
 
         return Response(response)
@@ -1,23 +1,26 @@
 import logging
 
-from django.db.models import Max
+from collections import OrderedDict
+
+from django.db.models import Max, Q
 from rest_framework.exceptions import NotFound
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from usaspending_api.awards.models import Award
-from usaspending_api.awards.v2.data_layer.orm import (
-    construct_contract_response,
-    construct_idv_response,
-    construct_assistance_response,
-)
+from usaspending_api.awards.v2.data_layer.orm import fetch_award_summaries
 from usaspending_api.common.cache_decorator import cache_response
-from usaspending_api.common.validator.tinyshield import TinyShield
+from usaspending_api.common.validator.tinyshield import TinyShield, validate_post_request
 
 
 logger = logging.getLogger("console")
 
+# Most awards a single AwardSummariesViewSet request can ask for
+MAX_SUMMARIES = 100
+
+SUMMARY_AWARD_VALUES = ("id", "generated_unique_award_id", "category", "update_date")
+
 
 class AwardLastUpdatedViewSet(APIView):
     """
@@ -62,23 +65,57 @@ class AwardRetrieveViewSet(APIView):
         return validated_request_data
 
     def _business_logic(self, request_dict: dict) -> dict:
-        try:
-            award = Award.objects.get(**request_dict)
-        except Award.DoesNotExist:
+        award = Award.objects.filter(**request_dict).values(*SUMMARY_AWARD_VALUES).first()
+        if award is None:
             logger.info("No Award found with: '{}'".format(request_dict))
             raise NotFound("No Award found with: '{}'".format(request_dict))
 
-        if award.category == "contract":
-            response_content = construct_contract_response(request_dict)
-        elif award.category == "idv":
-            response_content = construct_idv_response(request_dict)
-        else:
-            response_content = construct_assistance_response(request_dict)
-
-        return response_content
+        return fetch_award_summaries([award])[0]
 
     @cache_response()
     def get(self, request: Request, requested_award: str) -> Response:
         request_data = self._parse_and_validate_request(requested_award)
         response = self._business_logic(request_data)
         return Response(response)
+
+
+@validate_post_request(
+    [
+        {
+            "key": "award_ids",
+            "name": "award_ids",
+            "type": "array",
+            "array_type": "text",
+            "text_type": "search",
+            "array_max": MAX_SUMMARIES,
+            "optional": False,
+        }
+    ]
+)
+class AwardSummariesViewSet(APIView):
+    """
+    Returns the summaries of several awards at once, as AwardRetrieveViewSet would return each of them
+    """
+
+    endpoint_doc = "usaspending_api/api_contracts/contracts/v2/awards/summaries.md"
+
+    @cache_response()
+    def post(self, request: Request) -> Response:
+        requested_award_ids = [str(award_id) for award_id in request.data["award_ids"]]
+        internal_ids = [int(award_id) for award_id in requested_award_ids if award_id.isdigit()]
+        generated_ids = [award_id for award_id in requested_award_ids if not award_id.isdigit()]
+
+        awards = Award.objects.filter(Q(id__in=internal_ids) | Q(generated_unique_award_id__in=generated_ids))
+        awards_by_requested_id = {}
+        for award in awards.values(*SUMMARY_AWARD_VALUES):
+            awards_by_requested_id[str(award["id"])] = award
+            awards_by_requested_id[award["generated_unique_award_id"]] = award
+
+        # Awards are summarized once each in the order they were first asked for; IDs that match no award are skipped
+        requested_awards = OrderedDict()
+        for award_id in requested_award_ids:
+            award = awards_by_requested_id.get(award_id)
+            if award is not None:
+                requested_awards.setdefault(award["id"], award)
+
+        return Response({"results": fetch_award_summaries(list(requested_awards.values()))})
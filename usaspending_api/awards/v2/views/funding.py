@@ -7,23 +7,23 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from usaspending_api.common.cache_decorator import cache_response
-from usaspending_api.common.helpers.generic_helper import get_simple_pagination_metadata
-from usaspending_api.common.helpers.sql_helpers import build_composable_order_by, execute_sql_to_ordered_dictionary
+from usaspending_api.common.helpers.keyset_pagination import KeysetPagination
+from usaspending_api.common.helpers.sql_helpers import execute_sql_to_ordered_dictionary
 from usaspending_api.common.validator.award import get_internal_or_generated_award_id_model
-from usaspending_api.common.validator.pagination import customize_pagination_with_sort_columns
+from usaspending_api.common.validator.pagination import CURSOR, customize_pagination_with_sort_columns
 from usaspending_api.common.validator.tinyshield import validate_post_request
 
 
 SORTABLE_COLUMNS = {
-    "account_title": "fa.account_title",
+    "account_title": "account_title",
     "awarding_agency_name": "awarding_agency_name",
     "disaster_emergency_fund_code": "disaster_emergency_fund_code",
     "federal_account": "federal_account",
     "funding_agency_name": "funding_agency_name",
     "gross_outlay_amount": "gross_outlay_amount",
-    "object_class": ["oc.object_class", "oc.object_class_name"],
-    "program_activity": ["pa.program_activity_code", "pa.program_activity_name"],
-    "reporting_fiscal_date": ["sa.reporting_fiscal_year", "sa.reporting_fiscal_period"],
+    "object_class": ["object_class", "object_class_name"],
+    "program_activity": ["program_activity_code", "program_activity_name"],
+    "reporting_fiscal_date": ["reporting_fiscal_year", "reporting_fiscal_month"],
     "transaction_obligated_amount": "transaction_obligated_amount",
 }
 
@@ -31,11 +31,16 @@ SORTABLE_COLUMNS = {
 DEFAULT_SORT_COLUMN = "federal_account"
 
 
+# Identifies the File C record behind each row; not returned
+TIEBREAKER_COLUMN = "financial_accounts_by_awards_id"
+
+
 FUNDING_SQL = SQL(
     """
     with
     gather_financial_accounts_by_awards as (
-        select  a.awarding_agency_id,
+        select  faba.financial_accounts_by_awards_id,
+                a.awarding_agency_id,
                 a.funding_agency_id,
                 faba.submission_id,
                 faba.transaction_obligated_amount,
@@ -48,7 +53,8 @@ FUNDING_SQL = SQL(
                 inner join financial_accounts_by_awards as faba on faba.award_id = a.id
         where   a.{award_id_column} = {award_id}
     )
-    select  gfaba.transaction_obligated_amount,
+    select  gfaba.financial_accounts_by_awards_id,
+            gfaba.transaction_obligated_amount,
             gfaba.gross_outlay_amount,
             gfaba.disaster_emergency_fund_code,
             fa.federal_account_code                                         federal_account,
@@ -84,14 +90,12 @@ FUNDING_SQL = SQL(
                 gfaba.program_activity_id = pa.id
             left outer join submission_attributes sa on
                 gfaba.submission_id = sa.submission_id
-    {order_by}
-    limit {limit} offset {offset};
 """
 )
 
 
 TINYSHIELD_MODELS = customize_pagination_with_sort_columns(list(SORTABLE_COLUMNS.keys()), DEFAULT_SORT_COLUMN)
-TINYSHIELD_MODELS.append(get_internal_or_generated_award_id_model())
+TINYSHIELD_MODELS.extend([get_internal_or_generated_award_id_model(), CURSOR])
 
 
 @validate_post_request(deepcopy(TINYSHIELD_MODELS))
@@ -103,26 +107,26 @@ class AwardFundingViewSet(APIView):
     endpoint_doc = "usaspending_api/api_contracts/contracts/v2/awards/funding.md"
 
     @staticmethod
-    def _business_logic(request_data: dict) -> list:
+    def _get_pagination(request_data: dict) -> KeysetPagination:
+        return KeysetPagination(SORTABLE_COLUMNS[request_data["sort"]], [TIEBREAKER_COLUMN], request_data["order"])
+
+    def _business_logic(self, request_data: dict) -> list:
         # By this point, our award_id has been validated and cleaned up by
         # TinyShield.  We will either have an internal award id that is an
         # integer or a generated award id that is a string.
         award_id = request_data["award_id"]
         award_id_column = "id" if type(award_id) is int else "generated_unique_award_id"
 
-        sql = FUNDING_SQL.format(
-            award_id_column=Identifier(award_id_column),
-            award_id=Literal(award_id),
-            order_by=build_composable_order_by(SORTABLE_COLUMNS[request_data["sort"]], request_data["order"]),
-            limit=Literal(request_data["limit"] + 1),
-            offset=Literal((request_data["page"] - 1) * request_data["limit"]),
-        )
-        return execute_sql_to_ordered_dictionary(sql)
+        sql = FUNDING_SQL.format(award_id_column=Identifier(award_id_column), award_id=Literal(award_id))
+        return execute_sql_to_ordered_dictionary(self._get_pagination(request_data).paginate_sql(sql, request_data))
 
     @cache_response()
     def post(self, request: Request) -> Response:
         results = self._business_logic(request.data)
-        page_metadata = get_simple_pagination_metadata(len(results), request.data["limit"], request.data["page"])
-        response = OrderedDict((("results", results[: request.data["limit"]]), ("page_metadata", page_metadata)))
+        page_metadata = self._get_pagination(request.data).page_metadata(results, request.data)
+        results = results[: request.data["limit"]]
+        for result in results:
+            del result[TIEBREAKER_COLUMN]
+        response = OrderedDict((("results", results), ("page_metadata", page_metadata)))
 
         return Response(response)
@@ -1,13 +1,12 @@
 from copy import deepcopy
 
-from django.db.models import F
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from usaspending_api.search.models import SubawardView
 from usaspending_api.common.cache_decorator import cache_response
-from usaspending_api.common.helpers.generic_helper import get_simple_pagination_metadata
-from usaspending_api.common.validator.pagination import PAGINATION
+from usaspending_api.common.helpers.keyset_pagination import keyset_index_definitions, KeysetPagination
+from usaspending_api.common.validator.pagination import CURSOR, PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
 
 
@@ -30,8 +29,18 @@ class SubawardsViewSet(APIView):
         "recipient_name": "recipient_name",
     }
 
+    # Defined on subaward_view in its matview JSON, only for the sorts that page deep in practice
+    keyset_indexes = keyset_index_definitions(
+        "award_keyset",
+        "award_id",
+        ["action_date", "amount", "subaward_number", "subaward_id"],
+        ["subaward_id"],
+        nulls_low=True,
+    )
+
     def _parse_and_validate_request(self, request_dict):
         models = deepcopy(PAGINATION)
+        models.append(deepcopy(CURSOR))
         models.append(
             {
                 "key": "award_id",
@@ -53,10 +62,12 @@ class SubawardsViewSet(APIView):
         validated_request_data = TinyShield(models).block(request_dict)
         return validated_request_data
 
-    def _business_logic(self, request_data):
-        lower_limit = (request_data["page"] - 1) * request_data["limit"]
-        upper_limit = request_data["page"] * request_data["limit"]
+    def _get_pagination(self, request_data):
+        return KeysetPagination(
+            self.subaward_lookup[request_data["sort"]], ["subaward_id"], request_data["order"], nulls_low=True
+        )
 
+    def _get_rows(self, request_data):
         queryset = SubawardView.objects.all()
 
         award_id = request_data["award_id"]
@@ -65,21 +76,20 @@ class SubawardsViewSet(APIView):
             queryset = queryset.filter(**{award_id_column: award_id})
 
         queryset = queryset.values(*list(self.subaward_lookup.values()))
+        return self._get_pagination(request_data).paginate_queryset(queryset, request_data)
 
-        if request_data["order"] == "desc":
-            queryset = queryset.order_by(F(self.subaward_lookup[request_data["sort"]]).desc(nulls_last=True))
-        else:
-            queryset = queryset.order_by(F(self.subaward_lookup[request_data["sort"]]).asc(nulls_first=True))
-
-        rows = list(queryset[lower_limit : upper_limit + 1])
+    def _format_results(self, rows):
         return [{k: row[v] for k, v in self.subaward_lookup.items()} for row in rows]
 
+    def _business_logic(self, request_data):
+        return self._format_results(self._get_rows(request_data))
+
     @cache_response()
     def post(self, request):
         request_data = self._parse_and_validate_request(request.data)
-        results = self._business_logic(request_data)
-        page_metadata = get_simple_pagination_metadata(len(results), request_data["limit"], request_data["page"])
+        rows = self._get_rows(request_data)
+        page_metadata = self._get_pagination(request_data).page_metadata(rows, request_data)
 
-        response = {"page_metadata": page_metadata, "results": results[: request_data["limit"]]}
+        response = {"page_metadata": page_metadata, "results": self._format_results(rows[: request_data["limit"]])}
 
         return Response(response)
@@ -1,14 +1,14 @@
 from copy import deepcopy
 
-from django.db.models import F
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from usaspending_api.awards.models import TransactionNormalized
 from usaspending_api.common.cache_decorator import cache_response
-from usaspending_api.common.helpers.generic_helper import get_simple_pagination_metadata
+from usaspending_api.common.helpers.keyset_pagination import keyset_index_definitions, KeysetPagination
 from usaspending_api.common.validator import (
+    CURSOR,
     customize_pagination_with_sort_columns,
     get_internal_or_generated_award_id_model,
     TinyShield,
@@ -41,6 +41,19 @@ class TransactionViewSet(APIView):
         "cfda_number": "assistance_data__cfda_number",
     }
 
+    # Sorts order by the transaction_normalized column named for the sort (even "id"), except cfda_number
+    sort_columns = {sort: sort for sort in transaction_lookup}
+    sort_columns["cfda_number"] = "assistance_data__cfda_number"
+
+    # Created on transaction_normalized by awards migration 0076, only for the sorts that page deep in practice
+    keyset_indexes = keyset_index_definitions(
+        "tn_keyset",
+        "award_id",
+        ["action_date", "federal_action_obligation", "modification_number", "id"],
+        ["id"],
+        nulls_low=True,
+    )
+
     def __init__(self):
         models = customize_pagination_with_sort_columns(
             list(TransactionViewSet.transaction_lookup.keys()), "action_date"
@@ -49,6 +62,7 @@ class TransactionViewSet(APIView):
             [
                 get_internal_or_generated_award_id_model(),
                 {"key": "idv", "name": "idv", "type": "boolean", "default": True, "optional": True},
+                CURSOR,
             ]
         )
 
@@ -58,31 +72,27 @@ class TransactionViewSet(APIView):
     def _parse_and_validate_request(self, request_dict: dict) -> dict:
         return TinyShield(deepcopy(self._tiny_shield_models)).block(request_dict)
 
-    def _business_logic(self, request_data: dict) -> list:
+    def _get_pagination(self, request_data: dict) -> KeysetPagination:
+        return KeysetPagination(self.sort_columns[request_data["sort"]], ["id"], request_data["order"], nulls_low=True)
+
+    def _get_rows(self, request_data: dict) -> list:
         # By this point, our award_id has been validated and cleaned up by
         # TinyShield.  We will either have an internal award id that is an
         # integer or a generated award id that is a string.
         award_id = request_data["award_id"]
         award_id_column = "award_id" if type(award_id) is int else "award__generated_unique_award_id"
         filter = {award_id_column: award_id}
-        if request_data["sort"] == "cfda_number":
-            request_data["sort"] = "assistance_data__cfda_number"
-        lower_limit = (request_data["page"] - 1) * request_data["limit"]
-        upper_limit = request_data["page"] * request_data["limit"]
 
         queryset = (
             TransactionNormalized.objects.all()
             .filter(**filter)
             .select_related("assistance_data")
-            .values(*list(self.transaction_lookup.values()))
+            .values("id", *list(self.transaction_lookup.values()))
         )
-        if request_data["order"] == "desc":
-            queryset = queryset.order_by(F(request_data["sort"]).desc(nulls_last=True))
-        else:
-            queryset = queryset.order_by(F(request_data["sort"]).asc(nulls_first=True))
+        return self._get_pagination(request_data).paginate_queryset(queryset, request_data)
 
-        rows = list(queryset[lower_limit : upper_limit + 1])
-        return self._format_results(rows)
+    def _business_logic(self, request_data: dict) -> list:
+        return self._format_results(self._get_rows(request_data))
 
     def _format_results(self, rows):
         results = []
@@ -100,9 +110,9 @@ class TransactionViewSet(APIView):
     @cache_response()
     def post(self, request: Request) -> Response:
         request_data = self._parse_and_validate_request(request.data)
-        results = self._business_logic(request_data)
-        page_metadata = get_simple_pagination_metadata(len(results), request_data["limit"], request_data["page"])
+        rows = self._get_rows(request_data)
+        page_metadata = self._get_pagination(request_data).page_metadata(rows, request_data)
 
-        response = {"page_metadata": page_metadata, "results": results[: request_data["limit"]]}
+        response = {"page_metadata": page_metadata, "results": self._format_results(rows[: request_data["limit"]])}
 
         return Response(response)
@@ -0,0 +1,355 @@
+"""
+Columnar counterpart of get_business_categories.  The same rules are expressed as data and applied to whole columns
+at once, so a batch of Broker rows is categorized with a few dozen numpy operations instead of a few dozen dictionary
+lookups per row.  compile_fpds_business_categories and compile_fabs_business_categories (in
+broker/management/sql/create_business_categories_functions.sql) are the in-database equivalents used for backfills.
+"""
+import numpy as np
+import pandas as pd
+
+from typing import Iterable, List, NamedTuple, Tuple, Union
+
+# The values distutils.util.strtobool (and so build_business_categories_boolean_dict) accepts
+TRUE_STRINGS = ("y", "yes", "t", "true", "on", "1")
+FALSE_STRINGS = ("n", "no", "f", "false", "off", "0")
+
+
+class BusinessCategoryRule(NamedTuple):
+    """A category applies when any of its flags is true, any column equals the value, or any child category applies"""
+
+    category: str
+    flags: Tuple[str, ...] = ()
+    equals: Tuple[Tuple[str, str], ...] = ()
+    children: Tuple[str, ...] = ()
+
+
+def _business_types(*values):
+    return tuple(("business_types", value) for value in values)
+
+
+# Rules are listed so that child categories come before the categories built from them
+FABS_RULES = (
+    # BUSINESS (FOR-PROFIT)
+    BusinessCategoryRule("small_business", equals=_business_types("R", "23")),
+    BusinessCategoryRule("other_than_small_business", equals=_business_types("Q", "22")),
+    BusinessCategoryRule("category_business", children=("small_business", "other_than_small_business")),
+    # NON-PROFIT
+    BusinessCategoryRule("nonprofit", equals=_business_types("M", "N", "12")),
+    # HIGHER EDUCATION
+    BusinessCategoryRule("public_institution_of_higher_education", equals=_business_types("H", "06")),
+    BusinessCategoryRule("private_institution_of_higher_education", equals=_business_types("O", "20")),
+    BusinessCategoryRule(
+        "minority_serving_institution_of_higher_education", equals=_business_types("T", "U", "V", "S")
+    ),
+    BusinessCategoryRule(
+        "higher_education",
+        children=(
+            "public_institution_of_higher_education",
+            "private_institution_of_higher_education",
+            "minority_serving_institution_of_higher_education",
+        ),
+    ),
+    # GOVERNMENT
+    BusinessCategoryRule("regional_and_state_government", equals=_business_types("A", "00")),
+    BusinessCategoryRule("regional_organization", equals=_business_types("E")),
+    BusinessCategoryRule("us_territory_or_possession", equals=_business_types("F")),
+    BusinessCategoryRule("local_government", equals=_business_types("B", "C", "D", "G", "01", "02", "04", "05")),
+    BusinessCategoryRule("indian_native_american_tribal_government", equals=_business_types("I", "J", "K", "11")),
+    BusinessCategoryRule("authorities_and_commissions", equals=_business_types("L")),
+    BusinessCategoryRule(
+        "government",
+        children=(
+            "regional_and_state_government",
+            "us_territory_or_possession",
+            "local_government",
+            "indian_native_american_tribal_government",
+            "authorities_and_commissions",
+            "regional_organization",
+        ),
+    ),
+    # INDIVIDUALS
+    BusinessCategoryRule("individuals", equals=_business_types("P", "21")),
+)
+
+FPDS_RULES = (
+    # BUSINESS (FOR-PROFIT)
+    BusinessCategoryRule(
+        "small_business",
+        flags=(
+            "women_owned_small_business",
+            "economically_disadvantaged",
+            "joint_venture_women_owned",
+            "emerging_small_business",
+            "self_certified_small_disad",
+            "small_agricultural_coopera",
+            "small_disadvantaged_busine",
+        ),
+        equals=(("contracting_officers_deter", "S"),),
+    ),
+    BusinessCategoryRule("other_than_small_business", equals=(("contracting_officers_deter", "O"),)),
+    BusinessCategoryRule("corporate_entity_tax_exempt", flags=("corporate_entity_tax_exemp",)),
+    BusinessCategoryRule("corporate_entity_not_tax_exempt", flags=("corporate_entity_not_tax_e",)),
+    BusinessCategoryRule("partnership_or_limited_liability_partnership", flags=("partnership_or_limited_lia",)),
+    BusinessCategoryRule("sole_proprietorship", flags=("sole_proprietorship",)),
+    BusinessCategoryRule("manufacturer_of_goods", flags=("manufacturer_of_goods",)),
+    BusinessCategoryRule("subchapter_s_corporation", flags=("subchapter_s_corporation",)),
+    BusinessCategoryRule("limited_liability_corporation", flags=("limited_liability_corporat",)),
+    BusinessCategoryRule(
+        "category_business",
+        flags=("for_profit_organization",),
+        children=(
+            "small_business",
+            "other_than_small_business",
+            "corporate_entity_tax_exempt",
+            "corporate_entity_not_tax_exempt",
+            "partnership_or_limited_liability_partnership",
+            "sole_proprietorship",
+            "manufacturer_of_goods",
+            "subchapter_s_corporation",
+            "limited_liability_corporation",
+        ),
+    ),
+    # MINORITY BUSINESS
+    BusinessCategoryRule("alaskan_native_corporation_owned_firm", flags=("alaskan_native_owned_corpo",)),
+    BusinessCategoryRule("american_indian_owned_business", flags=("american_indian_owned_busi",)),
+    BusinessCategoryRule("asian_pacific_american_owned_business", flags=("asian_pacific_american_own",)),
+    BusinessCategoryRule("black_american_owned_business", flags=("black_american_owned_busin",)),
+    BusinessCategoryRule("hispanic_american_owned_business", flags=("hispanic_american_owned_bu",)),
+    BusinessCategoryRule("native_american_owned_business", flags=("native_american_owned_busi",)),
+    BusinessCategoryRule("native_hawaiian_organization_owned_firm", flags=("native_hawaiian_owned_busi",)),
+    BusinessCategoryRule("subcontinent_asian_indian_american_owned_business", flags=("subcontinent_asian_asian_i",)),
+    BusinessCategoryRule("tribally_owned_firm", flags=("tribally_owned_business",)),
+    BusinessCategoryRule("other_minority_owned_business", flags=("other_minority_owned_busin",)),
+    BusinessCategoryRule(
+        "minority_owned_business",
+        flags=("minority_owned_business",),
+        children=(
+            "alaskan_native_corporation_owned_firm",
+            "american_indian_owned_business",
+            "asian_pacific_american_owned_business",
+            "black_american_owned_business",
+            "hispanic_american_owned_business",
+            "native_american_owned_business",
+            "native_hawaiian_organization_owned_firm",
+            "subcontinent_asian_indian_american_owned_business",
+            "tribally_owned_firm",
+            "other_minority_owned_business",
+        ),
+    ),
+    # WOMEN OWNED BUSINESS
+    BusinessCategoryRule("women_owned_small_business", flags=("women_owned_small_business",)),
+    BusinessCategoryRule(
+        "economically_disadvantaged_women_owned_small_business", flags=("economically_disadvantaged",)
+    ),
+    BusinessCategoryRule("joint_venture_women_owned_small_business", flags=("joint_venture_women_owned",)),
+    BusinessCategoryRule(
+        "joint_venture_economically_disadvantaged_women_owned_small_business", flags=("joint_venture_economically",)
+    ),
+    BusinessCategoryRule(
+        "woman_owned_business",
+        flags=("woman_owned_business",),
+        children=(
+            "women_owned_small_business",
+            "economically_disadvantaged_women_owned_small_business",
+            "joint_venture_women_owned_small_business",
+            "joint_venture_economically_disadvantaged_women_owned_small_business",
+        ),
+    ),
+    # VETERAN OWNED BUSINESS
+    BusinessCategoryRule("service_disabled_veteran_owned_business", flags=("service_disabled_veteran_o",)),
+    BusinessCategoryRule(
+        "veteran_owned_business",
+        flags=("veteran_owned_business",),
+        children=("service_disabled_veteran_owned_business",),
+    ),
+    # SPECIAL DESIGNATIONS
+    BusinessCategoryRule("8a_program_participant", flags=("c8a_program_participant",)),
+    BusinessCategoryRule("ability_one_program", flags=("the_ability_one_program",)),
+    BusinessCategoryRule("dot_certified_disadvantaged_business_enterprise", flags=("dot_certified_disadvantage",)),
+    BusinessCategoryRule("emerging_small_business", flags=("emerging_small_business",)),
+    BusinessCategoryRule("federally_funded_research_and_development_corp", flags=("federally_funded_research",)),
+    BusinessCategoryRule("historically_underutilized_business_firm", flags=("historically_underutilized",)),
+    BusinessCategoryRule("labor_surplus_area_firm", flags=("labor_surplus_area_firm",)),
+    BusinessCategoryRule("sba_certified_8a_joint_venture", flags=("sba_certified_8_a_joint_ve",)),
+    BusinessCategoryRule("self_certified_small_disadvanted_business", flags=("self_certified_small_disad",)),
+    BusinessCategoryRule("small_agricultural_cooperative", flags=("small_agricultural_coopera",)),
+    BusinessCategoryRule("small_disadvantaged_business", flags=("small_disadvantaged_busine",)),
+    BusinessCategoryRule("community_developed_corporation_owned_firm", flags=("community_developed_corpor",)),
+    BusinessCategoryRule("us_owned_business", equals=(("domestic_or_foreign_entity", "A"),)),
+    BusinessCategoryRule("foreign_owned_and_us_located_business", equals=(("domestic_or_foreign_entity", "C"),)),
+    BusinessCategoryRule(
+        "foreign_owned", flags=("foreign_owned_and_located",), equals=(("domestic_or_foreign_entity", "D"),)
+    ),
+    BusinessCategoryRule("foreign_government", flags=("foreign_government",)),
+    BusinessCategoryRule("international_organization", flags=("international_organization",)),
+    BusinessCategoryRule("domestic_shelter", flags=("domestic_shelter",)),
+    BusinessCategoryRule("hospital", flags=("hospital_flag",)),
+    BusinessCategoryRule("veterinary_hospital", flags=("veterinary_hospital",)),
+    BusinessCategoryRule(
+        "special_designations",
+        children=(
+            "8a_program_participant",
+            "ability_one_program",
+            "dot_certified_disadvantaged_business_enterprise",
+            "emerging_small_business",
+            "federally_funded_research_and_development_corp",
+            "historically_underutilized_business_firm",
+            "labor_surplus_area_firm",
+            "sba_certified_8a_joint_venture",
+            "self_certified_small_disadvanted_business",
+            "small_agricultural_cooperative",
+            "small_disadvantaged_business",
+            "community_developed_corporation_owned_firm",
+            "us_owned_business",
+            "foreign_owned_and_us_located_business",
+            "foreign_owned",
+            "foreign_government",
+            "international_organization",
+            "domestic_shelter",
+            "hospital",
+            "veterinary_hospital",
+        ),
+    ),
+    # NON-PROFIT
+    BusinessCategoryRule("foundation", flags=("foundation",)),
+    BusinessCategoryRule("community_development_corporations", flags=("community_development_corp",)),
+    BusinessCategoryRule(
+        "nonprofit",
+        flags=("nonprofit_organization", "other_not_for_profit_organ"),
+        children=("foundation", "community_development_corporations"),
+    ),
+    # HIGHER EDUCATION
+    BusinessCategoryRule("educational_institution", flags=("educational_institution",)),
+    BusinessCategoryRule(
+        "public_institution_of_higher_education",
+        flags=(
+            "state_controlled_instituti",
+            "c1862_land_grant_college",
+            "c1890_land_grant_college",
+            "c1994_land_grant_college",
+        ),
+    ),
+    BusinessCategoryRule("private_institution_of_higher_education", flags=("private_university_or_coll",)),
+    BusinessCategoryRule(
+        "minority_serving_institution_of_higher_education",
+        flags=(
+            "minority_institution",
+            "historically_black_college",
+            "tribal_college",
+            "alaskan_native_servicing_i",
+            "native_hawaiian_servicing",
+            "hispanic_servicing_institu",
+        ),
+    ),
+    BusinessCategoryRule("school_of_forestry", flags=("school_of_forestry",)),
+    BusinessCategoryRule("veterinary_college", flags=("veterinary_college",)),
+    BusinessCategoryRule(
+        "higher_education",
+        children=(
+            "educational_institution",
+            "public_institution_of_higher_education",
+            "private_institution_of_higher_education",
+            "school_of_forestry",
+            "minority_serving_institution_of_higher_education",
+            "veterinary_college",
+        ),
+    ),
+    # GOVERNMENT
+    BusinessCategoryRule(
+        "national_government", flags=("us_federal_government", "federal_agency", "us_government_entity")
+    ),
+    BusinessCategoryRule("interstate_entity", flags=("interstate_entity",)),
+    BusinessCategoryRule("regional_and_state_government", flags=("us_state_government",)),
+    BusinessCategoryRule("council_of_governments", flags=("council_of_governments",)),
+    BusinessCategoryRule(
+        "local_government",
+        flags=(
+            "city_local_government",
+            "county_local_government",
+            "inter_municipal_local_gove",
+            "municipality_local_governm",
+            "township_local_government",
+            "us_local_government",
+            "local_government_owned",
+            "school_district_local_gove",
+        ),
+    ),
+    BusinessCategoryRule(
+        "indian_native_american_tribal_government", flags=("us_tribal_government", "indian_tribe_federally_rec")
+    ),
+    BusinessCategoryRule(
+        "authorities_and_commissions",
+        flags=(
+            "housing_authorities_public",
+            "airport_authority",
+            "port_authority",
+            "transit_authority",
+            "planning_commission",
+        ),
+    ),
+    BusinessCategoryRule(
+        "government",
+        children=(
+            "national_government",
+            "regional_and_state_government",
+            "local_government",
+            "indian_native_american_tribal_government",
+            "authorities_and_commissions",
+            "interstate_entity",
+            "council_of_governments",
+        ),
+    ),
+)
+
+RULES = {"fabs": FABS_RULES, "fpds": FPDS_RULES}
+
+
+def _flag_mask(frame: pd.DataFrame, column: str) -> np.ndarray:
+    """Vectorized build_business_categories_boolean_dict for one column: missing, null and "" are false"""
+    if column not in frame:
+        return np.zeros(len(frame), dtype=bool)
+    values = frame[column].fillna("").astype(str).str.lower().replace("", "false")
+    invalid = ~values.isin(TRUE_STRINGS + FALSE_STRINGS)
+    if invalid.any():
+        raise ValueError(f"invalid truth value {values[invalid].iloc[0]!r}")
+    return values.isin(TRUE_STRINGS).to_numpy()
+
+
+def _equals_mask(frame: pd.DataFrame, column: str, value: str) -> np.ndarray:
+    if column not in frame:
+        return np.zeros(len(frame), dtype=bool)
+    return frame[column].eq(value).to_numpy()
+
+
+def get_business_categories_batch(
+    records: Union[pd.DataFrame, Iterable[dict], dict], data_type: str
+) -> List[List[str]]:
+    """
+    Business categories of every record in a batch, in the same order and with the same (sorted) category lists
+    get_business_categories returns for each record.  records can be a DataFrame, a list of row dicts or a dict of
+    column arrays.
+    """
+    if data_type not in RULES:
+        raise ValueError(
+            "Invalid object type provided to update_business_categories. "
+            "Must be one of the following types: TransactionFPDS, TransactionFABS"
+        )
+
+    frame = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+    if frame.empty:
+        return [[] for _ in range(len(frame))]
+
+    masks = {}
+    for rule in RULES[data_type]:
+        mask = np.zeros(len(frame), dtype=bool)
+        for flag in rule.flags:
+            mask |= _flag_mask(frame, flag)
+        for column, value in rule.equals:
+            mask |= _equals_mask(frame, column, value)
+        for child in rule.children:
+            mask |= masks[child]
+        masks[rule.category] = mask
+
+    categories = np.array(sorted(masks))
+    matrix = np.column_stack([masks[category] for category in categories])
+    return [categories[row].tolist() for row in matrix]
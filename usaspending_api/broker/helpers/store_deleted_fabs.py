@@ -1,10 +1,11 @@
-import boto3
 import logging
 import time
 
 from datetime import datetime, timezone
 from django.conf import settings
 
+from usaspending_api.common.helpers.s3_helpers import get_s3_client
+
 
 logger = logging.getLogger("console")
 
@@ -26,5 +27,5 @@ def store_deleted_fabs(ids_to_delete):
         for row in rows_with_header:
             contents += bytes(f"{row}\n".encode())
 
-        s3client = boto3.client("s3", region_name=settings.USASPENDING_AWS_REGION)
+        s3client = get_s3_client(settings.USASPENDING_AWS_REGION)
         s3client.put_object(Bucket=settings.DELETED_TRANSACTION_JOURNAL_FILES, Key=file_name, Body=contents)
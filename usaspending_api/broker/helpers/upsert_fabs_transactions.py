@@ -5,14 +5,16 @@ from copy import copy
 from datetime import datetime, timezone
 from django.db import connection, transaction
 
+from usaspending_api.agency.profile_rollup import add_awarding_subtier_agencies
 from usaspending_api.awards.models import TransactionFABS, TransactionNormalized, Award
-from usaspending_api.broker.helpers.get_business_categories import get_business_categories
+from usaspending_api.broker.helpers.get_business_categories_batch import get_business_categories_batch
 from usaspending_api.common.helpers.date_helper import cast_datetime_to_utc
 from usaspending_api.common.helpers.dict_helpers import upper_case_dict_values
-from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
+from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages_delta
 from usaspending_api.common.helpers.date_helper import fy
 from usaspending_api.common.helpers.timing_helpers import timer
-from usaspending_api.etl.award_helpers import update_awards, update_assistance_awards
+from usaspending_api.disaster.file_c_spending import refresh_disaster_file_c_spending_for_awards
+from usaspending_api.etl.award_helpers import update_awards_by_partition
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management.load_base import load_data_into_model, format_date
 from usaspending_api.references.models import Agency
@@ -74,10 +76,16 @@ def insert_new_fabs(to_insert):
         "officer_5_amount": "high_comp_officer5_amount",
     }
 
-    update_award_ids = []
     for row in to_insert:
         upper_case_dict_values(row)
 
+    # FABS categories only depend on business_types, so that's the only column the batch needs
+    business_categories = get_business_categories_batch(
+        {"business_types": [row.get("business_types") for row in to_insert]}, "fabs"
+    )
+
+    update_award_ids = []
+    for row, categories in zip(to_insert, business_categories):
         # Find the toptier awards from the subtier awards
         awarding_agency = Agency.get_by_subtier_only(row["awarding_sub_tier_agency_c"])
         funding_agency = Agency.get_by_subtier_only(row["funding_sub_tier_agency_co"])
@@ -109,7 +117,7 @@ def insert_new_fabs(to_insert):
             "last_modified_date": last_mod_date,
             "type_description": row["assistance_type_desc"],
             "transaction_unique_id": row["afa_generated_unique"],
-            "business_categories": get_business_categories(row=row, data_type="fabs"),
+            "business_categories": categories,
         }
 
         transaction_normalized_dict = load_data_into_model(
@@ -164,16 +172,17 @@ def upsert_fabs_transactions(ids_to_upsert, externally_updated_award_ids):
                 update_award_ids.extend(insert_all_new_fabs(ids_to_upsert))
 
         if update_award_ids:
-            update_award_ids = tuple(set(update_award_ids))  # Convert to tuple and remove duplicates.
-            with timer("updating awards to reflect their latest associated transaction info", logger.info):
-                award_record_count = update_awards(update_award_ids)
-                logger.info("{} awards updated from their transactional data".format(award_record_count))
-            with timer("updating awards with executive compensation data", logger.info):
-                award_record_count = update_assistance_awards(update_award_ids)
-                logger.info("{} awards updated FABS-specific and exec comp data".format(award_record_count))
+            with timer("updating awards to reflect their latest transaction and executive compensation", logger.info):
+                award_record_counts = update_awards_by_partition(update_award_ids, ["awards", "assistance"])
+                logger.info(f"{award_record_counts['awards']} awards updated from their transactional data")
+                logger.info(f"{award_record_counts['assistance']} awards updated FABS-specific and exec comp data")
+                add_awarding_subtier_agencies(update_award_ids)
 
         with timer("updating C->D linkages", logger.info):
-            update_c_to_d_linkages("assistance")
+            update_c_to_d_linkages_delta("assistance")
+
+        if update_award_ids:
+            refresh_disaster_file_c_spending_for_awards(update_award_ids)
 
     else:
         logger.info("Nothing to insert...")
@@ -16,6 +16,11 @@ EXTERNAL_DATA_TYPE = [
     # "opposite" side of the broker data load, data from USAspending DB -> Elasticsearch
     LookupType(100, "es_transactions", "Load elasticsearch with transactions from USAspending"),
     LookupType(101, "es_awards", "Load elasticsearch with awards from USAspending"),
+    LookupType(102, "es_subawards", "Load elasticsearch with subawards from USAspending"),
+    # processing within the USAspending DB
+    LookupType(200, "file_c_contract_linkage", "Delta linkage of File C contract records to awards"),
+    LookupType(201, "file_c_assistance_linkage", "Delta linkage of File C assistance records to awards"),
+    LookupType(202, "recipient_profile", "Delta update of recipient profiles from changed transactions and recipients"),
 ]
 EXTERNAL_DATA_TYPE_DICT = {item.name: item.id for item in EXTERNAL_DATA_TYPE}
 EXTERNAL_DATA_TYPE_DICT_ID = {item.id: item.name for item in EXTERNAL_DATA_TYPE}
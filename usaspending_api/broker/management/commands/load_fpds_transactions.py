@@ -6,12 +6,15 @@ from datetime import datetime, timezone
 from django.core.management.base import BaseCommand
 from typing import IO, List, AnyStr, Optional
 
+from usaspending_api.agency.profile_rollup import add_awarding_subtier_agencies
+from usaspending_api.awards.idv_closure import refresh_idv_closure
 from usaspending_api.broker.helpers.last_load_date import get_last_load_date, update_last_load_date
 from usaspending_api.common.helpers.date_helper import datetime_command_line_argument_type
-from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
+from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages_delta
 from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
-from usaspending_api.etl.award_helpers import update_awards, update_procurement_awards, prune_empty_awards
+from usaspending_api.disaster.file_c_spending import refresh_disaster_file_c_spending_for_awards
+from usaspending_api.etl.award_helpers import prune_empty_awards, update_awards_by_partition
 from usaspending_api.etl.transaction_loaders.fpds_loader import load_fpds_transactions, failed_ids, delete_stale_fpds
 from usaspending_api.transactions.transaction_delete_journal_helpers import retrieve_deleted_fpds_transactions
 
@@ -98,12 +101,14 @@ class Command(BaseCommand):
             unique_awards = set(awards)
             logger.info(f"{len(unique_awards)} award records impacted by transaction DML operations")
             logger.info(f"{prune_empty_awards(tuple(unique_awards))} award records removed")
-            logger.info(f"{update_awards(tuple(unique_awards))} award records updated")
-            logger.info(
-                f"{update_procurement_awards(tuple(unique_awards))} award records updated on FPDS-specific fields"
-            )
+            updated = update_awards_by_partition(unique_awards, ["awards", "procurement"])
+            logger.info(f"{updated['awards']} award records updated")
+            logger.info(f"{updated['procurement']} award records updated on FPDS-specific fields")
+            add_awarding_subtier_agencies(unique_awards)
             if not skip_cd_linkage:
-                update_c_to_d_linkages("contract")
+                update_c_to_d_linkages_delta("contract")
+            refresh_idv_closure(unique_awards)
+            refresh_disaster_file_c_spending_for_awards(unique_awards)
         else:
             logger.info("No award records to update")
 
@@ -11,7 +11,7 @@ from usaspending_api.awards.models import Award
 from usaspending_api.common.helpers.timing_helpers import timer
 from usaspending_api.references.models import Agency, SubtierAgency, ToptierAgency
 from usaspending_api.etl.management.load_base import format_date, load_data_into_model
-from usaspending_api.etl.award_helpers import update_awards, update_procurement_awards, update_assistance_awards
+from usaspending_api.etl.award_helpers import update_awards_by_partition
 
 
 logger = logging.getLogger("console")
@@ -400,13 +400,13 @@ class Command(BaseCommand):
                 self.update_transaction_assistance(db_cursor=db_cursor, fiscal_year=fiscal_year, page=page, limit=limit)
 
         with timer("updating awards to reflect their latest associated transaction info", logger.info):
-            update_awards(tuple(award_update_id_list))
+            update_awards_by_partition(award_update_id_list)
 
         with timer("updating assistance-specific awards to reflect their latest transaction info", logger.info):
-            update_assistance_awards(tuple(award_assistance_update_id_list))
+            update_awards_by_partition(award_assistance_update_id_list, ["assistance"])
 
         with timer("updating contract-specific awards to reflect their latest transaction info", logger.info):
-            update_procurement_awards(tuple(award_contract_update_id_list))
+            update_awards_by_partition(award_contract_update_id_list, ["procurement"])
 
         # Done!
         logger.info("FINISHED")
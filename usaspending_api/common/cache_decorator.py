@@ -7,9 +7,12 @@ from django.db.models import QuerySet
 from rest_framework_extensions.cache.decorators import CacheResponse
 from typing import Any
 from usaspending_api.common.experimental_api_flags import is_experimental_elasticsearch_api
+from usaspending_api.common.request_instrumentation import record_cache_lookups
 
 logger = logging.getLogger("console")
 
+CACHE_BYPASS_HEADER = "HTTP_X_CACHE_BYPASS"
+
 
 def contains_queryset(data: Any) -> bool:
     """Traverse a complex object and return True if a Queryset exists anywhere"""
@@ -26,9 +29,14 @@ def contains_queryset(data: Any) -> bool:
         return False
 
 
+def is_cache_bypass_requested(request) -> bool:
+    """True when the request asks to skip the cache with X-Cache-Bypass and settings allow that header"""
+    return settings.ALLOW_CACHE_BYPASS and request.META.get(CACHE_BYPASS_HEADER, "").lower() in ["true", "1", "yes"]
+
+
 class CustomCacheResponse(CacheResponse):
     def process_cache_response(self, view_instance, view_method, request, args, kwargs):
-        if is_experimental_elasticsearch_api(request):
+        if is_experimental_elasticsearch_api(request) or is_cache_bypass_requested(request):
             # bypass cache altogether
             response = view_method(view_instance, request, *args, **kwargs)
             response = view_instance.finalize_response(request, response, *args, **kwargs)
@@ -44,6 +52,8 @@ class CustomCacheResponse(CacheResponse):
             msg = "Problem while retrieving key [{k}] from cache for path:'{p}'"
             logger.exception(msg.format(k=key, p=str(request.path)))
 
+        record_cache_lookups(hits=int(bool(response)), misses=int(not response))
+
         if not response:
             response = view_method(view_instance, request, *args, **kwargs)
             response = view_instance.finalize_response(request, response, *args, **kwargs)
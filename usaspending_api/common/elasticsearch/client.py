@@ -9,6 +9,7 @@ from elasticsearch.connection import create_ssl_context
 from ssl import CERT_NONE
 
 from elasticsearch_dsl.response import Response
+from usaspending_api.common.request_instrumentation import RecordingTransport
 
 logger = logging.getLogger("console")
 CLIENT = None
@@ -28,7 +29,7 @@ def create_es_client() -> Elasticsearch:
     if settings.ES_HOSTNAME is None or settings.ES_HOSTNAME == "":
         logger.error("env var 'ES_HOSTNAME' needs to be set for Elasticsearch connection")
     global CLIENT
-    es_config = {"hosts": [settings.ES_HOSTNAME], "timeout": settings.ES_TIMEOUT}
+    es_config = {"hosts": [settings.ES_HOSTNAME], "timeout": settings.ES_TIMEOUT, "transport_class": RecordingTransport}
     try:
         # If the connection string is using SSL with localhost, disable verifying
         # the certificates to allow testing in a development environment
@@ -11,6 +11,7 @@ from elasticsearch import ConnectionError, Elasticsearch
 from elasticsearch import ConnectionTimeout
 from elasticsearch import NotFoundError
 from elasticsearch import TransportError
+from usaspending_api.common.request_instrumentation import RecordingTransport
 
 logger = logging.getLogger("console")
 
@@ -27,7 +28,11 @@ class _Search(Search):
     def _create_es_client() -> Elasticsearch:
         if settings.ES_HOSTNAME is None or settings.ES_HOSTNAME == "":
             logger.error("env var 'ES_HOSTNAME' needs to be set for Elasticsearch connection")
-        es_config = {"hosts": [settings.ES_HOSTNAME], "timeout": settings.ES_TIMEOUT}
+        es_config = {
+            "hosts": [settings.ES_HOSTNAME],
+            "timeout": settings.ES_TIMEOUT,
+            "transport_class": RecordingTransport,
+        }
         try:
             # If the connection string is using SSL with localhost, disable verifying
             # the certificates to allow testing in a development environment
@@ -95,3 +100,7 @@ class TransactionSearch(_Search):
 
 class AwardSearch(_Search):
     _index_name = f"{settings.ES_AWARDS_QUERY_ALIAS_PREFIX}*"
+
+
+class SubawardSearch(_Search):
+    _index_name = f"{settings.ES_SUBAWARDS_QUERY_ALIAS_PREFIX}*"
@@ -0,0 +1,350 @@
+"""
+A base for the management commands that load reference tables.  Rather than writing one row at a time, a loader
+COPYs everything it reads from its source (or, for Broker, selects it in the database) into a temporary staging table
+typed like its destination table, compares the two by natural key and row hash, and applies the resulting deletes,
+updates, and inserts in a single transaction.  The comparison is logged as a change report before anything is changed,
+and a dry run stops there.
+"""
+import io
+import json
+import logging
+
+from dataclasses import asdict, dataclass, field
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from psycopg2.sql import Composable, Identifier, SQL
+from typing import Any, Dict, Iterable, List, Sequence
+from usaspending_api.common.etl import ETLTable, primatives
+from usaspending_api.common.etl.mixins import ETLMixin
+from usaspending_api.common.helpers.sql_helpers import execute_sql_to_ordered_dictionary
+
+
+logger = logging.getLogger("console")
+
+# How many natural keys of inserted, updated, and deleted rows the change report lists
+SAMPLE_SIZE = 10
+
+
+@dataclass
+class ChangeReport:
+    """ What a load changed in its destination table or, for a dry run, would have changed. """
+
+    table: str
+    dry_run: bool
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    retained: int = 0  # Rows missing from the source that the loader keeps
+    samples: Dict[str, List[dict]] = field(default_factory=dict)
+
+    @property
+    def change_count(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+    def as_json(self) -> str:
+        return json.dumps(asdict(self), cls=DjangoJSONEncoder)
+
+
+def _copy_value(value: Any) -> str:
+    """ Renders a value in COPY's text format. """
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(table: Composable, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """ COPY rows of values for columns into table and return the number of rows copied. """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row) + "\n")
+    buffer.seek(0)
+
+    sql = SQL("copy {} ({}) from stdin").format(table, primatives.make_column_list(list(columns)))
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(sql.as_string(cursor.cursor), buffer)
+        return cursor.cursor.rowcount
+
+
+class ReferenceLoaderCommand(ETLMixin, BaseCommand):
+    """
+    Subclasses name their destination table and its natural key, list the columns they load in the order read_source
+    yields their values, and call load from handle.  Loaded columns are replaced by the source's values unless
+    merge_expressions says otherwise; columns that aren't loaded are never touched, aside from the overrides.
+    """
+
+    destination_table_name = None
+    natural_key_columns = None
+    source_columns = None
+
+    # SQL for loaded columns whose new value also depends on their current one, in terms of the staged row "s" and the
+    # destination row "d" (which is null for new rows), e.g. {"start_date": SQL("greatest(s.start_date, d.start_date)")}
+    merge_expressions = {}
+
+    # As for ETLTable, e.g. {"update_date": SQL("now()")}
+    insert_overrides = {}
+    update_overrides = {}
+
+    # If False, destination rows missing from the source are kept unless read_retired_keys names them
+    delete_missing_rows = False
+
+    etl_logger_function = logger.info
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the changes the load would make to the destination table without making them.",
+        )
+
+    def read_source(self) -> Iterable[Sequence[Any]]:
+        """ Rows of values for source_columns. """
+        raise NotImplementedError("Must be implemented in subclasses of ReferenceLoaderCommand.")
+
+    def read_retired_keys(self) -> Iterable[Sequence[Any]]:
+        """ Natural keys of rows the source says to delete even though delete_missing_rows is False. """
+        return []
+
+    def stage_source(self, staging_table: Composable) -> int:
+        """ Fill the staging table, by default with the rows read_source yields, and return the number of rows. """
+        return copy_rows(staging_table, self.source_columns, self.read_source())
+
+    def before_merge(self) -> None:
+        """ Runs in the load's transaction before the staged rows are compared with the destination table. """
+        pass
+
+    def after_merge(self, report: ChangeReport) -> None:
+        """ Runs in the load's transaction once the changes have been applied.  Not run for dry runs. """
+        pass
+
+    def load(self, dry_run: bool = False) -> ChangeReport:
+        destination = ETLTable(
+            self.destination_table_name,
+            key_overrides=self.natural_key_columns,
+            insert_overrides=self.insert_overrides,
+            update_overrides=self.update_overrides,
+        )
+
+        retired_table = self._temp_table("retired")
+        with transaction.atomic():
+            self._execute_dml_sql(self._create_staging_tables_sql(destination), "Create staging tables")
+            self._execute_function_and_log(self.stage_source, "Stage source rows", self._temp_table("source"))
+            self._execute_function_and_log(
+                copy_rows, "Stage retired keys", retired_table, self.natural_key_columns, self.read_retired_keys()
+            )
+            self.before_merge()
+            self._execute_dml_sql(self._merge_sql(destination), "Merge staged rows with current values")
+            self._validate_natural_keys()
+            self._execute_dml_sql(self._compare_sql(destination), "Compare staged rows with destination")
+
+            report = self._execute_function(self._build_report, "Build change report", dry_run)
+            logger.info(f"Change report: {report.as_json()}")
+
+            if dry_run:
+                logger.info("Dry run; rolling back")
+                transaction.set_rollback(True)
+            else:
+                if report.deleted:
+                    self._execute_dml_sql(self._delete_sql(destination), f"Delete {self.destination_table_name} rows")
+                if report.updated:
+                    self._execute_dml_sql(self._update_sql(destination), f"Update {self.destination_table_name} rows")
+                if report.inserted:
+                    self._execute_dml_sql(self._insert_sql(destination), f"Insert {self.destination_table_name} rows")
+                self.after_merge(report)
+                self._execute_dml_sql(self._drop_staging_tables_sql(), "Drop staging tables")
+
+        return report
+
+    def _temp_table(self, suffix: str) -> Composable:
+        return Identifier(f"temp_load_{self.destination_table_name}_{suffix}")
+
+    @property
+    def _compared_columns(self) -> List[str]:
+        """ The loaded columns that aren't part of the natural key and so can change. """
+        return [c for c in self.source_columns if c not in self.natural_key_columns]
+
+    def _row_hash(self) -> Composable:
+        if not self._compared_columns:
+            return SQL("''")
+        return SQL("md5(row({})::text)").format(primatives.make_column_list(self._compared_columns))
+
+    def _create_staging_tables_sql(self, destination: ETLTable) -> Composable:
+        sql = """
+            drop table if exists {source}, {retired}, {merged}, {changes};
+            create temporary table {source} ({source_columns});
+            create temporary table {retired} ({key_columns});
+        """
+        return SQL(sql).format(
+            source=self._temp_table("source"),
+            retired=self._temp_table("retired"),
+            merged=self._temp_table("merged"),
+            changes=self._temp_table("changes"),
+            source_columns=primatives.make_typed_column_list(self.source_columns, destination.data_types),
+            key_columns=primatives.make_typed_column_list(self.natural_key_columns, destination.data_types),
+        )
+
+    def _drop_staging_tables_sql(self) -> Composable:
+        return SQL("drop table if exists {}, {}, {}, {}").format(
+            *[self._temp_table(suffix) for suffix in ("source", "retired", "merged", "changes")]
+        )
+
+    def _merge_sql(self, destination: ETLTable) -> Composable:
+        """ The rows the destination table should contain for each staged natural key, without exact duplicates. """
+        sql = """
+            create temporary table {merged} as
+            select distinct {merged_columns}
+            from            {source} as s
+                            left outer join {destination} as d on {join}
+        """
+        merged_columns = [
+            SQL("{} as {}").format(self.merge_expressions[c], Identifier(c))
+            if c in self.merge_expressions
+            else SQL("{}.{}").format(Identifier("s"), Identifier(c))
+            for c in self.source_columns
+        ]
+        return SQL(sql).format(
+            merged=self._temp_table("merged"),
+            merged_columns=SQL(", ").join(merged_columns),
+            source=self._temp_table("source"),
+            destination=destination.object_representation,
+            join=primatives.make_join_conditional(destination.key_columns, "s", "d"),
+        )
+
+    def _validate_natural_keys(self) -> None:
+        sql = """
+            select  count(*) as duplicate_count
+            from    (select from {merged} group by {key_columns} having count(*) > 1) as duplicates
+        """
+        sql = SQL(sql).format(
+            merged=self._temp_table("merged"), key_columns=primatives.make_column_list(self.natural_key_columns),
+        )
+        duplicate_count = execute_sql_to_ordered_dictionary(sql, read_only=False)[0]["duplicate_count"]
+        if duplicate_count:
+            raise RuntimeError(
+                f"{duplicate_count:,} natural key(s) appear more than once in the source with different values."
+            )
+
+    def _compare_sql(self, destination: ETLTable) -> Composable:
+        """ Pairs staged rows with destination rows by natural key and decides what to do with each pair. """
+        sql = """
+            create temporary table {changes} as
+            select  {key_columns},
+                    case
+                        when d.in_destination is null then 'insert'
+                        when m.in_source is null then
+                            case when {delete_missing_rows} or r.is_retired then 'delete' else 'retain' end
+                        when m.row_hash is distinct from d.row_hash then 'update'
+                        else 'unchanged'
+                    end as action
+            from    (select {keys}, {row_hash} as row_hash, true as in_source from {merged}) as m
+                    full outer join (
+                        select {keys}, {row_hash} as row_hash, true as in_destination from {destination}
+                    ) as d on {join}
+                    left outer join (
+                        select distinct {keys}, true as is_retired from {retired}
+                    ) as r on {retired_join}
+        """
+        key_columns = [
+            SQL("coalesce(m.{column}, d.{column}) as {column}").format(column=Identifier(c))
+            for c in self.natural_key_columns
+        ]
+        return SQL(sql).format(
+            changes=self._temp_table("changes"),
+            key_columns=SQL(", ").join(key_columns),
+            delete_missing_rows=SQL("true" if self.delete_missing_rows else "false"),
+            keys=primatives.make_column_list(self.natural_key_columns),
+            row_hash=self._row_hash(),
+            merged=self._temp_table("merged"),
+            destination=destination.object_representation,
+            join=primatives.make_join_conditional(destination.key_columns, "m", "d"),
+            retired=self._temp_table("retired"),
+            retired_join=primatives.make_join_conditional(destination.key_columns, "r", "d"),
+        )
+
+    def _build_report(self, dry_run: bool) -> ChangeReport:
+        report = ChangeReport(table=self.destination_table_name, dry_run=dry_run)
+
+        sql = SQL("select action, count(*) as row_count from {} group by action").format(self._temp_table("changes"))
+        counts = {r["action"]: r["row_count"] for r in execute_sql_to_ordered_dictionary(sql, read_only=False)}
+        report.inserted = counts.get("insert", 0)
+        report.updated = counts.get("update", 0)
+        report.deleted = counts.get("delete", 0)
+        report.unchanged = counts.get("unchanged", 0)
+        report.retained = counts.get("retain", 0)
+
+        sql = """
+            select  {keys}, action
+            from    (
+                        select  *, row_number() over (partition by action order by {keys}) as action_row_number
+                        from    {changes}
+                        where   action in ('insert', 'update', 'delete')
+                    ) as t
+            where   action_row_number <= {sample_size}
+            order   by action, {keys}
+        """
+        sql = SQL(sql).format(
+            keys=primatives.make_column_list(self.natural_key_columns),
+            changes=self._temp_table("changes"),
+            sample_size=SQL(str(SAMPLE_SIZE)),
+        )
+        for row in execute_sql_to_ordered_dictionary(sql, read_only=False):
+            action = row.pop("action")
+            report.samples.setdefault(action, []).append(dict(row))
+
+        return report
+
+    def _delete_sql(self, destination: ETLTable) -> Composable:
+        sql = """
+            delete from {destination} as d
+            using       {changes} as c
+            where       c.action = 'delete' and {join}
+        """
+        return SQL(sql).format(
+            destination=destination.object_representation,
+            changes=self._temp_table("changes"),
+            join=primatives.make_join_conditional(destination.key_columns, "c", "d"),
+        )
+
+    def _update_sql(self, destination: ETLTable) -> Composable:
+        sql = """
+            update  {destination} as d
+            set     {set}
+            from    {merged} as m
+                    inner join {changes} as c on {changes_join}
+            where   c.action = 'update' and {join}
+        """
+        settable_columns = self._compared_columns + [
+            c for c in destination.update_overrides if c not in self._compared_columns
+        ]
+        return SQL(sql).format(
+            destination=destination.object_representation,
+            set=primatives.make_column_setter_list(settable_columns, "m", destination.update_overrides),
+            merged=self._temp_table("merged"),
+            changes=self._temp_table("changes"),
+            changes_join=primatives.make_join_conditional(destination.key_columns, "m", "c"),
+            join=primatives.make_join_conditional(destination.key_columns, "m", "d"),
+        )
+
+    def _insert_sql(self, destination: ETLTable) -> Composable:
+        sql = """
+            insert into {destination} ({insert_columns})
+            select      {select_columns}
+            from        {merged} as m
+                        inner join {changes} as c on {changes_join}
+            where       c.action = 'insert'
+        """
+        insertable_columns = self.source_columns + [
+            c for c in destination.insert_overrides if c not in self.source_columns
+        ]
+        return SQL(sql).format(
+            destination=destination.object_representation,
+            insert_columns=primatives.make_column_list(insertable_columns),
+            select_columns=primatives.make_column_list(insertable_columns, "m", destination.insert_overrides),
+            merged=self._temp_table("merged"),
+            changes=self._temp_table("changes"),
+            changes_join=primatives.make_join_conditional(destination.key_columns, "m", "c"),
+        )
+
+
+__all__ = ["ChangeReport", "copy_rows", "ReferenceLoaderCommand"]
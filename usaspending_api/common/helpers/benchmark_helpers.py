@@ -0,0 +1,138 @@
+"""
+Helpers for the benchmark_api command: reading a corpus of recorded requests, reading the SQL and Elasticsearch
+work a live server reports for each one, and summarizing latencies per endpoint for comparison with a stored baseline.
+In process, requests are measured with the RequestRecorder of common/request_instrumentation.py.
+"""
+import json
+import math
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+from usaspending_api.common.request_instrumentation import RequestRecorder
+
+# Summary metrics compared with a baseline; all of them get worse as they grow
+BASELINE_METRICS = ["p50_ms", "p95_ms", "p99_ms", "sql_queries", "sql_ms", "es_requests", "es_ms"]
+
+# Timings within this many milliseconds of their baseline are noise, however large a fraction of it they are
+TIMING_SLACK_MS = 1.0
+
+
+class CorpusRequest(NamedTuple):
+    name: str
+    method: str
+    url: str
+    request_object: Optional[dict]
+
+
+class Sample(NamedTuple):
+    name: str
+    status_code: int
+    milliseconds: float
+    metrics: Optional[RequestRecorder]
+
+
+def load_corpus(path: Path) -> List[CorpusRequest]:
+    """
+    Reads recorded requests from a JSON Lines file (one request per line) or a JSON list of requests in the format of
+    endpoint_testing_data.json.  Every request needs a url; method defaults to POST when there is a request_object
+    and GET otherwise, and name (which groups requests in the results) defaults to the method and path of the url.
+    """
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        entries = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    else:
+        entries = json.loads(path.read_text())
+
+    corpus = []
+    for entry in entries:
+        if not entry.get("url"):
+            raise ValueError(f"Request in {path} has no url: {entry}")
+        request_object = entry.get("request_object")
+        method = entry.get("method", "GET" if request_object is None else "POST").upper()
+        name = entry.get("name") or f"{method} {urlsplit(entry['url']).path}"
+        corpus.append(CorpusRequest(name, method, entry["url"], request_object))
+    return corpus
+
+
+def parse_server_timing(header: Optional[str]) -> Optional[RequestRecorder]:
+    """
+    Reads the SQL and Elasticsearch metrics a live server reports in its Server-Timing header, where each is given as
+    `sql;dur=<milliseconds>;desc="<count>"` or `es;dur=<milliseconds>;desc="<count>"`.  None without either.
+    """
+    if not header:
+        return None
+
+    metrics = RequestRecorder()
+    found = False
+    for entry in header.split(","):
+        name, *parameters = [part.strip() for part in entry.split(";")]
+        if name not in ("sql", "es"):
+            continue
+        values = dict(parameter.split("=", 1) for parameter in parameters if "=" in parameter)
+        description = values.get("desc", "").strip('"').split()
+        count = int(description[0]) if description else 0
+        seconds = float(values.get("dur", 0)) / 1000
+        if name == "sql":
+            metrics.sql_count, metrics.sql_seconds = count, seconds
+        else:
+            metrics.es_count, metrics.es_seconds = count, seconds
+        found = True
+    return metrics if found else None
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile: the smallest value with at least percent of the values at or below it"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * percent / 100) - 1)]
+
+
+def summarize(samples: List[Sample]) -> Dict[str, dict]:
+    """Latency percentiles and mean SQL and Elasticsearch work per request, by endpoint name"""
+    by_name = {}
+    for sample in samples:
+        by_name.setdefault(sample.name, []).append(sample)
+
+    summary = {}
+    for name in sorted(by_name):
+        endpoint_samples = by_name[name]
+        timings = [sample.milliseconds for sample in endpoint_samples]
+        measured = [sample.metrics for sample in endpoint_samples if sample.metrics is not None]
+        summary[name] = {
+            "requests": len(endpoint_samples),
+            "errors": sum(1 for sample in endpoint_samples if sample.status_code >= 400),
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "sql_queries": _mean([metrics.sql_count for metrics in measured]),
+            "sql_ms": _mean([metrics.sql_seconds * 1000 for metrics in measured]),
+            "es_requests": _mean([metrics.es_count for metrics in measured]),
+            "es_ms": _mean([metrics.es_seconds * 1000 for metrics in measured]),
+        }
+    return summary
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def compare_to_baseline(summary: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Describes every way summary is worse than baseline: an endpoint with more errors, or with any of BASELINE_METRICS
+    more than tolerance (a fraction, so 0.2 is 20%) above its baseline value (and timings more than TIMING_SLACK_MS
+    above it).  Endpoints or metrics missing from either side are not compared.
+    """
+    regressions = []
+    for name, current in summary.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if current["errors"] > expected.get("errors", 0):
+            regressions.append(f"{name}: {current['errors']} errors, baseline {expected.get('errors', 0)}")
+        for metric in BASELINE_METRICS:
+            if current.get(metric) is None or expected.get(metric) is None:
+                continue
+            slack = TIMING_SLACK_MS if metric.endswith("_ms") else 0
+            if current[metric] > expected[metric] * (1 + tolerance) + slack:
+                regressions.append(f"{name}: {metric} {current[metric]}, baseline {expected[metric]}")
+    return regressions
@@ -3,8 +3,13 @@ import logging
 from datetime import datetime
 from django.conf import settings
 from django.db import connection
+from django.db.models import Sum
+from usaspending_api.awards.idv_closure import refresh_idv_funding_rollups
+from usaspending_api.awards.models import UnlinkedFileCCount
+from usaspending_api.broker.helpers.last_load_date import get_last_load_date, update_last_load_date
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.sql_helpers import read_sql_file
+from usaspending_api.disaster.file_c_spending import refresh_disaster_file_c_spending_for_awards
 
 
 logger = logging.getLogger("console")
@@ -12,6 +17,29 @@ logger = logging.getLogger("console")
 
 _ETL_SQL_FILE_PATH = settings.APP_DIR / "etl" / "management" / "sql" / "c_file_linkage"
 
+# A delta run also links against awards changed up to this long before the previous run started, in case they were
+# written by a transaction that was still open then
+DELTA_LOOKBACK_MINUTES = 15
+
+_LINKAGE_TYPES = {
+    "contract": {
+        "file_names": ["update_file_c_linkages_piid.sql"],
+        "unlinked_count_file_name": "check_contract_file_c_linkages.sql",
+        "unlinked_filter": "piid is not null",
+        "award_keys": ["piid"],
+    },
+    "assistance": {
+        "file_names": [
+            "update_file_c_linkages_fain.sql",
+            "update_file_c_linkages_uri.sql",
+            "update_file_c_linkages_fain_and_uri.sql",
+        ],
+        "unlinked_count_file_name": "check_assistance_file_c_linkages.sql",
+        "unlinked_filter": "(fain is not null or uri is not null)",
+        "award_keys": ["fain", "uri"],
+    },
+}
+
 
 def get_unlinked_count(file_name):
 
@@ -31,42 +59,223 @@ def get_unlinked_count(file_name):
     return int(result)
 
 
-def update_c_to_d_linkages(type, count=True, submission_id=None):
-    logger.info("Starting File C to D linkage updates for %s records" % type)
+def _get_linkage_type(type):
+    if type.lower() not in _LINKAGE_TYPES:
+        raise InvalidParameterException("Invalid type provided to process C to D linkages.")
+    return _LINKAGE_TYPES[type.lower()]
 
-    if type.lower() == "contract":
-        file_names = ["update_file_c_linkages_piid.sql"]
-        unlinked_count_file_name = "check_contract_file_c_linkages.sql"
-    elif type.lower() == "assistance":
-        file_names = [
-            "update_file_c_linkages_fain.sql",
-            "update_file_c_linkages_uri.sql",
-            "update_file_c_linkages_fain_and_uri.sql",
-        ]
-        unlinked_count_file_name = "check_assistance_file_c_linkages.sql"
+
+def get_counted_unlinked_count(type):
+    """Total of the UnlinkedFileCCount counters for a linkage type, or None if it has never been counted"""
+    counters = UnlinkedFileCCount.objects.filter(linkage_type=type.lower())
+    if not counters.exists():
+        return None
+    return counters.aggregate(total=Sum("unlinked_count"))["total"]
+
+
+def refresh_unlinked_counts(type, submission_clause=""):
+    """
+    Recounts the unlinked File C records of a linkage type for the submissions matching submission_clause (a SQL
+    condition on submission_id, such as "submission_id = 5"), or for every submission when it is empty, and drops the
+    counters of submissions that no longer exist.
+    """
+    linkage = _get_linkage_type(type)
+    submission_filter = f"and {submission_clause}" if submission_clause else ""
+    with connection.cursor() as cursor:
+        cursor.execute(f"delete from unlinked_file_c_count where linkage_type = %s {submission_filter}", [type.lower()])
+        cursor.execute(
+            f"""
+            insert into unlinked_file_c_count (submission_id, linkage_type, unlinked_count)
+            select submission_id, %s, count(*)
+            from financial_accounts_by_awards
+            where award_id is null and {linkage['unlinked_filter']} {submission_filter}
+            group by submission_id
+            """,
+            [type.lower()],
+        )
+        cursor.execute(
+            """
+            delete from unlinked_file_c_count
+            where linkage_type = %s and submission_id not in (select submission_id from submission_attributes)
+            """,
+            [type.lower()],
+        )
+
+
+def check_unlinked_counts(type):
+    """
+    Full-scan consistency check: compares the UnlinkedFileCCount counters of a linkage type with a count of every
+    unlinked File C record, rebuilding the counters if they disagree.  Returns the scanned count.
+    """
+    linkage = _get_linkage_type(type)
+    counted = get_counted_unlinked_count(type)
+    scanned = get_unlinked_count(file_name=linkage["unlinked_count_file_name"])
+    if counted == scanned:
+        logger.info("Counters of unlinked %s records match a full count: %s" % (type, scanned))
     else:
-        raise InvalidParameterException("Invalid type provided to process C to D linkages.")
+        logger.warning("Counters show %s unlinked %s records but a full count found %s" % (counted, type, scanned))
+        refresh_unlinked_counts(type)
+    return scanned
 
-    file_paths = [str(_ETL_SQL_FILE_PATH / file_name) for file_name in file_names]
 
-    if count:
-        starting_unlinked_count = get_unlinked_count(file_name=unlinked_count_file_name)
-        logger.info("Current count of unlinked %s records: %s" % (type, str(starting_unlinked_count)))
+def _get_unlinked_count_from_counters(type):
+    unlinked_count = get_counted_unlinked_count(type)
+    if unlinked_count is None:
+        refresh_unlinked_counts(type)
+        unlinked_count = get_counted_unlinked_count(type) or 0
+    return unlinked_count
+
 
+def refresh_file_c_link_dependents(award_ids):
+    """
+    Refreshes what is built from File C's links to awards after File C records are linked to or unlinked from these
+    awards: the funding rollups of the IDVs above them and the disaster File C spending of their submissions.
+    """
+    award_ids = list(award_ids)
+    if award_ids:
+        refresh_idv_funding_rollups(award_ids)
+        refresh_disaster_file_c_spending_for_awards(award_ids)
+
+
+def _run_linkage_sql(type, submission_id_clause, refresh_dependents=True):
     total_start = datetime.now()
-    for file_name in file_paths:
-        start = datetime.now()
-        logger.info("Running %s" % file_name)
-        sql_commands = read_sql_file(file_path=file_name)
-        for command in sql_commands:
-            submission_id_clause = f"and faba_sub.submission_id = {submission_id}" if submission_id else ""
-            command = command.format(submission_id_clause=submission_id_clause)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            drop table if exists temp_c_to_d_linked_records;
+            create temporary table temp_c_to_d_linked_records (submission_id integer, award_id bigint)
+            """
+        )
+    try:
+        for file_name in _get_linkage_type(type)["file_names"]:
+            file_path = str(_ETL_SQL_FILE_PATH / file_name)
+            start = datetime.now()
+            logger.info("Running %s" % file_path)
+            sql_commands = read_sql_file(file_path=file_path)
+            for command in sql_commands:
+                command = command.format(submission_id_clause=submission_id_clause)
+                with connection.cursor() as cursor:
+                    cursor.execute(command)
+            logger.info("Finished %s in %s seconds" % (file_path, str(datetime.now() - start)))
+        logger.info("Finished all queries in %s seconds" % str(datetime.now() - total_start))
+
+        if refresh_dependents:
             with connection.cursor() as cursor:
-                cursor.execute(command)
-        logger.info("Finished %s in %s seconds" % (file_name, str(datetime.now() - start)))
+                cursor.execute("select distinct award_id from temp_c_to_d_linked_records where award_id is not null")
+                linked_award_ids = [row[0] for row in cursor.fetchall()]
+            logger.info("Linked File C records to %s awards" % len(linked_award_ids))
+            refresh_file_c_link_dependents(linked_award_ids)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("drop table if exists temp_c_to_d_linked_records")
+
+
+def update_c_to_d_linkages(type, count=True, submission_id=None, refresh_dependents=True):
+    """
+    Links unlinked File C records of a linkage type, only those of one submission if submission_id is given.  Unless
+    refresh_dependents is False (for callers that refresh them for the whole submission anyway), what is built from
+    File C's links to awards is then refreshed for the awards records were linked to.
+    """
+    logger.info("Starting File C to D linkage updates for %s records" % type)
+    _get_linkage_type(type)
 
     if count:
-        ending_unlinked_count = get_unlinked_count(file_name=unlinked_count_file_name)
+        starting_unlinked_count = _get_unlinked_count_from_counters(type)
+        logger.info("Current count of unlinked %s records: %s" % (type, str(starting_unlinked_count)))
+
+    submission_id_clause = f"and faba_sub.submission_id = {submission_id}" if submission_id else ""
+    _run_linkage_sql(type, submission_id_clause, refresh_dependents)
+    refresh_unlinked_counts(type, f"submission_id = {submission_id}" if submission_id else "")
+
+    if count:
+        ending_unlinked_count = _get_unlinked_count_from_counters(type)
         logger.info("Count of unlinked %s records after updates: %s" % (type, str(ending_unlinked_count)))
 
-    logger.info("Finished all queries in %s seconds" % str(datetime.now() - total_start))
+
+def update_c_to_d_linkages_delta(type, count=True):
+    """
+    Links the File C records of submissions changed since the previous delta run against all awards, and every other
+    unlinked File C record against only the awards created or changed since then, which covers every record whose
+    link can have changed except one left ambiguous by an award that has since been deleted.  The previous run's start
+    is kept in external_data_load_date; without one, every File C record is linked.
+    """
+    linkage = _get_linkage_type(type)
+    last_load_date_key = f"file_c_{type.lower()}_linkage"
+    with connection.cursor() as cursor:
+        cursor.execute("select now()")
+        run_start = cursor.fetchone()[0]
+
+    changed_since = get_last_load_date(last_load_date_key, lookback_minutes=DELTA_LOOKBACK_MINUTES)
+    if changed_since is None:
+        logger.info("No previous File C to D linkage delta for %s records, linking them all" % type)
+        update_c_to_d_linkages(type, count)
+        update_last_load_date(last_load_date_key, run_start)
+        return
+
+    logger.info("Starting File C to D linkage updates for %s records changed since %s" % (type, changed_since))
+    if count:
+        starting_unlinked_count = _get_unlinked_count_from_counters(type)
+        logger.info("Current count of unlinked %s records: %s" % (type, str(starting_unlinked_count)))
+
+    key_selects = " union ".join(
+        f"select upper({key}) from awards where update_date >= %s and {key} is not null"
+        for key in linkage["award_keys"]
+    )
+    changed_key_filter = " or ".join(
+        f"upper(faba_sub.{key}) in (select award_key from temp_c_to_d_changed_award_keys)"
+        for key in linkage["award_keys"]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            drop table if exists temp_c_to_d_changed_submissions;
+            create temporary table temp_c_to_d_changed_submissions as
+            select submission_id from submission_attributes where update_date >= %s
+            """,
+            [changed_since],
+        )
+        cursor.execute(
+            f"""
+            drop table if exists temp_c_to_d_changed_award_keys;
+            create temporary table temp_c_to_d_changed_award_keys (award_key text primary key);
+            insert into temp_c_to_d_changed_award_keys {key_selects};
+            analyze temp_c_to_d_changed_award_keys
+            """,
+            [changed_since] * len(linkage["award_keys"]),
+        )
+        # The submissions whose counters linking can change, found before it hides which rows were unlinked
+        cursor.execute(
+            f"""
+            drop table if exists temp_c_to_d_recount_submissions;
+            create temporary table temp_c_to_d_recount_submissions as
+            select submission_id from temp_c_to_d_changed_submissions
+            union
+            select faba_sub.submission_id from financial_accounts_by_awards as faba_sub
+            where faba_sub.award_id is null and ({changed_key_filter})
+            """
+        )
+        cursor.execute(
+            "select (select count(*) from temp_c_to_d_changed_submissions), "
+            "(select count(*) from temp_c_to_d_changed_award_keys)"
+        )
+        changed_submissions, changed_award_keys = cursor.fetchone()
+    logger.info(f"Linking {changed_submissions:,} changed submissions and {changed_award_keys:,} changed award keys")
+
+    submission_id_clause = (
+        "and (faba_sub.submission_id in (select submission_id from temp_c_to_d_changed_submissions) "
+        f"or {changed_key_filter})"
+    )
+    try:
+        _run_linkage_sql(type, submission_id_clause)
+        refresh_unlinked_counts(type, "submission_id in (select submission_id from temp_c_to_d_recount_submissions)")
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "drop table if exists temp_c_to_d_changed_submissions, temp_c_to_d_changed_award_keys, "
+                "temp_c_to_d_recount_submissions"
+            )
+
+    if count:
+        ending_unlinked_count = _get_unlinked_count_from_counters(type)
+        logger.info("Count of unlinked %s records after updates: %s" % (type, str(ending_unlinked_count)))
+    update_last_load_date(last_load_date_key, run_start)
@@ -3,7 +3,7 @@ import logging
 from datetime import datetime, MAXYEAR, MINYEAR, timedelta
 from dateutil.relativedelta import relativedelta
 from fiscalyear import FiscalDate, FiscalDateTime
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from usaspending_api.common.helpers.generic_helper import validate_date, min_and_max_from_date_ranges
 
 
@@ -170,6 +170,36 @@ def bolster_missing_time_periods(filter_time_periods, queryset, date_range_type,
     return results
 
 
+def fill_missing_fiscal_periods(rows: List[dict], group: str, empty_row: dict) -> List[dict]:
+    """
+    Orders rows by fiscal year and, unless group is "fiscal_year", by the fiscal quarter or month found under the
+    group's name, adding a copy of empty_row for every fiscal year, quarter or month between the first and last row
+    that has none.  Rows' fiscal years and periods are integers.  There is no fiscal period 1, so no empty row is
+    added for month 1.
+    """
+    periods_per_year = {"fiscal_year": 1, "quarter": 4, "month": 12}[group]
+
+    def ordinal(row):
+        return row["fiscal_year"] * periods_per_year + (row[group] - 1 if periods_per_year > 1 else 0)
+
+    rows_by_ordinal = {ordinal(row): row for row in rows}
+    if not rows_by_ordinal:
+        return []
+
+    results = []
+    for period_ordinal in range(min(rows_by_ordinal), max(rows_by_ordinal) + 1):
+        row = rows_by_ordinal.get(period_ordinal)
+        if row is None:
+            fiscal_year, period = divmod(period_ordinal, periods_per_year)
+            if group == "month" and period == 0:
+                continue
+            row = {**empty_row, "fiscal_year": fiscal_year}
+            if periods_per_year > 1:
+                row[group] = period + 1
+        results.append(row)
+    return results
+
+
 def calculate_last_completed_fiscal_quarter(fiscal_year, as_of_date=current_fiscal_date()):
     """
     ENABLE_CARES_ACT_FEATURES TECH DEBT:  Make this work with new standardized, yet-to-be-named
@@ -0,0 +1,44 @@
+"""
+A HyperLogLog sketch with 1024 registers (about 3% standard error) whose registers can be built either here or in
+Postgres, see restock_state_award_rollup.sql. The first 32 bits of the MD5 of a value pick the register with their
+low 10 bits, and the register keeps the highest rank (1-based position of the leading 1-bit) of the other 22 bits.
+"""
+import math
+
+from hashlib import md5
+from typing import Iterable, List
+
+PRECISION = 10
+REGISTER_COUNT = 1 << PRECISION
+RANK_BITS = 32 - PRECISION
+
+
+def build_sketch(values: Iterable) -> List[int]:
+    sketch = [0] * REGISTER_COUNT
+    for value in values:
+        value_hash = int(md5(str(value).encode()).hexdigest()[:8], 16)
+        register = value_hash & (REGISTER_COUNT - 1)
+        rank = RANK_BITS + 1 - (value_hash >> PRECISION).bit_length()
+        sketch[register] = max(sketch[register], rank)
+    return sketch
+
+
+def merge_sketches(*sketches: List[int]) -> List[int]:
+    """The union of the values in each sketch is the element-wise maximum of the registers"""
+    return [max(registers) for registers in zip(*sketches)]
+
+
+def estimate_cardinality(sketch: List[int]) -> int:
+    if not any(sketch):
+        return 0
+
+    alpha = 0.7213 / (1 + 1.079 / REGISTER_COUNT)
+    estimate = alpha * REGISTER_COUNT ** 2 / sum(2.0 ** -register for register in sketch)
+
+    empty_registers = sketch.count(0)
+    if estimate <= 2.5 * REGISTER_COUNT and empty_registers:
+        # Linear counting is more accurate while many registers are still empty
+        estimate = REGISTER_COUNT * math.log(REGISTER_COUNT / empty_registers)
+    elif estimate > 2 ** 32 / 30:
+        estimate = -(2 ** 32) * math.log(1 - estimate / 2 ** 32)
+    return round(estimate)
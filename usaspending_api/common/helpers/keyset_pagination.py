@@ -0,0 +1,213 @@
+"""
+Keyset ("cursor") pagination for the endpoints that list the children of an award.  Paging with an offset makes the
+database produce and throw away every row before the page, which makes the later pages of large awards and IDVs slow.
+A cursor instead records the sort values of the last row a client received, along with tiebreaker columns that make
+the order total, so the next page is just the rows that sort after it and an index on the filter, sort and tiebreaker
+columns can seek straight to them.
+
+Clients opt in by sending "cursor": null for the first page and the "next_cursor" from each response's page_metadata
+after that.  Requests without a cursor page exactly as before, except that ties are now broken the same way.
+"""
+import base64
+import binascii
+import json
+
+from collections import namedtuple
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from psycopg2.sql import Composable, Identifier, Literal, SQL
+from typing import List, Optional, Sequence, Union
+
+from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.common.helpers.generic_helper import get_simple_pagination_metadata
+from usaspending_api.common.helpers.sql_helpers import build_composable_order_by
+
+
+SortKey = namedtuple("SortKey", ["column", "order", "nulls"])
+
+
+ORDERED_SQL = SQL(
+    """
+    select  *
+    from    ({sql}) as page_rows
+    {where}
+    {order_by}
+"""
+)
+
+
+PAGE_SQL = SQL(
+    """
+    select  *
+    from    ({sql}) as page_rows
+    {where}
+    {order_by}
+    limit {limit} offset {offset}
+"""
+)
+
+
+class KeysetPagination:
+    """
+    The order a view pages through: its sort column(s) followed by the tiebreaker columns that identify a row, all in
+    the requested direction.  Views whose ORM queries sort nulls as though they were lower than any value pass
+    nulls_low=True; otherwise nulls sort as PostgreSQL does by default (higher than any value).  Columns must be keys
+    of the rows being paged through: Django lookups for querysets, output column names for SQL.
+    """
+
+    def __init__(
+        self, sort_columns: Union[str, Sequence[str]], tiebreakers: Sequence[str], order: str, nulls_low: bool = False
+    ):
+        if type(sort_columns) is str:
+            sort_columns = [sort_columns]
+        columns = list(sort_columns) + [column for column in tiebreakers if column not in sort_columns]
+        nulls = "first" if nulls_low == (order == "asc") else "last"
+        self.order = order
+        self.keys = [SortKey(column, order, nulls) for column in columns]
+
+    def encode_cursor(self, row: dict) -> str:
+        payload = [[key.column for key in self.keys], self.order, [row[key.column] for key in self.keys]]
+        return base64.urlsafe_b64encode(json.dumps(payload, cls=DjangoJSONEncoder).encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> list:
+        """The row values a cursor carries, provided it was issued for this same sort and order"""
+        try:
+            columns, order, values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values = list(values)
+        except (binascii.Error, TypeError, UnicodeDecodeError, ValueError):
+            raise InvalidParameterException("Invalid cursor")
+        if columns != [key.column for key in self.keys] or order != self.order or len(values) != len(self.keys):
+            raise InvalidParameterException("Cursor does not match the requested sort and order")
+        return values
+
+    def _conditions_after(self, values: list) -> List[list]:
+        """
+        The rows after a cursor are those that first differ from it on some key and sort after it on that key.  Each
+        entry is one such case as a list of (column, operator, value) conditions that must all hold.
+        """
+        cases = []
+        ties = []
+        for key, value in zip(self.keys, values):
+            if value is None:
+                if key.nulls == "first":
+                    cases.append(ties + [(key.column, "is not null", None)])
+                ties = ties + [(key.column, "is null", None)]
+            else:
+                cases.append(ties + [(key.column, ">" if key.order == "asc" else "<", value)])
+                if key.nulls == "last":
+                    cases.append(ties + [(key.column, "is null", None)])
+                ties = ties + [(key.column, "=", value)]
+        return cases
+
+    def sql_predicate(self, values: list) -> Composable:
+        cases = []
+        for conditions in self._conditions_after(values):
+            sql_conditions = []
+            for column, operator, value in conditions:
+                sql_column = SQL(".").join([Identifier(c) for c in column.split(".")])
+                if value is None:
+                    sql_conditions.append(sql_column + SQL(f" {operator}"))
+                else:
+                    sql_conditions.append(sql_column + SQL(f" {operator} ") + Literal(value))
+            cases.append(SQL("(") + SQL(" and ").join(sql_conditions) + SQL(")"))
+        return SQL(" or ").join(cases) if cases else SQL("false")
+
+    def q_predicate(self, values: list) -> Q:
+        lookups = {"=": "exact", ">": "gt", "<": "lt"}
+        predicate = Q(pk__in=[])
+        for conditions in self._conditions_after(values):
+            case = Q()
+            for column, operator, value in conditions:
+                if value is None:
+                    case &= Q(**{f"{column}__isnull": operator == "is null"})
+                else:
+                    case &= Q(**{f"{column}__{lookups[operator]}": value})
+            predicate |= case
+        return predicate
+
+    def sql_order_by(self) -> Composable:
+        return build_composable_order_by(
+            [key.column for key in self.keys], [key.order for key in self.keys], [key.nulls for key in self.keys]
+        )
+
+    def orm_order_by(self) -> list:
+        order_by = []
+        for key in self.keys:
+            nulls = {"nulls_first": True} if key.nulls == "first" else {"nulls_last": True}
+            order_by.append(F(key.column).asc(**nulls) if key.order == "asc" else F(key.column).desc(**nulls))
+        return order_by
+
+    def order_sql(self, sql: Composable) -> Composable:
+        """Wraps a query so it returns every row in order, for views that paginate them in Python"""
+        return ORDERED_SQL.format(sql=sql, where=SQL(""), order_by=self.sql_order_by())
+
+    def paginate_sql(self, sql: Composable, request_data: dict) -> Composable:
+        """
+        Wraps a query so it returns the requested page plus one more row, which is only there to tell whether another
+        page follows.  Its output columns must include every key.
+        """
+        if "cursor" in request_data:
+            cursor = request_data["cursor"]
+            where = SQL("where ") + self.sql_predicate(self.decode_cursor(cursor)) if cursor is not None else SQL("")
+            offset = 0
+        else:
+            where = SQL("")
+            offset = (request_data["page"] - 1) * request_data["limit"]
+        return PAGE_SQL.format(
+            sql=sql,
+            where=where,
+            order_by=self.sql_order_by(),
+            limit=Literal(request_data["limit"] + 1),
+            offset=Literal(offset),
+        )
+
+    def paginate_queryset(self, queryset, request_data: dict) -> list:
+        """As paginate_sql, for a queryset of dictionaries (.values()) that include every key"""
+        queryset = queryset.order_by(*self.orm_order_by())
+        if "cursor" in request_data:
+            if request_data["cursor"] is not None:
+                queryset = queryset.filter(self.q_predicate(self.decode_cursor(request_data["cursor"])))
+            return list(queryset[: request_data["limit"] + 1])
+        lower_limit = (request_data["page"] - 1) * request_data["limit"]
+        upper_limit = request_data["page"] * request_data["limit"]
+        return list(queryset[lower_limit : upper_limit + 1])
+
+    def page_metadata(self, rows: list, request_data: dict, page_metadata: Optional[dict] = None) -> dict:
+        """
+        The page_metadata for rows fetched by paginate_sql or paginate_queryset.  Offset requests get page_metadata if
+        it is supplied, or the usual simple page_metadata.
+        """
+        limit = request_data["limit"]
+        has_next = len(rows) > limit
+        if "cursor" not in request_data:
+            return page_metadata or get_simple_pagination_metadata(len(rows), limit, request_data["page"])
+        return {
+            "cursor": request_data["cursor"],
+            "next_cursor": self.encode_cursor(rows[limit - 1]) if has_next else None,
+            "hasNext": has_next,
+            "hasPrevious": request_data["cursor"] is not None,
+        }
+
+
+def keyset_index_definitions(
+    name_prefix: str,
+    filter_column: str,
+    indexed_sort_columns: Sequence[str],
+    tiebreakers: Sequence[str],
+    nulls_low: bool = False,
+) -> List[dict]:
+    """
+    The indexes that let a view seek straight to a cursor, in the matview generator's JSON index format: one per sort
+    column in the allow-list, holding the column the view filters by, then its keys ordered as for a descending sort
+    (ascending sorts scan the index backwards).  Only list the sorts that page deep in practice: the others still page
+    by cursor, sorting the filtered rows instead, and each index slows down writes to the table.
+    """
+    indexes = []
+    for sort_column in indexed_sort_columns:
+        if "__" in sort_column or "." in sort_column:
+            raise ValueError(f"Sort column '{sort_column}' is on a related table and can't share an index")
+        keys = KeysetPagination(sort_column, tiebreakers, "desc", nulls_low).keys
+        columns = [{"name": filter_column}]
+        columns.extend({"name": key.column, "order": f"DESC NULLS {key.nulls.upper()}"} for key in keys)
+        indexes.append({"name": f"{name_prefix}_{sort_column}", "columns": columns})
+    return indexes
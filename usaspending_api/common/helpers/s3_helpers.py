@@ -2,19 +2,51 @@ import boto3
 import io
 import logging
 import math
+import queue
+import threading
+import time
 
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Union
 
 
 logger = logging.getLogger("script")
 
+# S3 rejects multipart parts smaller than 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+SHARED_TRANSFER_CONFIG = TransferConfig(multipart_chunksize=16 * 1024 * 1024, max_concurrency=8)
+PART_UPLOAD_ATTEMPTS = 3
+# Enough connections for several concurrent transfers sharing one client
+S3_MAX_POOL_CONNECTIONS = 4 * SHARED_TRANSFER_CONFIG.max_concurrency
 
-def retrieve_s3_bucket_object_list(bucket_name: str) -> List["boto3.resources.factory.s3.ObjectSummary"]:
+
+@lru_cache(maxsize=None)
+def get_s3_client(
+    region_name: str = settings.USASPENDING_AWS_REGION, endpoint_url: Optional[str] = settings.AWS_S3_ENDPOINT_URL
+):
+    """
+    One client per (region, endpoint) for the life of the process. Clients are thread safe and expensive to create,
+    so threads share them; each one is built from its own Session since the default Session is not thread safe.
+    """
+    return boto3.session.Session().client(
+        "s3",
+        region_name=region_name,
+        endpoint_url=endpoint_url,
+        config=Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS),
+    )
+
+
+def retrieve_s3_bucket_object_list(bucket_name: str, prefix: str = "", start_after: str = "") -> Iterator[dict]:
+    """Like list_s3_bucket_objects, with an error message pointing at the usual misconfigurations"""
     try:
-        bucket = get_s3_bucket(bucket_name=bucket_name)
-        bucket_objects = list(bucket.objects.all())
+        yield from list_s3_bucket_objects(bucket_name, prefix, start_after)
     except Exception as e:
         message = (
             f"Problem accessing S3 bucket '{bucket_name}' for deleted records.  Most likely the "
@@ -22,36 +54,290 @@ def retrieve_s3_bucket_object_list(bucket_name: str) -> List["boto3.resources.fa
         )
         logger.exception(message)
         raise RuntimeError(message) from e
-    return bucket_objects
+
+
+def list_s3_bucket_objects(
+    bucket_name: str, prefix: str = "", start_after: str = "", region_name: str = settings.USASPENDING_AWS_REGION
+) -> Iterator[dict]:
+    """
+    Yield the listing entries (Key, LastModified, ETag, Size) under a prefix and after the `start_after` key, page by
+    page as they are listed
+    """
+    paginator = get_s3_client(region_name).get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix, StartAfter=start_after):
+        yield from page.get("Contents", [])
+
+
+def list_s3_bucket_objects_by_prefix(
+    bucket_name: str,
+    prefixes: List[str],
+    start_after: str = "",
+    region_name: str = settings.USASPENDING_AWS_REGION,
+    max_workers: int = SHARED_TRANSFER_CONFIG.max_concurrency,
+) -> Iterator[dict]:
+    """
+    List several prefixes concurrently. A single listing is a chain of continuation tokens, so the pages of one prefix
+    are sequential, but every page is yielded as soon as it arrives regardless of which prefix it belongs to.
+    """
+    listed = queue.Queue(maxsize=max_workers * 1000)
+    finished = object()
+    stop = threading.Event()
+
+    def list_prefix(prefix):
+        try:
+            for obj in list_s3_bucket_objects(bucket_name, prefix, start_after, region_name):
+                if stop.is_set():
+                    return
+                listed.put(obj)
+        finally:
+            listed.put(finished)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(list_prefix, prefix) for prefix in prefixes]
+        try:
+            remaining = len(futures)
+            while remaining:
+                obj = listed.get()
+                if obj is finished:
+                    remaining -= 1
+                else:
+                    yield obj
+            for future in futures:
+                future.result()  # raise listing errors
+        finally:
+            stop.set()
+            while any(not future.done() for future in futures):
+                try:
+                    listed.get(timeout=0.1)  # unblock producers stuck on a full queue
+                except queue.Empty:
+                    pass
+
+
+def stream_s3_object(
+    bucket_name: str,
+    key: str,
+    region_name: str = settings.USASPENDING_AWS_REGION,
+    range_size: int = SHARED_TRANSFER_CONFIG.multipart_chunksize,
+    max_workers: int = SHARED_TRANSFER_CONFIG.max_concurrency,
+) -> Iterator[bytes]:
+    """
+    Yield the bytes of an S3 object in order while fetching up to `max_workers` byte ranges of it concurrently. Every
+    range is pinned to the ETag seen when the download started, so an object replaced mid-download fails instead of
+    being stitched together from two versions.
+    """
+    client = get_s3_client(region_name)
+    head = client.head_object(Bucket=bucket_name, Key=key)
+    size, etag = head["ContentLength"], head["ETag"]
+
+    def get_range(start):
+        end = min(start + range_size, size) - 1
+        response = client.get_object(Bucket=bucket_name, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag)
+        return response["Body"].read()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque()
+        try:
+            for start in range(0, size, range_size):
+                in_flight.append(executor.submit(get_range, start))
+                if len(in_flight) > max_workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def download_s3_object(
+    bucket_name: str, key: str, destination: Union[str, Path], region_name: str = settings.USASPENDING_AWS_REGION
+) -> None:
+    """Download an S3 object to a file using concurrent ranged GETs"""
+    with open(destination, "wb") as f:
+        for chunk in stream_s3_object(bucket_name, key, region_name):
+            f.write(chunk)
+
+
+def stream_s3_object_lines(
+    bucket_name: str, key: str, region_name: str = settings.USASPENDING_AWS_REGION
+) -> Iterator[str]:
+    """Yield the decoded lines of an S3 object as they are read instead of buffering the whole object"""
+    reader = io.BufferedReader(_ChunkReader(stream_s3_object(bucket_name, key, region_name)))
+    for line in io.TextIOWrapper(reader, encoding="utf-8", newline=""):
+        yield line.rstrip("\r\n")
+
+
+class _ChunkReader(io.RawIOBase):
+    """A readable file object over an iterator of byte strings"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self.chunks = chunks
+        self.leftover = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.leftover:
+            self.leftover = next(self.chunks, None)
+            if self.leftover is None:
+                self.leftover = b""
+                return 0
+        size = min(len(buffer), len(self.leftover))
+        buffer[:size] = self.leftover[:size]
+        self.leftover = self.leftover[size:]
+        return size
 
 
 def get_s3_bucket(
     bucket_name: str, region_name: str = settings.USASPENDING_AWS_REGION
 ) -> "boto3.resources.factory.s3.Instance":
-    s3 = boto3.resource("s3", region_name=region_name)
+    s3 = boto3.resource("s3", region_name=region_name, endpoint_url=settings.AWS_S3_ENDPOINT_URL)
     return s3.Bucket(bucket_name)
 
 
-def access_s3_object(bucket_name: str, obj: "boto3.resources.factory.s3.ObjectSummary") -> io.BytesIO:
+def access_s3_object(bucket_name: str, key: str) -> io.BytesIO:
     """Return the Bytes of an S3 object"""
-    bucket = get_s3_bucket(bucket_name=bucket_name)
     data = io.BytesIO()
-    bucket.download_fileobj(obj.key, data)
+    for chunk in stream_s3_object(bucket_name, key):
+        data.write(chunk)
     data.seek(0)  # Like rewinding a VCR cassette
     return data
 
 
-def upload_download_file_to_s3(file_path):
-    bucket = settings.BULK_DOWNLOAD_S3_BUCKET_NAME
-    region = settings.USASPENDING_AWS_REGION
-    multipart_upload(bucket, region, str(file_path), file_path.name)
-
-
 def multipart_upload(bucketname, regionname, source_path, keyname):
-    s3client = boto3.client("s3", region_name=regionname)
+    s3client = get_s3_client(regionname)
     source_size = Path(source_path).stat().st_size
     # Sets the chunksize at minimum ~5MB to sqrt(5MB) * sqrt(source size)
     bytes_per_chunk = max(int(math.sqrt(5242880) * math.sqrt(source_size)), 5242880)
-    config = boto3.s3.transfer.TransferConfig(multipart_chunksize=bytes_per_chunk)
+    config = TransferConfig(multipart_chunksize=bytes_per_chunk, max_concurrency=SHARED_TRANSFER_CONFIG.max_concurrency)
     transfer = boto3.s3.transfer.S3Transfer(s3client, config)
     transfer.upload_file(source_path, bucketname, Path(keyname).name)
+
+
+class S3MultipartUploadSink:
+    """
+    A write-only, unseekable file object that uploads what is written to it as an S3 multipart upload while the
+    writer is still producing data, e.g. `zipfile.ZipFile(sink, "w")` compressing a download straight into S3.
+
+    Fixed-size parts are uploaded on a thread pool, each retried up to PART_UPLOAD_ATTEMPTS times. At most
+    `max_queued_parts` parts wait behind the running uploads; `write` blocks past that so memory stays bounded. An
+    object smaller than one part is sent with a single PUT. Any failure (or leaving the `with` block on an exception)
+    aborts the multipart upload so no orphaned parts are left in the bucket.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        key: str,
+        region_name: str = settings.USASPENDING_AWS_REGION,
+        part_size: int = SHARED_TRANSFER_CONFIG.multipart_chunksize,
+        max_workers: int = SHARED_TRANSFER_CONFIG.max_concurrency,
+        max_queued_parts: int = 2,
+    ):
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        self.bucket_name = bucket_name
+        self.key = key
+        self.part_size = part_size
+        self.client = get_s3_client(region_name)
+        self.bytes_written = 0
+        self.closed = False
+        self._upload_id = None
+        self._buffer = bytearray()
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued_parts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self.bytes_written
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("write to closed S3MultipartUploadSink")
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._submit_part(part)
+        return len(data)
+
+    def flush(self):
+        """Parts have a minimum size, so buffered bytes are only sent once a part fills up or on close"""
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self.client.put_object(Bucket=self.bucket_name, Key=self.key, Body=bytes(self._buffer))
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                parts = [future.result() for future in self._futures]
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket_name, Key=self.key, UploadId=self._upload_id, MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            self.abort()
+            raise
+        self._buffer = bytearray()
+        self._executor.shutdown()
+        self.closed = True
+
+    def abort(self):
+        if self.closed:
+            return
+        self.closed = True
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown()
+        self._buffer = bytearray()
+        if self._upload_id is not None:
+            logger.warning(f"Aborting multipart upload of s3://{self.bucket_name}/{self.key}")
+            self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=self.key, UploadId=self._upload_id)
+
+    def _submit_part(self, body: bytes):
+        self._raise_for_failed_parts()
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(Bucket=self.bucket_name, Key=self.key)
+            self._upload_id = response["UploadId"]
+        part_number = len(self._futures) + 1
+        self._slots.acquire()
+        future = self._executor.submit(self._upload_part, part_number, body)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _upload_part(self, part_number: int, body: bytes) -> dict:
+        for attempt in range(1, PART_UPLOAD_ATTEMPTS + 1):
+            try:
+                response = self.client.upload_part(
+                    Bucket=self.bucket_name, Key=self.key, UploadId=self._upload_id, PartNumber=part_number, Body=body
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            except (BotoCoreError, ClientError):
+                if attempt == PART_UPLOAD_ATTEMPTS:
+                    raise
+                logger.warning(f"Retrying part {part_number} of s3://{self.bucket_name}/{self.key} (attempt {attempt})")
+                time.sleep(2 ** attempt)
+
+    def _raise_for_failed_parts(self):
+        """Fail the writer as soon as a part has given up instead of after everything has been compressed"""
+        for future in self._futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.utils.timezone import now
 from django.utils.deprecation import MiddlewareMixin
+from usaspending_api.common.request_instrumentation import get_request_recorder, recording, sample_request
 
 import logging
 import traceback
@@ -42,6 +44,8 @@ class LoggingMiddleware(MiddlewareMixin):
             this format is used to search through Kibana interface)
       "request": {"filters":{...}} (request body sent by user)
       "traceback": null (traceback of call if error, used for debugging server error)
+      "instrumentation": {"sql_count": 12, "sql_ms": 310.2, ...} (sampled requests only, see
+            common/request_instrumentation.py)
     }
 
     LOG Levels:
@@ -56,6 +60,14 @@ class LoggingMiddleware(MiddlewareMixin):
     start = None
     log = None
 
+    def __call__(self, request):
+        # A request served inside another recording (such as benchmark_api's) is reported with that one
+        recorder = sample_request(request) if get_request_recorder() is None else None
+        if recorder is None:
+            return super().__call__(request)
+        with recording(recorder):
+            return super().__call__(request)
+
     def process_request(self, request):
         """Func called when a request is called on server, function stores request fields for logging"""
         self.start = perf_counter()
@@ -91,6 +103,12 @@ class LoggingMiddleware(MiddlewareMixin):
             if "cache-trace" in response._headers and len(response._headers["cache-trace"]) >= 2:
                 self.log["cache_trace"] = response._headers["cache-trace"][1]
 
+        recorder = get_request_recorder()
+        if recorder is not None:
+            self.log["instrumentation"] = recorder.as_log()
+            if settings.REQUEST_INSTRUMENTATION_SERVER_TIMING:
+                response["Server-Timing"] = recorder.server_timing()
+
         if 100 <= status_code < 400:
             # Logged at an INFO level: 1xx (Informational), 2xx (Success), 3xx Redirection
             self.log["status"] = "INFO"
@@ -137,6 +155,10 @@ class LoggingMiddleware(MiddlewareMixin):
         self.log["timestamp"] = now().strftime("%d/%m/%y %H:%M:%S")
         self.log["traceback"] = traceback.format_exc()
 
+        recorder = get_request_recorder()
+        if recorder is not None:
+            self.log["instrumentation"] = recorder.as_log()
+
         self.server_logger.error("%s", self.get_message_string(), extra=self.log)
 
     def get_response_ms(self):
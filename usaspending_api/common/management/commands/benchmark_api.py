@@ -0,0 +1,149 @@
+import json
+import logging
+import queue
+import requests
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from pathlib import Path
+from usaspending_api.common.helpers.benchmark_helpers import (
+    Sample,
+    compare_to_baseline,
+    load_corpus,
+    parse_server_timing,
+    summarize,
+)
+from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
+from usaspending_api.common.request_instrumentation import RequestRecorder, recording
+
+
+logger = logging.getLogger("script")
+
+DEFAULT_CORPUS = settings.APP_DIR / "data" / "testing_data" / "benchmark_corpus.jsonl"
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays a corpus of recorded API requests in process (through the Django test client) or against a live "
+        "server, reports p50/p95/p99 latency, SQL queries and Elasticsearch requests per endpoint, and optionally "
+        "compares them with a baseline saved by an earlier run.  Load a dataset to run against first, for example "
+        "with generate_benchmark_fixtures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="JSON Lines or JSON list of requests")
+        parser.add_argument(
+            "--server",
+            help="Base URL of a running API (e.g. http://localhost:8000) to replay against instead of the test client. "
+            "SQL and Elasticsearch counts are only reported when it returns a Server-Timing header.",
+        )
+        parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight at once")
+        parser.add_argument("--repeat", type=int, default=5, help="Times to replay the whole corpus")
+        parser.add_argument("--warmup", type=int, default=1, help="Unmeasured passes over the corpus beforehand")
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Send X-Cache-Bypass so cached endpoints do their full work.  A live server only honors it with "
+            "ALLOW_CACHE_BYPASS set.",
+        )
+        parser.add_argument("--baseline", type=Path, help="Fail when results regress from this saved baseline")
+        parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression, as a fraction")
+        parser.add_argument("--save-baseline", type=Path, help="Save the results as a baseline to this path")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["repeat"] < 1 or options["warmup"] < 0:
+            raise CommandError("--concurrency and --repeat must be at least 1 and --warmup can't be negative")
+
+        corpus = load_corpus(options["corpus"])
+        logger.info(f"Replaying {len(corpus):,} requests from {options['corpus']} {options['repeat']:,} times")
+
+        with ExitStack() as stack:
+            if not options["server"]:
+                stack.enter_context(override_settings(ALLOW_CACHE_BYPASS=True))
+            self.replay(corpus * options["warmup"], options)
+            with Timer("Benchmark"):
+                samples = self.replay(corpus * options["repeat"], options)
+
+        summary = summarize(samples)
+        for name, result in summary.items():
+            logger.info(
+                f"{name}: {result['requests']:,} requests  {result['errors']:,} errors  "
+                f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  p99 {result['p99_ms']} ms  "
+                f"sql {result['sql_queries']} queries / {result['sql_ms']} ms  "
+                f"es {result['es_requests']} requests / {result['es_ms']} ms"
+            )
+
+        if options["save_baseline"]:
+            options["save_baseline"].write_text(json.dumps(summary, indent=4, sort_keys=True))
+            logger.info(f"Saved baseline to {options['save_baseline']}")
+
+        if options["baseline"]:
+            regressions = compare_to_baseline(
+                summary, json.loads(options["baseline"].read_text()), options["tolerance"]
+            )
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions):,} regressions from {options['baseline']}:\n" + "\n".join(regressions)
+                )
+            logger.info(f"No regressions from {options['baseline']} beyond {options['tolerance']:.0%}")
+
+    def replay(self, corpus, options):
+        """Sends every request in corpus using --concurrency workers; returns a Sample for each"""
+        pending = queue.Queue()
+        for request in corpus:
+            pending.put(request)
+
+        worker = self.live_worker if options["server"] else self.client_worker
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            workers = [executor.submit(worker, pending, options) for _ in range(options["concurrency"])]
+            return [sample for future in workers for sample in future.result()]
+
+    @staticmethod
+    def client_worker(pending, options):
+        headers = {"HTTP_X_CACHE_BYPASS": "true"} if options["no_cache"] else {}
+        client = Client()
+        samples = []
+        try:
+            while True:
+                try:
+                    request = pending.get_nowait()
+                except queue.Empty:
+                    return samples
+                with recording(RequestRecorder()) as metrics:
+                    start = time.perf_counter()
+                    if request.method == "GET":
+                        response = client.get(request.url, **headers)
+                    else:
+                        response = client.generic(
+                            request.method,
+                            request.url,
+                            json.dumps(request.request_object or {}),
+                            content_type="application/json",
+                            **headers,
+                        )
+                    milliseconds = (time.perf_counter() - start) * 1000
+                samples.append(Sample(request.name, response.status_code, milliseconds, metrics))
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def live_worker(pending, options):
+        headers = {"X-Cache-Bypass": "true"} if options["no_cache"] else {}
+        samples = []
+        with requests.Session() as session:
+            while True:
+                try:
+                    request = pending.get_nowait()
+                except queue.Empty:
+                    return samples
+                url = options["server"].rstrip("/") + request.url
+                start = time.perf_counter()
+                response = session.request(request.method, url, json=request.request_object, headers=headers)
+                milliseconds = (time.perf_counter() - start) * 1000
+                metrics = parse_server_timing(response.headers.get("Server-Timing"))
+                samples.append(Sample(request.name, response.status_code, milliseconds, metrics))
@@ -0,0 +1,325 @@
+import logging
+import random
+
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from usaspending_api.awards.models import Award, TransactionFABS, TransactionFPDS, TransactionNormalized
+from usaspending_api.awards.v2.lookups.lookups import (
+    all_award_types_mappings,
+    award_type_mapping,
+    contract_type_mapping,
+)
+from usaspending_api.common.helpers.fiscal_year_helpers import generate_fiscal_year
+from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
+from usaspending_api.conftest_helpers import TestElasticSearchIndex
+from usaspending_api.etl.award_helpers import update_assistance_awards, update_awards, update_procurement_awards
+from usaspending_api.references.models import Agency, Cfda, NAICS, PSC, SubtierAgency, ToptierAgency
+
+
+logger = logging.getLogger("script")
+
+# Tables this command fills; they must be empty (or emptied with --clear) beforehand
+BENCHMARK_TABLES = [
+    "transaction_fabs",
+    "transaction_fpds",
+    "transaction_normalized",
+    "awards",
+    "recipient_profile",
+    "recipient_lookup",
+    "agency",
+    "subtier_agency",
+    "toptier_agency",
+    "references_cfda",
+    "naics",
+    "psc",
+]
+
+WORDS = [
+    "agriculture",
+    "construction",
+    "defense",
+    "development",
+    "education",
+    "energy",
+    "environmental",
+    "equipment",
+    "health",
+    "housing",
+    "maintenance",
+    "medical",
+    "research",
+    "security",
+    "services",
+    "software",
+    "support",
+    "training",
+    "transportation",
+    "water",
+]
+STATES = ["AL", "AZ", "CA", "CO", "FL", "GA", "IL", "MA", "MD", "NY", "OH", "PA", "TX", "VA", "WA"]
+ASSISTANCE_TYPES = [code for code in award_type_mapping if code not in contract_type_mapping and code[:3] != "IDV"]
+
+TOPTIER_AGENCY_COUNT = 20
+SUBTIERS_PER_TOPTIER = 3
+FIRST_ACTION_DATE = date(2017, 10, 1)
+ACTION_DATE_DAYS = 4 * 365
+MAX_TRANSACTIONS_PER_AWARD = 4
+RESTOCK_RECIPIENT_PROFILE_SQL = settings.APP_DIR / "recipient" / "management" / "sql" / "restock_recipient_profile.sql"
+
+
+class ElasticsearchBenchmarkIndex(TestElasticSearchIndex):
+    """Loads an index from the database the way the test fixtures do, but under a fixed name and the query aliases"""
+
+    def __init__(self, index_type):
+        super().__init__(index_type)
+        self.index_name = f"benchmark-{index_type}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills an empty database (and optionally a local Elasticsearch) with a deterministic synthetic dataset of "
+        "agencies, recipients, reference data, awards and transactions for benchmark_api to run against offline.  "
+        "The same --awards and --seed always produce the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--awards", type=int, default=10000, help="Number of awards to generate")
+        parser.add_argument("--seed", type=int, default=0, help="Seed for the random values")
+        parser.add_argument(
+            "--clear", action="store_true", help=f"Truncate {', '.join(BENCHMARK_TABLES)} (CASCADE) first"
+        )
+        parser.add_argument(
+            "--skip-matviews", action="store_true", help="Don't recreate the materialized views afterwards"
+        )
+        parser.add_argument(
+            "--elasticsearch",
+            action="store_true",
+            help=f"Also load the transactions and awards into indexes on {settings.ES_HOSTNAME}",
+        )
+
+    def handle(self, *args, **options):
+        if options["awards"] < 1:
+            raise CommandError("--awards must be at least 1")
+        self.random = random.Random(options["seed"])
+
+        with Timer("Generate benchmark fixtures"):
+            with transaction.atomic():
+                self.prepare_tables(options["clear"])
+                agencies = self.create_agencies()
+                self.create_reference_data()
+                self.create_awards(options["awards"], agencies)
+                with Timer("Derive awards from transactions"):
+                    update_awards()
+                    update_procurement_awards()
+                    update_assistance_awards()
+
+            with Timer("Derive recipients from transactions"):
+                call_command("update_recipient_lookup")
+                with connection.cursor() as cursor:
+                    cursor.execute(RESTOCK_RECIPIENT_PROFILE_SQL.read_text())
+
+            if not options["skip_matviews"]:
+                call_command("matview_runner", "--dependencies")
+
+            if options["elasticsearch"]:
+                for index_type in ("transactions", "awards"):
+                    with Timer(f"Load Elasticsearch {index_type}"):
+                        ElasticsearchBenchmarkIndex(index_type).update_index()
+
+    @staticmethod
+    def prepare_tables(clear):
+        with connection.cursor() as cursor:
+            if clear:
+                cursor.execute(f"truncate {', '.join(BENCHMARK_TABLES)} restart identity cascade")
+                return
+            for table in BENCHMARK_TABLES:
+                cursor.execute(f"select exists(select from {table})")
+                if cursor.fetchone()[0]:
+                    raise CommandError(f"{table} already has rows; use --clear to truncate the benchmark tables")
+
+    def phrase(self, word_count):
+        return " ".join(self.random.sample(WORDS, word_count))
+
+    def amount(self, low, high):
+        return Decimal(self.random.randrange(low * 100, high * 100)) / 100
+
+    def create_agencies(self):
+        toptiers, subtiers, agencies = [], [], []
+        for toptier_number in range(1, TOPTIER_AGENCY_COUNT + 1):
+            name = f"Department of {self.phrase(2).title()} {toptier_number}"
+            toptiers.append(
+                ToptierAgency(
+                    toptier_agency_id=toptier_number,
+                    toptier_code=f"{toptier_number:03d}",
+                    abbreviation=f"D{toptier_number:02d}",
+                    name=name,
+                )
+            )
+            for subtier_index in range(SUBTIERS_PER_TOPTIER):
+                subtier_number = (toptier_number - 1) * SUBTIERS_PER_TOPTIER + subtier_index + 1
+                subtiers.append(
+                    SubtierAgency(
+                        subtier_agency_id=subtier_number,
+                        subtier_code=f"{subtier_number:04d}",
+                        abbreviation=f"S{subtier_number:03d}",
+                        name=name if subtier_index == 0 else f"Office of {self.phrase(2).title()} {subtier_number}",
+                    )
+                )
+                agencies.append(
+                    Agency(
+                        id=subtier_number,
+                        toptier_agency_id=toptier_number,
+                        subtier_agency_id=subtier_number,
+                        toptier_flag=subtier_index == 0,
+                        user_selectable=True,
+                    )
+                )
+        ToptierAgency.objects.bulk_create(toptiers)
+        SubtierAgency.objects.bulk_create(subtiers)
+        Agency.objects.bulk_create(agencies)
+        return agencies
+
+    def create_reference_data(self):
+        cfdas = [
+            Cfda(
+                program_number=f"{10 + number // 100:02d}.{number % 100 * 10 + 1:03d}",
+                program_title=self.phrase(3).title(),
+                popular_name=self.phrase(2).title(),
+            )
+            for number in range(200)
+        ]
+        Cfda.objects.bulk_create(cfdas)
+
+        naics = []
+        for sector in range(11, 31, 2):
+            naics.append(NAICS(code=str(sector), description=self.phrase(2).upper()))
+            for group in range(11, 16):
+                naics.append(NAICS(code=f"{sector}{group}", description=self.phrase(3).upper()))
+                for leaf in range(10, 16):
+                    naics.append(NAICS(code=f"{sector}{group}{leaf}", description=self.phrase(4).upper()))
+        NAICS.objects.bulk_create(naics)
+
+        pscs = [
+            PSC(code=f"{chr(ord('A') + number // 100)}{number % 100:03d}", length=4, description=self.phrase(3).upper())
+            for number in range(300)
+        ]
+        PSC.objects.bulk_create(pscs)
+
+    def create_awards(self, award_count, agencies):
+        naics_codes = list(NAICS.objects.filter(code__regex=r"^\d{6}$").values_list("code", flat=True))
+        psc_codes = list(PSC.objects.values_list("code", flat=True))
+        cfdas = list(Cfda.objects.values_list("program_number", "program_title"))
+        recipients = [
+            (f"{100000000 + number:09d}", f"{self.phrase(2).upper()} {number} INC", self.random.choice(STATES))
+            for number in range(max(10, award_count // 10))
+        ]
+
+        awards, transactions, contracts, assistance = [], [], [], []
+        for award_id in range(1, award_count + 1):
+            is_fpds = self.random.random() < 0.5
+            award_type = self.random.choice(list(contract_type_mapping) if is_fpds else ASSISTANCE_TYPES)
+            agency = self.random.choice(agencies)
+            duns, recipient_name, recipient_state = self.random.choice(recipients)
+            subtier_code = f"{agency.subtier_agency_id:04d}"
+            toptier_code = f"{agency.toptier_agency_id:03d}"
+            description = self.phrase(4).upper()
+            start_date = FIRST_ACTION_DATE + timedelta(days=self.random.randrange(ACTION_DATE_DAYS))
+            end_date = start_date + timedelta(days=self.random.randrange(30, 1000))
+            if is_fpds:
+                piid, fain = f"BENCH{award_id:08d}", None
+                unique_award_key = f"CONT_AWD_{piid}_{subtier_code}_-NONE-_-NONE-"
+            else:
+                piid, fain = None, f"BENCH{award_id:08d}"
+                unique_award_key = f"ASST_NON_{fain}_{subtier_code}"
+            awards.append(
+                Award(id=award_id, generated_unique_award_id=unique_award_key, is_fpds=is_fpds, piid=piid, fain=fain)
+            )
+
+            naics = self.random.choice(naics_codes)
+            psc = self.random.choice(psc_codes)
+            cfda_number, cfda_title = self.random.choice(cfdas)
+            pop_state = self.random.choice(STATES)
+            for modification in range(self.random.randint(1, MAX_TRANSACTIONS_PER_AWARD)):
+                transaction_id = len(transactions) + 1
+                action_date = start_date + timedelta(days=modification * 30)
+                obligation = self.amount(-1000, 5000000) if modification else self.amount(1000, 5000000)
+                transaction_unique_id = f"{unique_award_key}_{modification}"
+                is_loan = award_type in all_award_types_mappings["loans"]
+                transactions.append(
+                    TransactionNormalized(
+                        id=transaction_id,
+                        award_id=award_id,
+                        type=award_type,
+                        type_description=award_type_mapping[award_type],
+                        action_date=action_date,
+                        action_type="A" if modification == 0 else "C",
+                        fiscal_year=generate_fiscal_year(action_date),
+                        federal_action_obligation=0 if is_loan else obligation,
+                        original_loan_subsidy_cost=obligation / 10 if is_loan else None,
+                        face_value_loan_guarantee=obligation if is_loan else None,
+                        modification_number=str(modification),
+                        awarding_agency_id=agency.id,
+                        funding_agency_id=agency.id,
+                        description=description,
+                        period_of_performance_start_date=start_date,
+                        period_of_performance_current_end_date=end_date,
+                        last_modified_date=action_date,
+                        is_fpds=is_fpds,
+                        transaction_unique_id=transaction_unique_id,
+                        unique_award_key=unique_award_key,
+                    )
+                )
+                shared = {
+                    "transaction_id": transaction_id,
+                    "action_date": action_date.isoformat(),
+                    "award_description": description,
+                    "awardee_or_recipient_legal": recipient_name,
+                    "awardee_or_recipient_uniqu": duns,
+                    "awarding_agency_code": toptier_code,
+                    "awarding_sub_tier_agency_c": subtier_code,
+                    "funding_agency_code": toptier_code,
+                    "funding_sub_tier_agency_co": subtier_code,
+                    "federal_action_obligation": obligation,
+                    "legal_entity_country_code": "USA",
+                    "legal_entity_state_code": recipient_state,
+                    "place_of_perform_country_c": "USA",
+                    "unique_award_key": unique_award_key,
+                }
+                if is_fpds:
+                    contracts.append(
+                        TransactionFPDS(
+                            **shared,
+                            detached_award_proc_unique=transaction_unique_id,
+                            piid=piid,
+                            contract_award_type=award_type,
+                            naics=naics,
+                            product_or_service_code=psc,
+                            place_of_performance_state=pop_state,
+                            base_and_all_options_value=str(obligation),
+                            base_exercised_options_val=str(obligation),
+                        )
+                    )
+                else:
+                    assistance.append(
+                        TransactionFABS(
+                            **shared,
+                            afa_generated_unique=transaction_unique_id,
+                            fain=fain,
+                            assistance_type=award_type,
+                            cfda_number=cfda_number,
+                            cfda_title=cfda_title,
+                            place_of_perfor_state_code=pop_state,
+                            record_type=2,
+                            is_active=True,
+                        )
+                    )
+
+        with Timer(f"Insert {len(awards):,} awards and {len(transactions):,} transactions"):
+            Award.objects.bulk_create(awards, batch_size=5000)
+            TransactionNormalized.objects.bulk_create(transactions, batch_size=5000)
+            TransactionFPDS.objects.bulk_create(contracts, batch_size=5000)
+            TransactionFABS.objects.bulk_create(assistance, batch_size=5000)
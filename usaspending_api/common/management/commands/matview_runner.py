@@ -3,6 +3,7 @@ import logging
 import psycopg2
 import subprocess
 
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from pathlib import Path
 
@@ -64,6 +65,8 @@ class Command(BaseCommand):
             if self.run_dependencies:
                 create_dependencies()
             self.create_views()
+            if "summary_state_view" in self.matviews:
+                call_command("restock_state_award_rollup")
             if not self.no_cleanup:
                 self.cleanup()
 
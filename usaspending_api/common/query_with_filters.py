@@ -32,6 +32,18 @@ class _Keywords(_Filter):
             "parent_recipient_unique_id",
             "description",
         ]
+        if query_type == _QueryType.SUBAWARDS:
+            fields = [
+                "recipient_name",
+                "product_or_service_code",
+                "product_or_service_description",
+                "description",
+                "piid",
+                "fain",
+                "subaward_number",
+                "recipient_unique_id",
+                "parent_recipient_unique_id",
+            ]
         for v in filter_values:
             query = es_sanitize(v) + "*"
             if "\\" in es_sanitize(v):
@@ -127,13 +139,29 @@ class _AwardTypeCodes(_Filter):
     @classmethod
     def generate_elasticsearch_query(cls, filter_values: List[str], query_type: _QueryType) -> ES_Q:
         award_type_codes_query = []
+        # Subawards are filtered by the type of their prime award
+        type_field = "prime_award_type" if query_type == _QueryType.SUBAWARDS else "type"
 
         for v in filter_values:
-            award_type_codes_query.append(ES_Q("match", type=v))
+            award_type_codes_query.append(ES_Q("match", **{type_field: v}))
 
         return ES_Q("bool", should=award_type_codes_query, minimum_should_match=1)
 
 
+class _PrimeAndSubAwardTypes(_Filter):
+    underscore_name = "prime_and_sub_award_types"
+
+    @classmethod
+    def generate_elasticsearch_query(cls, filter_values: dict, query_type: _QueryType) -> List[ES_Q]:
+        if query_type != _QueryType.SUBAWARDS:
+            raise InvalidParameterException(f"Invalid filter: {cls.underscore_name} does not exist.")
+
+        sub_award_types = filter_values.get("sub_awards")
+        if not sub_award_types:
+            return []
+        return [ES_Q("terms", award_type=sub_award_types)]
+
+
 class _Agencies(_Filter):
     underscore_name = "agencies"
 
@@ -304,10 +332,11 @@ class _AwardAmounts(_Filter):
     @classmethod
     def generate_elasticsearch_query(cls, filter_values: List[dict], query_type: _QueryType) -> ES_Q:
         award_amounts_query = []
+        amount_field = "amount" if query_type == _QueryType.SUBAWARDS else "award_amount"
         for v in filter_values:
             lower_bound = v.get("lower_bound")
             upper_bound = v.get("upper_bound")
-            award_amounts_query.append(ES_Q("range", award_amount={"gte": lower_bound, "lte": upper_bound}))
+            award_amounts_query.append(ES_Q("range", **{amount_field: {"gte": lower_bound, "lte": upper_bound}}))
         return ES_Q("bool", should=award_amounts_query, minimum_should_match=1)
 
 
@@ -436,6 +465,7 @@ class QueryWithFilters:
         _KeywordSearch.underscore_name: _KeywordSearch,
         _TimePeriods.underscore_name: _TimePeriods,
         _AwardTypeCodes.underscore_name: _AwardTypeCodes,
+        _PrimeAndSubAwardTypes.underscore_name: _PrimeAndSubAwardTypes,
         _Agencies.underscore_name: _Agencies,
         _RecipientSearchText.underscore_name: _RecipientSearchText,
         _RecipientId.underscore_name: _RecipientId,
@@ -459,6 +489,10 @@ class QueryWithFilters:
 
     unsupported_filters = ["legal_entities"]
 
+    # Subawards are not linked to NAICS and do not carry recipient hashes or the full keyword search fields
+    unsupported_subaward_filters = [NaicsCodes.underscore_name]
+    invalid_subaward_filters = [_KeywordSearch.underscore_name, _RecipientId.underscore_name]
+
     @classmethod
     def _generate_elasticsearch_query(cls, filters: dict, query_type: _QueryType) -> ES_Q:
         must_queries = []
@@ -468,11 +502,15 @@ class QueryWithFilters:
         must_queries.extend(cls._handle_defc_query(filters, query_type))
         for filter_type, filter_values in filters.items():
             # Validate the filters
-            if filter_type in cls.unsupported_filters:
+            if filter_type in cls.unsupported_filters or (
+                query_type == _QueryType.SUBAWARDS and filter_type in cls.unsupported_subaward_filters
+            ):
                 msg = "API request included '{}' key. No filtering will occur with provided value '{}'"
                 logger.warning(msg.format(filter_type, filter_values))
                 continue
-            elif filter_type not in cls.filter_lookup.keys():
+            elif filter_type not in cls.filter_lookup.keys() or (
+                query_type == _QueryType.SUBAWARDS and filter_type in cls.invalid_subaward_filters
+            ):
                 raise InvalidParameterException(f"Invalid filter: {filter_type} does not exist.")
 
             # Generate the query for a filter
@@ -527,3 +565,7 @@ class QueryWithFilters:
     @classmethod
     def generate_transactions_elasticsearch_query(cls, filters: dict) -> ES_Q:
         return cls._generate_elasticsearch_query(filters, _QueryType.TRANSACTIONS)
+
+    @classmethod
+    def generate_subawards_elasticsearch_query(cls, filters: dict) -> ES_Q:
+        return cls._generate_elasticsearch_query(filters, _QueryType.SUBAWARDS)
@@ -0,0 +1,159 @@
+"""
+Opt-in measurement of where an API request spends its time: Postgres queries, Elasticsearch requests and cache
+lookups.  LoggingMiddleware samples requests at settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE (or on request with an
+X-Instrument-Request header when settings.ALLOW_INSTRUMENTATION_HEADER is set), records them with a RequestRecorder
+and adds the results to the request's log line and, if settings.REQUEST_INSTRUMENTATION_SERVER_TIMING is set, to a
+Server-Timing response header.  The benchmark_api command records the requests it replays the same way.
+
+Nothing is installed for requests that are not sampled (all of them when the rate is 0): their queries run without a
+database execute wrapper, and RecordingTransport and the cache hooks only find that no recorder is active.
+"""
+import hashlib
+import random
+import re
+import threading
+
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.db import connections
+from elasticsearch.transport import Transport
+from time import perf_counter
+from typing import Callable, Optional
+
+
+INSTRUMENTATION_HEADER = "HTTP_X_INSTRUMENT_REQUEST"
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|%s|\b\d+(?:\.\d+)?\b")
+_VALUE_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+_local = threading.local()
+
+
+def fingerprint_sql(sql: str) -> str:
+    """ The statement with its literals and parameters replaced by ? so runs of the same query look alike. """
+    sql = _LITERALS.sub("?", sql)
+    sql = _VALUE_LISTS.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class RequestRecorder:
+    """ Totals for one request.  Doubles as the execute wrapper installed on every database connection. """
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.slowest_sql = None
+        self.slowest_sql_seconds = 0.0
+        self.es_count = 0
+        self.es_seconds = 0.0
+        self.es_took_ms = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - start
+            self.sql_count += 1
+            self.sql_seconds += duration
+            if duration >= self.slowest_sql_seconds:
+                self.slowest_sql = sql
+                self.slowest_sql_seconds = duration
+
+    def record_elasticsearch(self, perform_request: Callable):
+        """ Run an Elasticsearch request, adding its round trip and, for searches, Elasticsearch's own time. """
+        start = perf_counter()
+        try:
+            response = perform_request()
+        finally:
+            self.es_count += 1
+            self.es_seconds += perf_counter() - start
+        if isinstance(response, dict) and response.get("took") is not None:
+            self.es_took_ms += response["took"]
+        return response
+
+    def record_cache_lookups(self, hits: int = 0, misses: int = 0):
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+    def as_log(self) -> dict:
+        fingerprint = fingerprint_sql(str(self.slowest_sql)) if self.slowest_sql is not None else None
+        return {
+            "sql_count": self.sql_count,
+            "sql_ms": _ms(self.sql_seconds),
+            "slowest_sql_ms": _ms(self.slowest_sql_seconds),
+            "slowest_sql": fingerprint,
+            "slowest_sql_fingerprint": hashlib.md5(fingerprint.encode("utf-8")).hexdigest() if fingerprint else None,
+            "es_count": self.es_count,
+            "es_ms": _ms(self.es_seconds),
+            "es_took_ms": self.es_took_ms,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            [
+                f'sql;dur={_ms(self.sql_seconds)};desc="{self.sql_count}"',
+                f'es;dur={_ms(self.es_seconds)};desc="{self.es_count}"',
+                f"es-took;dur={self.es_took_ms}",
+                f'cache-hit;desc="{self.cache_hits}"',
+                f'cache-miss;desc="{self.cache_misses}"',
+            ]
+        )
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def sample_request(request) -> Optional[RequestRecorder]:
+    """ A recorder for the request if it is sampled or asks to be instrumented (where allowed), otherwise None. """
+    requested = request.META.get(INSTRUMENTATION_HEADER, "").lower() in ["true", "1", "yes"]
+    if requested and settings.ALLOW_INSTRUMENTATION_HEADER:
+        return RequestRecorder()
+    rate = settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE
+    if rate <= 0 or random.random() >= rate:
+        return None
+    return RequestRecorder()
+
+
+class RecordingTransport(Transport):
+    """ The transport of the API's Elasticsearch clients, which adds every request to the active recorder, if any. """
+
+    def perform_request(self, *args, **kwargs):
+        recorder = get_request_recorder()
+        if recorder is None:
+            return super().perform_request(*args, **kwargs)
+        return recorder.record_elasticsearch(lambda: super(RecordingTransport, self).perform_request(*args, **kwargs))
+
+
+@contextmanager
+def recording(recorder: RequestRecorder):
+    """
+    Record the queries, Elasticsearch requests and cache lookups this thread makes until the block exits.  Serve the
+    request in the same thread.
+    """
+    previous_recorder = get_request_recorder()
+    _local.recorder = recorder
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            yield recorder
+    finally:
+        _local.recorder = previous_recorder
+
+
+def get_request_recorder() -> Optional[RequestRecorder]:
+    return getattr(_local, "recorder", None)
+
+
+def record_cache_lookups(hits: int = 0, misses: int = 0):
+    """ Count cache lookups made by the current request, if it is being recorded. """
+    recorder = get_request_recorder()
+    if recorder is not None:
+        recorder.record_cache_lookups(hits, misses)
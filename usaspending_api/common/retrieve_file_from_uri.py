@@ -1,10 +1,10 @@
-import boto3
 import requests
 import tempfile
 import urllib
 
 from shutil import copyfile
-from django.conf import settings
+
+from usaspending_api.common.helpers.s3_helpers import download_s3_object, stream_s3_object
 
 
 VALID_SCHEMES = ("http", "https", "s3", "file", "")
@@ -47,9 +47,7 @@ class RetrieveFileFromUri:
         """
         if self.parsed_url_obj.scheme == "s3":
             file_path = self.parsed_url_obj.path[1:]  # remove leading '/' character
-            boto3_s3 = boto3.resource("s3", region_name=settings.USASPENDING_AWS_REGION)
-            s3_bucket = boto3_s3.Bucket(self.parsed_url_obj.netloc)
-            s3_bucket.download_file(file_path, dest_file_path)
+            download_s3_object(self.parsed_url_obj.netloc, file_path, dest_file_path)
         elif self.parsed_url_obj.scheme.startswith("http"):
             urllib.request.urlretrieve(self.ruri, dest_file_path)
         elif self.parsed_url_obj.scheme in ("file", ""):
@@ -66,11 +64,10 @@ class RetrieveFileFromUri:
 
     def _handle_s3(self, text):
         file_path = self.parsed_url_obj.path[1:]  # remove leading '/' character
-        boto3_s3 = boto3.resource("s3", region_name=settings.USASPENDING_AWS_REGION)
-        s3_bucket = boto3_s3.Bucket(self.parsed_url_obj.netloc)
 
         f = tempfile.SpooledTemporaryFile()  # Must be in binary mode (default)
-        s3_bucket.download_fileobj(file_path, f)
+        for chunk in stream_s3_object(self.parsed_url_obj.netloc, file_path):
+            f.write(chunk)
 
         if text:
             byte_str = f._file.getvalue()
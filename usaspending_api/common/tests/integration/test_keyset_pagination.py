@@ -0,0 +1,164 @@
+import json
+import pytest
+
+from django.db import connection
+from model_mommy import mommy
+from rest_framework import status
+
+from usaspending_api.awards.models import Award, FinancialAccountsByAwards
+from usaspending_api.awards.v2.views import accounts, funding
+from usaspending_api.awards.v2.views.subawards import SubawardsViewSet
+from usaspending_api.awards.v2.views.transactions import TransactionViewSet
+from usaspending_api.idvs.tests.data.idv_test_data import create_idv_test_data
+from usaspending_api.idvs.v2.views import accounts as idv_accounts, awards as idv_awards
+
+
+def _post(client, endpoint, request):
+    response = client.post(endpoint, content_type="application/json", data=json.dumps(request))
+    assert response.status_code == status.HTTP_200_OK, response.content
+    return response.json()
+
+
+def assert_cursor_pages_match_offset_pages(client, endpoint, request, limit=2):
+    """
+    Pages all the way through an endpoint by page number and then by cursor, checks both return the same results in
+    the same order, and returns them
+    """
+    offset_results = []
+    page = 1
+    while True:
+        response = _post(client, endpoint, {**request, "limit": limit, "page": page})
+        offset_results.extend(response["results"])
+        if not response["page_metadata"]["hasNext"]:
+            break
+        page += 1
+
+    cursor_results = []
+    cursor = None
+    while True:
+        response = _post(client, endpoint, {**request, "limit": limit, "cursor": cursor})
+        assert len(response["results"]) <= limit
+        cursor_results.extend(response["results"])
+        if not response["page_metadata"]["hasNext"]:
+            assert response["page_metadata"]["next_cursor"] is None
+            break
+        cursor = response["page_metadata"]["next_cursor"]
+
+    assert cursor_results == offset_results
+    return offset_results
+
+
+# Action date, amount and modification number of each transaction and subaward
+CHILDREN = [
+    ("2020-01-01", 5, "1"),
+    ("2020-01-01", 5, "1"),
+    ("2020-03-01", None, None),
+    ("2020-02-01", 7, "2"),
+    ("2020-01-01", 5, "1"),
+]
+
+
+# Treasury account and amount of each File C record
+FILE_C = [(0, 5), (0, 5), (1, 5), (None, None), (2, 7), (1, None), (None, 5)]
+
+
+@pytest.fixture
+def award_children():
+    """An award whose children tie on, or lack, most of the values they can be sorted by"""
+    mommy.make("awards.Award", id=100, generated_unique_award_id="CONT_AWD_100")
+    for i, (action_date, amount, modification) in enumerate(CHILDREN):
+        mommy.make(
+            "awards.TransactionNormalized",
+            id=1000 + i,
+            award_id=100,
+            action_date=action_date,
+            federal_action_obligation=amount,
+            modification_number=modification,
+            is_fpds=False,
+        )
+        if amount is not None:
+            mommy.make("awards.TransactionFABS", transaction_id=1000 + i, cfda_number="10.00%s" % (i % 2))
+        mommy.make(
+            "awards.Subaward",
+            id=1000 + i,
+            award_id=100,
+            subaward_number=modification or "0",
+            action_date=action_date if amount is not None else None,
+            amount=amount or 0,
+            recipient_name=modification,
+        )
+
+    federal_accounts = [
+        mommy.make("accounts.FederalAccount", id=100 + i, account_title="account %s" % (i % 2)) for i in range(3)
+    ]
+    treasury_accounts = [
+        mommy.make(
+            "accounts.TreasuryAppropriationAccount",
+            treasury_account_identifier=100 + i,
+            federal_account=federal_account,
+            agency_id="012",
+            main_account_code="000%s" % i,
+        )
+        for i, federal_account in enumerate(federal_accounts)
+    ]
+    for treasury_account, amount in FILE_C:
+        mommy.make(
+            "awards.FinancialAccountsByAwards",
+            award_id=100,
+            treasury_account=treasury_accounts[treasury_account] if treasury_account is not None else None,
+            transaction_obligated_amount=amount,
+            gross_outlay_amount_by_award_cpe=amount,
+        )
+
+
+def _requests(sortable_columns, **request):
+    return [{**request, "sort": sort, "order": order} for sort in sortable_columns for order in ("asc", "desc")]
+
+
+@pytest.mark.django_db
+def test_award_children_cursor_pages_match_offset_pages(client, award_children):
+    for request in _requests(TransactionViewSet.transaction_lookup, award_id=100):
+        assert len(assert_cursor_pages_match_offset_pages(client, "/api/v2/transactions/", request)) == 5
+    for request in _requests(SubawardsViewSet.subaward_lookup, award_id=100):
+        assert len(assert_cursor_pages_match_offset_pages(client, "/api/v2/subawards/", request)) == 5
+    for request in _requests(funding.SORTABLE_COLUMNS, award_id=100):
+        assert len(assert_cursor_pages_match_offset_pages(client, "/api/v2/awards/funding/", request)) == 7
+    for request in _requests(accounts.SORTABLE_COLUMNS, award_id=100):
+        assert len(assert_cursor_pages_match_offset_pages(client, "/api/v2/awards/accounts/", request)) == 4
+
+
+@pytest.mark.django_db
+def test_idv_children_cursor_pages_match_offset_pages(client):
+    create_idv_test_data()
+    Award.objects.filter(id__in=[3, 4, 11, 12]).update(
+        period_of_performance_start_date="2018-02-01", total_obligation=7
+    )
+    Award.objects.filter(id__in=[5, 13]).update(period_of_performance_start_date=None, description=None)
+    FinancialAccountsByAwards.objects.filter(award_id__in=[11, 12]).update(transaction_obligated_amount=5)
+
+    for award_type, award_id, count in (("child_idvs", 1, 3), ("child_awards", 1, 1), ("grandchild_awards", 2, 5)):
+        for request in _requests(idv_awards.SORTABLE_COLUMNS, award_id=award_id, type=award_type):
+            results = assert_cursor_pages_match_offset_pages(client, "/api/v2/idvs/awards/", request)
+            assert len(results) == count
+    for request in _requests(idv_accounts.SORTABLE_COLUMNS, award_id=2):
+        assert len(assert_cursor_pages_match_offset_pages(client, "/api/v2/idvs/accounts/", request)) == 7
+    request = {"award_id": 2, "hide_edge_cases": True}
+    assert len(assert_cursor_pages_match_offset_pages(client, "/api/v2/idvs/activity/", request)) == 7
+
+
+@pytest.mark.django_db
+def test_invalid_cursor(client, award_children):
+    cursor = _post(client, "/api/v2/transactions/", {"award_id": 100, "limit": 1, "cursor": None})["page_metadata"]
+    request = {"award_id": 100, "limit": 1, "cursor": cursor["next_cursor"], "order": "asc"}
+    response = client.post("/api/v2/transactions/", content_type="application/json", data=json.dumps(request))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_transaction_keyset_indexes_exist():
+    with connection.cursor() as cursor:
+        cursor.execute("select indexname, indexdef from pg_indexes where tablename = 'transaction_normalized'")
+        indexes = dict(cursor.fetchall())
+    for index in TransactionViewSet.keyset_indexes:
+        columns = ", ".join(" ".join([column["name"], column.get("order", "")]).strip() for column in index["columns"])
+        assert indexes[index["name"]].endswith(f"({columns})")
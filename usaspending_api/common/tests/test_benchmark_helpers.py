@@ -0,0 +1,103 @@
+import json
+
+from usaspending_api.common.helpers.benchmark_helpers import (
+    CorpusRequest,
+    Sample,
+    compare_to_baseline,
+    load_corpus,
+    parse_server_timing,
+    percentile,
+    summarize,
+)
+from usaspending_api.common.request_instrumentation import RequestRecorder
+
+
+def test_load_corpus(tmp_path):
+    jsonl = tmp_path / "corpus.jsonl"
+    jsonl.write_text(
+        '{"name": "psc", "url": "/api/v2/autocomplete/psc/", "request_object": {"search_text": "a"}}\n'
+        "\n"
+        '{"url": "/api/v2/references/toptier_agencies/?sort=name"}\n'
+    )
+    assert load_corpus(jsonl) == [
+        CorpusRequest("psc", "POST", "/api/v2/autocomplete/psc/", {"search_text": "a"}),
+        CorpusRequest(
+            "GET /api/v2/references/toptier_agencies/", "GET", "/api/v2/references/toptier_agencies/?sort=name", None
+        ),
+    ]
+
+    endpoint_testing_data = tmp_path / "corpus.json"
+    endpoint_testing_data.write_text(json.dumps([{"url": "/api/v1/awards/1/", "method": "post", "request_object": {}}]))
+    assert load_corpus(endpoint_testing_data) == [
+        CorpusRequest("POST /api/v1/awards/1/", "POST", "/api/v1/awards/1/", {})
+    ]
+
+
+def test_percentile():
+    timings = list(range(1, 101))
+    assert percentile(timings, 50) == 50
+    assert percentile(timings, 95) == 95
+    assert percentile(timings, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([3, 1, 2], 50) == 2
+
+
+def test_parse_server_timing():
+    metrics = parse_server_timing('sql;dur=12.5;desc="4", es;dur=30;desc="1", total;dur=50')
+    assert (metrics.sql_count, metrics.sql_seconds, metrics.es_count, metrics.es_seconds) == (4, 0.0125, 1, 0.03)
+    assert parse_server_timing("total;dur=50") is None
+    assert parse_server_timing(None) is None
+
+
+def make_metrics(sql_queries, es_requests):
+    metrics = RequestRecorder()
+    metrics.sql_count, metrics.sql_seconds = sql_queries, sql_queries / 1000
+    metrics.es_count, metrics.es_seconds = es_requests, es_requests / 100
+    return metrics
+
+
+def test_summarize():
+    samples = [Sample("award", 200, float(milliseconds), make_metrics(3, 0)) for milliseconds in range(1, 21)]
+    samples += [Sample("search", 200, 40.0, make_metrics(1, 2)), Sample("search", 422, 2.0, None)]
+    summary = summarize(samples)
+
+    assert summary["award"] == {
+        "requests": 20,
+        "errors": 0,
+        "p50_ms": 10.0,
+        "p95_ms": 19.0,
+        "p99_ms": 20.0,
+        "sql_queries": 3.0,
+        "sql_ms": 3.0,
+        "es_requests": 0.0,
+        "es_ms": 0.0,
+    }
+    assert summary["search"]["errors"] == 1
+    assert summary["search"]["p50_ms"] == 2.0
+    assert summary["search"]["es_requests"] == 2.0
+
+
+def test_compare_to_baseline():
+    baseline = {
+        "award": {"errors": 0, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0, "sql_queries": 3.0, "es_requests": 0.0},
+        "retired": {"errors": 0, "p50_ms": 1.0},
+    }
+    within_tolerance = {
+        "award": {"errors": 0, "p50_ms": 11.9, "p95_ms": 24.0, "p99_ms": 10.0, "sql_queries": 3.0, "es_requests": 0.0},
+        "new": {"errors": 3, "p50_ms": 500.0},
+    }
+    assert compare_to_baseline(within_tolerance, baseline, 0.2) == []
+
+    regressed = {
+        "award": {"errors": 1, "p50_ms": 13.5, "p95_ms": 20.0, "p99_ms": 30.0, "sql_queries": 4.0, "es_requests": 1.0}
+    }
+    assert compare_to_baseline(regressed, baseline, 0.2) == [
+        "award: 1 errors, baseline 0",
+        "award: p50_ms 13.5, baseline 10.0",
+        "award: sql_queries 4.0, baseline 3.0",
+        "award: es_requests 1.0, baseline 0.0",
+    ]
+    assert compare_to_baseline(regressed, baseline, 0.5) == [
+        "award: 1 errors, baseline 0",
+        "award: es_requests 1.0, baseline 0.0",
+    ]
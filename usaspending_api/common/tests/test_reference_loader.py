@@ -0,0 +1,114 @@
+import pytest
+
+from psycopg2.sql import SQL
+from usaspending_api.common.etl.reference_loader import ReferenceLoaderCommand
+from usaspending_api.common.helpers.sql_helpers import execute_dml_sql, execute_sql
+
+
+class Loader(ReferenceLoaderCommand):
+
+    destination_table_name = "reference_loader_test_table"
+    natural_key_columns = ["code", "variant"]
+    source_columns = ["code", "variant", "name", "year"]
+    update_overrides = {"updated": SQL("true")}
+
+    def __init__(self, rows, retired_keys=(), **attributes):
+        super().__init__()
+        self.rows = rows
+        self.retired_keys = retired_keys
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    def read_source(self):
+        return self.rows
+
+    def read_retired_keys(self):
+        return self.retired_keys
+
+
+@pytest.fixture
+def reference_table(db):
+    execute_dml_sql(
+        """
+        create table reference_loader_test_table (
+            id serial primary key,
+            code text not null,
+            variant text,
+            name text,
+            year int,
+            updated boolean not null default false
+        );
+        insert into reference_loader_test_table (code, variant, name, year) values
+            ('A', null, 'Apple', 2017),
+            ('A', 'x', 'Apple X', 2017),
+            ('B', null, 'Banana', 2017),
+            ('C', null, 'Cherry', 2017);
+        """
+    )
+
+
+def _rows():
+    sql = "select code, variant, name, year, updated from reference_loader_test_table order by code, variant"
+    return execute_sql(sql, read_only=False)
+
+
+@pytest.mark.django_db
+def test_diff_and_merge(reference_table):
+    rows = [
+        ("A", None, "Apple", 2017),  # unchanged
+        ("A", "x", "Apple\tX\\", 2020),  # updated
+        ("B", None, "Banana", 2017),  # unchanged
+        ("B", None, "Banana", 2017),  # exact duplicate
+        ("D", None, "", None),  # inserted
+    ]
+
+    report = Loader(rows).load()
+    assert (report.inserted, report.updated, report.deleted, report.unchanged, report.retained) == (1, 1, 0, 2, 1)
+    assert report.samples == {"insert": [{"code": "D", "variant": None}], "update": [{"code": "A", "variant": "x"}]}
+    assert _rows() == [
+        ("A", None, "Apple", 2017, False),
+        ("A", "x", "Apple\tX\\", 2020, True),
+        ("B", None, "Banana", 2017, False),
+        ("C", None, "Cherry", 2017, False),
+        ("D", None, "", None, False),
+    ]
+
+    report = Loader(rows, delete_missing_rows=True).load()
+    assert (report.inserted, report.updated, report.deleted, report.unchanged) == (0, 0, 1, 4)
+    assert [row[0] for row in _rows()] == ["A", "A", "B", "D"]
+
+
+@pytest.mark.django_db
+def test_dry_run(reference_table):
+    before = _rows()
+    report = Loader([("A", None, "Avocado", 2017), ("E", None, "Elderberry", 2017)], delete_missing_rows=True).load(
+        dry_run=True
+    )
+    assert report.dry_run is True
+    assert (report.inserted, report.updated, report.deleted) == (1, 1, 3)
+    assert _rows() == before
+
+
+@pytest.mark.django_db
+def test_merge_expressions_and_retired_keys(reference_table):
+    loader = Loader(
+        [("A", None, "Apricot", 2015), ("B", None, "Blueberry", 2018)],
+        retired_keys=[("C", None)],
+        merge_expressions={
+            "name": SQL("case when d.year >= s.year then d.name else s.name end"),
+            "year": SQL("greatest(d.year, s.year)"),
+        },
+    )
+    report = loader.load()
+    assert (report.updated, report.deleted, report.retained) == (1, 1, 1)
+    assert _rows() == [
+        ("A", None, "Apple", 2017, False),
+        ("A", "x", "Apple X", 2017, False),
+        ("B", None, "Blueberry", 2018, True),
+    ]
+
+
+@pytest.mark.django_db
+def test_conflicting_natural_keys(reference_table):
+    with pytest.raises(RuntimeError):
+        Loader([("A", None, "Apple", 2017), ("A", None, "Avocado", 2017)]).load()
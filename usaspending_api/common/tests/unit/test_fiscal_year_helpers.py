@@ -216,3 +216,35 @@ def test_get_quarter_from_period():
     assert fyh.get_quarter_from_period("1") is None
     assert fyh.get_quarter_from_period("a") is None
     assert fyh.get_quarter_from_period({"hello": "there"}) is None
+
+
+def test_fill_missing_fiscal_periods():
+    assert fyh.fill_missing_fiscal_periods([], "quarter", {"amount": 0}) == []
+
+    rows = [{"fiscal_year": 2020, "amount": 1}, {"fiscal_year": 2018, "amount": 2}]
+    assert fyh.fill_missing_fiscal_periods(rows, "fiscal_year", {"amount": 0}) == [
+        {"fiscal_year": 2018, "amount": 2},
+        {"fiscal_year": 2019, "amount": 0},
+        {"fiscal_year": 2020, "amount": 1},
+    ]
+
+    rows = [{"fiscal_year": 2021, "quarter": 1, "amount": 1}, {"fiscal_year": 2020, "quarter": 3, "amount": 2}]
+    assert fyh.fill_missing_fiscal_periods(rows, "quarter", {"amount": 0}) == [
+        {"fiscal_year": 2020, "quarter": 3, "amount": 2},
+        {"fiscal_year": 2020, "quarter": 4, "amount": 0},
+        {"fiscal_year": 2021, "quarter": 1, "amount": 1},
+    ]
+
+    rows = [{"fiscal_year": 2020, "month": 12, "amount": 1}, {"fiscal_year": 2021, "month": 2, "amount": 2}]
+    assert fyh.fill_missing_fiscal_periods(rows, "month", {"amount": 0}) == [
+        {"fiscal_year": 2020, "month": 12, "amount": 1},
+        {"fiscal_year": 2021, "month": 2, "amount": 2},
+    ]
+
+    rows = [{"fiscal_year": 2020, "month": 11, "amount": 1}, {"fiscal_year": 2021, "month": 3, "amount": 2}]
+    assert fyh.fill_missing_fiscal_periods(rows, "month", {"amount": 0}) == [
+        {"fiscal_year": 2020, "month": 11, "amount": 1},
+        {"fiscal_year": 2020, "month": 12, "amount": 0},
+        {"fiscal_year": 2021, "month": 2, "amount": 0},
+        {"fiscal_year": 2021, "month": 3, "amount": 2},
+    ]
@@ -0,0 +1,17 @@
+from usaspending_api.common.helpers.hyperloglog_helpers import build_sketch, estimate_cardinality, merge_sketches
+
+
+def test_estimate_cardinality():
+    assert estimate_cardinality(build_sketch([])) == 0
+    assert estimate_cardinality(build_sketch(["1", "2", "2", "3"])) == 3
+
+    estimate = estimate_cardinality(build_sketch(range(50000)))
+    assert abs(estimate - 50000) < 50000 * 0.1
+
+
+def test_merged_sketches_count_shared_values_once():
+    first_year = build_sketch(range(0, 6000))
+    second_year = build_sketch(range(4000, 10000))
+
+    assert merge_sketches(first_year, second_year) == build_sketch(range(10000))
+    assert abs(estimate_cardinality(merge_sketches(first_year, second_year)) - 10000) < 10000 * 0.1
@@ -0,0 +1,118 @@
+import datetime
+import itertools
+import json
+import pytest
+
+from decimal import Decimal
+from django.conf import settings
+
+from usaspending_api.awards.v2.views.subawards import SubawardsViewSet
+from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.common.helpers.keyset_pagination import keyset_index_definitions, KeysetPagination
+
+
+ROWS = [
+    {"a": 1, "b": 2, "id": 1},
+    {"a": 1, "b": None, "id": 2},
+    {"a": None, "b": 1, "id": 3},
+    {"a": 2, "b": 1, "id": 4},
+    {"a": None, "b": None, "id": 5},
+    {"a": 2, "b": 1, "id": 6},
+    {"a": 1, "b": 2, "id": 7},
+    {"a": None, "b": 1, "id": 8},
+]
+
+
+def _sort_key(row, columns, nulls_low):
+    return tuple((1, row[c]) if row[c] is not None else (0 if nulls_low else 2, 0) for c in columns)
+
+
+def _matches(row, conditions):
+    for column, operator, value in conditions:
+        if operator in ("is null", "is not null"):
+            if (row[column] is None) != (operator == "is null"):
+                return False
+        elif row[column] is None:
+            return False
+        elif not {"=": row[column] == value, ">": row[column] > value, "<": row[column] < value}[operator]:
+            return False
+    return True
+
+
+@pytest.mark.parametrize(
+    "sort_columns,order,nulls_low", itertools.product([["a"], ["a", "b"], ["id"]], ["asc", "desc"], [True, False])
+)
+def test_rows_after_cursor_follow_it_in_order(sort_columns, order, nulls_low):
+    pagination = KeysetPagination(sort_columns, ["id"], order, nulls_low)
+    columns = [key.column for key in pagination.keys]
+    expected = sorted(ROWS, key=lambda row: _sort_key(row, columns, nulls_low), reverse=order == "desc")
+
+    for position, row in enumerate(expected):
+        values = pagination.decode_cursor(pagination.encode_cursor(row))
+        cases = pagination._conditions_after(values)
+        after = [r for r in expected if any(_matches(r, conditions) for conditions in cases)]
+        assert after == expected[position + 1 :]
+
+
+def test_cursor_round_trip():
+    pagination = KeysetPagination(["action_date", "amount"], ["id"], "desc")
+    row = {"action_date": datetime.date(2020, 4, 1), "amount": Decimal("12.50"), "id": 7, "other": "ignored"}
+    assert pagination.decode_cursor(pagination.encode_cursor(row)) == ["2020-04-01", "12.50", 7]
+
+
+def test_cursor_only_valid_for_its_sort_and_order():
+    cursor = KeysetPagination("a", ["id"], "desc").encode_cursor({"a": 1, "id": 2})
+    with pytest.raises(InvalidParameterException):
+        KeysetPagination("a", ["id"], "asc").decode_cursor(cursor)
+    with pytest.raises(InvalidParameterException):
+        KeysetPagination("b", ["id"], "desc").decode_cursor(cursor)
+    for bogus in ("not a cursor", "", "W10=", "e30="):
+        with pytest.raises(InvalidParameterException):
+            KeysetPagination("a", ["id"], "desc").decode_cursor(bogus)
+
+
+def test_page_metadata():
+    pagination = KeysetPagination("a", ["id"], "asc")
+    rows = [{"a": 1, "id": 1}, {"a": 2, "id": 2}, {"a": 3, "id": 3}]
+
+    metadata = pagination.page_metadata(rows, {"limit": 2, "cursor": None})
+    assert metadata["cursor"] is None
+    assert pagination.decode_cursor(metadata["next_cursor"]) == [2, 2]
+    assert metadata["hasNext"] is True
+    assert metadata["hasPrevious"] is False
+
+    metadata = pagination.page_metadata(rows[2:], {"limit": 2, "cursor": "abc"})
+    assert metadata == {"cursor": "abc", "next_cursor": None, "hasNext": False, "hasPrevious": True}
+
+    assert pagination.page_metadata(rows, {"limit": 2, "page": 3}) == {
+        "page": 3,
+        "next": 4,
+        "previous": 2,
+        "hasNext": True,
+        "hasPrevious": True,
+    }
+
+
+def test_keyset_index_definitions():
+    indexes = keyset_index_definitions("t", "award_id", ["id", "amount"], ["id"], nulls_low=True)
+    assert indexes == [
+        {"name": "t_id", "columns": [{"name": "award_id"}, {"name": "id", "order": "DESC NULLS LAST"}]},
+        {
+            "name": "t_amount",
+            "columns": [
+                {"name": "award_id"},
+                {"name": "amount", "order": "DESC NULLS LAST"},
+                {"name": "id", "order": "DESC NULLS LAST"},
+            ],
+        },
+    ]
+
+    with pytest.raises(ValueError):
+        keyset_index_definitions("t", "award_id", ["related__name"], ["id"])
+
+
+def test_subaward_view_has_keyset_indexes():
+    with open(str(settings.APP_DIR / "database_scripts" / "matview_generator" / "subaward_view.json")) as f:
+        matview_indexes = [index["columns"] for index in json.load(f)["indexes"]]
+    for index in SubawardsViewSet.keyset_indexes:
+        assert index["columns"] in matview_indexes
@@ -0,0 +1,127 @@
+import pytest
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from elasticsearch.transport import Transport
+from unittest.mock import Mock
+
+from usaspending_api.common import request_instrumentation
+from usaspending_api.common.logging import LoggingMiddleware
+from usaspending_api.common.request_instrumentation import (
+    RecordingTransport,
+    RequestRecorder,
+    fingerprint_sql,
+    get_request_recorder,
+    record_cache_lookups,
+    recording,
+)
+
+
+def run_request(view, **headers):
+    middleware = LoggingMiddleware(view)
+    response = middleware(RequestFactory().get("/api/v2/references/toptier_agencies/", **headers))
+    return middleware.log, response
+
+
+def test_fingerprint_sql():
+    assert fingerprint_sql("SELECT *\n  FROM award WHERE id IN (1, 2, 3) AND piid = 'AB''1'") == (
+        "SELECT * FROM award WHERE id IN (?) AND piid = ?"
+    )
+    assert fingerprint_sql("select * from award where id = %s and total > 10.5") == (
+        "select * from award where id = ? and total > ?"
+    )
+    assert fingerprint_sql("select col_2 from t2") == "select col_2 from t2"
+
+
+def test_recording_transport(monkeypatch):
+    responses = {"/transactions/_search": {"took": 7, "hits": {}}, "/transactions/_count": {"count": 3}}
+    monkeypatch.setattr(Transport, "perform_request", lambda transport, method, url, **kwargs: responses[url])
+    transport = RecordingTransport.__new__(RecordingTransport)
+
+    assert transport.perform_request("GET", "/transactions/_count") == {"count": 3}
+    with recording(RequestRecorder()) as recorder:
+        assert transport.perform_request("POST", "/transactions/_search", body={}) == {"took": 7, "hits": {}}
+        assert transport.perform_request("GET", "/transactions/_count") == {"count": 3}
+    assert recorder.es_count == 2
+    assert recorder.es_took_ms == 7
+    assert get_request_recorder() is None
+
+
+def test_nested_recording_restores_outer_recorder():
+    with recording(RequestRecorder()) as outer:
+        with recording(RequestRecorder()) as inner:
+            assert get_request_recorder() is inner
+        assert get_request_recorder() is outer
+    assert get_request_recorder() is None
+
+
+@pytest.mark.django_db
+def test_sampled_request(settings):
+    settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE = 1
+    settings.REQUEST_INSTRUMENTATION_SERVER_TIMING = True
+
+    def view(request):
+        with connection.cursor() as cursor:
+            cursor.execute("select %s", [1])
+            cursor.execute("select 'slow', pg_sleep(0.05)")
+        record_cache_lookups(hits=2, misses=1)
+        return HttpResponse()
+
+    log, response = run_request(view)
+
+    instrumentation = log["instrumentation"]
+    assert instrumentation["sql_count"] == 2
+    assert instrumentation["sql_ms"] >= instrumentation["slowest_sql_ms"] >= 50
+    assert instrumentation["slowest_sql"] == "select ?, pg_sleep(?)"
+    assert len(instrumentation["slowest_sql_fingerprint"]) == 32
+    assert instrumentation["es_count"] == 0
+    assert instrumentation["cache_hits"] == 2
+    assert instrumentation["cache_misses"] == 1
+
+    assert response["Server-Timing"].startswith("sql;dur=")
+    assert 'cache-hit;desc="2"' in response["Server-Timing"]
+    assert get_request_recorder() is None
+
+    # Inside another recording, such as benchmark_api's, the request is reported with that one
+    with recording(RequestRecorder()) as recorder:
+        log, _ = run_request(view)
+    assert recorder.sql_count == log["instrumentation"]["sql_count"] == 2
+
+
+@pytest.mark.django_db
+def test_instrumentation_header(settings):
+    settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE = 0
+    settings.REQUEST_INSTRUMENTATION_SERVER_TIMING = False
+
+    settings.ALLOW_INSTRUMENTATION_HEADER = False
+    log, _ = run_request(lambda request: HttpResponse(), HTTP_X_INSTRUMENT_REQUEST="true")
+    assert "instrumentation" not in log
+
+    settings.ALLOW_INSTRUMENTATION_HEADER = True
+    log, response = run_request(lambda request: HttpResponse(), HTTP_X_INSTRUMENT_REQUEST="true")
+    assert log["instrumentation"]["sql_count"] == 0
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_disabled_instrumentation_adds_no_per_query_work(settings, monkeypatch):
+    settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE = 0
+    settings.REQUEST_INSTRUMENTATION_SERVER_TIMING = True
+    timer = Mock(side_effect=AssertionError("instrumentation timed a query"))
+    monkeypatch.setattr(request_instrumentation, "perf_counter", timer)
+    execute_wrappers = list(connection.execute_wrappers)
+
+    def view(request):
+        assert get_request_recorder() is None
+        assert connection.execute_wrappers == execute_wrappers
+        with connection.cursor() as cursor:
+            cursor.execute("select 1")
+        record_cache_lookups(hits=1)
+        return HttpResponse()
+
+    log, response = run_request(view)
+
+    timer.assert_not_called()
+    assert "instrumentation" not in log
+    assert "Server-Timing" not in response
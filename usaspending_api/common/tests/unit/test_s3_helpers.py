@@ -0,0 +1,159 @@
+import io
+import os
+import pytest
+import zipfile
+
+from botocore.exceptions import ClientError
+from moto import mock_s3
+
+from usaspending_api.common.helpers import s3_helpers
+from usaspending_api.common.helpers.s3_helpers import (
+    MIN_PART_SIZE,
+    S3MultipartUploadSink,
+    access_s3_object,
+    download_s3_object,
+    get_s3_client,
+    list_s3_bucket_objects,
+    list_s3_bucket_objects_by_prefix,
+    stream_s3_object,
+    stream_s3_object_lines,
+)
+from usaspending_api.download.filestreaming.zip_file import write_files_to_zip_stream
+
+BUCKET = "bulk-download"
+REGION = "us-east-1"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(s3_helpers.time, "sleep", lambda seconds: None)
+    get_s3_client.cache_clear()  # clients must be created inside the mock
+    with mock_s3():
+        client = get_s3_client(REGION)
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+    get_s3_client.cache_clear()
+
+
+def _read(client, key):
+    return client.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+
+
+def _sink(key, **kwargs):
+    return S3MultipartUploadSink(BUCKET, key, region_name=REGION, part_size=MIN_PART_SIZE, max_workers=2, **kwargs)
+
+
+def test_small_object_is_a_single_put(s3):
+    with _sink("small.txt") as sink:
+        sink.write(b"hello ")
+        sink.write(b"world")
+
+    assert _read(s3, "small.txt") == b"hello world"
+    assert sink.bytes_written == 11
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads") is None
+
+
+def test_parts_are_uploaded_while_writing(s3):
+    data = os.urandom(2 * MIN_PART_SIZE + 1234)
+    with _sink("large.bin") as sink:
+        for start in range(0, len(data), 1024 * 1024):
+            sink.write(data[start : start + 1024 * 1024])
+        # Two full parts have been handed to the upload threads before the writer is done
+        assert len(sink._futures) == 2
+
+    assert _read(s3, "large.bin") == data
+    assert sink.bytes_written == len(data)
+
+
+def test_zip_archive_is_compressed_into_s3(s3, tmp_path):
+    file_paths = []
+    for name in ("Contracts_1.csv", "Contracts_2.csv", "Data_Dictionary_Crosswalk.xlsx"):
+        path = tmp_path / name
+        path.write_bytes(os.urandom(3 * 1024 * 1024))  # incompressible, so the archive spans several parts
+        file_paths.append(str(path))
+
+    with _sink("download.zip") as sink:
+        write_files_to_zip_stream(file_paths, sink)
+
+    with zipfile.ZipFile(io.BytesIO(_read(s3, "download.zip"))) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["Contracts_1.csv", "Contracts_2.csv", "Data_Dictionary_Crosswalk.xlsx"]
+        assert archive.read("Contracts_2.csv") == (tmp_path / "Contracts_2.csv").read_bytes()
+
+
+def test_failed_part_is_retried(s3, monkeypatch):
+    upload_part = s3.upload_part
+    calls = []
+
+    def flaky_upload_part(**kwargs):
+        calls.append(kwargs["PartNumber"])
+        if len(calls) == 1:
+            raise ClientError({"Error": {"Code": "SlowDown", "Message": "Slow down"}}, "UploadPart")
+        return upload_part(**kwargs)
+
+    monkeypatch.setattr(s3, "upload_part", flaky_upload_part)
+    data = os.urandom(MIN_PART_SIZE + 10)
+    with _sink("retried.bin") as sink:
+        sink.write(data)
+
+    assert sorted(calls) == [1, 1, 2]
+    assert _read(s3, "retried.bin") == data
+
+
+def test_failed_upload_is_aborted(s3, monkeypatch):
+    def failing_upload_part(**kwargs):
+        raise ClientError({"Error": {"Code": "InternalError", "Message": "Broken"}}, "UploadPart")
+
+    monkeypatch.setattr(s3, "upload_part", failing_upload_part)
+    with pytest.raises(ClientError):
+        with _sink("aborted.bin") as sink:
+            sink.write(os.urandom(MIN_PART_SIZE + 10))
+
+    assert sink.closed
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads") is None
+    assert s3.list_objects_v2(Bucket=BUCKET).get("Contents") is None
+
+
+def test_clients_are_shared_per_region_and_endpoint(s3):
+    assert get_s3_client(REGION) is s3
+    assert get_s3_client(REGION, "http://localhost:9000") is not s3
+    assert get_s3_client(REGION, "http://localhost:9000") is get_s3_client(REGION, "http://localhost:9000")
+
+
+def test_ranged_reads_are_reassembled_in_order(s3, tmp_path):
+    data = os.urandom(10 * 1024 + 7)
+    s3.put_object(Bucket=BUCKET, Key="object.bin", Body=data)
+
+    chunks = list(stream_s3_object(BUCKET, "object.bin", REGION, range_size=1024, max_workers=4))
+    assert [len(chunk) for chunk in chunks] == [1024] * 10 + [7]
+    assert b"".join(chunks) == data
+
+    destination = tmp_path / "object.bin"
+    download_s3_object(BUCKET, "object.bin", destination, REGION)
+    assert destination.read_bytes() == data
+    assert access_s3_object(BUCKET, "object.bin").read() == data
+
+    s3.put_object(Bucket=BUCKET, Key="empty.bin", Body=b"")
+    assert list(stream_s3_object(BUCKET, "empty.bin", REGION)) == []
+
+
+def test_stream_object_lines(s3):
+    s3.put_object(Bucket=BUCKET, Key="ids.csv", Body="id\r\nabc\r\ndéf\n".encode())
+    assert list(stream_s3_object_lines(BUCKET, "ids.csv", REGION)) == ["id", "abc", "déf"]
+
+
+def test_listing_with_prefix_and_start_after(s3):
+    keys = [f"08-0{day}-2020_FABSdeletions_{n}.csv" for day in (1, 2, 3) for n in range(3)]
+    for key in keys:
+        s3.put_object(Bucket=BUCKET, Key=key, Body=b"")
+
+    listed = list_s3_bucket_objects(BUCKET, prefix="08-02-2020", region_name=REGION)
+    assert [obj["Key"] for obj in listed] == keys[3:6]
+
+    listed = list_s3_bucket_objects(BUCKET, start_after=keys[4], region_name=REGION)
+    assert [obj["Key"] for obj in listed] == keys[5:]
+
+    listed = list_s3_bucket_objects_by_prefix(BUCKET, ["08-01-2020", "08-03-2020"], region_name=REGION)
+    assert sorted(obj["Key"] for obj in listed) == keys[:3] + keys[6:]
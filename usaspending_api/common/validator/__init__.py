@@ -3,12 +3,13 @@ from usaspending_api.common.validator.award import (
     get_internal_award_id_model,
     get_internal_or_generated_award_id_model,
 )
-from usaspending_api.common.validator.pagination import PAGINATION, customize_pagination_with_sort_columns
+from usaspending_api.common.validator.pagination import CURSOR, PAGINATION, customize_pagination_with_sort_columns
 from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.common.validator.utils import get_model_by_name, update_model_in_list
 
 
 __all__ = [
+    "CURSOR",
     "customize_pagination_with_sort_columns",
     "get_generated_award_id_model",
     "get_internal_award_id_model",
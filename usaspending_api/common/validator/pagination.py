@@ -16,6 +16,12 @@ for p in PAGINATION:
     p["key"] = p["name"]
 
 
+# Opt-in keyset pagination for endpoints that support it: null requests the first page and each response's
+# page_metadata supplies the "next_cursor" for the one after.  There is deliberately no default so views can tell a
+# null cursor from none at all.  See usaspending_api/common/helpers/keyset_pagination.py.
+CURSOR = {"key": "cursor", "name": "cursor", "type": "text", "text_type": "raw", "optional": True, "allow_nulls": True}
+
+
 def customize_pagination_with_sort_columns(sortable_columns, default_sort_column=None, pagination=None):
     """
     A common customization to TinyShield pagination rules is to enumerate the
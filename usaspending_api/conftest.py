@@ -94,6 +94,7 @@ def django_db_setup(
             generate_matviews(materialized_views_as_traditional_views=True)
             ensure_view_exists(settings.ES_TRANSACTIONS_ETL_VIEW_NAME)
             ensure_view_exists(settings.ES_AWARDS_ETL_VIEW_NAME)
+            ensure_view_exists(settings.ES_SUBAWARDS_ETL_VIEW_NAME)
             ensure_business_categories_functions_exist()
             call_command("load_broker_static_data")
 
@@ -138,6 +139,21 @@ def elasticsearch_award_index(db):
         elastic_search_index.delete_index()
 
 
+@pytest.fixture
+def elasticsearch_subaward_index(db):
+    """
+    Add this fixture to your test if you intend to use the Elasticsearch
+    subaward index.  To use, create some mock database data then call
+    elasticsearch_subaward_index.update_index to populate Elasticsearch.
+
+    See test_subaward_elasticsearch_parity.py for sample usage.
+    """
+    elastic_search_index = TestElasticSearchIndex("subawards")
+    with override_settings(ES_SUBAWARDS_QUERY_ALIAS_PREFIX=elastic_search_index.alias_prefix):
+        yield elastic_search_index
+        elastic_search_index.delete_index()
+
+
 @pytest.fixture(scope="session")
 def broker_db_setup(django_db_setup, django_db_use_migrations):
     """Fixture to use during a pytest session if you will run integration tests that requires an actual broker
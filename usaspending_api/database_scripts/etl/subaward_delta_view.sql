@@ -0,0 +1,321 @@
+-- Needs to be present in the Postgres DB if data needs to be retrieved for Elasticsearch
+-- Column expressions mirror "subaward_view" so results from the subaward index match the Postgres implementation
+DROP VIEW IF EXISTS subaward_delta_view;
+
+CREATE VIEW subaward_delta_view AS
+SELECT
+  sub.id AS subaward_id,
+  sub.subaward_number,
+  sub.updated_at AS update_date,
+
+  sub.award_id,
+  sub.unique_award_key AS generated_unique_award_id,
+  COALESCE(sub.piid, sub.fain) AS display_award_id,
+  sub.piid,
+  sub.fain,
+  sub.award_type,
+  sub.prime_award_type,
+  sub.description,
+  COALESCE(sub.amount, 0)::NUMERIC(23, 2) AS amount,
+  sub.action_date,
+  fy(sub.action_date) AS fiscal_year,
+
+  sub.recipient_unique_id,
+  UPPER(COALESCE(recipient_lookup.legal_business_name, sub.recipient_name)) AS recipient_name,
+  CASE
+    WHEN RECIPIENT_HASH_AND_LEVEL.recipient_hash IS NULL OR RECIPIENT_HASH_AND_LEVEL.recipient_level IS NULL
+      THEN CONCAT(
+        '{"hash_with_level": "","name":"', UPPER(COALESCE(recipient_lookup.legal_business_name, sub.recipient_name)),
+        '","unique_id":"', sub.recipient_unique_id, '"}'
+      )
+    ELSE
+      CONCAT(
+        '{"hash_with_level":"', CONCAT(RECIPIENT_HASH_AND_LEVEL.recipient_hash, '-', RECIPIENT_HASH_AND_LEVEL.recipient_level),
+        '","name":"', UPPER(COALESCE(recipient_lookup.legal_business_name, sub.recipient_name)),
+        '","unique_id":"', sub.recipient_unique_id, '"}'
+      )
+  END AS recipient_agg_key,
+  sub.parent_recipient_unique_id,
+  UPPER(COALESCE(parent_recipient_lookup.legal_business_name, sub.parent_recipient_name)) AS parent_recipient_name,
+  sub.business_categories,
+
+  sub.awarding_agency_id,
+  sub.funding_agency_id,
+  sub.awarding_toptier_agency_name,
+  sub.awarding_subtier_agency_name,
+  sub.funding_toptier_agency_name,
+  sub.funding_subtier_agency_name,
+  sub.awarding_toptier_agency_abbreviation,
+  sub.funding_toptier_agency_abbreviation,
+  sub.awarding_subtier_agency_abbreviation,
+  sub.funding_subtier_agency_abbreviation,
+  CASE
+    WHEN sub.awarding_toptier_agency_name IS NOT NULL
+      THEN CONCAT(
+        '{"name":"', sub.awarding_toptier_agency_name,
+        '","abbreviation":"', sub.awarding_toptier_agency_abbreviation,
+        '","id":"', AWARDING_TOPTIER.id, '"}'
+      )
+    ELSE NULL
+  END AS awarding_toptier_agency_agg_key,
+  CASE
+    WHEN sub.awarding_subtier_agency_name IS NOT NULL
+      THEN CONCAT(
+        '{"name":"', sub.awarding_subtier_agency_name,
+        '","abbreviation":"', sub.awarding_subtier_agency_abbreviation,
+        '","id":"', AWARDING_SUBTIER.id, '"}'
+      )
+    ELSE NULL
+  END AS awarding_subtier_agency_agg_key,
+  CASE
+    WHEN sub.funding_toptier_agency_name IS NOT NULL
+      THEN CONCAT(
+        '{"name":"', sub.funding_toptier_agency_name,
+        '","abbreviation":"', sub.funding_toptier_agency_abbreviation,
+        '","id":"', FUNDING_TOPTIER.id, '"}'
+      )
+    ELSE NULL
+  END AS funding_toptier_agency_agg_key,
+  CASE
+    WHEN sub.funding_subtier_agency_name IS NOT NULL
+      THEN CONCAT(
+        '{"name":"', sub.funding_subtier_agency_name,
+        '","abbreviation":"', sub.funding_subtier_agency_abbreviation,
+        '","id":"', FUNDING_SUBTIER.id, '"}'
+      )
+    ELSE NULL
+  END AS funding_subtier_agency_agg_key,
+
+  sub.cfda_number,
+  sub.cfda_title,
+  CASE
+    WHEN sub.cfda_number IS NOT NULL
+      THEN CONCAT(
+        '{"code":"', sub.cfda_number,
+        '","description":"', CFDA.program_title,
+        '","id":"', CFDA.id, '"}'
+      )
+    ELSE NULL
+  END AS cfda_agg_key,
+
+  sub.type_of_contract_pricing,
+  sub.type_set_aside,
+  sub.extent_competed,
+  sub.product_or_service_code,
+  psc.description AS product_or_service_description,
+
+  COALESCE(sub.pop_country_code, 'USA') AS pop_country_code,
+  sub.pop_country_name,
+  sub.pop_state_code,
+  POP.county_code AS pop_county_code,
+  sub.pop_county_name,
+  LEFT(COALESCE(sub.pop_zip4, ''), 5) AS pop_zip5,
+  POP.congressional_code AS pop_congressional_code,
+  sub.pop_city_name,
+  CASE
+    WHEN sub.pop_state_code IS NOT NULL AND POP.county_code IS NOT NULL
+      THEN CONCAT(
+        '{"country_code":"', COALESCE(sub.pop_country_code, 'USA'),
+        '","state_code":"', sub.pop_state_code,
+        '","state_fips":"', POP_STATE_LOOKUP.fips,
+        '","county_code":"', POP.county_code,
+        '","county_name":"', sub.pop_county_name,
+        '","population":"', POP_COUNTY_POPULATION.latest_population, '"}'
+      )
+    ELSE NULL
+  END AS pop_county_agg_key,
+  CASE
+    WHEN sub.pop_state_code IS NOT NULL AND POP.congressional_code IS NOT NULL
+      THEN CONCAT(
+        '{"country_code":"', COALESCE(sub.pop_country_code, 'USA'),
+        '","state_code":"', sub.pop_state_code,
+        '","state_fips":"', POP_STATE_LOOKUP.fips,
+        '","congressional_code":"', POP.congressional_code,
+        '","population":"', POP_DISTRICT_POPULATION.latest_population, '"}'
+      )
+    ELSE NULL
+  END AS pop_congressional_agg_key,
+  CASE
+    WHEN sub.pop_state_code IS NOT NULL
+      THEN CONCAT(
+        '{"country_code":"', COALESCE(sub.pop_country_code, 'USA'),
+        '","state_code":"', sub.pop_state_code,
+        '","state_name":"', POP_STATE_LOOKUP.name,
+        '","population":"', POP_STATE_POPULATION.latest_population, '"}'
+      )
+    ELSE NULL
+  END AS pop_state_agg_key,
+  CONCAT(
+    '{"country_code":"', COALESCE(sub.pop_country_code, 'USA'),
+    '","country_name":"', POP_COUNTRY_LOOKUP.country_name, '"}'
+  ) AS pop_country_agg_key,
+
+  COALESCE(sub.recipient_location_country_code, 'USA') AS recipient_location_country_code,
+  sub.recipient_location_country_name,
+  sub.recipient_location_state_code,
+  RL.county_code AS recipient_location_county_code,
+  sub.recipient_location_county_name,
+  LEFT(COALESCE(sub.recipient_location_zip4, ''), 5) AS recipient_location_zip5,
+  RL.congressional_code AS recipient_location_congressional_code,
+  sub.recipient_location_city_name,
+  CASE
+    WHEN sub.recipient_location_state_code IS NOT NULL AND RL.county_code IS NOT NULL
+      THEN CONCAT(
+        '{"country_code":"', COALESCE(sub.recipient_location_country_code, 'USA'),
+        '","state_code":"', sub.recipient_location_state_code,
+        '","state_fips":"', RL_STATE_LOOKUP.fips,
+        '","county_code":"', RL.county_code,
+        '","county_name":"', sub.recipient_location_county_name,
+        '","population":"', RL_COUNTY_POPULATION.latest_population, '"}'
+      )
+    ELSE NULL
+  END AS recipient_location_county_agg_key,
+  CASE
+    WHEN sub.recipient_location_state_code IS NOT NULL AND RL.congressional_code IS NOT NULL
+      THEN CONCAT(
+        '{"country_code":"', COALESCE(sub.recipient_location_country_code, 'USA'),
+        '","state_code":"', sub.recipient_location_state_code,
+        '","state_fips":"', RL_STATE_LOOKUP.fips,
+        '","congressional_code":"', RL.congressional_code,
+        '","population":"', RL_DISTRICT_POPULATION.latest_population, '"}'
+      )
+    ELSE NULL
+  END AS recipient_location_congressional_agg_key,
+  CASE
+    WHEN sub.recipient_location_state_code IS NOT NULL
+      THEN CONCAT(
+        '{"country_code":"', COALESCE(sub.recipient_location_country_code, 'USA'),
+        '","state_code":"', sub.recipient_location_state_code,
+        '","state_name":"', RL_STATE_LOOKUP.name,
+        '","population":"', RL_STATE_POPULATION.latest_population, '"}'
+      )
+    ELSE NULL
+  END AS recipient_location_state_agg_key,
+
+  TREASURY_ACCT.tas_paths,
+  TREASURY_ACCT.tas_components,
+  DEFC.disaster_emergency_fund_codes
+
+FROM subaward sub
+LEFT JOIN psc ON (psc.code = sub.product_or_service_code)
+LEFT JOIN recipient_lookup ON (recipient_lookup.duns = sub.recipient_unique_id AND sub.recipient_unique_id IS NOT NULL)
+LEFT JOIN recipient_lookup parent_recipient_lookup ON (
+  parent_recipient_lookup.duns = sub.parent_recipient_unique_id AND sub.parent_recipient_unique_id IS NOT NULL
+)
+LEFT JOIN LATERAL (
+  SELECT   recipient_hash, recipient_level
+  FROM     recipient_profile
+  WHERE    recipient_unique_id = sub.recipient_unique_id AND (
+             recipient_name IS NULL OR recipient_name NOT IN (
+               'MULTIPLE RECIPIENTS',
+               'REDACTED DUE TO PII',
+               'MULTIPLE FOREIGN RECIPIENTS',
+               'PRIVATE INDIVIDUAL',
+               'INDIVIDUAL RECIPIENT',
+               'MISCELLANEOUS FOREIGN AWARDEES'
+             )
+           )
+  ORDER BY CASE
+             WHEN recipient_level = 'C' then 0
+             WHEN recipient_level = 'R' then 1
+             ELSE 2
+           END ASC
+  LIMIT 1
+) RECIPIENT_HASH_AND_LEVEL ON TRUE
+LEFT JOIN LATERAL (
+  SELECT a.id FROM agency a INNER JOIN toptier_agency ta ON (a.toptier_agency_id = ta.toptier_agency_id)
+  WHERE ta.name = sub.awarding_toptier_agency_name AND a.toptier_flag = TRUE ORDER BY a.id LIMIT 1
+) AWARDING_TOPTIER ON TRUE
+LEFT JOIN LATERAL (
+  SELECT a.id FROM agency a INNER JOIN subtier_agency sa ON (a.subtier_agency_id = sa.subtier_agency_id)
+  WHERE sa.name = sub.awarding_subtier_agency_name ORDER BY a.id LIMIT 1
+) AWARDING_SUBTIER ON TRUE
+LEFT JOIN LATERAL (
+  SELECT a.id FROM agency a INNER JOIN toptier_agency ta ON (a.toptier_agency_id = ta.toptier_agency_id)
+  WHERE ta.name = sub.funding_toptier_agency_name AND a.toptier_flag = TRUE ORDER BY a.id LIMIT 1
+) FUNDING_TOPTIER ON TRUE
+LEFT JOIN LATERAL (
+  SELECT a.id FROM agency a INNER JOIN subtier_agency sa ON (a.subtier_agency_id = sa.subtier_agency_id)
+  WHERE sa.name = sub.funding_subtier_agency_name ORDER BY a.id LIMIT 1
+) FUNDING_SUBTIER ON TRUE
+LEFT JOIN LATERAL (
+  SELECT c.id, c.program_title FROM references_cfda c WHERE c.program_number = sub.cfda_number ORDER BY c.id LIMIT 1
+) CFDA ON TRUE
+LEFT JOIN LATERAL (
+  SELECT
+    LPAD(CAST(CAST((REGEXP_MATCH(sub.pop_county_code, '^[A-Z]*(\d+)(?:\.\d+)?$'))[1] AS smallint) AS text), 3, '0') AS county_code,
+    LPAD(CAST(CAST((REGEXP_MATCH(sub.pop_congressional_code, '^[A-Z]*(\d+)(?:\.\d+)?$'))[1] AS smallint) AS text), 2, '0') AS congressional_code
+) POP ON TRUE
+LEFT JOIN LATERAL (
+  SELECT
+    LPAD(CAST(CAST((REGEXP_MATCH(sub.recipient_location_county_code, '^[A-Z]*(\d+)(?:\.\d+)?$'))[1] AS smallint) AS text), 3, '0') AS county_code,
+    LPAD(CAST(CAST((REGEXP_MATCH(sub.recipient_location_congressional_code, '^[A-Z]*(\d+)(?:\.\d+)?$'))[1] AS smallint) AS text), 2, '0') AS congressional_code
+) RL ON TRUE
+LEFT JOIN LATERAL (
+  SELECT country_name FROM ref_country_code WHERE country_code = COALESCE(sub.pop_country_code, 'USA') LIMIT 1
+) POP_COUNTRY_LOOKUP ON TRUE
+LEFT JOIN (
+  SELECT   code, name, fips, MAX(id)
+  FROM     state_data
+  GROUP BY code, name, fips
+) POP_STATE_LOOKUP ON (POP_STATE_LOOKUP.code = sub.pop_state_code)
+LEFT JOIN ref_population_county POP_STATE_POPULATION ON (POP_STATE_POPULATION.state_code = POP_STATE_LOOKUP.fips AND POP_STATE_POPULATION.county_number = '000')
+LEFT JOIN ref_population_county POP_COUNTY_POPULATION ON (POP_COUNTY_POPULATION.state_code = POP_STATE_LOOKUP.fips AND POP_COUNTY_POPULATION.county_number = POP.county_code)
+LEFT JOIN ref_population_cong_district POP_DISTRICT_POPULATION ON (POP_DISTRICT_POPULATION.state_code = POP_STATE_LOOKUP.fips AND POP_DISTRICT_POPULATION.congressional_district = POP.congressional_code)
+LEFT JOIN (
+  SELECT   code, name, fips, MAX(id)
+  FROM     state_data
+  GROUP BY code, name, fips
+) RL_STATE_LOOKUP ON (RL_STATE_LOOKUP.code = sub.recipient_location_state_code)
+LEFT JOIN ref_population_county RL_STATE_POPULATION ON (RL_STATE_POPULATION.state_code = RL_STATE_LOOKUP.fips AND RL_STATE_POPULATION.county_number = '000')
+LEFT JOIN ref_population_county RL_COUNTY_POPULATION ON (RL_COUNTY_POPULATION.state_code = RL_STATE_LOOKUP.fips AND RL_COUNTY_POPULATION.county_number = RL.county_code)
+LEFT JOIN ref_population_cong_district RL_DISTRICT_POPULATION ON (RL_DISTRICT_POPULATION.state_code = RL_STATE_LOOKUP.fips AND RL_DISTRICT_POPULATION.congressional_district = RL.congressional_code)
+LEFT JOIN (
+  SELECT
+    faba.award_id,
+    ARRAY_AGG(
+      DISTINCT CONCAT(
+        'agency=', agency.toptier_code,
+        'faaid=', fa.agency_identifier,
+        'famain=', fa.main_account_code,
+        'aid=', taa.agency_id,
+        'main=', taa.main_account_code,
+        'ata=', taa.allocation_transfer_agency_id,
+        'sub=', taa.sub_account_code,
+        'bpoa=', taa.beginning_period_of_availability,
+        'epoa=', taa.ending_period_of_availability,
+        'a=', taa.availability_type_code
+       )
+     ) tas_paths,
+     ARRAY_AGG(
+      DISTINCT CONCAT(
+        'aid=', taa.agency_id,
+        'main=', taa.main_account_code,
+        'ata=', taa.allocation_transfer_agency_id,
+        'sub=', taa.sub_account_code,
+        'bpoa=', taa.beginning_period_of_availability,
+        'epoa=', taa.ending_period_of_availability,
+        'a=', taa.availability_type_code
+       )
+     ) tas_components
+ FROM
+   treasury_appropriation_account taa
+   INNER JOIN financial_accounts_by_awards faba ON (taa.treasury_account_identifier = faba.treasury_account_id)
+   INNER JOIN federal_account fa ON (taa.federal_account_id = fa.id)
+   INNER JOIN toptier_agency agency ON (fa.parent_toptier_agency_id = agency.toptier_agency_id)
+ WHERE
+   faba.award_id IS NOT NULL
+ GROUP BY
+   faba.award_id
+) TREASURY_ACCT ON (TREASURY_ACCT.award_id = sub.award_id)
+LEFT JOIN (
+  SELECT
+    faba.award_id,
+    ARRAY_AGG(DISTINCT faba.disaster_emergency_fund_code) disaster_emergency_fund_codes
+  FROM
+    financial_accounts_by_awards faba
+  WHERE
+    faba.award_id IS NOT NULL AND faba.disaster_emergency_fund_code IS NOT NULL
+  GROUP BY
+    faba.award_id
+) DEFC ON (DEFC.award_id = sub.award_id);
@@ -0,0 +1,184 @@
+"""
+Maintains disaster_file_c_spending (DisasterFileCSpending), which the disaster endpoints aggregate instead of
+financial_accounts_by_awards.  Its rows sum a submission's File C records by DEFC, treasury account, object class and
+award, so they only change when a submission loads, when its File C records are linked to or unlinked from awards
+(the C to D linkage and prune_empty_awards refresh those awards), or when one of the awards they are linked to
+changes.  Which submissions are closed depends on the current date and the DABS submission window schedule, so that
+is still decided at query time by joining submission_attributes, exactly as for financial_accounts_by_awards.
+"""
+import logging
+
+from django.db import connection
+from typing import List, Optional, Sequence
+
+
+logger = logging.getLogger("script")
+
+COLUMNS = (
+    "submission_id, reporting_fiscal_year, reporting_fiscal_period, quarter_format_flag, disaster_emergency_fund_code, "
+    "treasury_account_id, federal_account_id, funding_toptier_agency_id, object_class_id, award_id, award_type, "
+    "cfda_number, recipient_hash, transaction_obligated_amount, gross_outlay_amount_by_award_cpe, total_loan_value"
+)
+
+# The recipient hash is derived as in mv_covid_financial_account
+FILE_C_SPENDING_SQL = """
+insert into {table} ({columns})
+select
+    faba.submission_id,
+    sa.reporting_fiscal_year,
+    sa.reporting_fiscal_period,
+    sa.quarter_format_flag,
+    faba.disaster_emergency_fund_code,
+    faba.treasury_account_id,
+    taa.federal_account_id,
+    taa.funding_toptier_agency_id,
+    faba.object_class_id,
+    faba.award_id,
+    a.type,
+    fabs.cfda_number,
+    case when a.id is not null then coalesce(rl.recipient_hash, md5(upper(
+        case
+            when coalesce(fpds.awardee_or_recipient_uniqu, fabs.awardee_or_recipient_uniqu) is not null
+                then concat('duns-', coalesce(fpds.awardee_or_recipient_uniqu, fabs.awardee_or_recipient_uniqu))
+            else concat('name-', coalesce(fpds.awardee_or_recipient_legal, fabs.awardee_or_recipient_legal))
+        end
+    ))::uuid) end,
+    sum(faba.transaction_obligated_amount),
+    sum(faba.gross_outlay_amount_by_award_cpe),
+    a.total_loan_value
+from
+    financial_accounts_by_awards as faba
+    inner join submission_attributes as sa on sa.submission_id = faba.submission_id
+    left outer join treasury_appropriation_account as taa on taa.treasury_account_identifier = faba.treasury_account_id
+    left outer join awards as a on a.id = faba.award_id
+    left outer join transaction_fpds as fpds on fpds.transaction_id = a.latest_transaction_id
+    left outer join transaction_fabs as fabs on fabs.transaction_id = a.latest_transaction_id
+    left outer join recipient_lookup as rl on
+        rl.duns = coalesce(fpds.awardee_or_recipient_uniqu, fabs.awardee_or_recipient_uniqu)
+where
+    faba.disaster_emergency_fund_code is not null and
+    ({predicate})
+group by
+    1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 16
+"""
+
+
+def rebuild_disaster_file_c_spending() -> int:
+    """Replaces every row; returns how many were written"""
+    with connection.cursor() as cursor:
+        cursor.execute("delete from disaster_file_c_spending")
+        cursor.execute(
+            FILE_C_SPENDING_SQL.format(table="disaster_file_c_spending", columns=COLUMNS, predicate="true"), {}
+        )
+        row_count = cursor.rowcount
+    logger.info(f"Rebuilt {row_count:,} disaster File C spending rows")
+    return row_count
+
+
+def refresh_disaster_file_c_spending(submission_ids: Sequence[int]) -> int:
+    """
+    Recomputes the rows of these submissions, which are removed if the submissions no longer exist; returns how many
+    were written
+    """
+    submission_ids = list(submission_ids)
+    if not submission_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute("delete from disaster_file_c_spending where submission_id = any(%s)", [submission_ids])
+        cursor.execute(
+            FILE_C_SPENDING_SQL.format(
+                table="disaster_file_c_spending",
+                columns=COLUMNS,
+                predicate="faba.submission_id = any(%(submission_ids)s)",
+            ),
+            {"submission_ids": submission_ids},
+        )
+        row_count = cursor.rowcount
+    logger.info(f"Refreshed {row_count:,} disaster File C spending rows for {len(submission_ids):,} submissions")
+    return row_count
+
+
+def refresh_disaster_file_c_spending_for_awards(award_ids: Sequence[int]) -> int:
+    """
+    Recomputes the rows of these awards after they change, are deleted, or have File C records linked to or unlinked
+    from them, along with the unlinked rows of the submissions those File C records belong to; returns how many rows
+    were written
+    """
+    award_ids = list(award_ids)
+    if not award_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            drop table if exists temp_disaster_file_c_spending_submissions;
+            create temporary table temp_disaster_file_c_spending_submissions as
+            select submission_id from financial_accounts_by_awards
+            where award_id = any(%(award_ids)s) and disaster_emergency_fund_code is not null
+            union
+            select submission_id from disaster_file_c_spending where award_id = any(%(award_ids)s)
+            """,
+            {"award_ids": award_ids},
+        )
+        try:
+            predicate = (
+                "{prefix}award_id = any(%(award_ids)s) or ({prefix}award_id is null and {prefix}submission_id in "
+                "(select submission_id from temp_disaster_file_c_spending_submissions))"
+            )
+            cursor.execute(
+                f"delete from disaster_file_c_spending where {predicate.format(prefix='')}", {"award_ids": award_ids}
+            )
+            cursor.execute(
+                FILE_C_SPENDING_SQL.format(
+                    table="disaster_file_c_spending", columns=COLUMNS, predicate=predicate.format(prefix="faba.")
+                ),
+                {"award_ids": award_ids},
+            )
+            row_count = cursor.rowcount
+        finally:
+            cursor.execute("drop table if exists temp_disaster_file_c_spending_submissions")
+    logger.info(f"Refreshed {row_count:,} disaster File C spending rows for {len(award_ids):,} awards")
+    return row_count
+
+
+def check_disaster_file_c_spending() -> List[str]:
+    """
+    Full consistency check: rebuilds the table into a temporary one and describes how many stored rows differ from it.
+    An empty list means it is current.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            drop table if exists temp_disaster_file_c_spending;
+            create temporary table temp_disaster_file_c_spending as
+            select {COLUMNS} from disaster_file_c_spending limit 0
+            """
+        )
+        try:
+            cursor.execute(
+                FILE_C_SPENDING_SQL.format(table="temp_disaster_file_c_spending", columns=COLUMNS, predicate="true"), {}
+            )
+            difference = _count_differences(cursor)
+        finally:
+            cursor.execute("drop table if exists temp_disaster_file_c_spending")
+    return [difference] if difference else []
+
+
+def _count_differences(cursor) -> Optional[str]:
+    cursor.execute(
+        f"""
+        select count(*)
+        from (
+            (
+                select {COLUMNS} from disaster_file_c_spending
+                except all
+                select {COLUMNS} from temp_disaster_file_c_spending
+            ) union all (
+                select {COLUMNS} from temp_disaster_file_c_spending
+                except all
+                select {COLUMNS} from disaster_file_c_spending
+            )
+        ) as differences
+        """
+    )
+    count = cursor.fetchone()[0]
+    return f"disaster_file_c_spending: {count:,} rows differ" if count else None
@@ -11,16 +11,17 @@ from django.utils.functional import cached_property
 from pathlib import Path
 
 from usaspending_api.common.csv_helpers import count_rows_in_delimited_file
-from usaspending_api.common.helpers.s3_helpers import upload_download_file_to_s3
+from usaspending_api.common.helpers.s3_helpers import S3MultipartUploadSink
 from usaspending_api.download.filestreaming.download_generation import (
-    split_and_zip_data_files,
+    partition_data_file,
+    partitioned_file_paths,
     wait_for_process,
-    add_data_dictionary_to_zip,
+    download_data_dictionary,
     execute_psql,
     generate_export_query_temp_file,
 )
 from usaspending_api.download.filestreaming.file_description import build_file_description, save_file_description
-from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+from usaspending_api.download.filestreaming.zip_file import write_files_to_zip_stream
 from usaspending_api.download.models import DownloadJob
 from usaspending_api.download.lookups import FILE_FORMATS, JOB_STATUS_DICT
 from usaspending_api.references.models import DisasterEmergencyFundCode
@@ -34,6 +35,7 @@ class Command(BaseCommand):
     help = "Assemble raw COVID-19 Disaster Spending data into CSVs and Zip"
     file_format = "csv"
     filepaths_to_delete = []
+    archive_file_paths = []
     total_download_count = 0
     total_download_columns = 0
     total_download_size = 0
@@ -69,27 +71,30 @@ class Command(BaseCommand):
 
     def process_data_copy_jobs(self):
         logger.info(f"Creating new COVID-19 download zip file: {self.zip_file_path}")
-        self.filepaths_to_delete.append(self.zip_file_path)
 
         for sql_file, final_name in self.download_file_list:
             intermediate_data_file_path = final_name.parent / (final_name.name + "_temp")
-            data_file, count = self.download_to_csv(sql_file, final_name, str(intermediate_data_file_path))
+            data_files, count = self.download_to_csv(sql_file, final_name, str(intermediate_data_file_path))
             if count <= 0:
                 logger.warning(f"Empty data file generated: {final_name}!")
+            self.archive_file_paths.extend(data_files)
 
             self.filepaths_to_delete.extend(self.working_dir_path.glob(f"{final_name.stem}*"))
 
     def complete_zip_and_upload(self):
         self.finalize_zip_contents()
         if self.upload:
-            logger.info("Upload final zip file to S3")
-            upload_download_file_to_s3(self.zip_file_path)
+            logger.info("Compressing zip file into S3")
+            with S3MultipartUploadSink(settings.BULK_DOWNLOAD_S3_BUCKET_NAME, self.zip_file_path.name) as sink:
+                write_files_to_zip_stream(self.archive_file_paths, sink)
+            self.total_download_size = sink.bytes_written
             db_id = self.store_record_in_database()
             logger.info(f"Created database record {db_id} for future retrieval")
-            logger.info("Marking zip file for deletion in cleanup")
         else:
             logger.warn("Not uploading zip file to S3. Leaving file locally")
-            self.filepaths_to_delete.remove(self.zip_file_path)
+            with open(self.zip_file_path, "wb") as destination:
+                write_files_to_zip_stream(self.archive_file_paths, destination)
+            self.total_download_size = self.zip_file_path.stat().st_size
             logger.warn("Not creating database record")
 
     @property
@@ -138,15 +143,14 @@ class Command(BaseCommand):
     def finalize_zip_contents(self):
         self.filepaths_to_delete.append(self.working_dir_path / "Data_Dictionary_Crosswalk.xlsx")
 
-        add_data_dictionary_to_zip(str(self.zip_file_path.parent), str(self.zip_file_path))
+        self.archive_file_paths.append(download_data_dictionary(str(self.zip_file_path.parent)))
 
         file_description = build_file_description(str(self.readme_path), dict())
         file_description_path = save_file_description(
             str(self.zip_file_path.parent), self.readme_path.name, file_description
         )
         self.filepaths_to_delete.append(Path(file_description_path))
-        append_files_to_zip_file([file_description_path], str(self.zip_file_path))
-        self.total_download_size = self.zip_file_path.stat().st_size
+        self.archive_file_paths.append(file_description_path)
 
     def prep_filesystem(self):
         if self.zip_file_path.exists():
@@ -184,23 +188,19 @@ class Command(BaseCommand):
                 logger.exception("Unable to obtain delimited text file line count")
 
             start_time = time.perf_counter()
-            zip_process = multiprocessing.Process(
-                target=split_and_zip_data_files,
-                args=(
-                    str(self.zip_file_path),
-                    intermediate_data_filename,
-                    str(destination_path),
-                    self.file_format,
-                    None,
-                ),
+            partition_process = multiprocessing.Process(
+                target=partition_data_file,
+                args=(intermediate_data_filename, str(destination_path), self.file_format, None),
             )
-            zip_process.start()
-            wait_for_process(zip_process, start_time, None)
+            partition_process.start()
+            wait_for_process(partition_process, start_time, None)
+            Path(intermediate_data_filename).unlink()
         except Exception as e:
             raise e
         finally:
             Path(temp_file_path).unlink()
-        return destination_path, count
+        extension = FILE_FORMATS[self.file_format]["extension"]
+        return partitioned_file_paths(str(destination_path.parent), destination_path.name, extension), count
 
     def store_record_in_database(self):
         download_record = DownloadJob.objects.create(
@@ -0,0 +1,38 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
+from usaspending_api.disaster.file_c_spending import check_disaster_file_c_spending, rebuild_disaster_file_c_spending
+
+
+logger = logging.getLogger("script")
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Rebuild disaster_file_c_spending, which the disaster endpoints aggregate File C spending from.  Submission, "
+        "FPDS and FABS loads keep it current; run this to populate it or after data corrections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Instead of rebuilding, compare the table with a fresh one and fail if they differ",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            with Timer("Check disaster_file_c_spending"):
+                differences = check_disaster_file_c_spending()
+            if differences:
+                raise CommandError("Disaster File C spending is out of date:\n" + "\n".join(differences))
+            logger.info("disaster_file_c_spending is current")
+            return
+
+        with Timer("Rebuild disaster_file_c_spending"):
+            with transaction.atomic():
+                rebuild_disaster_file_c_spending()
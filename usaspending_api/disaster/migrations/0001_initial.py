@@ -0,0 +1,44 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0005_delete_appropriationaccountbalancesquarterly'),
+        ('awards', '0075_idvclosure_idvfundingrollup'),
+        ('references', '0050_naics_psc_update_date'),
+        ('submissions', '0012_submissionattributes_is_final_balances_for_fy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DisasterFileCSpending',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reporting_fiscal_year', models.IntegerField()),
+                ('reporting_fiscal_period', models.IntegerField()),
+                ('quarter_format_flag', models.BooleanField()),
+                ('award_type', models.TextField(null=True)),
+                ('cfda_number', models.TextField(null=True)),
+                ('recipient_hash', models.UUIDField(null=True)),
+                ('transaction_obligated_amount', models.DecimalField(decimal_places=2, max_digits=23, null=True)),
+                ('gross_outlay_amount_by_award_cpe', models.DecimalField(decimal_places=2, max_digits=23, null=True)),
+                ('total_loan_value', models.DecimalField(decimal_places=2, max_digits=23, null=True)),
+                ('award', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='awards.Award')),
+                ('disaster_emergency_fund', models.ForeignKey(db_column='disaster_emergency_fund_code', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, to='references.DisasterEmergencyFundCode')),
+                ('federal_account', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.FederalAccount')),
+                ('funding_toptier_agency', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='references.ToptierAgency')),
+                ('object_class', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='references.ObjectClass')),
+                ('submission', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, to='submissions.SubmissionAttributes')),
+                ('treasury_account', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.TreasuryAppropriationAccount')),
+            ],
+            options={
+                'db_table': 'disaster_file_c_spending',
+                'managed': True,
+                'index_together': {('reporting_fiscal_year', 'reporting_fiscal_period', 'disaster_emergency_fund')},
+            },
+        ),
+    ]
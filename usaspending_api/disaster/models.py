@@ -0,0 +1,46 @@
+from django.db import models
+from django_cte import CTEManager
+
+
+class DisasterFileCSpending(models.Model):
+    """
+    File C (financial_accounts_by_awards) records that carry a Disaster Emergency Fund Code, summed per submission at
+    the grain the disaster endpoints group by: DEFC, treasury account (with its federal account and funding toptier
+    agency), object class and award (with the award's type, CFDA number and recipient).  Only submissions covering
+    periods since DEFCs were first reported are included; which of them are closed is still decided when queried.
+    Foreign keys are not enforced so submissions and awards can be deleted before their rows are refreshed.  See
+    usaspending_api/disaster/file_c_spending.py.
+    """
+
+    submission = models.ForeignKey("submissions.SubmissionAttributes", models.DO_NOTHING, db_constraint=False)
+    reporting_fiscal_year = models.IntegerField()
+    reporting_fiscal_period = models.IntegerField()
+    quarter_format_flag = models.BooleanField()
+    disaster_emergency_fund = models.ForeignKey(
+        "references.DisasterEmergencyFundCode",
+        models.DO_NOTHING,
+        db_constraint=False,
+        db_column="disaster_emergency_fund_code",
+    )
+    treasury_account = models.ForeignKey(
+        "accounts.TreasuryAppropriationAccount", models.DO_NOTHING, db_constraint=False, null=True
+    )
+    federal_account = models.ForeignKey("accounts.FederalAccount", models.DO_NOTHING, db_constraint=False, null=True)
+    funding_toptier_agency = models.ForeignKey(
+        "references.ToptierAgency", models.DO_NOTHING, db_constraint=False, null=True
+    )
+    object_class = models.ForeignKey("references.ObjectClass", models.DO_NOTHING, db_constraint=False, null=True)
+    award = models.ForeignKey("awards.Award", models.DO_NOTHING, db_constraint=False, null=True)
+    award_type = models.TextField(null=True)
+    cfda_number = models.TextField(null=True)
+    recipient_hash = models.UUIDField(null=True)
+    transaction_obligated_amount = models.DecimalField(max_digits=23, decimal_places=2, null=True)
+    gross_outlay_amount_by_award_cpe = models.DecimalField(max_digits=23, decimal_places=2, null=True)
+    total_loan_value = models.DecimalField(max_digits=23, decimal_places=2, null=True)
+
+    objects = CTEManager()
+
+    class Meta:
+        managed = True
+        db_table = "disaster_file_c_spending"
+        index_together = ("reporting_fiscal_year", "reporting_fiscal_period", "disaster_emergency_fund")
@@ -72,7 +72,7 @@ class Helpers:
 
     @staticmethod
     def reset_dabs_cache():
-        usaspending_api.disaster.v2.views.disaster_base.final_submissions_for_all_fy.cache_clear()
+        usaspending_api.disaster.v2.views.disaster_base.clear_final_submissions_cache()
 
 
 @pytest.fixture
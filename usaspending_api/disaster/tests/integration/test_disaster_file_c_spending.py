@@ -0,0 +1,134 @@
+import pytest
+
+from django.core.management import call_command
+from model_mommy import mommy
+from rest_framework import status
+
+from usaspending_api.accounts.models import TreasuryAppropriationAccount
+from usaspending_api.awards.models import Award, FinancialAccountsByAwards
+from usaspending_api.disaster.file_c_spending import (
+    check_disaster_file_c_spending,
+    rebuild_disaster_file_c_spending,
+    refresh_disaster_file_c_spending,
+    refresh_disaster_file_c_spending_for_awards,
+)
+from usaspending_api.disaster.models import DisasterFileCSpending
+from usaspending_api.disaster.v2.views.disaster_base import final_submissions_for_all_fy
+from usaspending_api.etl.award_helpers import prune_empty_awards
+
+DEF_CODES = ["L", "M", "N", "O", "9"]
+
+
+@pytest.fixture
+def file_c_account_data(generic_account_data):
+    toptier_agency = mommy.make("references.ToptierAgency", toptier_agency_id=31, toptier_code="031", name="Agency")
+    mommy.make("references.Agency", id=32, toptier_agency=toptier_agency, toptier_flag=True)
+    TreasuryAppropriationAccount.objects.update(funding_toptier_agency=toptier_agency)
+    object_class = mommy.make(
+        "references.ObjectClass", major_object_class="10", major_object_class_name="Major", object_class="110"
+    )
+    FinancialAccountsByAwards.objects.filter(award_id__in=[111, 333]).update(object_class=object_class)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,spending_type",
+    [
+        ("/api/v2/disaster/agency/spending/", "award"),
+        ("/api/v2/disaster/agency/loans/", None),
+        ("/api/v2/disaster/federal_account/spending/", "award"),
+        ("/api/v2/disaster/federal_account/loans/", None),
+        ("/api/v2/disaster/object_class/spending/", "award"),
+        ("/api/v2/disaster/object_class/loans/", None),
+    ],
+)
+def test_spending_matches_live_file_c(client, monkeypatch, helpers, file_c_account_data, url, spending_type):
+    helpers.patch_datetime_now(monkeypatch, 2022, 12, 31)
+    helpers.reset_dabs_cache()
+    live_resp = helpers.post_for_spending_endpoint(client, url, def_codes=DEF_CODES, spending_type=spending_type)
+    assert live_resp.status_code == status.HTTP_200_OK
+    assert live_resp.json()["results"]
+
+    rebuild_disaster_file_c_spending()
+    resp = helpers.post_for_spending_endpoint(client, url, def_codes=DEF_CODES, spending_type=spending_type)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == live_resp.json()
+
+
+@pytest.mark.django_db
+def test_overview_matches_live_file_c(client, monkeypatch, helpers, file_c_account_data):
+    helpers.patch_datetime_now(monkeypatch, 2022, 12, 31)
+    helpers.reset_dabs_cache()
+    live_resp = client.get("/api/v2/disaster/overview/")
+    assert live_resp.data["spending"]["award_obligations"] == 306
+
+    rebuild_disaster_file_c_spending()
+    resp = client.get("/api/v2/disaster/overview/")
+    assert resp.data["spending"] == live_resp.data["spending"]
+
+
+@pytest.mark.django_db
+def test_refresh_disaster_file_c_spending(file_c_account_data):
+    rebuild_disaster_file_c_spending()
+    assert DisasterFileCSpending.objects.filter(award_id=111).count() == 2
+    assert check_disaster_file_c_spending() == []
+
+    # A submission reloads with another File C record
+    submission_id = FinancialAccountsByAwards.objects.values_list("submission_id", flat=True).first()
+    mommy.make(
+        "awards.FinancialAccountsByAwards",
+        submission_id=submission_id,
+        award_id=222,
+        transaction_obligated_amount=5,
+        disaster_emergency_fund_id="9",
+    )
+    assert check_disaster_file_c_spending() == ["disaster_file_c_spending: 1 rows differ"]
+    refresh_disaster_file_c_spending([submission_id])
+    assert check_disaster_file_c_spending() == []
+
+    # An award is deleted and its File C records are unlinked, then another award changes type
+    FinancialAccountsByAwards.objects.filter(award_id=444).update(award_id=None)
+    Award.objects.filter(id=444).delete()
+    Award.objects.filter(id=333).update(type="A", total_loan_value=None)
+    refresh_disaster_file_c_spending_for_awards([333, 444])
+    assert check_disaster_file_c_spending() == []
+    assert DisasterFileCSpending.objects.filter(award_id__isnull=True, gross_outlay_amount_by_award_cpe=333).exists()
+    call_command("rebuild_disaster_file_c_spending", "--check")
+
+
+@pytest.mark.django_db
+def test_file_c_relinks_refresh_disaster_file_c_spending(file_c_account_data):
+    FinancialAccountsByAwards.objects.filter(award_id=333).update(award_id=None)
+    Award.objects.filter(id=333).update(fain="43TGFVDVFV")
+    rebuild_disaster_file_c_spending()
+
+    call_command("update_file_c_linkages")
+    assert DisasterFileCSpending.objects.filter(award_id=333).exists()
+    assert check_disaster_file_c_spending() == []
+
+    # Award 333 has no transactions, so it is pruned and its File C record unlinked
+    prune_empty_awards((333,))
+    assert not DisasterFileCSpending.objects.filter(award_id=333).exists()
+    assert check_disaster_file_c_spending() == []
+
+
+@pytest.mark.django_db
+def test_final_submissions_change_when_window_reveals(monkeypatch, helpers, generic_account_data):
+    mommy.make(
+        "submissions.DABSSubmissionWindowSchedule",
+        is_quarter=False,
+        submission_fiscal_year=2022,
+        submission_fiscal_quarter=3,
+        submission_fiscal_month=8,
+        submission_reveal_date="2022-07-15",
+        period_start_date="2022-05-01",
+    )
+    helpers.reset_dabs_cache()
+    helpers.patch_datetime_now(monkeypatch, 2022, 7, 1)
+    assert sorted(final_submissions_for_all_fy()) == [(2022, False, 7), (2022, True, 7)]
+
+    helpers.patch_datetime_now(monkeypatch, 2022, 7, 16)
+    assert sorted(final_submissions_for_all_fy()) == [(2022, False, 8), (2022, True, 7)]
+
+    helpers.patch_datetime_now(monkeypatch, 2022, 7, 1)
+    assert sorted(final_submissions_for_all_fy()) == [(2022, False, 7), (2022, True, 7)]
@@ -9,7 +9,6 @@ from django.views.decorators.csrf import csrf_exempt
 from django_cte import With
 from rest_framework.response import Response
 
-from usaspending_api.awards.models import FinancialAccountsByAwards
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.elasticsearch.json_helpers import json_str_to_dict
 from usaspending_api.common.helpers.generic_helper import get_pagination_metadata
@@ -197,7 +196,7 @@ class SpendingByAgencyViewSet(PaginationMixin, SpendingMixin, FabaOutlayMixin, D
         # Assuming it is more performant to fetch all rows once rather than
         #  run a count query and fetch only a page's worth of results
         return (
-            cte.join(FinancialAccountsByAwards, treasury_account__funding_toptier_agency_id=cte.col.toptier_agency_id)
+            cte.join(self.file_c_model, treasury_account__funding_toptier_agency_id=cte.col.toptier_agency_id)
             .with_cte(cte)
             .filter(*filters)
             .annotate(agency_id=cte.col.agency_id, toptier_code=cte.col.toptier_code, toptier_name=cte.col.toptier_name)
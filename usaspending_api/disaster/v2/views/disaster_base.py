@@ -1,12 +1,12 @@
 import json
 
 from datetime import date
-from django.db.models import Max, Q, F, Value, Case, When, Sum, Count
+from django.conf import settings
+from django.db.models import Max, Min, Q, F, Value, Case, When, Sum, Count
 from django.db.models.functions import Coalesce
 from django.http import HttpRequest
 from django.utils.functional import cached_property
 from django_cte import With
-from functools import lru_cache
 from rest_framework.views import APIView
 from typing import List
 
@@ -18,6 +18,7 @@ from usaspending_api.common.helpers.date_helper import now
 from usaspending_api.common.helpers.fiscal_year_helpers import generate_fiscal_year_and_month
 from usaspending_api.common.helpers.orm_helpers import ConcatAll
 from usaspending_api.common.validator import customize_pagination_with_sort_columns, TinyShield
+from usaspending_api.disaster.models import DisasterFileCSpending
 from usaspending_api.references.models import DisasterEmergencyFundCode
 from usaspending_api.references.models.gtas_sf133_balances import GTASSF133Balances
 from usaspending_api.submissions.helpers import get_last_closed_submission_date
@@ -28,6 +29,9 @@ COVID_19_GROUP_NAME = "covid_19"
 REPORTING_PERIOD_MIN_DATE = date(2020, 4, 1)
 REPORTING_PERIOD_MIN_YEAR, REPORTING_PERIOD_MIN_MONTH = generate_fiscal_year_and_month(REPORTING_PERIOD_MIN_DATE)
 
+# The result of final_submissions_for_all_fy with the reveal dates it is valid between
+_final_submissions_cache = {}
+
 
 def latest_gtas_of_each_year_queryset():
     q = Q()
@@ -39,11 +43,12 @@ def latest_gtas_of_each_year_queryset():
     return GTASSF133Balances.objects.filter(q)
 
 
-def latest_faba_of_each_year_queryset() -> FinancialAccountsByAwards:
+def latest_file_c_of_each_year_queryset(model):
+    """File C rows of model (see file_c_spending_model) from the latest closed submissions"""
     q = filter_by_latest_closed_periods()
     if not q:
-        return FinancialAccountsByAwards.objects.none()
-    return FinancialAccountsByAwards.objects.filter(q)
+        return model.objects.none()
+    return model.objects.filter(q)
 
 
 def filter_by_latest_closed_periods(submission_query_path: str = "") -> Q:
@@ -81,18 +86,50 @@ def filter_by_defc_closed_periods() -> Q:
     return q & Q(submission__reporting_period_start__gte=str(REPORTING_PERIOD_MIN_DATE))
 
 
-@lru_cache(maxsize=1)
 def final_submissions_for_all_fy() -> List[tuple]:
     """
         Returns a list the latest monthly and quarterly submission for each
         fiscal year IF it is "closed" aka ready for display on USAspending.gov
+
+        The list can only change when the next submission window is revealed,
+        so it is kept until then (or until the current time falls before the
+        latest reveal it reflects)
+    """
+    current_time = now()
+    revealed_since, next_reveal, submissions = _final_submissions_cache.get("entry", (None, None, None))
+    if (
+        submissions is None
+        or (revealed_since is not None and current_time < revealed_since)
+        or (next_reveal is not None and current_time >= next_reveal)
+    ):
+        schedule = DABSSubmissionWindowSchedule.objects.filter(submission_reveal_date__lte=current_time)
+        submissions = list(
+            schedule.values("submission_fiscal_year", "is_quarter")
+            .annotate(fiscal_year=F("submission_fiscal_year"), fiscal_period=Max("submission_fiscal_month"))
+            .values_list("fiscal_year", "is_quarter", "fiscal_period", named=True)
+        )
+        revealed_since = schedule.aggregate(reveal_date=Max("submission_reveal_date"))["reveal_date"]
+        next_reveal = DABSSubmissionWindowSchedule.objects.filter(submission_reveal_date__gt=current_time).aggregate(
+            reveal_date=Min("submission_reveal_date")
+        )["reveal_date"]
+        _final_submissions_cache["entry"] = (revealed_since, next_reveal, submissions)
+    return submissions
+
+
+def clear_final_submissions_cache() -> None:
+    """For when the DABS submission window schedule changes in this process, such as between tests"""
+    _final_submissions_cache.clear()
+
+
+def file_c_spending_model():
+    """
+    The model the disaster endpoints aggregate File C spending from: disaster_file_c_spending, unless falling back to
+    financial_accounts_by_awards is enabled and it has not been built.  Both have the fields and relations the
+    endpoints use, except that loan type and face value are award fields of financial_accounts_by_awards.
     """
-    return (
-        DABSSubmissionWindowSchedule.objects.filter(submission_reveal_date__lte=now())
-        .values("submission_fiscal_year", "is_quarter")
-        .annotate(fiscal_year=F("submission_fiscal_year"), fiscal_period=Max("submission_fiscal_month"))
-        .values_list("fiscal_year", "is_quarter", "fiscal_period", named=True)
-    )
+    if settings.DISASTER_FILE_C_SPENDING_LIVE_FALLBACK and not DisasterFileCSpending.objects.exists():
+        return FinancialAccountsByAwards
+    return DisasterFileCSpending
 
 
 class DisasterBase(APIView):
@@ -193,6 +230,10 @@ class DisasterBase(APIView):
     def all_closed_defc_submissions(self):
         return filter_by_defc_closed_periods()
 
+    @cached_property
+    def file_c_model(self):
+        return file_c_spending_model()
+
     @property
     def is_in_provided_def_codes(self):
         return Q(disaster_emergency_fund__code__in=self.def_codes)
@@ -228,21 +269,25 @@ class DisasterBase(APIView):
     def construct_loan_queryset(self, faba_grouping_column, base_model, base_model_column):
         grouping_key = F(faba_grouping_column) if isinstance(faba_grouping_column, str) else faba_grouping_column
 
+        if self.file_c_model is FinancialAccountsByAwards:
+            is_loan = Q(award__type__in=loan_type_mapping)
+            # Fields disaster_file_c_spending keeps copies of
+            copied_fields = {
+                "total_loan_value": F("award__total_loan_value"),
+                "reporting_fiscal_year": F("submission__reporting_fiscal_year"),
+                "reporting_fiscal_period": F("submission__reporting_fiscal_period"),
+                "quarter_format_flag": F("submission__quarter_format_flag"),
+            }
+        else:
+            is_loan = Q(award_type__in=loan_type_mapping)
+            copied_fields = {}
+
         base_values = With(
-            FinancialAccountsByAwards.objects.filter(
-                Q(award__type__in=loan_type_mapping), self.all_closed_defc_submissions, self.is_in_provided_def_codes,
-            )
-            .annotate(
-                grouping_key=grouping_key,
-                total_loan_value=F("award__total_loan_value"),
-                reporting_fiscal_year=F("submission__reporting_fiscal_year"),
-                reporting_fiscal_period=F("submission__reporting_fiscal_period"),
-                quarter_format_flag=F("submission__quarter_format_flag"),
-            )
+            self.file_c_model.objects.filter(is_loan, self.all_closed_defc_submissions, self.is_in_provided_def_codes)
+            .annotate(grouping_key=grouping_key, **copied_fields)
             .filter(grouping_key__isnull=False)
             .values(
                 "grouping_key",
-                "financial_accounts_by_awards_id",
                 "award_id",
                 "transaction_obligated_amount",
                 "gross_outlay_amount_by_award_cpe",
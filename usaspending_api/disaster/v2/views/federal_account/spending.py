@@ -2,7 +2,6 @@ from django.db.models import Q, Sum, F, Value, DecimalField, Case, When, OuterRe
 from django.db.models.functions import Coalesce
 from rest_framework.response import Response
 
-from usaspending_api.awards.models import FinancialAccountsByAwards
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.data_classes import Pagination
 from usaspending_api.common.helpers.generic_helper import get_pagination_metadata
@@ -149,7 +148,7 @@ class SpendingViewSet(PaginationMixin, SpendingMixin, FabaOutlayMixin, DisasterB
         # Assuming it is more performant to fetch all rows once rather than
         #  run a count query and fetch only a page's worth of results
         return (
-            FinancialAccountsByAwards.objects.filter(*filters)
+            self.file_c_model.objects.filter(*filters)
             .values(
                 "treasury_account__federal_account__id",
                 "treasury_account__federal_account__federal_account_code",
@@ -2,7 +2,6 @@ from django.db.models import Q, Sum, F, Value, Case, When, Min, TextField, Integ
 from django.db.models.functions import Coalesce, Cast
 from rest_framework.response import Response
 
-from usaspending_api.awards.models import FinancialAccountsByAwards
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.data_classes import Pagination
 from usaspending_api.common.helpers.generic_helper import get_pagination_metadata
@@ -122,7 +121,7 @@ class ObjectClassSpendingViewSet(PaginationMixin, SpendingMixin, FabaOutlayMixin
         # Assuming it is more performant to fetch all rows once rather than
         #  run a count query and fetch only a page's worth of results
         return (
-            FinancialAccountsByAwards.objects.filter(*filters)
+            self.file_c_model.objects.filter(*filters)
             .values("object_class__major_object_class", "object_class__major_object_class_name")
             .annotate(**annotations)
             .values(*annotations.keys())
@@ -2,13 +2,12 @@ from decimal import Decimal
 from django.db.models import Sum, F
 from rest_framework.response import Response
 
-from usaspending_api.awards.models.financial_accounts_by_awards import FinancialAccountsByAwards
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.disaster.v2.views.disaster_base import (
     DisasterBase,
     filter_by_defc_closed_periods,
-    latest_faba_of_each_year_queryset,
+    latest_file_c_of_each_year_queryset,
     latest_gtas_of_each_year_queryset,
 )
 from usaspending_api.references.models import DisasterEmergencyFundCode
@@ -70,9 +69,7 @@ class OverviewViewSet(DisasterBase):
 
     def award_obligations(self):
         return (
-            FinancialAccountsByAwards.objects.filter(
-                filter_by_defc_closed_periods(), disaster_emergency_fund__in=self.defc
-            )
+            self.file_c_model.objects.filter(filter_by_defc_closed_periods(), disaster_emergency_fund__in=self.defc)
             .values("transaction_obligated_amount")
             .aggregate(total=Sum("transaction_obligated_amount"))["total"]
             or 0.0
@@ -80,7 +77,7 @@ class OverviewViewSet(DisasterBase):
 
     def award_outlays(self):
         return (
-            latest_faba_of_each_year_queryset()
+            latest_file_c_of_each_year_queryset(self.file_c_model)
             .filter(disaster_emergency_fund__in=self.defc)
             .aggregate(total=Sum("gross_outlay_amount_by_award_cpe"))["total"]
         ) or 0.0
@@ -0,0 +1,175 @@
+import csv
+import io
+import logging
+import os
+import subprocess
+
+from django.db.models import OuterRef, Subquery
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager, Dict, Iterator, List, Optional
+
+from usaspending_api.common.helpers.orm_helpers import generate_raw_quoted_query
+from usaspending_api.download.filestreaming.download_generation import (
+    EXCEL_ROW_LIMIT,
+    apply_annotations_to_sql,
+    retrieve_db_string,
+)
+from usaspending_api.download.filestreaming.download_source import DownloadSource
+from usaspending_api.download.filestreaming.zip_file import write_files_to_zip_stream
+from usaspending_api.download.lookups import FILE_FORMATS
+from usaspending_api.references.models import ToptierAgency
+
+logger = logging.getLogger(__name__)
+
+ROUTING_COLUMN = "fan_out_awarding_toptier_code"
+
+
+def generate_fan_out_export_query(source: DownloadSource, columns: List[str], file_format: str) -> str:
+    """
+    The export query of an "all agencies" download source with the toptier code of the awarding agency appended as a
+    last column and the rows ordered by it, so one agency is written at a time.
+    """
+    toptier_code = ToptierAgency.objects.filter(toptier_agency_id=OuterRef("awarding_toptier_agency_id")).values(
+        "toptier_code"
+    )
+    queryset = source.row_emitter(columns).annotate(**{ROUTING_COLUMN: Subquery(toptier_code)})
+    query = apply_annotations_to_sql(generate_raw_quoted_query(queryset), source.columns(columns) + [ROUTING_COLUMN])
+    options = FILE_FORMATS[file_format]["options"]
+    return rf'\COPY (SELECT * FROM ({query}) AS fan_out ORDER BY "{ROUTING_COLUMN}") TO STDOUT {options}'
+
+
+def stream_export_query(export_query: str, delimiter: str) -> Iterator[List[str]]:
+    """Run a psql \\COPY ... TO STDOUT and parse its rows as they arrive instead of writing them to a file first"""
+    psql_process = subprocess.Popen(
+        ["psql", "-q", retrieve_db_string(), "-v", "ON_ERROR_STOP=1"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+    )
+    try:
+        psql_process.stdin.write(export_query.encode())
+        psql_process.stdin.close()
+
+        # Read the same way partition_large_delimited_file reads the file psql writes, so rows are parsed identically
+        yield from csv.reader(io.TextIOWrapper(psql_process.stdout), delimiter=delimiter)
+        psql_process.wait()
+    finally:
+        if psql_process.returncode is None:
+            # The rows were not all read (routing them failed), so don't leave psql blocked writing to the pipe
+            psql_process.terminate()
+            psql_process.wait()
+        psql_process.stdout.close()
+
+    if psql_process.returncode != 0:
+        raise RuntimeError(f"psql exited with code {psql_process.returncode}")
+
+
+class PartitionedDelimitedWriter:
+    """
+    Writes rows to `<data_file_name>_1.<ext>`, `<data_file_name>_2.<ext>`, ... with `row_limit` rows and the header
+    in each file. The files are identical to the ones partition_large_delimited_file produces from a single file.
+    """
+
+    def __init__(self, directory, data_file_name, header, file_format, row_limit=EXCEL_ROW_LIMIT):
+        self.directory = Path(directory)
+        self.data_file_name = data_file_name
+        self.header = header
+        self.delimiter = FILE_FORMATS[file_format]["delimiter"]
+        self.extension = FILE_FORMATS[file_format]["extension"]
+        self.row_limit = row_limit
+        self.file_paths = []
+        self.rows_in_partition = 0
+        self._open_partition()
+
+    def _open_partition(self):
+        path = self.directory / f"{self.data_file_name}_{len(self.file_paths) + 1}.{self.extension}"
+        self.file_paths.append(str(path))
+        self.file = open(path, "w")
+        self.writer = csv.writer(self.file, delimiter=self.delimiter)
+        self.writer.writerow(self.header)
+        self.rows_in_partition = 0
+
+    def writerow(self, row):
+        if self.rows_in_partition == self.row_limit:
+            self.file.close()
+            self._open_partition()
+        self.writer.writerow(row)
+        self.rows_in_partition += 1
+
+    def close(self) -> List[str]:
+        self.file.close()
+        return self.file_paths
+
+
+class AgencyFanOutRouter:
+    """
+    Splits one stream of rows, ordered by the awarding toptier code in their last column, into one archive per agency
+    plus an optional archive of every row. Only the current agency's writer (and the "all" writer) are open.
+
+    `archives` maps toptier codes to archive file names; agencies without rows still get an archive holding only the
+    header, like a per-agency download that matched nothing. Each archive is zipped into `open_archive(archive_name)`
+    (by default a file of that name in the working directory; an S3MultipartUploadSink uploads it instead) and then
+    `on_archive_complete(archive_name)` is called.
+    """
+
+    def __init__(
+        self,
+        working_dir: str,
+        header: List[str],
+        file_format: str,
+        archives: Dict[str, str],
+        all_archive: Optional[str],
+        on_archive_complete: Callable[[str], None],
+        row_limit: int = EXCEL_ROW_LIMIT,
+        open_archive: Optional[Callable[[str], ContextManager[BinaryIO]]] = None,
+    ):
+        self.working_dir = Path(working_dir)
+        self.open_archive = open_archive or (lambda archive_name: open(self.working_dir / archive_name, "wb"))
+        self.header = header
+        self.file_format = file_format
+        self.archives = archives
+        self.pending_agencies = set(archives)
+        self.on_archive_complete = on_archive_complete
+        self.row_limit = row_limit
+        self.current_agency = None
+        self.current_writer = None
+        self.all_writer = self._new_writer(all_archive) if all_archive else None
+        self.all_archive = all_archive
+
+    def route(self, row: List[str]):
+        agency, row = row[-1], row[:-1]
+        if self.all_writer:
+            self.all_writer.writerow(row)
+
+        if agency != self.current_agency:
+            self._finish_current_agency()
+            self.current_agency = agency
+            if agency in self.pending_agencies:
+                self.current_writer = self._new_writer(self.archives[agency])
+        if self.current_writer:
+            self.current_writer.writerow(row)
+
+    def close(self):
+        self._finish_current_agency()
+        for agency in sorted(self.pending_agencies):
+            self._finish_archive(self.archives[agency], self._new_writer(self.archives[agency]))
+        self.pending_agencies.clear()
+        if self.all_writer:
+            self._finish_archive(self.all_archive, self.all_writer)
+
+    def _new_writer(self, archive_name):
+        data_file_name = os.path.splitext(archive_name)[0]
+        return PartitionedDelimitedWriter(
+            self.working_dir, data_file_name, self.header, self.file_format, self.row_limit
+        )
+
+    def _finish_current_agency(self):
+        if self.current_writer:
+            self._finish_archive(self.archives[self.current_agency], self.current_writer)
+            self.pending_agencies.discard(self.current_agency)
+        self.current_writer = None
+
+    def _finish_archive(self, archive_name, writer):
+        file_paths = writer.close()
+        with self.open_archive(archive_name) as destination:
+            write_files_to_zip_stream(file_paths, destination)
+        for file_path in file_paths:
+            os.remove(file_path)
+        self.on_archive_complete(archive_name)
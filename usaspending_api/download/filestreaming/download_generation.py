@@ -21,14 +21,14 @@ from usaspending_api.awards.v2.lookups.lookups import contract_type_mapping, ass
 from usaspending_api.common.csv_helpers import count_rows_in_delimited_file, partition_large_delimited_file
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.orm_helpers import generate_raw_quoted_query
-from usaspending_api.common.helpers.s3_helpers import multipart_upload
+from usaspending_api.common.helpers.s3_helpers import S3MultipartUploadSink
 from usaspending_api.common.helpers.text_helpers import slugify_text_for_file_names
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 from usaspending_api.download.download_utils import construct_data_date_range
 from usaspending_api.download.filestreaming import NAMING_CONFLICT_DISCRIMINATOR
 from usaspending_api.download.filestreaming.download_source import DownloadSource
 from usaspending_api.download.filestreaming.file_description import build_file_description, save_file_description
-from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file, write_files_to_zip_stream
 from usaspending_api.download.helpers import verify_requested_columns_available, write_to_download_log as write_to_log
 from usaspending_api.download.lookups import JOB_STATUS_DICT, VALUE_MAPPINGS, FILE_FORMATS
 from usaspending_api.download.models import DownloadJob
@@ -67,23 +67,24 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
 
         write_to_log(message=f"Generating {file_name}", download_job=download_job)
 
-        # Generate sources from the JSON request object
+        # Generate sources from the JSON request object; the files to archive are collected and zipped in one pass
         sources = get_download_sources(json_request, origination)
+        archive_file_paths = []
         for source in sources:
             # Parse and write data to the file; if there are no matching columns for a source then add an empty file
             source_column_count = len(source.columns(columns))
             if source_column_count == 0:
-                create_empty_data_file(
-                    source, download_job, working_dir, piid, assistance_id, zip_file_path, file_format
+                archive_file_paths.append(
+                    create_empty_data_file(source, download_job, working_dir, piid, assistance_id, file_format)
                 )
             else:
                 download_job.number_of_columns += source_column_count
-                parse_source(
-                    source, columns, download_job, working_dir, piid, assistance_id, zip_file_path, limit, file_format
+                archive_file_paths.extend(
+                    parse_source(source, columns, download_job, working_dir, piid, assistance_id, limit, file_format)
                 )
         include_data_dictionary = json_request.get("include_data_dictionary")
         if include_data_dictionary:
-            add_data_dictionary_to_zip(working_dir, zip_file_path)
+            archive_file_paths.append(download_data_dictionary(working_dir))
         include_file_description = json_request.get("include_file_description")
         if include_file_description:
             write_to_log(message="Adding file description to zip file")
@@ -92,8 +93,8 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
             file_description_path = save_file_description(
                 working_dir, include_file_description["destination"], file_description
             )
-            append_files_to_zip_file([file_description_path], zip_file_path)
-        download_job.file_size = os.stat(zip_file_path).st_size
+            archive_file_paths.append(file_description_path)
+        download_job.file_size = write_download_archive(archive_file_paths, zip_file_path, download_job)
     except InvalidParameterException as e:
         exc_msg = "InvalidParameterException was raised while attempting to process the DownloadJob"
         fail_download(download_job, e, exc_msg)
@@ -109,30 +110,6 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
             shutil.rmtree(working_dir)
         _kill_spawned_processes(download_job)
 
-    try:
-        # push file to S3 bucket, if not local
-        if not settings.IS_LOCAL:
-            bucket = settings.BULK_DOWNLOAD_S3_BUCKET_NAME
-            region = settings.USASPENDING_AWS_REGION
-            start_uploading = time.perf_counter()
-            multipart_upload(bucket, region, zip_file_path, os.path.basename(zip_file_path))
-            write_to_log(
-                message=f"Uploading took {time.perf_counter() - start_uploading:.2f}s", download_job=download_job
-            )
-    except Exception as e:
-        # Set error message; job_status_id will be set in download_sqs_worker.handle()
-        exc_msg = "An exception was raised while attempting to upload the file"
-        fail_download(download_job, e, exc_msg)
-        if isinstance(e, InvalidParameterException):
-            raise InvalidParameterException(e)
-        else:
-            raise Exception(download_job.error_message) from e
-    finally:
-        # Remove generated file
-        if not settings.IS_LOCAL and os.path.exists(zip_file_path):
-            os.remove(zip_file_path)
-        _kill_spawned_processes(download_job)
-
     return finish_download(download_job)
 
 
@@ -210,6 +187,28 @@ def get_download_sources(json_request: dict, origination: Optional[str] = None):
     return download_sources
 
 
+def write_download_archive(file_paths: List[str], zip_file_path: str, download_job: DownloadJob) -> int:
+    """
+    Zip the generated files and return the size of the archive. Locally the archive is written to zip_file_path;
+    otherwise it is compressed straight into a multipart upload to the bulk download bucket, so parts are uploaded
+    while later files are still being compressed and the archive never takes up local disk.
+    """
+    if settings.IS_LOCAL:
+        write_to_log(message="Beginning zipping and compression", download_job=download_job)
+        with open(zip_file_path, "wb") as destination:
+            write_files_to_zip_stream(file_paths, destination)
+        return os.stat(zip_file_path).st_size
+
+    start_uploading = time.perf_counter()
+    write_to_log(message="Beginning zipping and compression into S3", download_job=download_job)
+    with S3MultipartUploadSink(settings.BULK_DOWNLOAD_S3_BUCKET_NAME, os.path.basename(zip_file_path)) as sink:
+        write_files_to_zip_stream(file_paths, sink)
+    write_to_log(
+        message=f"Zipping and uploading took {time.perf_counter() - start_uploading:.2f}s", download_job=download_job
+    )
+    return sink.bytes_written
+
+
 def build_data_file_name(source, download_job, piid, assistance_id):
     d_map = {"d1": "Contracts", "d2": "Assistance", "treasury_account": "TAS", "federal_account": "FA"}
 
@@ -253,8 +252,8 @@ def build_data_file_name(source, download_job, piid, assistance_id):
     return data_file_name
 
 
-def parse_source(source, columns, download_job, working_dir, piid, assistance_id, zip_file_path, limit, file_format):
-    """Write to delimited text file(s) and zip file(s) using the source data"""
+def parse_source(source, columns, download_job, working_dir, piid, assistance_id, limit, file_format):
+    """Write the source data to delimited text file(s) and return their paths"""
 
     data_file_name = build_data_file_name(source, download_job, piid, assistance_id)
 
@@ -290,14 +289,14 @@ def parse_source(source, columns, download_job, working_dir, piid, assistance_id
             )
         download_job.save()
 
-        # Create a separate process to split the large data files into smaller file and write to zip; wait
-        zip_process = multiprocessing.Process(
-            target=split_and_zip_data_files,
-            args=(zip_file_path, source_path, data_file_name, file_format, download_job),
+        # Create a separate process to split the large data files into smaller files; wait
+        partition_process = multiprocessing.Process(
+            target=partition_data_file, args=(source_path, data_file_name, file_format, download_job)
         )
-        zip_process.start()
-        wait_for_process(zip_process, start_time, download_job)
+        partition_process.start()
+        wait_for_process(partition_process, start_time, download_job)
         download_job.save()
+        os.remove(source_path)
     except Exception as e:
         raise e
     finally:
@@ -305,10 +304,12 @@ def parse_source(source, columns, download_job, working_dir, piid, assistance_id
         os.close(temp_file)
         os.remove(temp_file_path)
 
+    return partitioned_file_paths(working_dir, data_file_name, FILE_FORMATS[file_format]["extension"])
 
-def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_format, download_job=None):
+
+def partition_data_file(source_path, data_file_name, file_format, download_job=None):
+    """Split a data file into `<data_file_name>_1.<ext>`, `<data_file_name>_2.<ext>`, ... of EXCEL_ROW_LIMIT rows"""
     try:
-        # Split data files into separate files
         # e.g. `Assistance_prime_transactions_delta_%s.csv`
         log_time = time.perf_counter()
         delim = FILE_FORMATS[file_format]["delimiter"]
@@ -322,7 +323,30 @@ def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_fo
 
         msg = f"Partitioning data into {len(list_of_files)} files took {time.perf_counter() - log_time:.4f}s"
         write_to_log(message=msg, download_job=download_job)
+        return list_of_files
+
+    except Exception as e:
+        message = "Exception while partitioning text file"
+        if download_job:
+            fail_download(download_job, e, message)
+            write_to_log(message=message, download_job=download_job, is_error=True)
+        logger.error(e)
+        raise e
+
+
+def partitioned_file_paths(directory, data_file_name, extension):
+    """The files partition_data_file wrote, when it ran in another process and could not return them"""
+    file_paths = []
+    file_path = os.path.join(directory, f"{data_file_name}_1.{extension}")
+    while os.path.exists(file_path):
+        file_paths.append(file_path)
+        file_path = os.path.join(directory, f"{data_file_name}_{len(file_paths) + 1}.{extension}")
+    return file_paths
 
+
+def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_format, download_job=None):
+    list_of_files = partition_data_file(source_path, data_file_name, file_format, download_job)
+    try:
         # Zip the split files into one zipfile
         write_to_log(message="Beginning zipping and compression", download_job=download_job)
         log_time = time.perf_counter()
@@ -333,7 +357,7 @@ def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_fo
         )
 
     except Exception as e:
-        message = "Exception while partitioning text file"
+        message = "Exception while zipping partitioned text files"
         if download_job:
             fail_download(download_job, e, message)
             write_to_log(message=message, download_job=download_job, is_error=True)
@@ -573,13 +597,13 @@ def fail_download(download_job, exception, message):
     download_job.save()
 
 
-def add_data_dictionary_to_zip(working_dir, zip_file_path):
+def download_data_dictionary(working_dir):
     write_to_log(message="Adding data dictionary to zip file")
     data_dictionary_file_name = "Data_Dictionary_Crosswalk.xlsx"
     data_dictionary_file_path = os.path.join(working_dir, data_dictionary_file_name)
     data_dictionary_url = settings.DATA_DICTIONARY_DOWNLOAD_URL
     RetrieveFileFromUri(data_dictionary_url).copy(data_dictionary_file_path)
-    append_files_to_zip_file([data_dictionary_file_path], zip_file_path)
+    return data_dictionary_file_path
 
 
 def _kill_spawned_processes(download_job=None):
@@ -604,9 +628,8 @@ def create_empty_data_file(
     working_dir: str,
     piid: str,
     assistance_id: str,
-    zip_file_path: str,
     file_format: str,
-) -> None:
+) -> str:
     data_file_name = build_data_file_name(source, download_job, piid, assistance_id)
     extension = FILE_FORMATS[file_format]["extension"]
     source.file_name = f"{data_file_name}.{extension}"
@@ -615,4 +638,4 @@ def create_empty_data_file(
         message=f"Skipping download of {source.file_name} due to no valid columns provided", download_job=download_job
     )
     Path(source_path).touch()
-    append_files_to_zip_file([source_path], zip_file_path)
+    return source_path
@@ -17,3 +17,14 @@ def append_files_to_zip_file(file_paths, zip_file_path):
         for file_path in file_paths:
             archive_name = os.path.basename(file_path)
             zip_file.write(file_path, archive_name)
+
+
+def write_files_to_zip_stream(file_paths, destination):
+    """
+    Write a new zip archive of the files at file_paths to a writable file object, in the order given. The destination
+    does not need to be seekable, so the archive can be compressed directly into an S3MultipartUploadSink instead of
+    being written to disk first.
+    """
+    with zipfile.ZipFile(destination, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
+        for file_path in file_paths:
+            zip_file.write(file_path, os.path.basename(file_path))
@@ -1,4 +1,3 @@
-import boto3
 import logging
 import os
 import pandas as pd
@@ -15,7 +14,7 @@ from django.db.models import Case, When, Value, CharField, F
 from usaspending_api.awards.v2.lookups.lookups import all_award_types_mappings as all_ats_mappings
 from usaspending_api.common.csv_helpers import count_rows_in_delimited_file
 from usaspending_api.common.helpers.orm_helpers import generate_raw_quoted_query
-from usaspending_api.common.helpers.s3_helpers import multipart_upload
+from usaspending_api.common.helpers.s3_helpers import get_s3_bucket, multipart_upload
 from usaspending_api.download.filestreaming.download_generation import (
     apply_annotations_to_sql,
     _top_level_split,
@@ -237,9 +236,7 @@ class Command(BaseCommand):
         )
 
         # Create a list of keys in the bucket that match the date range we want
-        bucket = boto3.resource("s3", region_name=settings.USASPENDING_AWS_REGION).Bucket(
-            settings.DELETED_TRANSACTION_JOURNAL_FILES
-        )
+        bucket = get_s3_bucket(settings.DELETED_TRANSACTION_JOURNAL_FILES, settings.USASPENDING_AWS_REGION)
 
         all_deletions = pd.DataFrame()
         for key in bucket.objects.all():
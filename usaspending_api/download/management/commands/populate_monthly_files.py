@@ -1,19 +1,27 @@
 import logging
 import datetime
 import json
-import boto3
+import os
 import re
+import tempfile
 
+from contextlib import closing
 from django.conf import settings
+from pathlib import Path
 from django.core.management.base import BaseCommand
 from usaspending_api.awards.v2.lookups.lookups import procurement_type_mapping, assistance_type_mapping
 from usaspending_api.common.helpers.dict_helpers import order_nested_object
 from usaspending_api.common.helpers.fiscal_year_helpers import generate_fiscal_year
-from usaspending_api.common.helpers.s3_helpers import multipart_upload
+from usaspending_api.common.helpers.s3_helpers import S3MultipartUploadSink, get_s3_bucket, multipart_upload
 from usaspending_api.common.sqs.sqs_handler import get_sqs_queue
 from usaspending_api.download.filestreaming import download_generation
+from usaspending_api.download.filestreaming.agency_fan_out import (
+    AgencyFanOutRouter,
+    generate_fan_out_export_query,
+    stream_export_query,
+)
 from usaspending_api.download.helpers import pull_modified_agencies_cgacs
-from usaspending_api.download.lookups import JOB_STATUS_DICT
+from usaspending_api.download.lookups import FILE_FORMATS, JOB_STATUS_DICT
 from usaspending_api.download.models import DownloadJob
 from usaspending_api.download.v2.request_validations import validate_award_request
 from usaspending_api.download.v2.year_limited_downloads import YearLimitedDownloadViewSet
@@ -75,18 +83,78 @@ class Command(BaseCommand):
             settings.BULK_DOWNLOAD_S3_BUCKET_NAME = settings.MONTHLY_DOWNLOAD_S3_BUCKET_NAME
             download_generation.generate_download(download_job=download_job)
             if cleanup:
-                # Get all the files that have the same prefix except for the update date
-                file_name_prefix = file_name[:-12]  # subtracting the 'YYYYMMDD.zip'
-                for key in self.bucket.objects.filter(Prefix=file_name_prefix):
-                    if key.key == file_name:
-                        # ignore the one we just uploaded
-                        continue
-                    key.delete()
-                    logger.info("Deleting {} from bucket".format(key.key))
+                self.delete_previous_versions(file_name)
         else:
             queue = get_sqs_queue(queue_name=settings.BULK_DOWNLOAD_SQS_QUEUE_NAME)
             queue.send_message(MessageBody=str(download_job.download_job_id))
 
+    def delete_previous_versions(self, file_name):
+        # Get all the files that have the same prefix except for the update date
+        file_name_prefix = file_name[:-12]  # subtracting the 'YYYYMMDD.zip'
+        for key in self.bucket.objects.filter(Prefix=file_name_prefix):
+            if key.key == file_name:
+                # ignore the one we just uploaded
+                continue
+            key.delete()
+            logger.info("Deleting {} from bucket".format(key.key))
+
+    def fan_out_download(self, fiscal_year, award_type, archives, all_archive, cleanup):
+        """
+        Generate the archives of every agency for one fiscal year and award type from a single ordered scan of the
+        "all agencies" download query, instead of one full download per agency.
+        """
+        json_request = {
+            "constraint_type": "year",
+            "filters": {
+                "prime_award_types": award_mappings[award_type],
+                "agency": "all",
+                "date_type": "action_date",
+                "date_range": {"start_date": f"{fiscal_year - 1}-10-01", "end_date": f"{fiscal_year}-09-30"},
+            },
+            "columns": [],
+            "file_format": "csv",
+        }
+        YearLimitedDownloadViewSet().process_filters(json_request)
+        validated_request = validate_award_request(json_request)
+        (source,) = download_generation.get_download_sources(validated_request)
+        delimiter = FILE_FORMATS["csv"]["delimiter"]
+
+        def open_archive(archive_name):
+            if settings.IS_LOCAL:
+                return open(Path(settings.CSV_LOCAL_PATH) / archive_name, "wb")
+            return S3MultipartUploadSink(settings.MONTHLY_DOWNLOAD_S3_BUCKET_NAME, archive_name)
+
+        def on_archive_complete(archive_name):
+            if cleanup and not settings.IS_LOCAL:
+                self.delete_previous_versions(archive_name)
+            self.mark_archive_complete(archive_name)
+            logger.info(f"Generated {archive_name}")
+
+        export_query = generate_fan_out_export_query(source, [], "csv")
+        rows = stream_export_query(export_query, delimiter)
+        # Closing the rows stops psql if routing them fails part way through
+        with closing(rows), tempfile.TemporaryDirectory(dir=settings.CSV_LOCAL_PATH) as working_dir:
+            header = next(rows)[:-1]
+            router = AgencyFanOutRouter(
+                working_dir, header, "csv", archives, all_archive, on_archive_complete, open_archive=open_archive
+            )
+            for row in rows:
+                router.route(row)
+            router.close()
+
+    def load_checkpoint(self, updated_date_timestamp, clobber):
+        """Archives already generated by an earlier (failed) fan-out run today"""
+        self.checkpoint_path = Path(settings.CSV_LOCAL_PATH) / f"populate_monthly_files_{updated_date_timestamp}.json"
+        if clobber or not self.checkpoint_path.exists():
+            self.checkpoint_path.write_text("[]")
+        return set(json.loads(self.checkpoint_path.read_text()))
+
+    def mark_archive_complete(self, archive_name):
+        self.completed_archives.add(archive_name)
+        temp_path = self.checkpoint_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(sorted(self.completed_archives)))
+        os.replace(temp_path, self.checkpoint_path)
+
     def upload_placeholder(self, file_name, empty_file):
         bucket = settings.BULK_DOWNLOAD_S3_BUCKET_NAME
         region = settings.USASPENDING_AWS_REGION
@@ -152,6 +220,15 @@ class Command(BaseCommand):
             help="Deletes the previous version of the newly generated file after uploading"
             " (only applies if --local is also provided).",
         )
+        parser.add_argument(
+            "--fan-out",
+            action="store_true",
+            dest="fan_out",
+            default=False,
+            help="Generate the files of every agency for a fiscal year and award type from a single scan of the source"
+            " data in this process (--local is implied). Finished files are checkpointed so a failed run can be"
+            " restarted without regenerating them.",
+        )
         parser.add_argument(
             "--empty-asssistance-file",
             dest="empty_asssistance_file",
@@ -211,7 +288,7 @@ class Command(BaseCommand):
         # moving it to self.bucket as it may be used in different cases
         bucket_name = settings.MONTHLY_DOWNLOAD_S3_BUCKET_NAME
         region_name = settings.USASPENDING_AWS_REGION
-        self.bucket = boto3.resource("s3", region_name=region_name).Bucket(bucket_name)
+        self.bucket = get_s3_bucket(bucket_name, region_name)
 
         if not clobber:
             reuploads = []
@@ -220,6 +297,26 @@ class Command(BaseCommand):
                 if re_match:
                     reuploads.append(re_match[0])
 
+        if options["fan_out"] and not placeholders:
+            self.completed_archives = self.load_checkpoint(updated_date_timestamp, clobber)
+            for fiscal_year in fiscal_years:
+                for award_type in award_types:
+                    archives, all_archive = {}, None
+                    for agency in toptier_agencies:
+                        file_name = f"FY{fiscal_year}_{agency['toptier_code']}_{award_type.capitalize()}"
+                        full_file_name = f"{file_name}_Full_{updated_date_timestamp}.zip"
+                        if not clobber and (file_name in reuploads or full_file_name in self.completed_archives):
+                            logger.info(f"Skipping already uploaded: {full_file_name}")
+                        elif agency["toptier_agency_id"] == "all":
+                            all_archive = full_file_name
+                        else:
+                            archives[agency["toptier_code"]] = full_file_name
+                    if archives or all_archive:
+                        self.fan_out_download(fiscal_year, award_type, archives, all_archive, cleanup)
+            self.checkpoint_path.unlink()
+            logger.info("Populate Monthly Files complete")
+            return
+
         logger.info("Generating {} files...".format(len(toptier_agencies) * len(fiscal_years) * 2))
         for agency in toptier_agencies:
             for fiscal_year in fiscal_years:
@@ -0,0 +1,90 @@
+import csv
+import pytest
+import subprocess
+import sys
+import zipfile
+
+from contextlib import closing
+from pathlib import Path
+
+from usaspending_api.common.csv_helpers import partition_large_delimited_file
+from usaspending_api.download.filestreaming import agency_fan_out
+from usaspending_api.download.filestreaming.agency_fan_out import AgencyFanOutRouter
+
+HEADER = ["award_id", "description"]
+ROWS = [
+    ["1", "plain", "001"],
+    ["2", "has, a comma", "001"],
+    ["3", 'has "quotes"', "001"],
+    ["4", "multi\nline", "002"],
+    ["5", "", None],
+]
+
+
+def _per_agency_files(tmp_path, name, rows):
+    """What a per-agency download produces: one delimited file partitioned by partition_large_delimited_file"""
+    source = tmp_path / f"{name}.csv"
+    with open(source, "w") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return {
+        Path(path).name: Path(path).read_bytes()
+        for path in partition_large_delimited_file(str(source), row_limit=2, output_name_template=f"{name}_%s.csv")
+    }
+
+
+def test_router_matches_per_agency_files(tmp_path):
+    fan_out_dir = tmp_path / "fan_out"
+    fan_out_dir.mkdir()
+    completed = []
+    archives = {
+        "001": "FY2020_001_Contracts.zip",
+        "002": "FY2020_002_Contracts.zip",
+        "003": "FY2020_003_Contracts.zip",
+    }
+
+    router = AgencyFanOutRouter(
+        fan_out_dir, HEADER, "csv", archives, "FY2020_All_Contracts.zip", completed.append, row_limit=2,
+    )
+    for row in ROWS:
+        router.route(row)
+    router.close()
+
+    assert completed == [
+        "FY2020_001_Contracts.zip",
+        "FY2020_002_Contracts.zip",
+        "FY2020_003_Contracts.zip",
+        "FY2020_All_Contracts.zip",
+    ]
+
+    expected_rows = {
+        "FY2020_001_Contracts": [row[:-1] for row in ROWS if row[-1] == "001"],
+        "FY2020_002_Contracts": [row[:-1] for row in ROWS if row[-1] == "002"],
+        "FY2020_003_Contracts": [],
+        "FY2020_All_Contracts": [row[:-1] for row in ROWS],
+    }
+    for name, rows in expected_rows.items():
+        with zipfile.ZipFile(fan_out_dir / f"{name}.zip") as archive:
+            contents = {info.filename: archive.read(info) for info in archive.infolist()}
+        assert contents == _per_agency_files(tmp_path, name, rows)
+
+
+def test_stream_export_query_stops_psql_when_routing_fails(monkeypatch):
+    started = []
+
+    def fake_psql(args, **kwargs):
+        # Writes rows until its stdout is closed, like psql streaming a large COPY
+        process = subprocess.Popen([sys.executable, "-c", "import sys\nwhile True: print('1,a', flush=True)"], **kwargs)
+        started.append(process)
+        return process
+
+    monkeypatch.setattr(agency_fan_out, "retrieve_db_string", lambda: "postgres://")
+    monkeypatch.setattr(agency_fan_out.subprocess, "Popen", fake_psql)
+
+    rows = agency_fan_out.stream_export_query("COPY", ",")
+    with pytest.raises(ValueError), closing(rows):
+        for row in rows:
+            raise ValueError("routing failed")
+
+    assert started[0].returncode is not None
@@ -1,4 +1,3 @@
-import boto3
 import re
 
 from django.conf import settings
@@ -6,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.common.helpers.s3_helpers import get_s3_bucket
 from usaspending_api.download.filestreaming.s3_handler import S3Handler
 from usaspending_api.references.models import ToptierAgency
 
@@ -54,7 +54,7 @@ class ListMonthlyDownloadsViewSet(APIView):
         delta_download_regex = r"FY\(All\)_{}_{}_Delta_.*\.zip".format(agency["toptier_code"], download_type)
 
         # Retrieve and filter the files we need
-        bucket = boto3.resource("s3", region_name=self.s3_handler.region).Bucket(self.s3_handler.bucketRoute)
+        bucket = get_s3_bucket(self.s3_handler.bucketRoute, self.s3_handler.region)
         monthly_download_names = list(
             filter(
                 re.compile(monthly_download_regex).search,
@@ -1,6 +1,18 @@
-from typing import Optional
+import io
+import logging
+import uuid
 
-from django.db import connection
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection, connections, transaction
+from itertools import islice
+from time import perf_counter
+from typing import Dict, Iterable, Optional, Sequence
+from usaspending_api.common.helpers.etl_helpers import refresh_file_c_link_dependents, refresh_unlinked_counts
+
+logger = logging.getLogger("script")
+
+# Award IDs are copied into the staging table this many at a time
+COPY_BATCH_SIZE = 100000
 
 general_award_update_sql_string = """
 WITH
@@ -271,6 +283,15 @@ subaward_award_update_sql_string = """
 """
 
 
+# The updates update_awards_by_partition() can run, with the column their predicate filters on
+AWARD_UPDATES = {
+    "awards": (general_award_update_sql_string, "tn.award_id"),
+    "procurement": (fpds_award_update_sql_string, "tn.award_id"),
+    "assistance": (fabs_award_update_sql_string, "tn.award_id"),
+    "subawards": (subaward_award_update_sql_string, "award_id"),
+}
+
+
 def execute_database_statement(sql: str, values: Optional[list] = None) -> int:
     """Execute the SQL and return the UPDATE count"""
     with connection.cursor() as cursor:
@@ -332,11 +353,30 @@ def prune_empty_awards(award_tuple: Optional[tuple] = None) -> int:
 
     _prune_empty_awards_sql = "DELETE FROM awards WHERE id IN ({}) ".format(_find_empty_awards_sql)
 
-    return execute_database_statement(
+    # The File C records about to lose their award, by submission and award
+    _find_file_c_links_sql = (
+        "SELECT DISTINCT submission_id, award_id FROM financial_accounts_by_awards WHERE award_id IN ({})"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(_find_file_c_links_sql.format(_find_empty_awards_sql), [award_tuple] if award_tuple else None)
+        file_c_links = cursor.fetchall()
+    file_c_submission_ids = sorted({submission_id for submission_id, _ in file_c_links})
+
+    pruned_count = execute_database_statement(
         _modify_subawards_sql + _modify_financial_accounts_sql + _delete_parent_award_sql + _prune_empty_awards_sql,
         [award_tuple, award_tuple, award_tuple, award_tuple],
     )
 
+    if file_c_submission_ids:
+        submission_clause = (
+            f"submission_id in ({', '.join(str(submission_id) for submission_id in file_c_submission_ids)})"
+        )
+        for link_type in ("contract", "assistance"):
+            refresh_unlinked_counts(link_type, submission_clause)
+        refresh_file_c_link_dependents({award_id for _, award_id in file_c_links})
+
+    return pruned_count
+
 
 def update_assistance_awards(award_tuple: Optional[tuple] = None) -> int:
     """Update assistance-specific award data based on the info in child transactions."""
@@ -373,3 +413,91 @@ def update_award_subawards(award_tuple: Optional[tuple] = None) -> int:
         predicate = ""
 
     return execute_database_statement(subaward_award_update_sql_string.format(predicate=predicate), values)
+
+
+def update_awards_by_partition(
+    award_ids: Iterable[int], updates: Sequence[str] = ("awards",), partitions: int = 8, workers: int = 4
+) -> Dict[str, int]:
+    """
+    Runs the updates named (keys of AWARD_UPDATES, in order) for award_ids, with the same results as update_awards()
+    and its siblings but without interpolating the IDs into the SQL.  The IDs are copied into a staging table and hash
+    partitioned; every partition is updated in its own transaction, joined against the staging table, by a pool of
+    workers on their own connections.  Returns how many awards each update changed.
+
+    Inside an open transaction (or with a single worker) the partitions run one after another on this connection
+    instead, since other connections can't see what the caller's transaction wrote.  Should a partition fail, those
+    already committed stay updated; the updates are idempotent, so rerunning for the same IDs is safe.
+    """
+    unknown = set(updates).difference(AWARD_UPDATES)
+    if unknown:
+        raise ValueError(f"Unknown award updates: {', '.join(sorted(unknown))}")
+
+    in_place = connection.in_atomic_block or workers == 1
+    staging_table = f"temp_award_update_ids_{uuid.uuid4().hex}"
+    try:
+        partition_sizes = _stage_award_ids(staging_table, award_ids, partitions, temporary=in_place)
+        arguments = [(staging_table, partition, size, updates) for partition, size in sorted(partition_sizes.items())]
+        if in_place:
+            results = [_update_partition(*partition_arguments) for partition_arguments in arguments]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="award_update") as executor:
+                futures = [executor.submit(_update_partition_on_own_connection, *args) for args in arguments]
+                results = [future.result() for future in futures]
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"drop table if exists {staging_table}")
+
+    return {update: sum(result[update] for result in results) for update in updates}
+
+
+def _stage_award_ids(staging_table: str, award_ids: Iterable[int], partitions: int, temporary: bool) -> Dict[int, int]:
+    """Copy the distinct award_ids into staging_table with the partition each hashes to; returns partition sizes"""
+    raw_table = f"{staging_table}_raw"
+    award_ids = iter(award_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(f"create temporary table {raw_table} (award_id bigint not null)")
+        batch = list(islice(award_ids, COPY_BATCH_SIZE))
+        while batch:
+            ids_file = io.StringIO("".join(f"{int(award_id)}\n" for award_id in batch))
+            cursor.cursor.copy_expert(f"copy {raw_table} (award_id) from stdin", ids_file)
+            batch = list(islice(award_ids, COPY_BATCH_SIZE))
+
+        # hashint8 is signed, so shift it into the non-negative range before taking the modulus
+        cursor.execute(
+            f"""
+                create {"temporary" if temporary else "unlogged"} table {staging_table} as
+                select distinct
+                    award_id,
+                    mod(hashint8(award_id)::bigint + 2147483648, {int(partitions)})::int as partition
+                from {raw_table}
+            """
+        )
+        cursor.execute(f"drop table {raw_table}")
+        cursor.execute(f"create index on {staging_table} (partition, award_id)")
+        cursor.execute(f"analyze {staging_table}")
+        cursor.execute(f"select partition, count(*) from {staging_table} group by partition")
+        return dict(cursor.fetchall())
+
+
+def _update_partition_on_own_connection(
+    staging_table: str, partition: int, size: int, updates: Sequence[str]
+) -> Dict[str, int]:
+    try:
+        return _update_partition(staging_table, partition, size, updates)
+    finally:
+        connections.close_all()
+
+
+def _update_partition(staging_table: str, partition: int, size: int, updates: Sequence[str]) -> Dict[str, int]:
+    start = perf_counter()
+    award_ids = f"(select award_id from {staging_table} where partition = {partition})"
+    counts = {}
+    with transaction.atomic():
+        for update in updates:
+            sql, column = AWARD_UPDATES[update]
+            counts[update] = execute_database_statement(sql.format(predicate=f"WHERE {column} IN {award_ids}"))
+    logger.info(
+        f"Award update partition {partition} ({size:,} awards) took {perf_counter() - start:.2f}s: "
+        + ", ".join(f"{counts[update]:,} changed by {update}" for update in updates)
+    )
+    return counts
@@ -1,3 +1,4 @@
+import csv
 import json
 import os
 import pandas as pd
@@ -5,16 +6,18 @@ import psycopg2
 import subprocess
 
 from collections import defaultdict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from django.conf import settings
 from django.core.management import call_command
 from elasticsearch import helpers, TransportError
+from pathlib import Path
 from time import perf_counter, sleep
 from typing import Optional
 
 from usaspending_api.awards.v2.lookups.elasticsearch_lookups import INDEX_ALIASES_TO_AWARD_TYPES
 from usaspending_api.common.csv_helpers import count_rows_in_delimited_file
-from usaspending_api.common.helpers.s3_helpers import retrieve_s3_bucket_object_list, access_s3_object
+from usaspending_api.common.helpers.s3_helpers import list_s3_bucket_objects_by_prefix, stream_s3_object_lines
 from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
 
 # ==============================================================================
@@ -195,6 +198,76 @@ AWARD_VIEW_COLUMNS = [
     "total_covid_obligation",
     "total_covid_outlay",
 ]
+SUBAWARD_VIEW_COLUMNS = [
+    "subaward_id",
+    "subaward_number",
+    "update_date",
+    "award_id",
+    "generated_unique_award_id",
+    "display_award_id",
+    "piid",
+    "fain",
+    "award_type",
+    "prime_award_type",
+    "description",
+    "amount",
+    "action_date",
+    "fiscal_year",
+    "recipient_unique_id",
+    "recipient_name",
+    "recipient_agg_key",
+    "parent_recipient_unique_id",
+    "parent_recipient_name",
+    "business_categories",
+    "awarding_agency_id",
+    "funding_agency_id",
+    "awarding_toptier_agency_name",
+    "awarding_subtier_agency_name",
+    "funding_toptier_agency_name",
+    "funding_subtier_agency_name",
+    "awarding_toptier_agency_abbreviation",
+    "funding_toptier_agency_abbreviation",
+    "awarding_subtier_agency_abbreviation",
+    "funding_subtier_agency_abbreviation",
+    "awarding_toptier_agency_agg_key",
+    "awarding_subtier_agency_agg_key",
+    "funding_toptier_agency_agg_key",
+    "funding_subtier_agency_agg_key",
+    "cfda_number",
+    "cfda_title",
+    "cfda_agg_key",
+    "type_of_contract_pricing",
+    "type_set_aside",
+    "extent_competed",
+    "product_or_service_code",
+    "product_or_service_description",
+    "pop_country_code",
+    "pop_country_name",
+    "pop_state_code",
+    "pop_county_code",
+    "pop_county_name",
+    "pop_zip5",
+    "pop_congressional_code",
+    "pop_city_name",
+    "pop_county_agg_key",
+    "pop_congressional_agg_key",
+    "pop_state_agg_key",
+    "pop_country_agg_key",
+    "recipient_location_country_code",
+    "recipient_location_country_name",
+    "recipient_location_state_code",
+    "recipient_location_county_code",
+    "recipient_location_county_name",
+    "recipient_location_zip5",
+    "recipient_location_congressional_code",
+    "recipient_location_city_name",
+    "recipient_location_county_agg_key",
+    "recipient_location_congressional_agg_key",
+    "recipient_location_state_agg_key",
+    "tas_paths",
+    "tas_components",
+    "disaster_emergency_fund_codes",
+]
 
 COUNT_FY_SQL = """
 SELECT COUNT(*) AS count
@@ -244,9 +317,17 @@ AWARD_DESC_CATEGORIES = {
     "direct payment": "directpayments",
 }
 
+# Maps the --load-type of the ETL to the singular document type, which prefixes the primary key column
+ES_DOCUMENT_TYPES = {"transactions": "transaction", "awards": "award", "subawards": "subaward"}
+
 UNIVERSAL_TRANSACTION_ID_NAME = "generated_unique_transaction_id"
 UNIVERSAL_AWARD_ID_NAME = "generated_unique_award_id"
 
+DELETED_FILE_WORKERS = 8
+DELETED_FILE_PREFIX_MAX_DAYS = 31
+# Dates that begin delete file names: FPDS (Broker) files, then FABS files (store_deleted_fabs)
+DELETED_FILE_PREFIX_FORMATS = ["%m-%d-%Y", "%Y-%m-%d"]
+
 
 class DataJob:
     def __init__(self, *args):
@@ -311,6 +392,10 @@ def configure_sql_strings(config, filename, deleted_ids):
         view = settings.ES_AWARDS_ETL_VIEW_NAME
         view_type = "award"
         type_fy = ""
+    elif config["load_type"] == "subawards":
+        view = settings.ES_SUBAWARDS_ETL_VIEW_NAME
+        view_type = "subaward"
+        type_fy = ""
     else:
         view = settings.ES_TRANSACTIONS_ETL_VIEW_NAME
         view_type = "transaction"
@@ -335,6 +420,8 @@ def configure_sql_strings(config, filename, deleted_ids):
 def get_updated_record_count(config):
     if config["load_type"] == "awards":
         view_name = settings.ES_AWARDS_ETL_VIEW_NAME
+    elif config["load_type"] == "subawards":
+        view_name = settings.ES_SUBAWARDS_ETL_VIEW_NAME
     else:
         view_name = settings.ES_TRANSACTIONS_ETL_VIEW_NAME
 
@@ -378,6 +465,12 @@ def download_db_records(fetch_jobs, done_jobs, config):
         else:
             start = perf_counter()
             job = fetch_jobs.get_nowait()
+            if job.count is not None:
+                # The CSV was fully downloaded by the run being resumed; index it without another COPY
+                printf({"msg": f'Reusing checkpointed CSV "{job.csv}"', "job": job.name, "f": "Download"})
+                done_jobs.put(job)
+                continue
+
             printf({"msg": f'Preparing to download "{job.csv}"', "job": job.name, "f": "Download"})
 
             sql_config = {
@@ -392,6 +485,8 @@ def download_db_records(fetch_jobs, done_jobs, config):
                 os.remove(job.csv)
 
             job.count = download_csv(count_sql, copy_sql, job.csv, job.name, config["skip_counts"], config["verbose"])
+            if config.get("checkpoint"):
+                config["checkpoint"].mark_downloaded(job.fy, job.csv, job.count)
             done_jobs.put(job)
             printf(
                 {
@@ -440,7 +535,8 @@ def csv_chunk_gen(filename, chunksize, job_id, load_type):
         "disaster_emergency_fund_codes": convert_postgres_array_as_string_to_list,
     }
     # Panda's data type guessing causes issues for Elasticsearch. Explicitly cast using dictionary
-    dtype = {k: str for k in VIEW_COLUMNS if k not in converters}
+    view_columns = SUBAWARD_VIEW_COLUMNS if load_type == "subawards" else VIEW_COLUMNS
+    dtype = {k: str for k in view_columns if k not in converters}
     for file_df in pd.read_csv(filename, dtype=dtype, converters=converters, header=0, chunksize=chunksize):
         file_df = file_df.where(cond=(pd.notnull(file_df)), other=None)
         # Route all documents with the same recipient to the same shard
@@ -452,7 +548,7 @@ def csv_chunk_gen(filename, chunksize, job_id, load_type):
 
         # Explicitly setting the ES _id field to match the postgres PK value allows
         # bulk index operations to be upserts without creating duplicate documents
-        file_df["_id"] = file_df[f"{'award' if load_type == 'awards' else 'transaction'}_id"]
+        file_df["_id"] = file_df[f"{ES_DOCUMENT_TYPES[load_type]}_id"]
         yield file_df.to_dict(orient="records")
 
 
@@ -498,6 +594,19 @@ def put_alias(client, index, alias_name, alias_body):
 
 
 def create_aliases(client, index, load_type, silent=False):
+    if load_type == "subawards":
+        # Subawards are not split by award type; a single query alias lets documents without a linked prime award
+        # (and therefore without a prime award type) remain searchable
+        alias_name = f"{settings.ES_SUBAWARDS_QUERY_ALIAS_PREFIX}-all"
+        if silent is False:
+            printf({"msg": f"Putting alias '{alias_name}' on {index}", "job": None, "f": "ES Alias Put"})
+        put_alias(client, index, alias_name, {})
+        printf(
+            {"msg": f"Putting alias '{settings.ES_SUBAWARDS_WRITE_ALIAS}' on {index}", "job": None, "f": "ES Alias Put"}
+        )
+        put_alias(client, index, settings.ES_SUBAWARDS_WRITE_ALIAS, {})
+        return
+
     for award_type, award_type_codes in INDEX_ALIASES_TO_AWARD_TYPES.items():
         if load_type == "awards":
             prefix = settings.ES_AWARDS_QUERY_ALIAS_PREFIX
@@ -546,6 +655,8 @@ def swap_aliases(client, index, load_type):
         client.indices.delete_alias(index, "_all")
     if load_type == "awards":
         alias_patterns = settings.ES_AWARDS_QUERY_ALIAS_PREFIX + "*"
+    elif load_type == "subawards":
+        alias_patterns = settings.ES_SUBAWARDS_QUERY_ALIAS_PREFIX + "*"
     else:
         alias_patterns = settings.ES_TRANSACTIONS_QUERY_ALIAS_PREFIX + "*"
     old_indexes = []
@@ -581,8 +692,15 @@ def post_to_elasticsearch(client, job, config, chunksize=250000):
         client.indices.create(index=job.index)
         client.indices.refresh(job.index)
 
+    checkpoint = config.get("checkpoint")
+    completed_chunks = checkpoint.completed_chunks(job.fy) if checkpoint else set()
+
     csv_generator = csv_chunk_gen(job.csv, chunksize, job.name, config["load_type"])
     for count, chunk in enumerate(csv_generator):
+        if count in completed_chunks:
+            msg = f"Skipping chunk #{count}, indexed before the last checkpoint"
+            printf({"msg": msg, "job": job.name, "f": "ES Index"})
+            continue
         if len(chunk) == 0:
             printf({"msg": f"No documents to add/delete for chunk #{count}", "f": "ES Index", "job": job.name})
             continue
@@ -591,6 +709,8 @@ def post_to_elasticsearch(client, job, config, chunksize=250000):
         current_rows = f"({count * chunksize + 1:,}-{count * chunksize + len(chunk):,})"
         printf({"msg": f"ES Stream #{count} rows [{current_rows}/{job.count:,}]", "job": job.name, "f": "ES Index"})
         streaming_post_to_es(client, chunk, job.index, config["load_type"], job.name)
+        if checkpoint:
+            checkpoint.mark_chunk_complete(job.fy, count)
         printf(
             {
                 "msg": f"Iteration group #{count} took {perf_counter() - iteration:.2f}s",
@@ -599,13 +719,18 @@ def post_to_elasticsearch(client, job, config, chunksize=250000):
             }
         )
 
+    if checkpoint:
+        checkpoint.mark_fiscal_year_complete(job.fy)
     printf({"msg": f"Elasticsearch Index loading took {perf_counter() - start:.2f}s", "job": job.name, "f": "ES Index"})
 
 
 def deleted_transactions(client, config):
-    deleted_ids = gather_deleted_ids(config)
+    manifest = DeletedFileManifest(config["directory"], config["load_type"])
+    deleted_ids = gather_deleted_ids(config, manifest)
     id_list = [{"key": deleted_id, "col": UNIVERSAL_TRANSACTION_ID_NAME} for deleted_id in deleted_ids]
-    delete_from_es(client, id_list, None, config, None)
+    outcomes = delete_from_es(client, id_list, None, config, None)
+    _raise_on_failed_deletes(outcomes)
+    manifest.save(config["starting_date"])
 
 
 def deleted_awards(client, config):
@@ -613,11 +738,13 @@ def deleted_awards(client, config):
     so we have to find all the awards connected to these transactions,
     if we can't find the awards in the database, then we have to delete them from es
     """
-    deleted_ids = gather_deleted_ids(config)
+    manifest = DeletedFileManifest(config["directory"], config["load_type"])
+    deleted_ids = gather_deleted_ids(config, manifest)
     id_list = [{"key": deleted_id, "col": UNIVERSAL_TRANSACTION_ID_NAME} for deleted_id in deleted_ids]
     award_ids = get_deleted_award_ids(client, id_list, config, settings.ES_TRANSACTIONS_QUERY_ALIAS_PREFIX + "-*")
     if (len(award_ids)) == 0:
         printf({"msg": "No related awards require deletion. ", "f": "ES Delete", "job": None})
+        manifest.save(config["starting_date"])
         return
     deleted_award_ids = check_awards_for_deletes(award_ids)
     if len(deleted_award_ids) != 0:
@@ -625,12 +752,20 @@ def deleted_awards(client, config):
             {"key": deleted_award["generated_unique_award_id"], "col": UNIVERSAL_AWARD_ID_NAME}
             for deleted_award in deleted_award_ids
         ]
-        delete_from_es(client, award_id_list, None, config, None)
+        outcomes = delete_from_es(client, award_id_list, None, config, None)
+        _raise_on_failed_deletes(outcomes)
     else:
         printf({"msg": "No related awards require deletion. ", "f": "ES Delete", "job": None})
+    manifest.save(config["starting_date"])
     return
 
 
+def _raise_on_failed_deletes(outcomes):
+    # Exiting non-zero keeps a checkpointed run from recording the deletes as complete, so a resume retries them
+    if "failed" in outcomes.values():
+        raise SystemExit(1)
+
+
 def take_snapshot(client, index, repository):
     snapshot_name = f"{index}-{str(datetime.now().date())}"
     try:
@@ -646,28 +781,38 @@ def take_snapshot(client, index, repository):
         raise SystemExit(1)
 
 
-def gather_deleted_ids(config):
+def gather_deleted_ids(config, manifest=None):
     """
     Connect to S3 and gather all of the transaction ids stored in CSV files
     generated by the broker when transactions are removed from the DB.
+
+    When a manifest is provided, files it already records as processed are skipped and the files read here are
+    added to it; the caller saves the manifest once the deletes have been applied.
     """
 
     if not config["process_deletes"]:
         printf({"msg": "Skipping the S3 CSV fetch for deleted transactions"})
-        return
+        return {}
     printf({"msg": "Gathering all deleted transactions from S3"})
     start = perf_counter()
 
-    bucket_objects = retrieve_s3_bucket_object_list(bucket_name=config["s3_bucket"])
-    printf({"msg": f"{len(bucket_objects):,} files found in bucket '{config['s3_bucket']}'."})
-
     if config["verbose"]:
         printf({"msg": f"CSV data from {config['starting_date']} to now"})
 
+    prefixes = deleted_file_prefixes(config["starting_date"], config["processing_start_datetime"])
+    listing = list_s3_bucket_objects_by_prefix(config["s3_bucket"], prefixes, max_workers=DELETED_FILE_WORKERS)
+    bucket_objects = {obj["Key"]: obj for obj in listing}
+    printf({"msg": f"{len(bucket_objects):,} files found in bucket '{config['s3_bucket']}'."})
+
     filtered_csv_list = [
-        x
-        for x in bucket_objects
-        if (x.key.endswith(".csv") and not x.key.startswith("staging") and x.last_modified >= config["starting_date"])
+        obj
+        for obj in bucket_objects.values()
+        if (
+            obj["Key"].endswith(".csv")
+            and not obj["Key"].startswith("staging")
+            and obj["LastModified"] >= config["starting_date"]
+            and not (manifest and manifest.is_processed(obj))
+        )
     ]
 
     if config["verbose"]:
@@ -675,25 +820,17 @@ def gather_deleted_ids(config):
 
     deleted_ids = {}
 
-    for obj in filtered_csv_list:
-        object_data = access_s3_object(bucket_name=config["s3_bucket"], obj=obj)
-
-        # Ingests the CSV into a dataframe. pandas thinks some ids are dates, so disable parsing
-        data = pd.read_csv(object_data, dtype=str)
-
-        if "detached_award_proc_unique" in data:
-            new_ids = ["CONT_TX_" + x.upper() for x in data["detached_award_proc_unique"].values]
-        elif "afa_generated_unique" in data:
-            new_ids = ["ASST_TX_" + x.upper() for x in data["afa_generated_unique"].values]
-        else:
-            printf({"msg": f"  [Missing valid col] in {obj.key}"})
-
-        for uid in new_ids:
-            if uid in deleted_ids:
-                if deleted_ids[uid]["timestamp"] < obj.last_modified:
-                    deleted_ids[uid]["timestamp"] = obj.last_modified
-            else:
-                deleted_ids[uid] = {"timestamp": obj.last_modified}
+    with ThreadPoolExecutor(max_workers=DELETED_FILE_WORKERS) as executor:
+        file_ids = executor.map(lambda obj: read_deleted_ids(config["s3_bucket"], obj["Key"]), filtered_csv_list)
+        for obj, new_ids in zip(filtered_csv_list, file_ids):
+            for uid in new_ids:
+                if uid in deleted_ids:
+                    if deleted_ids[uid]["timestamp"] < obj["LastModified"]:
+                        deleted_ids[uid]["timestamp"] = obj["LastModified"]
+                else:
+                    deleted_ids[uid] = {"timestamp": obj["LastModified"]}
+            if manifest:
+                manifest.add(obj)
 
     if config["verbose"]:
         for uid, deleted_dict in deleted_ids.items():
@@ -703,13 +840,86 @@ def gather_deleted_ids(config):
     return deleted_ids
 
 
+def deleted_file_prefixes(starting_date, ending_date):
+    """
+    Broker names its FPDS delete files "MM-DD-YYYY_<type>_<epoch>.csv" and store_deleted_fabs names the FABS ones
+    "YYYY-MM-DD_FABSdeletions_<epoch>.csv". For short windows (incremental loads) only the keys of those days are
+    listed, in both formats, starting a day early to cover files named before midnight UTC. Longer windows list the
+    whole bucket since a few requests per day would cost more than the full listing.
+    """
+    first_day = (starting_date - timedelta(days=1)).date()
+    days = (ending_date.date() - first_day).days + 1
+    if days > DELETED_FILE_PREFIX_MAX_DAYS:
+        return [""]
+    return [
+        (first_day + timedelta(days=n)).strftime(date_format)
+        for n in range(days)
+        for date_format in DELETED_FILE_PREFIX_FORMATS
+    ]
+
+
+def read_deleted_ids(bucket_name, key):
+    """Stream a delete file and convert the values of its single ID column to unique transaction IDs"""
+    reader = csv.reader(stream_s3_object_lines(bucket_name, key))
+    header = next(reader, [])
+
+    if "detached_award_proc_unique" in header:
+        column, id_prefix = header.index("detached_award_proc_unique"), "CONT_TX_"
+    elif "afa_generated_unique" in header:
+        column, id_prefix = header.index("afa_generated_unique"), "ASST_TX_"
+    else:
+        printf({"msg": f"  [Missing valid col] in {key}"})
+        return []
+
+    return [id_prefix + row[column].upper() for row in reader if len(row) > column and row[column]]
+
+
+class DeletedFileManifest:
+    """
+    Local record of the S3 delete files whose IDs were already removed from Elasticsearch, so incremental loads
+    only read new (or re-uploaded) files. Delete the manifest file to force every file to be read again.
+    """
+
+    def __init__(self, directory, load_type):
+        self.path = Path(directory) / f"es_{load_type}_deleted_files.manifest.json"
+        self.files = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def is_processed(self, obj):
+        return self.files.get(obj["Key"], {}).get("etag") == obj["ETag"]
+
+    def add(self, obj):
+        self.files[obj["Key"]] = {"etag": obj["ETag"], "last_modified": obj["LastModified"].isoformat()}
+
+    def save(self, starting_date):
+        # Files older than the load window are never listed again, so they no longer need to be tracked
+        self.files = {
+            k: v for k, v in self.files.items() if datetime.fromisoformat(v["last_modified"]) >= starting_date
+        }
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(self.files, indent=2))
+        os.replace(temp_path, self.path)
+
+
 def filter_query(column, values, query_type="match_phrase"):
     queries = [{query_type: {column: str(i)}} for i in values]
     return {"query": {"bool": {"should": [queries]}}}
 
 
-def delete_query(response):
-    return {"query": {"ids": {"values": [i["_id"] for i in response["hits"]["hits"]]}}}
+def lookup_query(client, index, column, values):
+    """
+    Build the query that finds documents by a list of ID values. Keyword and numeric fields (or the keyword sub-field
+    of a text field) are matched with a single `terms` clause; a text field without a keyword sub-field falls back
+    to one `match_phrase` clause per value.
+    """
+    field_mappings = client.indices.get_field_mapping(fields=column, index=index)
+    mapping = next((m["mappings"][column]["mapping"] for m in field_mappings.values() if column in m["mappings"]), {})
+    field_mapping = mapping.get(column.split(".")[-1], {})
+
+    if field_mapping.get("type") == "text":
+        if "keyword" not in field_mapping.get("fields", {}):
+            return filter_query(column, values)
+        column = f"{column}.keyword"
+    return {"query": {"terms": {column: [str(v) for v in values]}}}
 
 
 def chunks(l, n):
@@ -718,7 +928,7 @@ def chunks(l, n):
         yield l[i : i + n]
 
 
-def delete_from_es(client, id_list, job_id, config, index=None):
+def delete_from_es(client, id_list, job_id, config, index=None, chunk_size=1000, max_workers=4):
     """
     id_list = [{key:'key1',col:'tranaction_id'},
                {key:'key2',col:'generated_unique_transaction_id'}],
@@ -727,6 +937,9 @@ def delete_from_es(client, id_list, job_id, config, index=None):
     id_list = [{key:'key1',col:'award_id'},
                {key:'key2',col:'generated_unique_award_id'}],
                ...]
+
+    Chunks of IDs are resolved to documents and removed with bulk `delete` actions concurrently, followed by a
+    single refresh. Returns the outcome for every key: "deleted", "not_found" or "failed".
     """
     start = perf_counter()
 
@@ -734,33 +947,65 @@ def delete_from_es(client, id_list, job_id, config, index=None):
 
     if index is None:
         index = f"{config['root_index']}-*"
-    start_ = client.count(index=index)["count"]
-    printf({"msg": f"Starting amount of indices ----- {start_:,}", "f": "ES Delete", "job": job_id})
     col_to_items_dict = defaultdict(list)
     for l in id_list:
         col_to_items_dict[l["col"]].append(l["key"])
 
-    for column, values in col_to_items_dict.items():
-        printf({"msg": f'Deleting {len(values):,} of "{column}"', "f": "ES Delete", "job": job_id})
-        values_generator = chunks(values, 1000)
-        for v in values_generator:
-            # IMPORTANT: This delete routine looks at just 1 index at a time. If there are duplicate records across
-            # multiple indexes, those duplicates will not be caught by this routine. It is left as is because at the
-            # time of this comment, we are migrating to using a single index.
-            body = filter_query(column, v)
-            response = client.search(index=index, body=json.dumps(body), size=config["max_query_size"])
-            delete_body = delete_query(response)
-            try:
-                client.delete_by_query(
-                    index=index, body=json.dumps(delete_body), refresh=True, size=config["max_query_size"]
-                )
-            except Exception as e:
-                printf({"msg": f"[ERROR][ERROR][ERROR]\n{str(e)}", "f": "ES Delete", "job": job_id})
-    end_ = client.count(index=index)["count"]
-
-    msg = f"ES Deletes took {perf_counter() - start:.2f}s. Deleted {start_ - end_:,} records"
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for column, values in col_to_items_dict.items():
+            printf({"msg": f'Deleting {len(values):,} of "{column}"', "f": "ES Delete", "job": job_id})
+            for v in chunks(values, chunk_size):
+                futures.append(executor.submit(_delete_chunk_from_es, client, index, column, v, config))
+        for future in as_completed(futures):
+            outcomes.update(future.result())
+    client.indices.refresh(index=index)
+
+    deleted = sum(1 for o in outcomes.values() if o == "deleted")
+    not_found = sum(1 for o in outcomes.values() if o == "not_found")
+    failed = [k for k, o in outcomes.items() if o == "failed"]
+    msg = (
+        f"ES Deletes took {perf_counter() - start:.2f}s. Deleted {deleted:,} ID(s) | "
+        f"Not found: {not_found:,} | Failed: {len(failed):,}"
+    )
     printf({"msg": msg, "f": "ES Delete", "job": job_id})
-    return
+    if failed:
+        printf({"msg": f"[ERROR] Failed to delete: {failed}", "f": "ES Delete", "job": job_id})
+    return outcomes
+
+
+def _delete_chunk_from_es(client, index, column, values, config):
+    # IMPORTANT: This delete routine looks at just 1 index at a time. If there are duplicate records across
+    # multiple indexes, those duplicates will not be caught by this routine. It is left as is because at the
+    # time of this comment, we are migrating to using a single index.
+    outcomes = {str(v): "not_found" for v in values}
+    body = lookup_query(client, index, column, values)
+    body["_source"] = [column]
+    try:
+        response = client.search(index=index, body=json.dumps(body), size=config["max_query_size"])
+    except Exception as e:
+        printf({"msg": f"[ERROR][ERROR][ERROR]\n{str(e)}", "f": "ES Delete"})
+        return {key: "failed" for key in outcomes}
+
+    # Documents are routed by recipient, so each delete action needs the routing of the document it targets
+    key_by_doc = {}
+    actions = []
+    for hit in response["hits"]["hits"]:
+        key = str(hit["_source"].get(column))
+        key_by_doc[(hit["_index"], hit["_id"])] = key
+        action = {"_op_type": "delete", "_index": hit["_index"], "_id": hit["_id"]}
+        if "_routing" in hit:
+            action["routing"] = hit["_routing"]
+        actions.append(action)
+        outcomes[key] = "deleted"
+
+    for ok, item in helpers.streaming_bulk(client, actions, raise_on_error=False, raise_on_exception=False):
+        result = item["delete"]
+        # A document already gone (404) is still an accurate "deleted" outcome for the requested ID
+        if not ok and result.get("status") != 404:
+            outcomes[key_by_doc[(result["_index"], result["_id"])]] = "failed"
+    return outcomes
 
 
 def get_deleted_award_ids(client, id_list, config, index=None):
@@ -778,11 +1023,12 @@ def get_deleted_award_ids(client, id_list, config, index=None):
     for column, values in col_to_items_dict.items():
         values_generator = chunks(values, 1000)
         for v in values_generator:
-            body = filter_query(column, v)
+            body = lookup_query(client, index, column, v)
+            body["_source"] = [UNIVERSAL_AWARD_ID_NAME]
             response = client.search(index=index, body=json.dumps(body), size=config["max_query_size"])
             if response["hits"]["total"]["value"] != 0:
-                awards = [x["_source"]["generated_unique_award_id"] for x in response["hits"]["hits"]]
-    return awards
+                awards.extend(x["_source"][UNIVERSAL_AWARD_ID_NAME] for x in response["hits"]["hits"])
+    return list(dict.fromkeys(awards))
 
 
 def check_awards_for_deletes(id_list):
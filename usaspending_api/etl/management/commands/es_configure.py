@@ -4,7 +4,7 @@ import subprocess
 from django.core.management.base import BaseCommand
 
 from django.conf import settings
-from usaspending_api.etl.es_etl_helpers import VIEW_COLUMNS, AWARD_VIEW_COLUMNS
+from usaspending_api.etl.es_etl_helpers import VIEW_COLUMNS, AWARD_VIEW_COLUMNS, SUBAWARD_VIEW_COLUMNS
 
 CURL_STATEMENT = 'curl -XPUT "{url}" -H "Content-Type: application/json" -d \'{data}\''
 
@@ -17,6 +17,7 @@ CURL_COMMANDS = {
 FILES = {
     "transaction_template": settings.APP_DIR / "etl" / "es_transaction_template.json",
     "award_template": settings.APP_DIR / "etl" / "es_award_template.json",
+    "subaward_template": settings.APP_DIR / "etl" / "es_subaward_template.json",
     "settings": settings.APP_DIR / "etl" / "es_config_objects.json",
 }
 
@@ -31,8 +32,8 @@ class Command(BaseCommand):
         parser.add_argument(
             "--load-type",
             type=str,
-            help="Select which type of index to configure, current options are awards or transactions",
-            choices=["transactions", "awards"],
+            help="Select which type of index to configure, current options are awards, subawards, or transactions",
+            choices=["transactions", "awards", "subawards"],
             default="transactions",
         )
         parser.add_argument(
@@ -50,6 +51,10 @@ class Command(BaseCommand):
             self.index_pattern = "*{}".format(settings.ES_AWARDS_NAME_SUFFIX)
             self.max_result_window = settings.ES_AWARDS_MAX_RESULT_WINDOW
             self.load_columns = AWARD_VIEW_COLUMNS
+        elif options["load_type"] == "subawards":
+            self.index_pattern = "*{}".format(settings.ES_SUBAWARDS_NAME_SUFFIX)
+            self.max_result_window = settings.ES_SUBAWARDS_MAX_RESULT_WINDOW
+            self.load_columns = SUBAWARD_VIEW_COLUMNS
         elif options["load_type"] == "transactions":
             self.index_pattern = "*{}".format(settings.ES_TRANSACTIONS_NAME_SUFFIX)
             self.max_result_window = settings.ES_TRANSACTIONS_MAX_RESULT_WINDOW
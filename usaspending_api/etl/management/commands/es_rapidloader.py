@@ -11,6 +11,13 @@ from usaspending_api.common.helpers.date_helper import datetime_command_line_arg
 from usaspending_api.common.helpers.fiscal_year_helpers import create_fiscal_year_list
 from usaspending_api.etl.es_etl_helpers import printf
 from usaspending_api.etl.rapidloader import Rapidloader
+from usaspending_api.etl.rapidloader_checkpoint import RapidloaderCheckpoint
+
+INDEX_NAME_SUFFIXES = {
+    "transactions": settings.ES_TRANSACTIONS_NAME_SUFFIX,
+    "awards": settings.ES_AWARDS_NAME_SUFFIX,
+    "subawards": settings.ES_SUBAWARDS_NAME_SUFFIX,
+}
 
 
 class Command(BaseCommand):
@@ -34,6 +41,13 @@ class Command(BaseCommand):
         3. All aliases used by the API queries will be re-assigned to the new index
         4. An alias for incremental indexes will be applied to the new index
         5. If any previous indexes existed with the API aliases, they will be deleted.
+
+    TO RESUME A FAILED RUN:
+        python3 manage.py es_rapidloader <SAME ARGUMENTS> --resume <RUN-ID>
+
+        Each run logs its run ID and records completed (fiscal year, chunk) units in a checkpoint file in --dir.
+        Resuming skips completed fiscal years, reuses CSVs that finished downloading and skips their indexed chunks.
+        The checkpoint is removed once the run completes.
     """
 
     help = """Hopefully the code comments are helpful enough to figure this out...."""
@@ -94,8 +108,8 @@ class Command(BaseCommand):
         parser.add_argument(
             "--load-type",
             type=str,
-            help="Select which type of load to perform, current options are transactions or awards.",
-            choices=["transactions", "awards"],
+            help="Select which type of load to perform, current options are transactions, awards, or subawards.",
+            choices=["transactions", "awards", "subawards"],
             default="transactions",
         )
         parser.add_argument(
@@ -104,6 +118,13 @@ class Command(BaseCommand):
             help="Time in seconds the ES index process should wait before looking for a new CSV data file.",
             default=60,
         )
+        parser.add_argument(
+            "--resume",
+            type=str,
+            metavar="RUN_ID",
+            help="Resume a failed run from its last checkpoint, skipping fiscal years and chunks it already indexed. "
+            "Provide the run ID logged at the start of that run along with the same arguments it was started with.",
+        )
 
     def handle(self, *args, **options):
         elasticsearch_client = instantiate_elasticsearch_client()
@@ -113,11 +134,19 @@ class Command(BaseCommand):
         printf({"msg": f"Starting script\n{'=' * 56}"})
         start_msg = "target index: {index_name} | FY(s): {fiscal_years} | Starting from: {starting_date}"
         printf({"msg": start_msg.format(**config)})
+        if config["resume"]:
+            printf({"msg": f"Resuming run {config['run_id']} from checkpoint '{config['checkpoint'].path}'"})
+        else:
+            checkpoint = config["checkpoint"]
+            checkpoint.create(config["load_type"], config["starting_date"], config["processing_start_datetime"])
+            printf({"msg": f"Run ID: {config['run_id']} (restart with --resume {config['run_id']} if this run fails)"})
 
         if config["load_type"] == "transactions":
             ensure_view_exists(settings.ES_TRANSACTIONS_ETL_VIEW_NAME)
         elif config["load_type"] == "awards":
             ensure_view_exists(settings.ES_AWARDS_ETL_VIEW_NAME)
+        elif config["load_type"] == "subawards":
+            ensure_view_exists(settings.ES_SUBAWARDS_ETL_VIEW_NAME)
 
         loader = Rapidloader(config, elasticsearch_client)
         loader.run_load_steps()
@@ -139,6 +168,7 @@ def process_cli_parameters(options: dict, es_client) -> dict:
         "directory",
         "skip_counts",
         "load_type",
+        "resume",
     )
     config = set_config(simple_args, options)
 
@@ -150,10 +180,7 @@ def process_cli_parameters(options: dict, es_client) -> dict:
     elif config["create_new_index"]:
         config["index_name"] = config["index_name"].lower()
         config["starting_date"] = default_datetime
-        check_new_index_name_is_ok(
-            config["index_name"],
-            settings.ES_AWARDS_NAME_SUFFIX if config["load_type"] == "awards" else settings.ES_TRANSACTIONS_NAME_SUFFIX,
-        )
+        check_new_index_name_is_ok(config["index_name"], INDEX_NAME_SUFFIXES[config["load_type"]])
     elif options["start_datetime"]:
         config["starting_date"] = options["start_datetime"]
     else:
@@ -167,6 +194,8 @@ def process_cli_parameters(options: dict, es_client) -> dict:
     config["max_query_size"] = settings.ES_TRANSACTIONS_MAX_RESULT_WINDOW
     if options["load_type"] == "awards":
         config["max_query_size"] = settings.ES_AWARDS_MAX_RESULT_WINDOW
+    elif options["load_type"] == "subawards":
+        config["max_query_size"] = settings.ES_SUBAWARDS_MAX_RESULT_WINDOW
 
     config["is_incremental_load"] = not bool(config["create_new_index"]) and (
         config["starting_date"] != default_datetime
@@ -176,13 +205,15 @@ def process_cli_parameters(options: dict, es_client) -> dict:
         write_alias = settings.ES_TRANSACTIONS_WRITE_ALIAS
         if config["load_type"] == "awards":
             write_alias = settings.ES_AWARDS_WRITE_ALIAS
+        elif config["load_type"] == "subawards":
+            write_alias = settings.ES_SUBAWARDS_WRITE_ALIAS
         if config["index_name"]:
             printf({"msg": f"Ignoring provided index name, using alias '{write_alias}' for incremental load"})
         config["index_name"] = write_alias
         if not es_client.cat.aliases(name=write_alias):
             printf({"msg": f"Fatal error: write alias '{write_alias}' is missing"})
             raise SystemExit(1)
-    else:
+    elif not config["resume"]:
         if es_client.indices.exists(config["index_name"]):
             printf({"msg": "Fatal error: data load into existing index. Change index name or run an incremental load"})
             raise SystemExit(1)
@@ -196,17 +227,44 @@ def process_cli_parameters(options: dict, es_client) -> dict:
     elif not config["is_incremental_load"] and config["process_deletes"]:
         printf({"msg": "Skipping deletions for ths load, --deleted overwritten to False"})
         config["process_deletes"] = False
+    elif config["load_type"] == "subawards" and config["process_deletes"]:
+        # Deleted records are only journaled to S3 for transactions. Subawards removed from Broker are only dropped
+        # from Elasticsearch by a full reload with --create-new-index
+        printf({"msg": "Deletes are not supported for subawards, --deleted overwritten to False"})
+        config["process_deletes"] = False
 
     config["ingest_wait"] = options["idle_wait_time"]
 
+    config["run_id"] = config["resume"] or RapidloaderCheckpoint.generate_run_id()
+    config["checkpoint"] = RapidloaderCheckpoint(config["directory"], config["run_id"], config["index_name"])
+    if config["resume"]:
+        restore_checkpointed_config(config)
+
     return config
 
 
+def restore_checkpointed_config(config: dict) -> None:
+    """Load the window of the run being resumed so the remaining work covers exactly the same records"""
+    if not config["checkpoint"].exists():
+        printf({"msg": f"Fatal error: no checkpoint found for run '{config['run_id']}' on '{config['index_name']}'"})
+        raise SystemExit(1)
+
+    state = config["checkpoint"].read()
+    if state["load_type"] != config["load_type"]:
+        printf({"msg": f"Fatal error: run '{config['run_id']}' was a {state['load_type']} load"})
+        raise SystemExit(1)
+
+    config["starting_date"] = datetime.fromisoformat(state["starting_date"])
+    config["processing_start_datetime"] = datetime.fromisoformat(state["processing_start_datetime"])
+
+
 def set_config(copy_args: list, arg_parse_options: dict) -> dict:
     """Set values based on env vars and when the script started"""
     root_index = settings.ES_TRANSACTIONS_QUERY_ALIAS_PREFIX
     if arg_parse_options["load_type"] == "awards":
         root_index = settings.ES_AWARDS_QUERY_ALIAS_PREFIX
+    elif arg_parse_options["load_type"] == "subawards":
+        root_index = settings.ES_SUBAWARDS_QUERY_ALIAS_PREFIX
     config = {
         "aws_region": settings.USASPENDING_AWS_REGION,
         "s3_bucket": settings.DELETED_TRANSACTION_JOURNAL_FILES,
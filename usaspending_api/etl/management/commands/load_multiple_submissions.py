@@ -6,10 +6,12 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.db.models import Max
 from django.utils.crypto import get_random_string
+from usaspending_api.agency.profile_rollup import FILE_B_DIMENSIONS, rebuild_agency_profile_rollup
 from usaspending_api.common.helpers.date_helper import now, datetime_command_line_argument_type
 from usaspending_api.etl.submission_loader_helpers.final_of_fy import populate_final_of_fy
 from usaspending_api.etl.submission_loader_helpers.submission_ids import get_new_or_updated_submission_ids
 from usaspending_api.submissions import dabs_loader_queue_helpers as dlqh
+from usaspending_api.references.models import ToptierAgency
 from usaspending_api.submissions.models import SubmissionAttributes
 
 
@@ -37,7 +39,6 @@ class Command(BaseCommand):
     report_queue_status_only = False
     processor_id = None
     heartbeat_timer = None
-    file_c_chunk_size = 100000
     do_not_retry = []
 
     def add_arguments(self, parser):
@@ -79,16 +80,6 @@ class Command(BaseCommand):
             action="store_true",
             help="Just reports the queue status.  Nothing is loaded.",
         )
-        parser.add_argument(
-            "--file-c-chunk-size",
-            type=int,
-            default=self.file_c_chunk_size,
-            help=(
-                f"Controls the number of File C records processed in a single batch.  Theoretically, "
-                f"bigger should be faster... right up until you run out of memory.  Balance carefully.  "
-                f"Default is {self.file_c_chunk_size:,}."
-            ),
-        )
 
         parser.epilog = (
             "And to answer your next question, yes this can be run standalone.  The parallelization "
@@ -129,7 +120,6 @@ class Command(BaseCommand):
         self.incremental = options.get("incremental")
         self.start_datetime = options.get("start_datetime")
         self.report_queue_status_only = options.get("report_queue_status_only")
-        self.file_c_chunk_size = options.get("file_c_chunk_size")
         self.processor_id = f"{now()}/{get_random_string()}"
 
         logger.info(f'processor_id = "{self.processor_id}"')
@@ -235,7 +225,7 @@ class Command(BaseCommand):
         Accepts a locked/claimed submission id, spins up a heartbeat thread, loads the submission,
         returns True if successful or False if not.
         """
-        args = ["--file-c-chunk-size", self.file_c_chunk_size, "--skip-final-of-fy-calculation"]
+        args = ["--skip-final-of-fy-calculation"]
         if force_reload:
             args.append("--force-reload")
         self.start_heartbeat_timer(submission_id)
@@ -278,3 +268,7 @@ class Command(BaseCommand):
         logger.info("Updating final_of_fy")
         populate_final_of_fy()
         logger.info(f"Finished updating final_of_fy.")
+        # Other loaders may have loaded submissions for any agency since final_of_fy was last updated
+        rebuild_agency_profile_rollup(
+            ToptierAgency.objects.values_list("toptier_agency_id", flat=True), FILE_B_DIMENSIONS
+        )
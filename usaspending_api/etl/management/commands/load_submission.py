@@ -1,14 +1,19 @@
 import logging
 import signal
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from django.core.management.base import CommandError
-from django.db import transaction
+from django.db import connection, connections, transaction
+from usaspending_api.agency.profile_rollup import rebuild_agency_profile_rollup_for_submission
+from usaspending_api.awards.idv_closure import get_file_c_award_ids, refresh_idv_funding_rollups
+from usaspending_api.disaster.file_c_spending import refresh_disaster_file_c_spending
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management import load_base
 from usaspending_api.etl.submission_loader_helpers.file_a import get_file_a, load_file_a
 from usaspending_api.etl.submission_loader_helpers.file_b import get_file_b, load_file_b
-from usaspending_api.etl.submission_loader_helpers.file_c import get_file_c, load_file_c
+from usaspending_api.etl.submission_loader_helpers.file_c import drop_file_c_staging_table, load_file_c, stage_file_c
 from usaspending_api.etl.submission_loader_helpers.final_of_fy import populate_final_of_fy
 from usaspending_api.etl.submission_loader_helpers.program_activities import update_program_activities
 from usaspending_api.etl.submission_loader_helpers.submission_attributes import (
@@ -27,10 +32,10 @@ class Command(load_base.Command):
     """
 
     submission_id = None
-    file_c_chunk_size = 100000
     force_reload = False
     skip_final_of_fy_calculation = False
     db_cursor = None
+    stage_concurrently = True
 
     help = (
         "Loads a single submission from the DATA Act broker. The DATA_BROKER_DATABASE_URL environment variable "
@@ -55,25 +60,19 @@ class Command(load_base.Command):
                 "the final_of_fy value from being recalculated for each submission that's loaded.",
             ),
         )
-        parser.add_argument(
-            "--file-c-chunk-size",
-            type=int,
-            default=self.file_c_chunk_size,
-            help=(
-                "Controls the number of File C records processed in a single batch.  Theoretically, "
-                "bigger should be faster... right up until you run out of memory.  Balance carefully."
-            ),
-        )
         super(Command, self).add_arguments(parser)
 
     def handle_loading(self, db_cursor, *args, **options):
 
         self.submission_id = options["submission_id"]
         self.force_reload = options["force_reload"]
-        self.file_c_chunk_size = options["file_c_chunk_size"]
         self.skip_final_of_fy_calculation = options["skip_final_of_fy_calculation"]
         self.db_cursor = db_cursor
 
+        # Connections opened by other threads can't see data written by a transaction the caller already holds (which
+        # is mostly a test thing), so in that case Broker reads and File C staging share the caller's connections.
+        self.stage_concurrently = not (connection.in_atomic_block or connections["data_broker"].in_atomic_block)
+
         logger.info(f"Starting processing for submission {self.submission_id}...")
 
         # This has to occur outside of the transaction so we don't hang up other loaders that may be
@@ -84,7 +83,10 @@ class Command(load_base.Command):
         new_program_activities = update_program_activities(self.submission_id)
         logger.info(f"{new_program_activities:,} new program activities created")
 
-        self.load_in_transaction()
+        try:
+            self.load_in_transaction()
+        finally:
+            drop_file_c_staging_table(self.submission_id)
 
     @transaction.atomic
     def load_in_transaction(self):
@@ -106,39 +108,52 @@ class Command(load_base.Command):
             logger.info(f"{self.submission_id} did not require a full reload.  Updated.")
             return
 
-        submission_attributes = get_submission_attributes(self.submission_id, submission_data)
+        # The awards the previous version's File C was linked to, whose IDV funding rollups also need refreshing
+        previous_file_c_award_ids = get_file_c_award_ids(self.submission_id)
+
+        # Reading the files from Broker and staging File C don't depend on anything done in this transaction, so they
+        # run on their own connections while the previous version of the submission is deleted and Files A and B load.
+        with self.file_executor() as executor:
+            file_a_future = self.submit_file_task(executor, get_file_a)
+            file_b_future = self.submit_file_task(executor, get_file_b)
+            file_c_future = self.submit_file_task(executor, stage_file_c)
+
+            submission_attributes = get_submission_attributes(self.submission_id, submission_data)
+
+            logger.info("Getting File A data")
+            appropriation_data = file_a_future.result()
+            logger.info(
+                f"Acquired File A (appropriation) data for {self.submission_id}, "
+                f"there are {len(appropriation_data):,} rows."
+            )
+            logger.info("Loading File A data")
+            start_time = datetime.now()
+            load_file_a(submission_attributes, appropriation_data, self.db_cursor)
+            logger.info(f"Finished loading File A data, took {datetime.now() - start_time}")
+
+            logger.info("Getting File B data")
+            prg_act_obj_cls_data = file_b_future.result()
+            logger.info(
+                f"Acquired File B (program activity object class) data for {self.submission_id}, "
+                f"there are {len(prg_act_obj_cls_data):,} rows."
+            )
+            logger.info("Loading File B data")
+            start_time = datetime.now()
+            load_file_b(submission_attributes, prg_act_obj_cls_data, self.db_cursor)
+            logger.info(f"Finished loading File B data, took {datetime.now() - start_time}")
+
+            logger.info("Getting File C data")
+            file_c_row_count = file_c_future.result()
+            logger.info(
+                f"Acquired File C (award financial) data for {self.submission_id}, there are {file_c_row_count:,} rows."
+            )
+            logger.info("Loading File C data")
+            start_time = datetime.now()
+            load_file_c(submission_attributes, self.db_cursor, file_c_row_count)
+            logger.info(f"Finished loading File C data, took {datetime.now() - start_time}")
 
-        logger.info("Getting File A data")
-        appropriation_data = get_file_a(submission_attributes, self.db_cursor)
-        logger.info(
-            f"Acquired File A (appropriation) data for {self.submission_id}, there are {len(appropriation_data):,} rows."
-        )
-        logger.info("Loading File A data")
-        start_time = datetime.now()
-        load_file_a(submission_attributes, appropriation_data, self.db_cursor)
-        logger.info(f"Finished loading File A data, took {datetime.now() - start_time}")
-
-        logger.info("Getting File B data")
-        prg_act_obj_cls_data = get_file_b(submission_attributes, self.db_cursor)
-        logger.info(
-            f"Acquired File B (program activity object class) data for {self.submission_id}, "
-            f"there are {len(prg_act_obj_cls_data):,} rows."
-        )
-        logger.info("Loading File B data")
-        start_time = datetime.now()
-        load_file_b(submission_attributes, prg_act_obj_cls_data, self.db_cursor)
-        logger.info(f"Finished loading File B data, took {datetime.now() - start_time}")
-
-        logger.info("Getting File C data")
-        certified_award_financial = get_file_c(submission_attributes, self.db_cursor, self.file_c_chunk_size)
-        logger.info(
-            f"Acquired File C (award financial) data for {self.submission_id}, "
-            f"there are {certified_award_financial.count:,} rows."
-        )
-        logger.info("Loading File C data")
-        start_time = datetime.now()
-        load_file_c(submission_attributes, self.db_cursor, certified_award_financial)
-        logger.info(f"Finished loading File C data, took {datetime.now() - start_time}")
+        refresh_idv_funding_rollups(set(previous_file_c_award_ids + get_file_c_award_ids(self.submission_id)))
+        refresh_disaster_file_c_spending([self.submission_id])
 
         if self.skip_final_of_fy_calculation:
             logger.info("Skipping final_of_fy calculation as requested.")
@@ -147,6 +162,7 @@ class Command(load_base.Command):
             start_time = datetime.now()
             populate_final_of_fy()
             logger.info(f"Finished updating final_of_fy, took {datetime.now() - start_time}")
+            rebuild_agency_profile_rollup_for_submission(self.submission_id)
 
         # Once all the files have been processed, run any global cleanup/post-load tasks.
         # Cleanup not specific to this submission is run in the `.handle` method
@@ -154,6 +170,22 @@ class Command(load_base.Command):
 
         logger.info("Committing transaction...")
 
+    @contextmanager
+    def file_executor(self):
+        if not self.stage_concurrently:
+            yield None
+            return
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix=f"load_submission_{self.submission_id}") as executor:
+            yield executor
+
+    def submit_file_task(self, executor, function):
+        """Run function(submission_id, broker_cursor) on the executor's own connections, or right here without one"""
+        if executor is None:
+            future = Future()
+            future.set_result(function(self.submission_id, self.db_cursor))
+            return future
+        return executor.submit(_run_on_own_connections, function, self.submission_id)
+
     def get_broker_submission(self):
         self.db_cursor.execute(
             f"""
@@ -201,3 +233,11 @@ class Command(load_base.Command):
             raise RuntimeError(f"d2_submission {submission_data['d2_submission']} is not allowed")
 
         return submission_data
+
+
+def _run_on_own_connections(function, submission_id):
+    try:
+        with connections["data_broker"].cursor() as broker_cursor:
+            return function(submission_id, broker_cursor)
+    finally:
+        connections.close_all()
@@ -1,7 +1,11 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
+from usaspending_api.common.helpers.etl_helpers import (
+    check_unlinked_counts,
+    update_c_to_d_linkages,
+    update_c_to_d_linkages_delta,
+)
 
 
 class Command(BaseCommand):
@@ -10,18 +14,40 @@ class Command(BaseCommand):
     ETL_SQL_FILE_PATH = "usaspending_api/etl/management/sql/"
 
     def add_arguments(self, parser):
-        parser.add_argument(
+        mutually_exclusive_group = parser.add_mutually_exclusive_group()
+        mutually_exclusive_group.add_argument(
             "--submission-ids", help=("One or more Broker submission_ids to be updated."), nargs="+", type=int,
         )
+        mutually_exclusive_group.add_argument(
+            "--delta",
+            action="store_true",
+            help="Only link File C records from submissions changed since the last delta run, and unlinked File C "
+            "records matching awards changed since then.  Each linkage type commits on its own.",
+        )
+        parser.add_argument(
+            "--check-counts",
+            action="store_true",
+            help="Afterwards, compare the maintained counts of unlinked File C records with a full count and rebuild "
+            "them if they differ.",
+        )
 
     def handle(self, *args, **options):
 
-        with transaction.atomic():
-            if options.get("submission_ids"):
-                for sub in options["submission_ids"]:
-                    self.run_sql(sub)
-            else:
-                self.run_sql()
+        if options["delta"]:
+            for link_type in self.LINKAGE_TYPES:
+                with transaction.atomic():
+                    update_c_to_d_linkages_delta(type=link_type)
+        else:
+            with transaction.atomic():
+                if options.get("submission_ids"):
+                    for sub in options["submission_ids"]:
+                        self.run_sql(sub)
+                else:
+                    self.run_sql()
+
+        if options["check_counts"]:
+            for link_type in self.LINKAGE_TYPES:
+                check_unlinked_counts(link_type)
 
     def run_sql(self, submission=None):
         for link_type in self.LINKAGE_TYPES:
@@ -35,7 +35,12 @@ WHERE
 					UPPER(aw_sub.parent_award_piid) = UPPER(faba_sub.parent_award_id)
 			) = 1
             {submission_id_clause}
-	) RETURNING award_id
+	) RETURNING award_id, submission_id
+),
+-- Recorded so the tables built from File C links to awards can be refreshed afterwards
+linked AS (
+	INSERT INTO temp_c_to_d_linked_records (submission_id, award_id)
+	SELECT submission_id, award_id FROM cte
 )
 UPDATE
 	awards
@@ -77,7 +82,12 @@ WHERE
 					UPPER(aw_sub.piid) = UPPER(faba_sub.piid)
 			) = 1
             {submission_id_clause}
-	) RETURNING award_id
+	) RETURNING award_id, submission_id
+),
+-- Recorded so the tables built from File C links to awards can be refreshed afterwards
+linked AS (
+	INSERT INTO temp_c_to_d_linked_records (submission_id, award_id)
+	SELECT submission_id, award_id FROM cte
 )
 UPDATE
 	awards
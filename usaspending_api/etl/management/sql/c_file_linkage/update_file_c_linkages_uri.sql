@@ -30,7 +30,12 @@ WHERE
 				WHERE UPPER(aw_sub.uri) = UPPER(faba_sub.uri)
 			) = 1
             {submission_id_clause}
-	) RETURNING award_id
+	) RETURNING award_id, submission_id
+),
+-- Recorded so the tables built from File C links to awards can be refreshed afterwards
+linked AS (
+	INSERT INTO temp_c_to_d_linked_records (submission_id, award_id)
+	SELECT submission_id, award_id FROM cte
 )
 UPDATE
 	awards
@@ -56,7 +56,11 @@ class Rapidloader:
         if updated_record_count != 0:  # only run if there are data to process
             process_list[0].start()  # Start Download process
 
-        if self.config["process_deletes"]:
+        checkpoint = self.config.get("checkpoint")
+        deletes_complete = checkpoint.read()["deletes_complete"] if checkpoint else False
+        if self.config["process_deletes"] and deletes_complete:
+            printf({"msg": "Skipping S3 deletes, already completed before the last checkpoint"})
+        elif self.config["process_deletes"]:
             process_list.append(
                 Process(
                     name="S3 Deleted Records Scrapper Process",
@@ -68,6 +72,8 @@ class Rapidloader:
             while process_list[-1].is_alive():
                 printf({"msg": "Waiting to start ES ingest until S3 deletes are complete"})
                 sleep(7)  # add a brief pause to make sure the deletes are processed in ES
+            if checkpoint and process_list[-1].exitcode == 0:
+                checkpoint.mark_deletes_complete()
 
         if updated_record_count != 0:
             process_list[1].start()  # start ES ingest process
@@ -82,14 +88,27 @@ class Rapidloader:
 
     def create_download_jobs(self) -> Tuple[Queue, int]:
         download_queue = Queue()
-        for job_number, fiscal_year in enumerate(self.config["fiscal_years"], start=1):
+        checkpoint = self.config.get("checkpoint")
+        job_number = 0
+        for fiscal_year in self.config["fiscal_years"]:
+            if self.config.get("resume") and checkpoint.is_fiscal_year_complete(fiscal_year):
+                printf({"msg": f"Skipping FY{fiscal_year}, completed before the last checkpoint"})
+                continue
+
+            job_number += 1
             index = self.config["index_name"]
             filename = str(self.config["directory"] / f"{fiscal_year}_{self.config['load_type']}.csv")
 
             new_job = DataJob(job_number, index, fiscal_year, filename)
 
-            if Path(filename).exists():
-                Path(filename).unlink()
+            if self.config.get("resume") and checkpoint.downloaded_csv(fiscal_year) == filename:
+                # Keep the CSV so the chunk numbers recorded in the checkpoint still refer to the same rows
+                new_job.count = checkpoint.fiscal_year_state(fiscal_year)["count"]
+            else:
+                if checkpoint:
+                    checkpoint.reset_fiscal_year(fiscal_year)
+                if Path(filename).exists():
+                    Path(filename).unlink()
             download_queue.put(new_job)
         return download_queue, job_number
 
@@ -109,3 +128,7 @@ class Rapidloader:
         if self.config["is_incremental_load"]:
             printf({"msg": f"Storing datetime {self.config['processing_start_datetime']} for next incremental load"})
             update_last_load_date(f"es_{self.config['load_type']}", self.config["processing_start_datetime"])
+
+        if self.config.get("checkpoint"):
+            printf({"msg": f"Run {self.config['run_id']} complete, removing its checkpoint"})
+            self.config["checkpoint"].remove()
@@ -0,0 +1,120 @@
+import fcntl
+import json
+import os
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+
+class RapidloaderCheckpoint:
+    """
+    Records which (fiscal year, chunk) units of an es_rapidloader run have completed so that a failed run can be
+    restarted with --resume without re-downloading and re-indexing finished work.
+
+    State is stored as JSON in the output directory, one file per (run ID, index name). The Download and ES Index
+    processes both write to it, so every update is a locked read-modify-write followed by an atomic rename.
+    """
+
+    def __init__(self, directory: Path, run_id: str, index_name: str):
+        self.run_id = run_id
+        self.index_name = index_name
+        self.path = Path(directory) / f"es_rapidloader_{run_id}_{index_name}.checkpoint.json"
+        self.lock_path = self.path.with_suffix(".lock")
+
+    @staticmethod
+    def generate_run_id() -> str:
+        return uuid4().hex[:12]
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def create(self, load_type: str, starting_date: datetime, processing_start_datetime: datetime) -> None:
+        state = {
+            "run_id": self.run_id,
+            "index_name": self.index_name,
+            "load_type": load_type,
+            "starting_date": starting_date.isoformat(),
+            "processing_start_datetime": processing_start_datetime.isoformat(),
+            "deletes_complete": False,
+            "fiscal_years": {},
+        }
+        with self._locked():
+            self._write(state)
+
+    def read(self) -> dict:
+        with self._locked():
+            return self._read()
+
+    def remove(self) -> None:
+        for path in (self.path, self.lock_path):
+            if path.exists():
+                path.unlink()
+
+    def fiscal_year_state(self, fiscal_year: int) -> dict:
+        return self.read()["fiscal_years"].get(str(fiscal_year), {})
+
+    def is_fiscal_year_complete(self, fiscal_year: int) -> bool:
+        return self.fiscal_year_state(fiscal_year).get("complete", False)
+
+    def downloaded_csv(self, fiscal_year: int) -> Optional[str]:
+        """Return the CSV of a fiscal year if it was fully downloaded during the checkpointed run and still exists"""
+        fy_state = self.fiscal_year_state(fiscal_year)
+        if fy_state.get("csv") and Path(fy_state["csv"]).exists():
+            return fy_state["csv"]
+        return None
+
+    def completed_chunks(self, fiscal_year: int) -> set:
+        return set(self.fiscal_year_state(fiscal_year).get("chunks", []))
+
+    def mark_downloaded(self, fiscal_year: int, csv: str, count: int) -> None:
+        # Chunk numbers are only meaningful for the CSV they were read from, so a new download resets them
+        with self._update() as state:
+            state["fiscal_years"][str(fiscal_year)] = {"csv": csv, "count": count, "chunks": [], "complete": False}
+
+    def reset_fiscal_year(self, fiscal_year: int) -> None:
+        with self._update() as state:
+            state["fiscal_years"].pop(str(fiscal_year), None)
+
+    def mark_chunk_complete(self, fiscal_year: int, chunk_number: int) -> None:
+        with self._update() as state:
+            fy_state = state["fiscal_years"].setdefault(str(fiscal_year), {"chunks": [], "complete": False})
+            if chunk_number not in fy_state["chunks"]:
+                fy_state["chunks"].append(chunk_number)
+
+    def mark_fiscal_year_complete(self, fiscal_year: int) -> None:
+        with self._update() as state:
+            fy_state = state["fiscal_years"].setdefault(str(fiscal_year), {"chunks": []})
+            fy_state["complete"] = True
+
+    def mark_deletes_complete(self) -> None:
+        with self._update() as state:
+            state["deletes_complete"] = True
+
+    @contextmanager
+    def _locked(self):
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _update(self):
+        with self._locked():
+            state = self._read()
+            yield state
+            self._write(state)
+
+    def _read(self) -> dict:
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _write(self, state: dict) -> None:
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self.path)
@@ -15,10 +15,8 @@ from usaspending_api.etl.submission_loader_helpers.treasury_appropriation_accoun
 logger = logging.getLogger("script")
 
 
-def get_file_a(submission_attributes, db_cursor):
-    db_cursor.execute(
-        "SELECT * FROM certified_appropriation WHERE submission_id = %s", [submission_attributes.submission_id]
-    )
+def get_file_a(submission_id, db_cursor):
+    db_cursor.execute("SELECT * FROM certified_appropriation WHERE submission_id = %s", [submission_id])
     return dictfetchall(db_cursor)
 
 
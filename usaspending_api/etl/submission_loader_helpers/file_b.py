@@ -19,7 +19,7 @@ from usaspending_api.financial_activities.models import FinancialAccountsByProgr
 logger = logging.getLogger("script")
 
 
-def get_file_b(submission_attributes, db_cursor):
+def get_file_b(submission_id, db_cursor):
     """
     Get broker File B data for a specific submission.
     This function was added as a workaround for the fact that a few agencies (two, as of April, 2017: DOI and ACHP)
@@ -37,11 +37,9 @@ def get_file_b(submission_attributes, db_cursor):
     necessary, we can go back to selecting * from the broker's File B data.
 
     Args:
-        submission_attributes: submission object currently being loaded
+        submission_id: Broker submission id currently being loaded
         db_cursor: db connection info
     """
-    submission_id = submission_attributes.submission_id
-
     # does this file B have the dupe object class edge case?
     check_dupe_oc = f"""
         select      count(*)
@@ -1,207 +1,339 @@
 import logging
-import numpy as np
-import pandas as pd
 import re
+import tempfile
 
-from collections import deque
 from datetime import datetime
-from django.db import connections
-from django.utils.functional import cached_property
+from django.db import connection
+from psycopg2.extras import execute_values
 from usaspending_api.awards.models import FinancialAccountsByAwards
-from usaspending_api.common.helpers.dict_helpers import upper_case_dict_values
 from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
-from usaspending_api.etl.broker_etl_helpers import dictfetchall
-from usaspending_api.etl.submission_loader_helpers.skipped_tas import update_skipped_tas
-from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
-from usaspending_api.etl.submission_loader_helpers.disaster_emergency_fund_codes import get_disaster_emergency_fund
-from usaspending_api.etl.submission_loader_helpers.object_class import get_object_class_row
-from usaspending_api.etl.submission_loader_helpers.program_activities import get_program_activity
+from usaspending_api.common.long_to_terse import LONG_TO_TERSE_LABELS
 from usaspending_api.etl.submission_loader_helpers.treasury_appropriation_account import (
     bulk_treasury_appropriation_account_tas_lookup,
     get_treasury_appropriation_account_tas_lookup,
 )
+from usaspending_api.references.models import DisasterEmergencyFundCode, ObjectClass, RefProgramActivity
 
 
 logger = logging.getLogger("script")
 
+# File C rows are spooled to disk past this size while being copied from Broker to the staging table
+COPY_SPOOL_SIZE = 64 * 1024 * 1024
+
+# this matches the file b reverse directive, but am repeating it here to ensure that we don't overwrite it as we
+# change up the order of file loading
+REVERSE = re.compile(r"(_(cpe|fyb)$)|^transaction_obligated_amount$")
+
+# financial_accounts_by_awards amount column -> certified_award_financial column it is loaded (reversed) from
+REVERSED_AMOUNT_COLUMNS = {
+    field.column: LONG_TO_TERSE_LABELS.get(field.name, field.name)
+    for field in FinancialAccountsByAwards._meta.concrete_fields
+    if REVERSE.search(field.name)
+}
+
+# Broker columns copied into the staging table
+STAGED_COLUMNS = {
+    "certified_award_financial_id": "integer",
+    "tas_id": "integer",
+    "object_class": "text",
+    "by_direct_reimbursable_fun": "text",
+    "program_activity_code": "text",
+    "program_activity_name": "text",
+    "agency_identifier": "text",
+    "allocation_transfer_agency": "text",
+    "main_account_code": "text",
+    "disaster_emergency_fund_code": "text",
+    "piid": "text",
+    "parent_award_id": "text",
+    "fain": "text",
+    "uri": "text",
+    **{broker_column: "numeric" for broker_column in REVERSED_AMOUNT_COLUMNS.values()},
+}
+
+# Columns filled in on the staging table by the set-based lookups below
+DERIVED_COLUMNS = {
+    "treasury_account_id": "integer",
+    "tas_rendering_label": "text",
+    "derived_object_class": "text",
+    "derived_direct_reimbursable": "text",
+    "object_class_id": "integer",
+    "program_activity_id": "integer",
+}
+
+
+def get_from_where(submission_id):
+    return f"""
+        from    certified_award_financial c
+                inner join submission s on s.submission_id = c.submission_id
+        where   s.submission_id = {submission_id} and
+                (
+                    (
+                        c.transaction_obligated_amou is not null and
+                        c.transaction_obligated_amou != 0
+                    ) or (
+                        c.gross_outlay_amount_by_awa_cpe is not null and
+                        c.gross_outlay_amount_by_awa_cpe != 0
+                    )
+                )
+    """
 
-class CertifiedAwardFinancialIterator:
-    def __init__(self, submission_attributes, chunk_size):
-        self.submission_attributes = submission_attributes
-        self.chunk_size = chunk_size
-
-        # For managing state.
-        self._last_id = None
-        self._current_chunk = None
 
-    def _retrieve_and_prepare_next_chunk(self):
-        sql = f"""
-            select  c.*
-            {CertifiedAwardFinancial.get_from_where(self.submission_attributes.submission_id)}
-            {"" if self._last_id is None else f"and certified_award_financial_id > {self._last_id}"}
-            order   by c.certified_award_financial_id
-            limit   {self.chunk_size}
-        """
+def get_staging_table_name(submission_id):
+    return f"temp_load_submission_file_c_{submission_id}".replace("-", "_")
 
-        award_financial_frame = pd.read_sql(sql, connections["data_broker"])
 
-        if award_financial_frame.size > 0:
-            award_financial_frame["object_class"] = award_financial_frame.apply(get_object_class_row, axis=1)
-            award_financial_frame["program_activity"] = award_financial_frame.apply(
-                get_program_activity, axis=1, submission_attributes=self.submission_attributes
+def stage_file_c(submission_id, db_cursor):
+    """
+    COPY a submission's File C (certified award financial) rows from Broker into an unlogged staging table and return
+    how many were staged.  Nothing here depends on the load transaction, so it can run on its own connections while
+    Files A and B are being loaded.
+    """
+    staging_table = get_staging_table_name(submission_id)
+    column_definitions = ", ".join(f"{c} {t}" for c, t in {**STAGED_COLUMNS, **DERIVED_COLUMNS}.items())
+    staged_columns = ", ".join(STAGED_COLUMNS)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"drop table if exists {staging_table}")
+        cursor.execute(f"create unlogged table {staging_table} ({column_definitions})")
+        with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_SIZE) as spool:
+            db_cursor.copy_expert(
+                f"copy (select {', '.join('c.' + c for c in STAGED_COLUMNS)} {get_from_where(submission_id)}) "
+                f"to stdout",
+                spool,
             )
-            award_financial_frame = award_financial_frame.replace({np.nan: None})
-
-            self._last_id = award_financial_frame["certified_award_financial_id"].max()
-            self._current_chunk = deque(award_financial_frame.to_dict(orient="records"))
-
-        else:
-            self._last_id = None
-            self._current_chunk = None
-
-    def __next__(self):
-        if not self._current_chunk:
-            self._retrieve_and_prepare_next_chunk()
-            if not self._current_chunk:
-                raise StopIteration
-        return self._current_chunk.popleft()
-
-
-class CertifiedAwardFinancial:
-    """ Abstract away the messy details of how we retrieve and prepare certified_award_financial rows. """
-
-    def __init__(self, submission_attributes, db_cursor, chunk_size):
-        self.submission_attributes = submission_attributes
-        self.db_cursor = db_cursor
-        self.chunk_size = chunk_size
-
-    @cached_property
-    def count(self):
-        sql = f"select count(*) {self.get_from_where(self.submission_attributes.submission_id)}"
-        self.db_cursor.execute(sql)
-        return self.db_cursor.fetchall()[0][0]
-
-    @property
-    def tas_ids(self):
-        sql = f"""
-            select distinct c.tas_id
-            {self.get_from_where(self.submission_attributes.submission_id)}
-            and c.tas_id is not null
-        """
-        self.db_cursor.execute(sql)
-        return dictfetchall(self.db_cursor)
-
-    @staticmethod
-    def get_from_where(submission_id):
-        return f"""
-            from    certified_award_financial c
-                    inner join submission s on s.submission_id = c.submission_id
-            where   s.submission_id = {submission_id} and
-                    (
-                        (
-                            c.transaction_obligated_amou is not null and
-                            c.transaction_obligated_amou != 0
-                        ) or (
-                            c.gross_outlay_amount_by_awa_cpe is not null and
-                            c.gross_outlay_amount_by_awa_cpe != 0
-                        )
-                    )
-        """
-
-    def __iter__(self):
-        return CertifiedAwardFinancialIterator(self.submission_attributes, self.chunk_size)
+            spool.seek(0)
+            cursor.cursor.copy_expert(f"copy {staging_table} ({staged_columns}) from stdin", spool)
+        cursor.execute(f"select count(*) from {staging_table}")
+        return cursor.fetchone()[0]
 
 
-def get_file_c(submission_attributes, db_cursor, chunk_size):
-    return CertifiedAwardFinancial(submission_attributes, db_cursor, chunk_size)
+def drop_file_c_staging_table(submission_id):
+    with connection.cursor() as cursor:
+        cursor.execute(f"drop table if exists {get_staging_table_name(submission_id)}")
 
 
-def load_file_c(submission_attributes, db_cursor, certified_award_financial):
+def load_file_c(submission_attributes, db_cursor, staged_row_count):
     """
-    Process and load file C broker data.
+    Process and load file C broker data from the table stage_file_c filled.
     Note: this should run AFTER the D1 and D2 files are loaded because we try to join to those records to retrieve some
     additional information about the awarding sub-tier agency.
     """
-    # this matches the file b reverse directive, but am repeating it here to ensure that we don't overwrite it as we
-    # change up the order of file loading
-
-    if certified_award_financial.count == 0:
+    if staged_row_count == 0:
         logger.warning("No File C (award financial) data found, skipping...")
         return
 
-    reverse = re.compile(r"(_(cpe|fyb)$)|^transaction_obligated_amount$")
-
-    # dictionary to capture TAS that were skipped and some metadata
-    # tas = top-level key
-    # count = number of rows skipped
-    # rows = row numbers skipped, corresponding to the original row numbers in the file that was submitted
-    skipped_tas = {}
-    total_rows = certified_award_financial.count
+    staging_table = get_staging_table_name(submission_attributes.submission_id)
     start_time = datetime.now()
 
-    bulk_treasury_appropriation_account_tas_lookup(certified_award_financial.tas_ids, db_cursor)
+    with connection.cursor() as cursor:
+        _resolve_treasury_accounts(cursor, staging_table, db_cursor)
+        _resolve_object_classes(cursor, staging_table)
+        _resolve_program_activities(cursor, staging_table, submission_attributes)
+        _validate_disaster_emergency_fund_codes(cursor, staging_table)
+        inserted_row_count = _insert_file_c_rows(cursor, staging_table, submission_attributes)
+    elapsed = datetime.now() - start_time
+    logger.info(f"C File Load: Loaded {inserted_row_count:,} of {staged_row_count:,} rows ({elapsed})")
+
+    # load_submission refreshes what depends on the submission's File C links once it is loaded
+    update_c_to_d_linkages("contract", False, submission_attributes.submission_id, refresh_dependents=False)
+    update_c_to_d_linkages("assistance", False, submission_attributes.submission_id, refresh_dependents=False)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+                select      coalesce(tas_rendering_label, 'Account number None not found in Broker'), count(*)
+                from        {staging_table}
+                where       treasury_account_id is null
+                group by    1
+                order by    1
+            """
+        )
+        skipped_tas = cursor.fetchall()
+
+    for tas_rendering_label, count in skipped_tas:
+        logger.info(f"Skipped {count:,} rows due to missing TAS: {tas_rendering_label}")
 
-    _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse)
+    total_tas_skipped = sum(count for tas_rendering_label, count in skipped_tas)
 
-    update_c_to_d_linkages("contract", False, submission_attributes.submission_id)
-    update_c_to_d_linkages("assistance", False, submission_attributes.submission_id)
+    logger.info(f"Skipped a total of {total_tas_skipped:,} TAS rows for File C")
 
-    for key in skipped_tas:
-        logger.info(f"Skipped {skipped_tas[key]['count']:,} rows due to missing TAS: {key}")
 
-    total_tas_skipped = 0
-    for key in skipped_tas:
-        total_tas_skipped += skipped_tas[key]["count"]
+def _resolve_treasury_accounts(cursor, staging_table, db_cursor):
+    """Rows whose TAS can't be found keep a null treasury_account_id and the label they are reported as skipped under"""
+    cursor.execute(f"select distinct tas_id from {staging_table} where tas_id is not null")
+    tas_ids = [tas_id for (tas_id,) in cursor.fetchall()]
 
-    logger.info(f"Skipped a total of {total_tas_skipped:,} TAS rows for File C")
+    bulk_treasury_appropriation_account_tas_lookup([{"tas_id": tas_id} for tas_id in tas_ids], db_cursor)
 
+    accounts = []
+    for tas_id in tas_ids:
+        treasury_account, tas_rendering_label = get_treasury_appropriation_account_tas_lookup(tas_id)
+        treasury_account_id = treasury_account.treasury_account_identifier if treasury_account else None
+        accounts.append((tas_id, treasury_account_id, tas_rendering_label))
 
-def _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse):
-    save_manager = BulkCreateManager(FinancialAccountsByAwards)
-    for index, row in enumerate(certified_award_financial, 1):
-        if not (index % 1000):
-            logger.info(f"C File Load: Loading row {index:,} of {total_rows:,} ({datetime.now() - start_time})")
-
-        upper_case_dict_values(row)
-
-        # Check and see if there is an entry for this TAS
-        treasury_account, tas_rendering_label = get_treasury_appropriation_account_tas_lookup(row.get("tas_id"))
-        if treasury_account is None:
-            update_skipped_tas(row, tas_rendering_label, skipped_tas)
-            continue
-
-        # Find a matching transaction record, so we can use its subtier agency information to match to (or create) an
-        # Award record.
-
-        # Find the award that this award transaction belongs to. If it doesn't exist, create it.
-        filters = {}
-        if row.get("piid"):
-            filters["piid"] = row.get("piid")
-            filters["parent_piid"] = row.get("parent_award_id")
-        else:
-            if row.get("fain") and not row.get("uri"):
-                filters["fain"] = row.get("fain")
-            elif row.get("uri") and not row.get("fain"):
-                filters["uri"] = row.get("uri")
-            else:
-                filters["fain"] = row.get("fain")
-                filters["uri"] = row.get("uri")
-
-        award_financial_data = FinancialAccountsByAwards()
-
-        value_map_faba = {
-            "submission": submission_attributes,
-            "reporting_period_start": submission_attributes.reporting_period_start,
-            "reporting_period_end": submission_attributes.reporting_period_end,
-            "treasury_account": treasury_account,
-            "object_class": row.get("object_class"),
-            "program_activity": row.get("program_activity"),
-            "disaster_emergency_fund": get_disaster_emergency_fund(row),
-        }
-
-        save_manager.append(
-            load_data_into_model(award_financial_data, row, value_map=value_map_faba, save=False, reverse=reverse)
+    execute_values(
+        cursor.cursor,
+        f"""
+            update  {staging_table} as s
+            set     treasury_account_id = v.treasury_account_id,
+                    tas_rendering_label = v.tas_rendering_label
+            from    (values %s) as v (tas_id, treasury_account_id, tas_rendering_label)
+            where   s.tas_id = v.tas_id
+        """,
+        accounts,
+        template="(%s, %s::integer, %s::text)",
+        page_size=10000,
+    )
+
+
+def _resolve_object_classes(cursor, staging_table):
+    """
+    Set based version of get_object_class_row.  4 digit object classes carry direct/reimbursable in their first digit,
+    3 digit ones get it from by_direct_reimbursable_fun, and all zeroes is "000".  As before, every row (including
+    those skipped for their TAS) has to resolve.
+    """
+    cursor.execute(
+        f"""
+            update  {staging_table}
+            set     derived_object_class = case
+                        when object_class ~ '^0*$' then '000'
+                        when length(object_class) = 4 and left(object_class, 1) in ('1', '2') then
+                            right(object_class, 3)
+                        when length(object_class) = 4 then null
+                        else object_class
+                    end,
+                    derived_direct_reimbursable = case
+                        when object_class !~ '^0*$' and length(object_class) = 4 then
+                            case left(object_class, 1) when '1' then 'D' when '2' then 'R' end
+                        else
+                            case upper(by_direct_reimbursable_fun) when 'D' then 'D' when 'R' then 'R' end
+                    end
+        """
+    )
+    cursor.execute(
+        f"""
+            update  {staging_table} as s
+            set     object_class_id = oc.id
+            from    object_class as oc
+            where   oc.object_class = s.derived_object_class and
+                    oc.direct_reimbursable is not distinct from s.derived_direct_reimbursable
+        """
+    )
+    cursor.execute(
+        f"""
+            select  object_class, by_direct_reimbursable_fun
+            from    {staging_table}
+            where   object_class_id is null
+            limit   1
+        """
+    )
+    unresolved = cursor.fetchone()
+    if unresolved:
+        raise ObjectClass.DoesNotExist(
+            f"Unable to find object class for object_class={unresolved[0]}, by_direct_reimbursable_fun={unresolved[1]}."
+        )
+
+
+def _resolve_program_activities(cursor, staging_table, submission_attributes):
+    """Set based version of get_program_activity.  Rows without a program activity code don't get one."""
+    cursor.execute(
+        f"""
+            update  {staging_table} as s
+            set     program_activity_id = pa.id
+            from    ref_program_activity as pa
+            where   s.program_activity_code is not null and
+                    pa.program_activity_code = s.program_activity_code and
+                    pa.program_activity_name is not distinct from upper(s.program_activity_name) and
+                    pa.budget_year = %s and
+                    pa.responsible_agency_id is not distinct from s.agency_identifier and
+                    pa.allocation_transfer_agency_id is not distinct from s.allocation_transfer_agency and
+                    pa.main_account_code is not distinct from s.main_account_code
+        """,
+        [str(submission_attributes.reporting_fiscal_year)],
+    )
+    cursor.execute(
+        f"""
+            select  program_activity_code, program_activity_name
+            from    {staging_table}
+            where   program_activity_code is not null and program_activity_id is null
+            limit   1
+        """
+    )
+    unresolved = cursor.fetchone()
+    if unresolved:
+        raise RefProgramActivity.DoesNotExist(
+            f"Unable to find program activity for program_activity_code={unresolved[0]}, "
+            f"program_activity_name={unresolved[1]}."
+        )
+
+
+def _validate_disaster_emergency_fund_codes(cursor, staging_table):
+    cursor.execute(
+        f"""
+            select  upper(s.disaster_emergency_fund_code)
+            from    {staging_table} as s
+            where   s.treasury_account_id is not null and
+                    s.disaster_emergency_fund_code != '' and
+                    not exists (
+                        select  from disaster_emergency_fund_code as d
+                        where   d.code = upper(s.disaster_emergency_fund_code)
+                    )
+            limit   1
+        """
+    )
+    unresolved = cursor.fetchone()
+    if unresolved:
+        raise DisasterEmergencyFundCode.DoesNotExist(
+            f"Unable to find disaster emergency fund code for '{unresolved[0]}'."
         )
 
-    save_manager.save_stragglers()
+
+def _insert_file_c_rows(cursor, staging_table, submission_attributes):
+    """Text is upper cased and amounts reversed exactly as load_data_into_model did for each row"""
+    amount_columns = ", ".join(REVERSED_AMOUNT_COLUMNS)
+    reversed_amounts = ", ".join(f"-s.{broker_column}" for broker_column in REVERSED_AMOUNT_COLUMNS.values())
+    cursor.execute(
+        f"""
+            insert into financial_accounts_by_awards (
+                data_source,
+                treasury_account_id,
+                submission_id,
+                program_activity_id,
+                object_class_id,
+                piid,
+                parent_award_id,
+                fain,
+                uri,
+                disaster_emergency_fund_code,
+                {amount_columns},
+                reporting_period_start,
+                reporting_period_end,
+                create_date,
+                update_date
+            )
+            select      'DBR',
+                        s.treasury_account_id,
+                        %(submission_id)s,
+                        s.program_activity_id,
+                        s.object_class_id,
+                        upper(s.piid),
+                        upper(s.parent_award_id),
+                        upper(s.fain),
+                        upper(s.uri),
+                        nullif(upper(s.disaster_emergency_fund_code), ''),
+                        {reversed_amounts},
+                        %(reporting_period_start)s,
+                        %(reporting_period_end)s,
+                        now(),
+                        now()
+            from        {staging_table} as s
+            where       s.treasury_account_id is not null
+            order by    s.certified_award_financial_id
+        """,
+        {
+            "submission_id": submission_attributes.submission_id,
+            "reporting_period_start": submission_attributes.reporting_period_start,
+            "reporting_period_end": submission_attributes.reporting_period_end,
+        },
+    )
+    return cursor.rowcount
@@ -242,6 +242,20 @@ class TestWithMultipleDatabases(TestCase):
 
         assert FinancialAccountsByAwards.objects.all().count() == 6
 
+    def test_load_submission_file_c_values(self):
+        """
+        Test that File C rows are loaded with their amounts reversed and their TAS and object class resolved
+        """
+        call_command("load_submission", "-9999")
+
+        actual_results = set(
+            FinancialAccountsByAwards.objects.values_list(
+                "data_source", "treasury_account_id", "object_class_id", "transaction_obligated_amount"
+            )
+        )
+
+        assert actual_results == {("DBR", -99999, 0, -100)}
+
 
 def _assemble_broker_tas_lookup_records() -> list:
     base_record = {
@@ -1,4 +1,5 @@
 # Stdlib imports
+from datetime import datetime, timezone
 
 # Core Django imports
 from django.core.management import call_command
@@ -8,7 +9,9 @@ import pytest
 from model_mommy import mommy
 
 # Imports from your apps
-from usaspending_api.awards.models import Award, FinancialAccountsByAwards
+from usaspending_api.awards.models import Award, FinancialAccountsByAwards, UnlinkedFileCCount
+from usaspending_api.common.helpers.etl_helpers import check_unlinked_counts, get_counted_unlinked_count
+from usaspending_api.submissions.models import SubmissionAttributes
 
 
 @pytest.mark.django_db
@@ -175,3 +178,54 @@ def test_update_assistance_linkages_fain_and_uri():
 
     assert file_c_award_uri is not None
     assert expected_results == file_c_award_uri.award_id
+
+
+@pytest.mark.django_db
+def test_update_linkages_delta():
+    """
+    Test that a delta run links File C records from changed submissions and those matching changed awards, and keeps
+    the counts of unlinked records current
+    """
+
+    submission = mommy.make(SubmissionAttributes, submission_id=1)
+    mommy.make(Award, id=999, piid="RANDOM_PIID", parent_award_piid=None)
+    for faba_id, piid, fain in [(777, "RANDOM_PIID", None), (778, None, "RANDOM_FAIN"), (779, "OLD_PIID", None)]:
+        mommy.make(
+            FinancialAccountsByAwards,
+            financial_accounts_by_awards_id=faba_id,
+            submission=submission,
+            piid=piid,
+            parent_award_id=None,
+            fain=fain,
+        )
+
+    def linked_award_ids():
+        return dict(FinancialAccountsByAwards.objects.values_list("financial_accounts_by_awards_id", "award_id"))
+
+    call_command("update_file_c_linkages", "--delta")
+
+    assert linked_award_ids() == {777: 999, 778: None, 779: None}
+    assert get_counted_unlinked_count("contract") == 1
+    assert get_counted_unlinked_count("assistance") == 1
+
+    # Neither the submission nor this award changed since the last run, so only a full run links record 779
+    long_ago = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    mommy.make(Award, id=1999, piid="OLD_PIID", parent_award_piid=None)
+    Award.objects.filter(id=1999).update(update_date=long_ago)
+    SubmissionAttributes.objects.filter(submission_id=1).update(update_date=long_ago)
+    mommy.make(Award, id=2999, fain="RANDOM_FAIN")
+
+    call_command("update_file_c_linkages", "--delta")
+
+    assert linked_award_ids() == {777: 999, 778: 2999, 779: None}
+    assert get_counted_unlinked_count("contract") == 1
+    assert get_counted_unlinked_count("assistance") is None
+
+    UnlinkedFileCCount.objects.filter(linkage_type="contract").update(unlinked_count=5)
+    assert check_unlinked_counts("contract") == 1
+    assert get_counted_unlinked_count("contract") == 1
+
+    call_command("update_file_c_linkages")
+
+    assert linked_award_ids() == {777: 999, 778: 2999, 779: 1999}
+    assert get_counted_unlinked_count("contract") is None
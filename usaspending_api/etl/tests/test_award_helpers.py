@@ -3,7 +3,17 @@ import pytest
 
 from model_mommy import mommy
 
-from usaspending_api.etl.award_helpers import update_awards, update_procurement_awards, update_assistance_awards
+from usaspending_api.awards.models import Award, FinancialAccountsByAwards
+from usaspending_api.common.helpers.etl_helpers import get_counted_unlinked_count, refresh_unlinked_counts
+from usaspending_api.etl.award_helpers import (
+    AWARD_UPDATES,
+    prune_empty_awards,
+    update_award_subawards,
+    update_awards,
+    update_awards_by_partition,
+    update_procurement_awards,
+    update_assistance_awards,
+)
 
 
 @pytest.mark.django_db
@@ -471,3 +481,77 @@ def test_award_update_transaction_fk():
         award.period_of_performance_current_end_date.strftime("%Y-%m-%d")
         == txn10.period_of_performance_current_end_date
     )
+
+
+@pytest.mark.django_db
+def test_award_update_by_partition_matches_award_update_with_list():
+    """Updating awards by partition from a staging table gives the same awards and counts as passing a tuple."""
+    for award_id in range(1, 8):
+        award = mommy.make("awards.Award", id=award_id, generated_unique_award_id=f"AWARD_{award_id}")
+        for modification in range(3):
+            transaction = mommy.make(
+                "awards.TransactionNormalized",
+                award=award,
+                type="A" if award_id % 2 else "02",
+                action_date=datetime.date(2019, award_id, modification + 1),
+                modification_number=str(modification),
+                federal_action_obligation=100 * award_id + modification,
+                description=f"award {award_id} modification {modification}",
+                unique_award_key=award.generated_unique_award_id,
+            )
+            officer = {"officer_1_name": f"Officer {modification}", "officer_1_amount": modification}
+            if award_id % 2:
+                mommy.make("awards.TransactionFPDS", transaction=transaction, base_and_all_options_value="1", **officer)
+            else:
+                mommy.make("awards.TransactionFABS", transaction=transaction, **officer)
+        if award_id % 3:
+            mommy.make("awards.Subaward", award=award, amount=award_id, _quantity=award_id % 3)
+
+    reset = {
+        "latest_transaction": None,
+        "earliest_transaction": None,
+        "date_signed": None,
+        "description": None,
+        "type": None,
+        "category": None,
+        "total_obligation": None,
+        "base_and_all_options_value": None,
+        "officer_1_name": None,
+        "total_subaward_amount": None,
+        "subaward_count": 0,
+    }
+    fields = ["id", "latest_transaction_id", "earliest_transaction_id", "fiscal_year"] + list(reset)[2:]
+    award_ids = [1, 2, 3, 4, 5, 6, 2, 5]
+
+    counts = update_awards_by_partition(award_ids, list(AWARD_UPDATES), partitions=3)
+    by_partition = list(Award.objects.order_by("id").values(*fields))
+
+    Award.objects.update(**reset)
+    award_tuple = tuple(set(award_ids))
+    assert counts == {
+        "awards": update_awards(award_tuple),
+        "procurement": update_procurement_awards(award_tuple),
+        "assistance": update_assistance_awards(award_tuple),
+        "subawards": update_award_subawards(award_tuple),
+    }
+    assert by_partition == list(Award.objects.order_by("id").values(*fields))
+    assert counts["awards"] == 6
+    assert by_partition[6]["latest_transaction_id"] is None
+
+
+@pytest.mark.django_db
+def test_prune_empty_awards_recounts_unlinked_file_c():
+    submission = mommy.make("submissions.SubmissionAttributes", submission_id=1)
+    empty_award = mommy.make("awards.Award", id=1, piid="EMPTY")
+    award = mommy.make("awards.Award", id=2, piid="KEPT")
+    mommy.make("awards.TransactionNormalized", award=award)
+    mommy.make(FinancialAccountsByAwards, submission=submission, award=empty_award, piid="EMPTY")
+    mommy.make(FinancialAccountsByAwards, submission=submission, award=award, piid="KEPT")
+    refresh_unlinked_counts("contract")
+    assert get_counted_unlinked_count("contract") is None
+
+    assert prune_empty_awards((1, 2)) > 0
+
+    assert not Award.objects.filter(id=1).exists()
+    assert FinancialAccountsByAwards.objects.filter(award__isnull=True).count() == 1
+    assert get_counted_unlinked_count("contract") == 1
@@ -7,7 +7,12 @@ from pathlib import Path
 from usaspending_api.common.elasticsearch.client import instantiate_elasticsearch_client
 from usaspending_api.common.helpers.sql_helpers import execute_sql_to_ordered_dictionary
 from usaspending_api.common.helpers.text_helpers import generate_random_string
-from usaspending_api.etl.es_etl_helpers import configure_sql_strings, check_awards_for_deletes, get_deleted_award_ids
+from usaspending_api.etl.es_etl_helpers import (
+    check_awards_for_deletes,
+    configure_sql_strings,
+    delete_from_es,
+    get_deleted_award_ids,
+)
 from usaspending_api.etl.rapidloader import Rapidloader
 
 
@@ -174,6 +179,25 @@ WHERE fiscal_year=2019 AND update_date >= '2007-10-01 00:00:00+00:00'
     assert count == count_sql
 
 
+def test_configure_sql_strings_subawards():
+    subaward_config = {**config, "fiscal_year": 2020, "root_index": "subaward-query", "load_type": "subawards"}
+    copy, id, count = configure_sql_strings(subaward_config, "filename", [1])
+    copy_sql = """"COPY (
+    SELECT *
+    FROM subaward_delta_view
+    WHERE fiscal_year=2020 AND update_date >= '2007-10-01 00:00:00+00:00'
+) TO STDOUT DELIMITER ',' CSV HEADER" > 'filename'
+"""
+    count_sql = """
+SELECT COUNT(*) AS count
+FROM subaward_delta_view
+WHERE fiscal_year=2020 AND update_date >= '2007-10-01 00:00:00+00:00'
+"""
+    assert copy == copy_sql
+    assert id is None
+    assert count == count_sql
+
+
 # SQL method is being mocked here since the `execute_sql_statement` used doesn't use the same DB connection to avoid multiprocessing errors
 def mock_execute_sql(sql, results, verbosity=None):
     return execute_sql_to_ordered_dictionary(sql)
@@ -198,3 +222,15 @@ def test_get_award_ids(award_data_fixture, elasticsearch_transaction_index):
     client = elasticsearch_transaction_index.client
     ids = get_deleted_award_ids(client, id_list, config, index=elasticsearch_transaction_index.index_name)
     assert ids == ["CONT_AWD_IND12PB00323"]
+
+
+def test_delete_from_es(award_data_fixture, elasticsearch_transaction_index):
+    elasticsearch_transaction_index.update_index()
+    id_list = [{"key": 1, "col": "transaction_id"}, {"key": 2, "col": "transaction_id"}]
+    client = elasticsearch_transaction_index.client
+    index = elasticsearch_transaction_index.index_name
+
+    outcomes = delete_from_es(client, id_list, None, config, index=index)
+
+    assert outcomes == {"1": "deleted", "2": "not_found"}
+    assert client.count(index=index)["count"] == 0
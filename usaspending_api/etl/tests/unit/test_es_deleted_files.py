@@ -0,0 +1,79 @@
+import boto3
+import pytest
+
+from datetime import datetime, timezone
+from moto import mock_s3
+
+from usaspending_api.common.helpers.s3_helpers import get_s3_client
+from usaspending_api.etl.es_etl_helpers import DeletedFileManifest, deleted_file_prefixes, gather_deleted_ids
+
+BUCKET = "deleted-transactions"
+
+
+@pytest.fixture
+def s3_bucket(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    get_s3_client.cache_clear()  # clients must be created inside the mock
+    with mock_s3():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=BUCKET)
+        files = {
+            "08-03-2020_delete_records_award_1596412800.csv": b"detached_award_proc_unique\nabc\ndef\n",
+            "2020-08-03_FABSdeletions_1596412800.csv": b"afa_generated_unique,other\nxyz,1\n",
+            "08-03-2020_notes.txt": b"not a delete file",
+            # Outside of the load window's key prefixes, so never listed
+            "07-01-2020_delete_records_award_1593561600.csv": b"detached_award_proc_unique\nold\n",
+            "2020-07-01_FABSdeletions_1593561600.csv": b"afa_generated_unique\nolder\n",
+        }
+        for key, body in files.items():
+            s3.put_object(Bucket=BUCKET, Key=key, Body=body)
+        yield s3
+    get_s3_client.cache_clear()
+
+
+def _config(tmp_path):
+    return {
+        "process_deletes": True,
+        "verbose": False,
+        "s3_bucket": BUCKET,
+        "directory": tmp_path,
+        "load_type": "transactions",
+        "starting_date": datetime(2020, 8, 3, tzinfo=timezone.utc),
+        "processing_start_datetime": datetime(2020, 8, 4, tzinfo=timezone.utc),
+    }
+
+
+def test_deleted_file_prefixes():
+    start = datetime(2020, 8, 3, 5, tzinfo=timezone.utc)
+    end = datetime(2020, 8, 4, 1, tzinfo=timezone.utc)
+
+    assert deleted_file_prefixes(start, end) == [
+        "08-02-2020",
+        "2020-08-02",
+        "08-03-2020",
+        "2020-08-03",
+        "08-04-2020",
+        "2020-08-04",
+    ]
+    assert deleted_file_prefixes(datetime(2007, 10, 1, tzinfo=timezone.utc), end) == [""]
+
+
+def test_gather_deleted_ids_skips_files_in_manifest(s3_bucket, tmp_path):
+    config = _config(tmp_path)
+    manifest = DeletedFileManifest(tmp_path, "transactions")
+
+    deleted_ids = gather_deleted_ids(config, manifest)
+    assert set(deleted_ids) == {"CONT_TX_ABC", "CONT_TX_DEF", "ASST_TX_XYZ"}
+
+    # Nothing is skipped until the caller saves the manifest after applying the deletes
+    manifest.save(config["starting_date"])
+    assert gather_deleted_ids(config, DeletedFileManifest(tmp_path, "transactions")) == {}
+
+    # A re-uploaded file has a new ETag and is read again
+    s3_bucket.put_object(
+        Bucket=BUCKET, Key="2020-08-03_FABSdeletions_1596412800.csv", Body=b"afa_generated_unique,other\nxyz,1\nuvw,2\n"
+    )
+    deleted_ids = gather_deleted_ids(config, DeletedFileManifest(tmp_path, "transactions"))
+    assert set(deleted_ids) == {"ASST_TX_XYZ", "ASST_TX_UVW"}
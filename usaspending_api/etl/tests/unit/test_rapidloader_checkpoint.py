@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+from usaspending_api.etl.rapidloader import Rapidloader
+from usaspending_api.etl.rapidloader_checkpoint import RapidloaderCheckpoint
+
+START = datetime(2007, 10, 1, tzinfo=timezone.utc)
+PROCESSING_START = datetime(2020, 8, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def _new_checkpoint(directory):
+    checkpoint = RapidloaderCheckpoint(directory, "abc123", "test-transactions")
+    checkpoint.create("transactions", START, PROCESSING_START)
+    return checkpoint
+
+
+def test_checkpoint_is_keyed_by_run_id_and_index_name(tmp_path):
+    checkpoint = _new_checkpoint(tmp_path)
+
+    assert checkpoint.exists()
+    assert checkpoint.path.name == "es_rapidloader_abc123_test-transactions.checkpoint.json"
+    assert not RapidloaderCheckpoint(tmp_path, "abc123", "other-transactions").exists()
+
+    state = checkpoint.read()
+    assert state["load_type"] == "transactions"
+    assert datetime.fromisoformat(state["starting_date"]) == START
+    assert datetime.fromisoformat(state["processing_start_datetime"]) == PROCESSING_START
+
+
+def test_checkpoint_tracks_chunks_and_fiscal_years(tmp_path):
+    checkpoint = _new_checkpoint(tmp_path)
+    csv = tmp_path / "2020_transactions.csv"
+    csv.write_text("header\n")
+
+    checkpoint.mark_downloaded(2020, str(csv), 10)
+    checkpoint.mark_chunk_complete(2020, 0)
+    checkpoint.mark_chunk_complete(2020, 1)
+    checkpoint.mark_chunk_complete(2020, 1)
+
+    assert checkpoint.downloaded_csv(2020) == str(csv)
+    assert checkpoint.completed_chunks(2020) == {0, 1}
+    assert not checkpoint.is_fiscal_year_complete(2020)
+
+    checkpoint.mark_fiscal_year_complete(2020)
+    assert checkpoint.is_fiscal_year_complete(2020)
+
+    # A new download invalidates the chunks read from the previous CSV
+    checkpoint.mark_downloaded(2020, str(csv), 12)
+    assert checkpoint.completed_chunks(2020) == set()
+    assert not checkpoint.is_fiscal_year_complete(2020)
+
+    csv.unlink()
+    assert checkpoint.downloaded_csv(2020) is None
+
+    checkpoint.remove()
+    assert not checkpoint.exists()
+
+
+def test_resumed_download_jobs_skip_completed_work(tmp_path):
+    checkpoint = _new_checkpoint(tmp_path)
+    checkpoint.mark_fiscal_year_complete(2018)
+    downloaded_csv = tmp_path / "2019_transactions.csv"
+    downloaded_csv.write_text("header\n")
+    checkpoint.mark_downloaded(2019, str(downloaded_csv), 5)
+    checkpoint.mark_chunk_complete(2019, 0)
+    checkpoint.mark_downloaded(2020, str(tmp_path / "2020_transactions.csv"), 7)
+
+    config = {
+        "fiscal_years": [2018, 2019, 2020],
+        "index_name": "test-transactions",
+        "directory": tmp_path,
+        "load_type": "transactions",
+        "resume": "abc123",
+        "checkpoint": checkpoint,
+    }
+    download_queue, job_count = Rapidloader(config, None).create_download_jobs()
+
+    jobs = [download_queue.get(timeout=1) for _ in range(job_count)]
+    assert job_count == 2
+    assert [job.fy for job in jobs] == [2019, 2020]
+
+    # FY2019 reuses its CSV and keeps its chunk checkpoints; FY2020's CSV is gone so it is downloaded again
+    assert jobs[0].count == 5
+    assert checkpoint.completed_chunks(2019) == {0}
+    assert jobs[1].count is None
+    assert checkpoint.fiscal_year_state(2020) == {}
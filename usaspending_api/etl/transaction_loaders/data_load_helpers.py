@@ -1,12 +1,13 @@
 from datetime import datetime
 import os
 import re
-import boto3
 import csv
 import logging
 
 from django.conf import settings
 
+from usaspending_api.common.helpers.s3_helpers import get_s3_bucket, get_s3_client
+
 logger = logging.getLogger("console")
 
 
@@ -98,9 +99,8 @@ def get_deleted_fpds_data_from_s3(date):
                 "Missing required environment variables: USASPENDING_AWS_REGION, DELETED_TRANSACTION_JOURNAL_FILES"
             )
 
-        s3client = boto3.client("s3", region_name=aws_region)
-        s3resource = boto3.resource("s3", region_name=aws_region)
-        s3_bucket = s3resource.Bucket(DELETED_TRANSACTION_JOURNAL_FILES)
+        s3client = get_s3_client(aws_region)
+        s3_bucket = get_s3_bucket(DELETED_TRANSACTION_JOURNAL_FILES, aws_region)
 
         # make an array of all the keys in the bucket
         file_list = [item.key for item in s3_bucket.objects.all()]
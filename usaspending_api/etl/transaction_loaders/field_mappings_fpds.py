@@ -4,7 +4,6 @@ from usaspending_api.etl.transaction_loaders.derived_field_functions_fpds import
     calculate_awarding_agency,
     calculate_funding_agency,
     current_datetime,
-    business_categories,
     created_at,
     updated_at,
 )
@@ -358,7 +357,6 @@ transaction_normalized_functions = {
     "create_date": current_datetime,  # Data loader won't add this value if it's an update
     "update_date": current_datetime,
     "action_date": lambda broker: truncate_timestamp(broker["action_date"]),
-    "business_categories": business_categories,
 }
 
 # broker column name -> usaspending column name
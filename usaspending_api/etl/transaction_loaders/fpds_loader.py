@@ -3,6 +3,7 @@ from psycopg2.extras import DictCursor
 from psycopg2 import Error
 from django.db import connection
 
+from usaspending_api.broker.helpers.get_business_categories_batch import get_business_categories_batch
 from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
     transaction_fpds_nonboolean_columns,
     transaction_normalized_nonboolean_columns,
@@ -132,7 +133,10 @@ def _create_load_object(broker_object, non_boolean_column_map, boolean_column_ma
 def _transform_objects(broker_objects):
     retval = []
 
-    for broker_object in broker_objects:
+    # Categorized for the whole batch at once rather than through transaction_normalized_functions row by row
+    business_categories = get_business_categories_batch([dict(obj) for obj in broker_objects], "fpds")
+
+    for broker_object, categories in zip(broker_objects, business_categories):
         connected_objects = {
             # award. NOT used if a matching award is found later
             "award": _create_load_object(broker_object, award_nonboolean_columns, None, award_functions),
@@ -146,6 +150,7 @@ def _transform_objects(broker_objects):
                 transaction_fpds_functions,
             ),
         }
+        connected_objects["transaction_normalized"]["business_categories"] = categories
         retval.append(connected_objects)
 
     return retval
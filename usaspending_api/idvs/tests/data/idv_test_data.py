@@ -15,6 +15,8 @@ in the IDV world but has been added for testing purposes.  Hope this helps.
 """
 from model_mommy import mommy
 
+from usaspending_api.awards.idv_closure import rebuild_idv_closure
+
 
 AWARD_COUNT = 15
 IDVS = (1, 2, 3, 4, 5, 7, 8)
@@ -192,3 +194,7 @@ def create_idv_test_data():
             parent_award_id=PARENTS.get(award_id),
             rollup_contract_count=400000 + award_id,
         )
+
+    # The closure and funding rollups, on the other hand, are derived from the
+    # awards and File C records above just as the loaders would derive them.
+    rebuild_idv_closure()
@@ -2,6 +2,7 @@ import json
 
 from django.test import TestCase
 from rest_framework import status
+from usaspending_api.awards.idv_closure import refresh_idv_closure
 from usaspending_api.awards.models import Award
 from usaspending_api.idvs.tests.data.idv_test_data import create_idv_test_data, PARENTS, IDVS, AWARD_COUNT
 
@@ -85,6 +86,7 @@ class IDVFundingRollupTestCase(TestCase):
 
         # Grab the treasury appropriation account for C14 and null out its agency values.
         Award.objects.filter(pk=14).update(awarding_agency_id=None, funding_agency_id=None)
+        refresh_idv_closure([14])
 
         # Now re-grab the rollup values and ensure they are decremented accordingly.
         response = self.client.post(AGGREGATE_ENDPOINT, {"award_id": 2})
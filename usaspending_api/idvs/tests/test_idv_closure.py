@@ -0,0 +1,92 @@
+import pytest
+
+from django.core.management import call_command
+from model_mommy import mommy
+
+from usaspending_api.awards.idv_closure import check_idv_closure, rebuild_idv_closure, refresh_idv_closure
+from usaspending_api.awards.models import Award, IdvClosure, IdvFundingRollup
+from usaspending_api.etl.award_helpers import prune_empty_awards
+
+
+def _make_award(award_id, award_type, parent_id=None):
+    mommy.make(
+        "awards.Award",
+        id=award_id,
+        type=award_type,
+        piid=f"piid_{award_id}",
+        fpds_agency_id="0001",
+        parent_award_piid=f"piid_{parent_id}" if parent_id else None,
+        fpds_parent_agency_id="0001" if parent_id else None,
+    )
+
+
+@pytest.fixture
+def idv_tree(db):
+    """I1 -> I2 -> C3, I1 -> C4, I5 -> C6, each contract with one File C record"""
+    for award_id, award_type, parent_id in (
+        (1, "IDV_A", None),
+        (2, "IDV_B", 1),
+        (3, "A", 2),
+        (4, "A", 1),
+        (5, "IDV_A", None),
+        (6, "A", 5),
+    ):
+        _make_award(award_id, award_type, parent_id)
+    for award_id in (3, 4, 6):
+        mommy.make("awards.FinancialAccountsByAwards", award_id=award_id, transaction_obligated_amount=award_id)
+    rebuild_idv_closure()
+
+
+def _closure():
+    return set(IdvClosure.objects.values_list("ancestor_award_id", "descendant_award_id", "parent_award_id", "depth"))
+
+
+def _rollup_totals():
+    return dict(IdvFundingRollup.objects.values_list("award_id", "total_transaction_obligated_amount"))
+
+
+def test_rebuild_idv_closure(idv_tree):
+    assert _closure() == {
+        (1, 1, None, 0),
+        (1, 2, 1, 1),
+        (1, 3, 2, 2),
+        (1, 4, 1, 1),
+        (2, 2, None, 0),
+        (2, 3, 2, 1),
+        (5, 5, None, 0),
+        (5, 6, 5, 1),
+    }
+    assert _rollup_totals() == {1: 7, 2: 3, 5: 6}
+    assert check_idv_closure() == []
+
+
+def test_refresh_idv_closure(idv_tree):
+    # I2 moves under I5, taking C3 with it, and C4 is pruned
+    Award.objects.filter(id=2).update(parent_award_piid="piid_5")
+    Award.objects.filter(id=4).delete()
+    assert check_idv_closure() == ["idv_closure: 5 rows differ", "idv_funding_rollup: 3 rows differ"]
+
+    refresh_idv_closure([2, 4])
+
+    assert _closure() == {
+        (1, 1, None, 0),
+        (2, 2, None, 0),
+        (2, 3, 2, 1),
+        (5, 5, None, 0),
+        (5, 2, 5, 1),
+        (5, 3, 2, 2),
+        (5, 6, 5, 1),
+    }
+    assert _rollup_totals() == {2: 3, 5: 9}
+    assert check_idv_closure() == []
+    call_command("rebuild_idv_closure", "--check")
+
+
+def test_file_c_relinks_refresh_funding_rollups(idv_tree):
+    mommy.make("awards.FinancialAccountsByAwards", piid="piid_6", parent_award_id=None, transaction_obligated_amount=10)
+    call_command("update_file_c_linkages")
+    assert _rollup_totals() == {1: 7, 2: 3, 5: 16}
+
+    # C4 has no transactions, so it is pruned and its File C record unlinked
+    prune_empty_awards((4,))
+    assert _rollup_totals() == {1: 3, 2: 3, 5: 16}
@@ -8,30 +8,17 @@ from rest_framework.views import APIView
 
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.helpers.generic_helper import get_pagination_metadata
+from usaspending_api.common.helpers.keyset_pagination import KeysetPagination
 from usaspending_api.common.helpers.sql_helpers import execute_sql_to_ordered_dictionary
 from usaspending_api.common.validator.award import get_internal_or_generated_award_id_model
-from usaspending_api.common.validator.pagination import PAGINATION
+from usaspending_api.common.validator.pagination import CURSOR, PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
 
 
-# In gather_award_ids, if any awards are found for IDVs in the second half of
-# the union, by definition, they have to be grandchildren so even though the
-# grandchild boolean appears to be applying to the IDV, it will actually
-# trickle down to its children.
+# Contracts beneath the IDV come from idv_closure, which also records each
+# one's own parent.  Anything more than one level down is a grandchild.
 ACTIVITY_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id,
-                false grandchild
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id,
-                true grandchild
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    )
     select
         ca.id                                           award_id,
         ta.name                                         awarding_agency,
@@ -47,15 +34,15 @@ ACTIVITY_SQL = SQL(
         ca.piid,
         rl.legal_business_name                          recipient_name,
         rp.recipient_hash || '-' || rp.recipient_level  recipient_id,
-        gaids.grandchild
+        c.depth > 1                                     grandchild
     from
-        gather_award_ids gaids
-        inner join awards pa on pa.id = gaids.award_id
+        parent_award pap
+        inner join idv_closure c on c.ancestor_award_id = pap.award_id
         inner join awards ca on
-            ca.parent_award_piid = pa.piid and
-            ca.fpds_parent_agency_id = pa.fpds_agency_id and
+            ca.id = c.descendant_award_id and
             ca.type not like 'IDV%'
             {hide_edges_awarded_amount}
+        inner join awards pa on pa.id = c.parent_award_id
         left outer join transaction_fpds tf on tf.transaction_id = ca.latest_transaction_id
         left outer join recipient_lookup rl on rl.duns = tf.awardee_or_recipient_uniqu
         left outer join recipient_profile rp on
@@ -63,14 +50,17 @@ ACTIVITY_SQL = SQL(
             rp.recipient_level = case when tf.ultimate_parent_unique_ide is null then 'R' else 'C' end
         left outer join agency a on a.id = ca.awarding_agency_id
         left outer join toptier_agency ta on ta.toptier_agency_id = a.toptier_agency_id
-    {hide_edges_end_date}
-    order by
-        ca.total_obligation desc, ca.id desc
-    limit {limit} offset {offset}
+    where
+        pap.{award_id_column} = {award_id}
+        {hide_edges_end_date}
 """
 )
 
 
+# Largest obligations first
+PAGINATION_ORDER = KeysetPagination("obligated_amount", ["award_id"], "desc")
+
+
 # So, as it turns out, we already count all descendant contracts.  Go us!
 # There's always the chance these may not 100% match the actual count for a
 # myriad of reasons, but they pretty much all involve failed operations
@@ -86,30 +76,19 @@ COUNT_ACTIVITY_SQL = SQL(
 
 COUNT_ACTIVITY_HIDDEN_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id,
-                false grandchild
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id,
-                true grandchild
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    )
     select
         count(*) rollup_contract_count
     from
-        gather_award_ids gaids
-        inner join awards pa on pa.id = gaids.award_id
+        parent_award pap
+        inner join idv_closure c on c.ancestor_award_id = pap.award_id
         inner join awards ca on
-            ca.parent_award_piid = pa.piid and
-            ca.fpds_parent_agency_id = pa.fpds_agency_id and
+            ca.id = c.descendant_award_id and
             ca.type not like 'IDV%'
             {hide_edges_awarded_amount}
         left outer join transaction_fpds tf on tf.transaction_id = ca.latest_transaction_id
-    {hide_edges_end_date}
+    where
+        pap.{award_id_column} = {award_id}
+        {hide_edges_end_date}
 """
 )
 
@@ -117,7 +96,7 @@ COUNT_ACTIVITY_HIDDEN_SQL = SQL(
 def _prepare_tiny_shield_models():
     # This endpoint has a fixed sort.  No need for "sort" or "order".
     models = [copy(p) for p in PAGINATION if p["name"] in ("page", "limit")]
-    models.extend([get_internal_or_generated_award_id_model()])
+    models.extend([get_internal_or_generated_award_id_model(), CURSOR])
     models.extend(
         [{"key": "hide_edge_cases", "name": "hide_edge_cases", "type": "boolean", "optional": True, "default": False}]
     )
@@ -152,7 +131,7 @@ class IDVActivityViewSet(APIView):
         award_id_column = "award_id" if type(award_id) is int else "generated_unique_award_id"
         if hide_edge_cases:
             hide_edges_awarded_amount = "and ca.base_and_all_options_value > 0 and ca.total_obligation > 0"
-            hide_edges_end_date = "where tf.period_of_perf_potential_e is not null"
+            hide_edges_end_date = "and tf.period_of_perf_potential_e is not null"
             sql = COUNT_ACTIVITY_HIDDEN_SQL.format(
                 award_id_column=Identifier(award_id_column),
                 award_id=Literal(award_id),
@@ -166,19 +145,20 @@ class IDVActivityViewSet(APIView):
         sql = ACTIVITY_SQL.format(
             award_id_column=Identifier(award_id_column),
             award_id=Literal(award_id),
-            limit=Literal(request_data["limit"] + 1),
-            offset=Literal((request_data["page"] - 1) * request_data["limit"]),
             hide_edges_awarded_amount=SQL(hide_edges_awarded_amount),
             hide_edges_end_date=SQL(hide_edges_end_date),
         )
 
-        return execute_sql_to_ordered_dictionary(sql), overall_count
+        return execute_sql_to_ordered_dictionary(PAGINATION_ORDER.paginate_sql(sql, request_data)), overall_count
 
     @cache_response()
     def post(self, request: Request) -> Response:
         request_data = self._parse_and_validate_request(request.data)
         results, overall_count = self._business_logic(request_data)
-        page_metadata = get_pagination_metadata(overall_count, request_data["limit"], request_data["page"])
+        if "cursor" in request_data:
+            page_metadata = PAGINATION_ORDER.page_metadata(results, request_data)
+        else:
+            page_metadata = get_pagination_metadata(overall_count, request_data["limit"], request_data["page"])
 
         response = OrderedDict((("results", results[: request_data["limit"]]), ("page_metadata", page_metadata)))
 
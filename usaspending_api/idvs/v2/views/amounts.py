@@ -18,27 +18,16 @@ from usaspending_api.references.models import DisasterEmergencyFundCode
 
 logger = logging.getLogger("console")
 
-child_award_sql = """
+# Like the other IDV endpoints, this counts every award beneath the IDV, however deep.  Anything more than one level
+# down is a grandchild.
+descendant_award_sql = """
     select
-        ac.id as award_id
+        ac.id as award_id,
+        c.depth
     from
         parent_award pap
-        inner join awards ap on ap.id = pap.award_id
-        inner join awards ac on ac.fpds_parent_agency_id = ap.fpds_agency_id and ac.parent_award_piid = ap.piid and
-            ac.type not like 'IDV%'
-    where
-        pap.{award_id_column} = '{award_id}'
-    """
-grandchild_award_sql = """
-    select
-        ac.id as award_id
-    from
-        parent_award pap
-        inner join parent_award pac on pac.parent_award_id = pap.award_id
-        inner join awards ap on ap.id = pac.award_id
-        inner join awards ac on ac.fpds_parent_agency_id = ap.fpds_agency_id and ac.parent_award_piid = ap.piid and
-            ac.type not like 'IDV%'
-
+        inner join idv_closure c on c.ancestor_award_id = pap.award_id and c.depth > 0
+        inner join awards ac on ac.id = c.descendant_award_id and ac.type not like 'IDV%'
     where
         pap.{award_id_column} = '{award_id}'
     """
@@ -47,18 +36,13 @@ grandchild_award_sql = """
 def fetch_account_details_idv(award_id, award_id_column) -> dict:
     if award_id_column != "award_id":
         award_id = re.sub(r"[']", r"''", award_id)
-    children = execute_sql_to_ordered_dictionary(
-        child_award_sql.format(award_id=award_id, award_id_column=award_id_column)
-    )
-    grandchildren = execute_sql_to_ordered_dictionary(
-        grandchild_award_sql.format(award_id=award_id, award_id_column=award_id_column)
+    descendants = execute_sql_to_ordered_dictionary(
+        descendant_award_sql.format(award_id=award_id, award_id_column=award_id_column)
     )
     covid_defcs = DisasterEmergencyFundCode.objects.filter(group_name="covid_19").values_list("code", flat=True)
 
-    child_award_ids = []
-    grandchild_award_ids = []
-    child_award_ids.extend([x["award_id"] for x in children])
-    grandchild_award_ids.extend([x["award_id"] for x in grandchildren])
+    child_award_ids = [x["award_id"] for x in descendants if x["depth"] == 1]
+    grandchild_award_ids = [x["award_id"] for x in descendants if x["depth"] > 1]
     award_id_sql = "faba.award_id in {award_id}".format(award_id="(" + str(child_award_ids).strip("[]") + ")")
     child_results = (
         execute_sql_to_ordered_dictionary(defc_sql.format(award_id_sql=award_id_sql)) if child_award_ids != [] else {}
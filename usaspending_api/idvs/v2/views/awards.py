@@ -7,10 +7,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from usaspending_api.common.cache_decorator import cache_response
-from usaspending_api.common.helpers.generic_helper import get_simple_pagination_metadata
+from usaspending_api.common.helpers.keyset_pagination import KeysetPagination
 from usaspending_api.common.helpers.sql_helpers import execute_sql_to_ordered_dictionary
 from usaspending_api.common.validator.award import get_internal_or_generated_award_id_model
-from usaspending_api.common.validator.pagination import customize_pagination_with_sort_columns
+from usaspending_api.common.validator.pagination import CURSOR, customize_pagination_with_sort_columns
 from usaspending_api.common.validator.tinyshield import TinyShield
 
 
@@ -55,7 +55,8 @@ GET_CHILD_IDVS_SQL = SQL(
         ac.piid
     from
         parent_award pap
-        inner join parent_award pac on pac.parent_award_id = pap.award_id
+        inner join idv_closure c on c.ancestor_award_id = pap.award_id and c.depth = 1
+        inner join parent_award pac on pac.award_id = c.descendant_award_id
         inner join awards ac on ac.id = pac.award_id
         inner join transaction_fpds tf on tf.transaction_id = ac.latest_transaction_id
         left outer join agency a on a.id = ac.funding_agency_id
@@ -64,9 +65,6 @@ GET_CHILD_IDVS_SQL = SQL(
         left outer join toptier_agency ttb on ttb.toptier_agency_id = b.toptier_agency_id
     where
         pap.{award_id_column} = {award_id}
-    order by
-        {sort_column} {sort_direction}, ac.id {sort_direction}
-    limit {limit} offset {offset}
 """
 )
 
@@ -89,9 +87,8 @@ GET_CHILD_AWARDS_SQL = SQL(
         ac.piid
     from
         parent_award pap
-        inner join awards ap on ap.id = pap.award_id
-        inner join awards ac on ac.fpds_parent_agency_id = ap.fpds_agency_id and ac.parent_award_piid = ap.piid and
-            ac.type not like 'IDV%'
+        inner join idv_closure c on c.ancestor_award_id = pap.award_id and c.depth = 1
+        inner join awards ac on ac.id = c.descendant_award_id and ac.type not like 'IDV%'
         inner join transaction_fpds tf on tf.transaction_id = ac.latest_transaction_id
         left outer join agency a on a.id = ac.funding_agency_id
         left outer join agency b on b.id = ac.awarding_agency_id
@@ -99,9 +96,6 @@ GET_CHILD_AWARDS_SQL = SQL(
         left outer join toptier_agency ttb on ttb.toptier_agency_id = b.toptier_agency_id
     where
         pap.{award_id_column} = {award_id}
-    order by
-        {sort_column} {sort_direction}, ac.id {sort_direction}
-    limit {limit} offset {offset}
 """
 )
 
@@ -124,10 +118,8 @@ GET_GRANDCHILD_AWARDS_SQL = SQL(
         ac.piid
     from
         parent_award pap
-        inner join parent_award pac on pac.parent_award_id = pap.award_id
-        inner join awards ap on ap.id = pac.award_id
-        inner join awards ac on ac.fpds_parent_agency_id = ap.fpds_agency_id and ac.parent_award_piid = ap.piid and
-            ac.type not like 'IDV%'
+        inner join idv_closure c on c.ancestor_award_id = pap.award_id and c.depth = 2
+        inner join awards ac on ac.id = c.descendant_award_id and ac.type not like 'IDV%'
         inner join transaction_fpds tf on tf.transaction_id = ac.latest_transaction_id
         left outer join agency a on a.id = ac.funding_agency_id
         left outer join agency b on b.id = ac.awarding_agency_id
@@ -136,9 +128,6 @@ GET_GRANDCHILD_AWARDS_SQL = SQL(
 
     where
         pap.{award_id_column} = {award_id}
-    order by
-        {sort_column} {sort_direction}, ac.id {sort_direction}
-    limit {limit} offset {offset}
 """
 )
 
@@ -163,6 +152,7 @@ def _prepare_tiny_shield_models():
                 "default": "child_idvs",
                 "optional": True,
             },
+            CURSOR,
         ]
     )
     return models
@@ -183,7 +173,10 @@ class IDVAwardsViewSet(APIView):
         return TinyShield(deepcopy(TINY_SHIELD_MODELS)).block(request)
 
     @staticmethod
-    def _business_logic(request_data: dict) -> list:
+    def _get_pagination(request_data: dict) -> KeysetPagination:
+        return KeysetPagination(request_data["sort"], ["award_id"], request_data["order"])
+
+    def _business_logic(self, request_data: dict) -> list:
         # By this point, our award_id has been validated and cleaned up by
         # TinyShield.  We will either have an internal award id that is an
         # integer or a generated award id that is a string.
@@ -191,22 +184,15 @@ class IDVAwardsViewSet(APIView):
         award_id_column = "award_id" if type(award_id) is int else "generated_unique_award_id"
 
         sql = TYPE_TO_SQL_MAPPING[request_data["type"]]
-        sql = sql.format(
-            award_id_column=Identifier(award_id_column),
-            award_id=Literal(award_id),
-            sort_column=Identifier(request_data["sort"]),
-            sort_direction=SQL(request_data["order"]),
-            limit=Literal(request_data["limit"] + 1),
-            offset=Literal((request_data["page"] - 1) * request_data["limit"]),
-        )
+        sql = sql.format(award_id_column=Identifier(award_id_column), award_id=Literal(award_id))
 
-        return execute_sql_to_ordered_dictionary(sql)
+        return execute_sql_to_ordered_dictionary(self._get_pagination(request_data).paginate_sql(sql, request_data))
 
     @cache_response()
     def post(self, request: Request) -> Response:
         request_data = self._parse_and_validate_request(request.data)
         results = self._business_logic(request_data)
-        page_metadata = get_simple_pagination_metadata(len(results), request_data["limit"], request_data["page"])
+        page_metadata = self._get_pagination(request_data).page_metadata(results, request_data)
 
         response = OrderedDict((("results", results[: request_data["limit"]]), ("page_metadata", page_metadata)))
 
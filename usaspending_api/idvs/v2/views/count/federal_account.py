@@ -11,28 +11,19 @@ from usaspending_api.common.validator.tinyshield import TinyShield
 
 GET_COUNT_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    ), gather_awards as (
+    with gather_awards as (
         select  id award_id
         from    awards
         where   {awards_table_id_column} = {award_id} and
                 (piid = {piid} or {piid} is null)
         union   all
         select  ca.id award_id
-        from    gather_award_ids gaids
-                inner join awards pa on pa.id = gaids.award_id
+        from    parent_award pap
+                inner join idv_closure c on c.ancestor_award_id = pap.award_id and c.depth > 0
                 inner join awards ca on
-                    ca.parent_award_piid = pa.piid and
-                    ca.fpds_parent_agency_id = pa.fpds_agency_id and
+                    ca.id = c.descendant_award_id and
                     (ca.piid = {piid} or {piid} is null)
+        where   pap.{award_id_column} = {award_id}
     ), gather_financial_accounts_by_awards as (
         select  ga.award_id,
                 faba.financial_accounts_by_awards_id
@@ -38,16 +38,7 @@ DEFAULT_SORT_COLUMN = "reporting_fiscal_date"
 # data not File C (financial_accounts_by_awards).
 GET_FUNDING_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    ), gather_awards as (
+    with gather_awards as (
         select  id award_id,
                 generated_unique_award_id,
                 piid,
@@ -62,12 +53,12 @@ GET_FUNDING_SQL = SQL(
                 ca.piid,
                 ca.awarding_agency_id,
                 ca.funding_agency_id
-        from    gather_award_ids gaids
-                inner join awards pa on pa.id = gaids.award_id
+        from    parent_award pap
+                inner join idv_closure c on c.ancestor_award_id = pap.award_id and c.depth > 0
                 inner join awards ca on
-                    ca.parent_award_piid = pa.piid and
-                    ca.fpds_parent_agency_id = pa.fpds_agency_id and
+                    ca.id = c.descendant_award_id and
                     (ca.piid = {piid} or {piid} is null)
+        where   pap.{award_id_column} = {award_id}
     ), gather_financial_accounts_by_awards as (
         select  ga.award_id,
                 ga.generated_unique_award_id,
@@ -11,50 +11,21 @@ from usaspending_api.common.validator.award import get_internal_or_generated_awa
 from usaspending_api.common.validator.tinyshield import validate_post_request
 
 
-# As per direction from the product owner, agency data is to be retrieved from
-# the File D (awards) data not File C (financial_accounts_by_awards).  Also,
-# even though this query structure looks terrible, it managed to boost
-# performance a bit.
+# File C totals and distinct agency and account counts beneath each IDV are
+# maintained in idv_funding_rollup (see usaspending_api/awards/idv_closure.py).
+# IDVs without File C records beneath them have no row, hence the coalesces.
 ROLLUP_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    ), gather_awards as (
-        select  ca.id award_id,
-                ca.awarding_agency_id,
-                ca.funding_agency_id
-        from    gather_award_ids gaids
-                inner join awards pa on pa.id = gaids.award_id
-                inner join awards ca on
-                    ca.parent_award_piid = pa.piid and
-                    ca.fpds_parent_agency_id = pa.fpds_agency_id and
-                    ca.type not like 'IDV%'
-    ), gather_financial_accounts_by_awards as (
-        select  ga.awarding_agency_id,
-                ga.funding_agency_id,
-                nullif(faba.transaction_obligated_amount, 'NaN') transaction_obligated_amount,
-                faba.treasury_account_id
-        from    gather_awards ga
-                inner join financial_accounts_by_awards faba on faba.award_id = ga.award_id
-    )
     select
-        coalesce(sum(gfaba.transaction_obligated_amount), 0.0)          total_transaction_obligated_amount,
-        count(distinct aa.toptier_agency_id)                            awarding_agency_count,
-        count(distinct af.toptier_agency_id)                            funding_agency_count,
-        count(distinct taa.agency_id || '-' || taa.main_account_code)   federal_account_count
+        coalesce(sum(r.total_transaction_obligated_amount), 0.0)        total_transaction_obligated_amount,
+        coalesce(sum(r.awarding_agency_count), 0)                       awarding_agency_count,
+        coalesce(sum(r.funding_agency_count), 0)                        funding_agency_count,
+        coalesce(sum(r.federal_account_count), 0)                       federal_account_count
     from
-        gather_financial_accounts_by_awards gfaba
-        left outer join treasury_appropriation_account taa on
-            taa.treasury_account_identifier = gfaba.treasury_account_id
-        left outer join agency aa on aa.id = gfaba.awarding_agency_id
-        left outer join agency af on af.id = gfaba.funding_agency_id
+        parent_award pap
+        inner join idv_funding_rollup r on r.award_id = pap.award_id
+    where
+        pap.{award_id_column} = {award_id}
 """
 )
 
@@ -1,8 +1,8 @@
 import logging
 import os
 import csv
-import boto3
 
+from usaspending_api.common.helpers.s3_helpers import get_s3_bucket
 from usaspending_api.etl.management.load_base import load_data_into_model
 from usaspending_api.recipient.models import StateData
 
@@ -44,8 +44,7 @@ class Command(BaseCommand):
                 raise Exception("Wrong filetype provided, expecting csv")
             file_path = csv_file
         elif not settings.IS_LOCAL and settings.USASPENDING_AWS_REGION and settings.STATE_DATA_BUCKET:
-            s3connection = boto3.resource("s3", region_name=settings.USASPENDING_AWS_REGION)
-            s3bucket = s3connection.Bucket(settings.STATE_DATA_BUCKET)
+            s3bucket = get_s3_bucket(settings.STATE_DATA_BUCKET, settings.USASPENDING_AWS_REGION)
             file_path = os.path.join("/", "tmp", LOCAL_STATE_DATA_FILENAME)
             s3bucket.download_file(LOCAL_STATE_DATA_FILENAME, file_path)
             remote = True
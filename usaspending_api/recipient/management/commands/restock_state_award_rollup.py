@@ -0,0 +1,28 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from pathlib import Path
+
+from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
+
+
+logger = logging.getLogger("script")
+
+RESTOCK_SQL_FILE = Path(__file__).resolve().parent.parent / "sql" / "restock_state_award_rollup.sql"
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Rebuild state_award_rollup from summary_state_view. Run after summary_state_view is refreshed "
+        "following a transaction load (matview_runner does this automatically)."
+    )
+
+    def handle(self, *args, **options):
+        with Timer("Restock state_award_rollup"):
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(RESTOCK_SQL_FILE.read_text())
+                    cursor.execute("SELECT COUNT(*) FROM state_award_rollup")
+                    logger.info(f"state_award_rollup restocked with {cursor.fetchone()[0]:,} rows")
@@ -0,0 +1,103 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from pathlib import Path
+from psycopg2.sql import Literal, SQL
+from usaspending_api.broker.helpers.last_load_date import get_last_load_date, update_last_load_date
+from usaspending_api.common.etl import mixins
+from usaspending_api.common.helpers.sql_helpers import execute_sql_return_single_value
+from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
+
+
+logger = logging.getLogger("script")
+
+LAST_LOAD_DATE_KEY = "recipient_profile"
+
+# Transactions and recipients changed this long before the previous run started are picked up again, in case they
+# were written by a database transaction that was still open then
+DELTA_LOOKBACK_MINUTES = 15
+
+
+class Command(mixins.ETLMixin, BaseCommand):
+
+    help = (
+        "Update recipient_profile in USAspending.  Only the profiles of recipients whose transactions or "
+        "recipient_lookup records changed or were deleted since the previous run are rebuilt; the 12 month totals of "
+        "the others are reduced by the days that have left the window since then.  The first run, or one with "
+        "--full, rebuilds every profile."
+    )
+
+    etl_logger_function = logger.info
+    etl_timer = Timer
+    etl_dml_sql_directory = Path(__file__).resolve().parent.parent / "sql" / "recipient_profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild recipient_profile and its supporting tables from every transaction.",
+        )
+
+    def handle(self, *args, **options):
+        with Timer("Update recipient_profile"):
+            try:
+                with transaction.atomic():
+                    run_start = execute_sql_return_single_value("select now()", read_only=False)
+                    changed_since = None
+                    if not options["full"]:
+                        changed_since = get_last_load_date(LAST_LOAD_DATE_KEY, DELTA_LOOKBACK_MINUTES)
+                        if changed_since is None:
+                            logger.info("recipient_profile has not been updated before.  Rebuilding every profile.")
+
+                    if changed_since is None:
+                        self._perform_full_load()
+                    else:
+                        self._perform_delta_load(changed_since)
+
+                    update_last_load_date(LAST_LOAD_DATE_KEY, run_start)
+                    t = Timer("Commit transaction")
+                    t.log_starting_message()
+                t.log_success_message()
+            except Exception:
+                logger.error("ALL CHANGES ROLLED BACK DUE TO EXCEPTION")
+                raise
+
+    def _perform_full_load(self):
+        self._execute_etl_dml_sql_directory_file("create_temp_relations")
+        self._execute_dml_sql(
+            "truncate table recipient_profile_transaction, recipient_profile_daily_obligation",
+            "Truncate recipient_profile_transaction and recipient_profile_daily_obligation",
+        )
+        self._execute_etl_dml_sql_directory_template("load_transactions", transaction_filter=SQL("true"))
+        self._execute_etl_dml_sql_directory_file("touch_all_recipients")
+        self._restock_touched_profiles()
+
+    def _perform_delta_load(self, changed_since):
+        logger.info(f"Updating recipient profiles for changes since {changed_since}")
+        self._execute_etl_dml_sql_directory_file("create_temp_relations")
+        self._execute_etl_dml_sql_directory_template("stage_changed_transactions", changed_since=Literal(changed_since))
+        self._execute_etl_dml_sql_directory_file("remove_changed_transactions")
+        self._execute_etl_dml_sql_directory_template(
+            "load_transactions",
+            transaction_filter=SQL("tn.id in (select transaction_id from temp_recipient_profile_changed_transactions)"),
+        )
+        self._execute_etl_dml_sql_directory_file("touch_loaded_transactions")
+        self._execute_etl_dml_sql_directory_template("touch_changed_recipients", changed_since=Literal(changed_since))
+        self._restock_touched_profiles(age_daily_obligations=True)
+
+    def _restock_touched_profiles(self, age_daily_obligations=False):
+        touched = execute_sql_return_single_value(
+            "select count(*) from temp_recipient_profile_touched", read_only=False
+        )
+        logger.info(f"Rebuilding {touched:,} recipient profiles")
+        self._execute_etl_dml_sql_directory_file("rebuild_daily_obligations")
+        if age_daily_obligations:
+            self._execute_etl_dml_sql_directory_file("age_daily_obligations")
+        self._execute_etl_dml_sql_directory_file("restock_touched_profiles")
+        self._execute_etl_dml_sql_directory_file("drop_temp_relations")
+
+    def _execute_etl_dml_sql_directory_template(self, file_name_no_extension, **kwargs):
+        """ Same as _execute_etl_dml_sql_directory_file but first fills in the file's {placeholders} from kwargs. """
+        file_path = self._get_sql_directory_file_path(file_name_no_extension)
+        return self._execute_dml_sql(SQL(file_path.read_text()).format(**kwargs), file_name_no_extension)
@@ -0,0 +1,116 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from pathlib import Path
+from usaspending_api.broker.helpers.last_load_date import get_last_load_date
+from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
+from usaspending_api.recipient.management.commands.update_recipient_profile import LAST_LOAD_DATE_KEY
+
+
+logger = logging.getLogger("script")
+
+RESTOCK_SQL_FILE = Path(__file__).resolve().parent.parent / "sql" / "restock_recipient_profile.sql"
+
+# restock_recipient_profile.sql builds temporary_restock_recipient_profile before this step and swaps it in after it
+SWAP_STEP_BANNER = "-- Step 10,"
+
+SAMPLE_SIZE = 10
+
+# Array order is not significant to either build.  The rebuild's recipient_level is a character(1) rather than a
+# varchar(1), which rows can't be compared across.
+COMPARED_COLUMNS = """
+    recipient_hash,
+    recipient_level::text as recipient_level,
+    recipient_unique_id,
+    recipient_name,
+    array(select unnest(recipient_affiliations) order by 1) as recipient_affiliations,
+    array(select unnest(award_types) order by 1) as award_types,
+    last_12_months,
+    last_12_contracts,
+    last_12_grants,
+    last_12_direct_payments,
+    last_12_loans,
+    last_12_other,
+    last_12_months_count
+"""
+
+COMPARE_SQL = f"""
+    create temporary table temp_verify_recipient_profile as
+    select  coalesce(f.recipient_hash, rp.recipient_hash) as recipient_hash,
+            coalesce(f.recipient_level, rp.recipient_level) as recipient_level,
+            case
+                when rp.recipient_hash is null then 'missing'
+                when f.recipient_hash is null then 'unexpected'
+                else 'different'
+            end as difference
+    from    (select {COMPARED_COLUMNS} from temporary_restock_recipient_profile) as f
+            full outer join (select {COMPARED_COLUMNS} from recipient_profile) as rp on
+                rp.recipient_hash = f.recipient_hash and rp.recipient_level = f.recipient_level
+    where   f.recipient_hash is null or rp.recipient_hash is null or f is distinct from rp
+"""
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Compare recipient_profile, as maintained by update_recipient_profile, with a full rebuild by "
+        "restock_recipient_profile.sql.  Nothing is changed.  Run it shortly after update_recipient_profile: the two "
+        "only agree when they use the same 12 month window."
+    )
+
+    def handle(self, *args, **options):
+        last_update = get_last_load_date(LAST_LOAD_DATE_KEY)
+        if last_update is None:
+            raise CommandError("recipient_profile has not been built by update_recipient_profile")
+
+        restock_sql, banner, _ = RESTOCK_SQL_FILE.read_text().partition(SWAP_STEP_BANNER)
+        if not banner:
+            raise CommandError(f"Unable to find '{SWAP_STEP_BANNER}' in {RESTOCK_SQL_FILE}")
+
+        with Timer("Verify recipient_profile"):
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("select %s::timestamptz::date = now()::date", [last_update])
+                    if not cursor.fetchone()[0]:
+                        logger.warning(
+                            f"recipient_profile was last updated at {last_update}.  Totals of days that have left the "
+                            f"12 month window since then will differ from the rebuild."
+                        )
+
+                    with Timer("Full rebuild"):
+                        cursor.execute(restock_sql)
+                    cursor.execute(COMPARE_SQL)
+                    cursor.execute(
+                        "select difference, count(*) from temp_verify_recipient_profile group by difference order by 1"
+                    )
+                    differences = dict(cursor.fetchall())
+                    cursor.execute(
+                        """
+                        select  difference, recipient_hash, recipient_level
+                        from    (
+                                    select  *, row_number() over (
+                                                partition by difference order by recipient_hash, recipient_level
+                                            ) as difference_row_number
+                                    from    temp_verify_recipient_profile
+                                ) as t
+                        where   difference_row_number <= %s
+                        order   by 1, 2, 3
+                        """,
+                        [SAMPLE_SIZE],
+                    )
+                    samples = cursor.fetchall()
+
+                # Leave no trace of the rebuild
+                transaction.set_rollback(True)
+
+        if not differences:
+            logger.info("recipient_profile matches a full rebuild")
+            return
+
+        for difference, recipient_hash, recipient_level in samples:
+            logger.info(f"{difference}: recipient_hash {recipient_hash}, recipient_level {recipient_level}")
+        raise CommandError(
+            "recipient_profile differs from a full rebuild: "
+            + ", ".join(f"{count:,} {difference}" for difference, count in differences.items())
+        )
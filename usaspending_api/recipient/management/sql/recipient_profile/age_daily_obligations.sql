@@ -0,0 +1,49 @@
+-- Subtract the days that have fallen out of the 12 month window since the previous run from the profiles that were
+-- not rebuilt (rebuilt profiles have no such days), then drop them
+CREATE TEMPORARY TABLE temp_recipient_profile_aged AS
+SELECT
+  recipient_hash,
+  recipient_level,
+  SUM(CASE WHEN award_category = 'contract' THEN obligation ELSE 0::NUMERIC(23,2) END) AS contracts,
+  SUM(CASE WHEN award_category = 'grant' THEN obligation ELSE 0::NUMERIC(23,2) END) AS grants,
+  SUM(CASE WHEN award_category = 'direct payment' THEN obligation ELSE 0::NUMERIC(23,2) END) AS direct_payments,
+  SUM(CASE WHEN award_category = 'loans' THEN obligation ELSE 0::NUMERIC(23,2) END) AS loans,
+  SUM(CASE WHEN award_category = 'other' THEN obligation ELSE 0::NUMERIC(23,2) END) AS other,
+  SUM(obligation) AS amount,
+  SUM(transaction_count) AS count
+FROM
+  public.recipient_profile_daily_obligation
+WHERE
+  action_date < now() - INTERVAL '1 year'
+GROUP BY
+  recipient_hash,
+  recipient_level;
+
+DELETE FROM public.recipient_profile_daily_obligation WHERE action_date < now() - INTERVAL '1 year';
+
+UPDATE public.recipient_profile AS rp
+SET
+  award_types = COALESCE(
+    (
+      SELECT
+        array_agg(DISTINCT rpdo.award_category)
+      FROM
+        public.recipient_profile_daily_obligation AS rpdo
+      WHERE
+        rpdo.recipient_hash = a.recipient_hash
+        AND rpdo.recipient_level = a.recipient_level
+    ),
+    ARRAY[]::TEXT[]
+  ),
+  last_12_months = rp.last_12_months - a.amount,
+  last_12_contracts = rp.last_12_contracts - a.contracts,
+  last_12_grants = rp.last_12_grants - a.grants,
+  last_12_direct_payments = rp.last_12_direct_payments - a.direct_payments,
+  last_12_loans = rp.last_12_loans - a.loans,
+  last_12_other = rp.last_12_other - a.other,
+  last_12_months_count = rp.last_12_months_count - a.count
+FROM
+  temp_recipient_profile_aged AS a
+WHERE
+  rp.recipient_hash = a.recipient_hash
+  AND rp.recipient_level = a.recipient_level;
@@ -0,0 +1,16 @@
+DROP TABLE IF EXISTS temp_recipient_profile_changed_transactions;
+DROP TABLE IF EXISTS temp_recipient_profile_touched;
+DROP TABLE IF EXISTS temp_recipient_profile_aged;
+DROP TABLE IF EXISTS temp_recipient_profile;
+
+-- Transactions to remove from recipient_profile_transaction and, if they still qualify, load again
+CREATE TEMPORARY TABLE temp_recipient_profile_changed_transactions (
+  transaction_id BIGINT PRIMARY KEY
+);
+
+-- Recipient profiles to rebuild
+CREATE TEMPORARY TABLE temp_recipient_profile_touched (
+  recipient_hash UUID NOT NULL,
+  recipient_level TEXT NOT NULL,
+  PRIMARY KEY (recipient_hash, recipient_level)
+);
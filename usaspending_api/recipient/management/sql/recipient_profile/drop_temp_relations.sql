@@ -0,0 +1,4 @@
+DROP TABLE IF EXISTS temp_recipient_profile_changed_transactions;
+DROP TABLE IF EXISTS temp_recipient_profile_touched;
+DROP TABLE IF EXISTS temp_recipient_profile_aged;
+DROP TABLE IF EXISTS temp_recipient_profile;
@@ -0,0 +1,45 @@
+-- Same recipient attributes restock_recipient_profile.sql derives for temporary_recipients_from_transactions_view
+INSERT INTO public.recipient_profile_transaction (
+  transaction_id,
+  recipient_hash,
+  recipient_unique_id,
+  parent_recipient_unique_id,
+  recipient_level,
+  award_category,
+  action_date,
+  generated_pragmatic_obligation
+)
+SELECT
+  tn.id AS transaction_id,
+  MD5(UPPER(
+    CASE
+      WHEN COALESCE(fpds.awardee_or_recipient_uniqu, fabs.awardee_or_recipient_uniqu) IS NOT NULL THEN CONCAT('duns-', COALESCE(fpds.awardee_or_recipient_uniqu, fabs.awardee_or_recipient_uniqu))
+      ELSE CONCAT('name-', COALESCE(fpds.awardee_or_recipient_legal, fabs.awardee_or_recipient_legal, '')) END
+  ))::uuid AS recipient_hash,
+  COALESCE(fpds.awardee_or_recipient_uniqu, fabs.awardee_or_recipient_uniqu) AS recipient_unique_id,
+  COALESCE(fpds.ultimate_parent_unique_ide, fabs.ultimate_parent_unique_ide) AS parent_recipient_unique_id,
+  CASE
+    WHEN COALESCE(fpds.ultimate_parent_unique_ide, fabs.ultimate_parent_unique_ide) IS NOT NULL THEN 'C'
+  ELSE 'R' END AS recipient_level,
+  CASE
+    WHEN tn.type IN ('A', 'B', 'C', 'D')      THEN 'contract'
+    WHEN tn.type IN ('02', '03', '04', '05')  THEN 'grant'
+    WHEN tn.type IN ('06', '10')              THEN 'direct payment'
+    WHEN tn.type IN ('07', '08')              THEN 'loans'
+    WHEN tn.type IN ('09', '11')              THEN 'other'     -- collapsing insurance into other
+    WHEN tn.type LIKE 'IDV%'                  THEN 'contract'  -- collapsing idv into contract
+    ELSE NULL
+  END AS award_category,
+  tn.action_date,
+  COALESCE(CASE
+      WHEN tn.type IN('07','08') THEN tn.original_loan_subsidy_cost
+      ELSE tn.federal_action_obligation
+    END, 0)::NUMERIC(23, 2) AS generated_pragmatic_obligation
+FROM
+  public.transaction_normalized AS tn
+  LEFT OUTER JOIN public.transaction_fpds AS fpds ON tn.id = fpds.transaction_id
+  LEFT OUTER JOIN public.transaction_fabs AS fabs ON tn.id = fabs.transaction_id
+WHERE
+  tn.action_date >= '2007-10-01'
+  AND tn.type IS NOT NULL
+  AND {transaction_filter};
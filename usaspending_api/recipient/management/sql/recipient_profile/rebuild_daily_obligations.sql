@@ -0,0 +1,62 @@
+DELETE FROM public.recipient_profile_daily_obligation AS rpdo
+USING temp_recipient_profile_touched AS t
+WHERE
+  rpdo.recipient_hash = t.recipient_hash
+  AND rpdo.recipient_level = t.recipient_level;
+
+-- Recipient and child profiles count their own transactions; parent profiles those of their children
+INSERT INTO public.recipient_profile_daily_obligation (
+  recipient_hash,
+  recipient_level,
+  action_date,
+  award_category,
+  obligation,
+  transaction_count
+)
+  SELECT
+    t.recipient_hash,
+    t.recipient_level,
+    rpt.action_date,
+    CASE
+      WHEN rpt.award_category NOT IN ('contract', 'grant', 'direct payment', 'loans')
+      THEN 'other' ELSE rpt.award_category
+    END AS award_category,
+    SUM(rpt.generated_pragmatic_obligation) AS obligation,
+    COUNT(*) AS transaction_count
+  FROM
+    temp_recipient_profile_touched AS t
+    INNER JOIN public.recipient_profile_transaction AS rpt ON
+      rpt.recipient_hash = t.recipient_hash
+      AND rpt.recipient_level = t.recipient_level
+  WHERE
+    t.recipient_level IN ('R', 'C')
+    AND rpt.action_date >= now() - INTERVAL '1 year'
+    AND EXISTS (SELECT FROM public.recipient_lookup AS rl WHERE rl.recipient_hash = t.recipient_hash)
+  GROUP BY
+    t.recipient_hash,
+    t.recipient_level,
+    rpt.action_date,
+    4
+UNION ALL
+  SELECT
+    t.recipient_hash,
+    t.recipient_level,
+    rpt.action_date,
+    CASE
+      WHEN rpt.award_category NOT IN ('contract', 'grant', 'direct payment', 'loans')
+      THEN 'other' ELSE rpt.award_category
+    END AS award_category,
+    SUM(rpt.generated_pragmatic_obligation) AS obligation,
+    COUNT(*) AS transaction_count
+  FROM
+    temp_recipient_profile_touched AS t
+    INNER JOIN public.recipient_lookup AS rl ON rl.recipient_hash = t.recipient_hash
+    INNER JOIN public.recipient_profile_transaction AS rpt ON rpt.parent_recipient_unique_id = rl.duns
+  WHERE
+    t.recipient_level = 'P'
+    AND rpt.action_date >= now() - INTERVAL '1 year'
+  GROUP BY
+    t.recipient_hash,
+    t.recipient_level,
+    rpt.action_date,
+    4;
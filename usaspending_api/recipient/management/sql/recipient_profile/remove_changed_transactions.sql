@@ -0,0 +1,30 @@
+-- The profiles these transactions counted towards before they changed need to be rebuilt as well
+WITH removed AS (
+  DELETE FROM public.recipient_profile_transaction AS rpt
+  USING temp_recipient_profile_changed_transactions AS ct
+  WHERE rpt.transaction_id = ct.transaction_id
+  RETURNING rpt.recipient_hash, rpt.recipient_level, rpt.recipient_unique_id, rpt.parent_recipient_unique_id
+)
+INSERT INTO temp_recipient_profile_touched (recipient_hash, recipient_level)
+  SELECT
+    recipient_hash,
+    recipient_level
+  FROM
+    removed
+UNION
+  SELECT
+    rl.recipient_hash,
+    'P'
+  FROM
+    removed
+    INNER JOIN public.recipient_lookup AS rl ON rl.duns = removed.parent_recipient_unique_id
+UNION
+  SELECT
+    rl.recipient_hash,
+    'C'
+  FROM
+    removed
+    INNER JOIN public.recipient_lookup AS rl ON rl.duns = removed.recipient_unique_id
+  WHERE
+    removed.parent_recipient_unique_id IS NOT NULL
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,108 @@
+-- Rebuild the touched profiles the way restock_recipient_profile.sql builds every profile, taking the 12 month totals
+-- from recipient_profile_daily_obligation
+CREATE TEMPORARY TABLE temp_recipient_profile AS
+WITH obligations AS (
+  SELECT
+    rpdo.recipient_hash,
+    rpdo.recipient_level,
+    array_agg(DISTINCT rpdo.award_category) AS award_types,
+    SUM(CASE WHEN rpdo.award_category = 'contract' THEN rpdo.obligation ELSE 0::NUMERIC(23,2) END) AS last_12_contracts,
+    SUM(CASE WHEN rpdo.award_category = 'grant' THEN rpdo.obligation ELSE 0::NUMERIC(23,2) END) AS last_12_grants,
+    SUM(CASE WHEN rpdo.award_category = 'direct payment' THEN rpdo.obligation ELSE 0::NUMERIC(23,2) END) AS last_12_direct_payments,
+    SUM(CASE WHEN rpdo.award_category = 'loans' THEN rpdo.obligation ELSE 0::NUMERIC(23,2) END) AS last_12_loans,
+    SUM(CASE WHEN rpdo.award_category = 'other' THEN rpdo.obligation ELSE 0::NUMERIC(23,2) END) AS last_12_other,
+    SUM(rpdo.obligation) AS last_12_months,
+    SUM(rpdo.transaction_count) AS last_12_months_count
+  FROM
+    temp_recipient_profile_touched AS t
+    INNER JOIN public.recipient_profile_daily_obligation AS rpdo ON
+      rpdo.recipient_hash = t.recipient_hash
+      AND rpdo.recipient_level = t.recipient_level
+  GROUP BY
+    rpdo.recipient_hash,
+    rpdo.recipient_level
+)
+SELECT
+  t.recipient_level,
+  rl.recipient_hash,
+  rl.duns AS recipient_unique_id,
+  rl.legal_business_name AS recipient_name,
+  COALESCE(
+    CASE t.recipient_level
+      WHEN 'P' THEN (
+        SELECT
+          array_agg(DISTINCT rpt.recipient_unique_id)
+        FROM
+          public.recipient_profile_transaction AS rpt
+        WHERE
+          rpt.parent_recipient_unique_id = rl.duns
+      )
+      WHEN 'C' THEN (
+        SELECT
+          array_agg(DISTINCT rpt.parent_recipient_unique_id)
+        FROM
+          public.recipient_profile_transaction AS rpt
+        WHERE
+          rpt.recipient_unique_id = rl.duns
+          AND rpt.parent_recipient_unique_id IS NOT NULL
+      )
+    END,
+    ARRAY[]::TEXT[]
+  ) AS recipient_affiliations,
+  COALESCE(o.award_types, ARRAY[]::TEXT[]) AS award_types,
+  COALESCE(o.last_12_months, 0.00) AS last_12_months,
+  COALESCE(o.last_12_contracts, 0.00) AS last_12_contracts,
+  COALESCE(o.last_12_grants, 0.00) AS last_12_grants,
+  COALESCE(o.last_12_direct_payments, 0.00) AS last_12_direct_payments,
+  COALESCE(o.last_12_loans, 0.00) AS last_12_loans,
+  COALESCE(o.last_12_other, 0.00) AS last_12_other,
+  COALESCE(o.last_12_months_count, 0) AS last_12_months_count
+FROM
+  temp_recipient_profile_touched AS t
+  INNER JOIN public.recipient_lookup AS rl ON rl.recipient_hash = t.recipient_hash
+  LEFT OUTER JOIN obligations AS o ON
+    o.recipient_hash = t.recipient_hash
+    AND o.recipient_level = t.recipient_level
+WHERE
+  -- Only keep profiles with transactions, as restock_recipient_profile.sql does
+  CASE t.recipient_level
+    WHEN 'P' THEN EXISTS (
+      SELECT FROM public.recipient_profile_transaction AS rpt WHERE rpt.parent_recipient_unique_id = rl.duns
+    )
+    ELSE EXISTS (
+      SELECT
+      FROM
+        public.recipient_profile_transaction AS rpt
+      WHERE
+        rpt.recipient_hash = t.recipient_hash
+        AND rpt.recipient_level = t.recipient_level
+    ) OR (
+      t.recipient_level = 'C'
+      AND EXISTS (
+        SELECT
+        FROM
+          public.recipient_profile_transaction AS rpt
+        WHERE
+          rpt.recipient_unique_id = rl.duns
+          AND rpt.parent_recipient_unique_id IS NOT NULL
+      )
+    )
+  END;
+
+DELETE FROM public.recipient_profile AS rp
+USING temp_recipient_profile_touched AS t
+WHERE
+  rp.recipient_hash = t.recipient_hash
+  AND rp.recipient_level = t.recipient_level;
+
+INSERT INTO public.recipient_profile (
+    recipient_level, recipient_hash, recipient_unique_id,
+    recipient_name, recipient_affiliations, award_types, last_12_months,
+    last_12_contracts, last_12_loans, last_12_grants, last_12_direct_payments, last_12_other,
+    last_12_months_count
+    )
+  SELECT recipient_level, recipient_hash, recipient_unique_id,
+    recipient_name, recipient_affiliations, award_types, last_12_months,
+    last_12_contracts, last_12_loans, last_12_grants, last_12_direct_payments, last_12_other,
+    last_12_months_count
+  FROM temp_recipient_profile;
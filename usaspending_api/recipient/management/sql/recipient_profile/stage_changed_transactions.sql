@@ -0,0 +1,15 @@
+-- Transactions written since the previous run plus those that have been deleted since it
+INSERT INTO temp_recipient_profile_changed_transactions (transaction_id)
+  SELECT
+    tn.id
+  FROM
+    public.transaction_normalized AS tn
+  WHERE
+    tn.update_date >= {changed_since}
+UNION
+  SELECT
+    rpt.transaction_id
+  FROM
+    public.recipient_profile_transaction AS rpt
+  WHERE
+    NOT EXISTS (SELECT FROM public.transaction_normalized AS tn WHERE tn.id = rpt.transaction_id);
@@ -0,0 +1,18 @@
+INSERT INTO temp_recipient_profile_touched (recipient_hash, recipient_level)
+  SELECT
+    rl.recipient_hash,
+    levels.recipient_level
+  FROM
+    public.recipient_lookup AS rl
+    CROSS JOIN (VALUES ('P'), ('C'), ('R')) AS levels (recipient_level)
+  WHERE
+    rl.recipient_hash IS NOT NULL
+UNION
+  SELECT
+    rp.recipient_hash,
+    rp.recipient_level
+  FROM
+    public.recipient_profile AS rp
+  WHERE
+    rp.recipient_hash IS NOT NULL
+ON CONFLICT DO NOTHING;
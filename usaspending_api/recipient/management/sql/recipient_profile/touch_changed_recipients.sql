@@ -0,0 +1,22 @@
+-- Every level of recipients whose recipient_lookup record changed since the previous run, plus profiles of
+-- recipients that have been removed from recipient_lookup
+INSERT INTO temp_recipient_profile_touched (recipient_hash, recipient_level)
+  SELECT
+    rl.recipient_hash,
+    levels.recipient_level
+  FROM
+    public.recipient_lookup AS rl
+    CROSS JOIN (VALUES ('P'), ('C'), ('R')) AS levels (recipient_level)
+  WHERE
+    rl.update_date >= {changed_since}
+    AND rl.recipient_hash IS NOT NULL
+UNION
+  SELECT
+    rp.recipient_hash,
+    rp.recipient_level
+  FROM
+    public.recipient_profile AS rp
+  WHERE
+    rp.recipient_hash IS NOT NULL
+    AND NOT EXISTS (SELECT FROM public.recipient_lookup AS rl WHERE rl.recipient_hash = rp.recipient_hash)
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,27 @@
+-- The profiles the changed transactions count towards now
+INSERT INTO temp_recipient_profile_touched (recipient_hash, recipient_level)
+  SELECT
+    rpt.recipient_hash,
+    rpt.recipient_level
+  FROM
+    temp_recipient_profile_changed_transactions AS ct
+    INNER JOIN public.recipient_profile_transaction AS rpt ON rpt.transaction_id = ct.transaction_id
+UNION
+  SELECT
+    rl.recipient_hash,
+    'P'
+  FROM
+    temp_recipient_profile_changed_transactions AS ct
+    INNER JOIN public.recipient_profile_transaction AS rpt ON rpt.transaction_id = ct.transaction_id
+    INNER JOIN public.recipient_lookup AS rl ON rl.duns = rpt.parent_recipient_unique_id
+UNION
+  SELECT
+    rl.recipient_hash,
+    'C'
+  FROM
+    temp_recipient_profile_changed_transactions AS ct
+    INNER JOIN public.recipient_profile_transaction AS rpt ON rpt.transaction_id = ct.transaction_id
+    INNER JOIN public.recipient_lookup AS rl ON rl.duns = rpt.recipient_unique_id
+  WHERE
+    rpt.parent_recipient_unique_id IS NOT NULL
+ON CONFLICT DO NOTHING;
@@ -327,6 +327,7 @@ DELETE FROM public.temporary_restock_recipient_profile WHERE unused = true;
 
 --------------------------------------------------------------------------------
 -- Step 10, Drop unnecessary relations and standup new table as final
+-- (verify_recipient_profile runs everything above this step)
 --------------------------------------------------------------------------------
 DO $$ BEGIN RAISE NOTICE 'Step 10: restocking destination table'; END $$;
 
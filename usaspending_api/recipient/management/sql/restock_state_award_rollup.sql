@@ -0,0 +1,100 @@
+--------------------------------------------------------------------------------
+-- Rebuild state_award_rollup from summary_state_view. The HyperLogLog registers
+-- must match usaspending_api/common/helpers/hyperloglog_helpers.py
+--
+-- Besides one row per fiscal year, each state and type gets a row with a NULL
+-- fiscal year for the trailing year ending today, as the "latest" year of the
+-- state endpoints (usaspending_api/recipient/v2/helpers.py reshape_filters).
+--------------------------------------------------------------------------------
+DROP TABLE IF EXISTS temp_state_periods;
+DROP TABLE IF EXISTS temp_state_awards;
+DROP TABLE IF EXISTS temp_state_award_registers;
+
+CREATE TEMPORARY TABLE temp_state_periods AS
+SELECT pop_state_code, fiscal_year, type, distinct_awards, generated_pragmatic_obligation
+FROM summary_state_view
+WHERE fiscal_year IS NOT NULL
+UNION ALL
+SELECT pop_state_code, NULL, type, distinct_awards, generated_pragmatic_obligation
+FROM summary_state_view
+WHERE action_date >= (CURRENT_DATE - INTERVAL '1 year')::DATE AND action_date <= CURRENT_DATE;
+
+CREATE TEMPORARY TABLE temp_state_awards AS
+SELECT
+  pop_state_code,
+  fiscal_year,
+  type,
+  ('x' || SUBSTR(MD5(award_id), 1, 8))::BIT(32)::INT AS award_hash
+FROM (
+  SELECT DISTINCT pop_state_code, fiscal_year, type, UNNEST(STRING_TO_ARRAY(distinct_awards, ',')) AS award_id
+  FROM temp_state_periods
+) AS awards;
+
+-- Low 10 bits pick the register; the rank is the position of the leading 1 in the remaining 22 bits (23 if none)
+CREATE TEMPORARY TABLE temp_state_award_registers AS
+SELECT
+  pop_state_code,
+  fiscal_year,
+  type,
+  (award_hash & 1023) + 1 AS register,
+  MAX(23 - LENGTH(LTRIM((award_hash >> 10)::BIT(22)::TEXT, '0'))) AS rank
+FROM temp_state_awards
+GROUP BY pop_state_code, fiscal_year, type, register;
+
+DELETE FROM state_award_rollup;
+
+INSERT INTO state_award_rollup (
+  pop_state_code, fiscal_year, window_end_date, type, total_obligation, award_count, award_sketch
+)
+WITH totals AS (
+  SELECT pop_state_code, fiscal_year, type, SUM(generated_pragmatic_obligation) AS total_obligation
+  FROM temp_state_periods
+  GROUP BY pop_state_code, fiscal_year, type
+),
+counts AS (
+  SELECT pop_state_code, fiscal_year, type, COUNT(*) AS award_count
+  FROM temp_state_awards
+  GROUP BY pop_state_code, fiscal_year, type
+),
+sketches AS (
+  SELECT
+    c.pop_state_code,
+    c.fiscal_year,
+    c.type,
+    ARRAY_AGG(COALESCE(r.rank, 0)::SMALLINT ORDER BY register.n) AS award_sketch
+  FROM counts AS c
+  CROSS JOIN GENERATE_SERIES(1, 1024) AS register(n)
+  LEFT OUTER JOIN temp_state_award_registers AS r ON (
+    r.pop_state_code = c.pop_state_code
+    AND r.fiscal_year IS NOT DISTINCT FROM c.fiscal_year
+    AND r.type IS NOT DISTINCT FROM c.type
+    AND r.register = register.n
+  )
+  GROUP BY c.pop_state_code, c.fiscal_year, c.type
+)
+SELECT
+  t.pop_state_code,
+  t.fiscal_year,
+  CASE WHEN t.fiscal_year IS NULL THEN CURRENT_DATE END,
+  t.type,
+  t.total_obligation,
+  COALESCE(s.award_count, 0),
+  COALESCE(s.award_sketch, ARRAY_FILL(0::SMALLINT, ARRAY[1024]))
+FROM totals AS t
+LEFT OUTER JOIN (
+  SELECT c.pop_state_code, c.fiscal_year, c.type, c.award_count, sk.award_sketch
+  FROM counts AS c
+  INNER JOIN sketches AS sk ON (
+    sk.pop_state_code = c.pop_state_code
+    AND sk.fiscal_year IS NOT DISTINCT FROM c.fiscal_year
+    AND sk.type IS NOT DISTINCT FROM c.type
+  )
+) AS s ON (
+  s.pop_state_code = t.pop_state_code
+  AND s.fiscal_year IS NOT DISTINCT FROM t.fiscal_year
+  AND s.type IS NOT DISTINCT FROM t.type
+);
+
+DROP TABLE temp_state_periods;
+DROP TABLE temp_state_awards;
+DROP TABLE temp_state_award_registers;
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipient', '0003_auto_20200312_1656'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='create index idx_recipient_profile_unique_id_trgm on recipient_profile using gin (recipient_unique_id gin_trgm_ops)',
+            reverse_sql='drop index if exists idx_recipient_profile_unique_id_trgm',
+        ),
+    ]
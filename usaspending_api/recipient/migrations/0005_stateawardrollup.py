@@ -0,0 +1,29 @@
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipient', '0004_recipient_profile_unique_id_trgm_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StateAwardRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pop_state_code', models.TextField()),
+                ('fiscal_year', models.IntegerField()),
+                ('type', models.TextField(null=True)),
+                ('total_obligation', models.DecimalField(decimal_places=2, max_digits=23)),
+                ('award_count', models.IntegerField()),
+                ('award_sketch', django.contrib.postgres.fields.ArrayField(base_field=models.SmallIntegerField(), size=None)),
+            ],
+            options={
+                'db_table': 'state_award_rollup',
+                'managed': True,
+                'index_together': {('pop_state_code', 'fiscal_year')},
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipient', '0005_stateawardrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipientProfileDailyObligation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient_hash', models.UUIDField()),
+                ('recipient_level', models.CharField(max_length=1)),
+                ('action_date', models.DateField(db_index=True)),
+                ('award_category', models.TextField(null=True)),
+                ('obligation', models.DecimalField(decimal_places=2, max_digits=23)),
+                ('transaction_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'recipient_profile_daily_obligation',
+                'managed': True,
+                'index_together': {('recipient_hash', 'recipient_level')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipientProfileTransaction',
+            fields=[
+                ('transaction_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('recipient_hash', models.UUIDField()),
+                ('recipient_unique_id', models.TextField(db_index=True, null=True)),
+                ('parent_recipient_unique_id', models.TextField(db_index=True, null=True)),
+                ('recipient_level', models.CharField(max_length=1)),
+                ('award_category', models.TextField(null=True)),
+                ('action_date', models.DateField()),
+                ('generated_pragmatic_obligation', models.DecimalField(decimal_places=2, max_digits=23)),
+            ],
+            options={
+                'db_table': 'recipient_profile_transaction',
+                'managed': True,
+                'index_together': {('recipient_hash', 'recipient_level')},
+            },
+        ),
+    ]
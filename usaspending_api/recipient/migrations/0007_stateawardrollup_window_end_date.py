@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipient', '0006_recipient_profile_delta'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stateawardrollup',
+            name='fiscal_year',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='stateawardrollup',
+            name='window_end_date',
+            field=models.DateField(null=True),
+        ),
+    ]
@@ -31,6 +31,28 @@ class StateData(models.Model):
         super().save(*args, **kwargs)
 
 
+class StateAwardRollup(models.Model):
+    """
+    Prime award totals per state, fiscal year and transaction type, rebuilt from summary_state_view by the
+    restock_state_award_rollup command. `award_count` is exact for its row; `award_sketch` holds the HyperLogLog
+    registers of the same awards so counts across fiscal years and types can be estimated without double counting.
+    Rows without a fiscal year cover the trailing year ("latest") ending on their `window_end_date` instead.
+    """
+
+    pop_state_code = models.TextField()
+    fiscal_year = models.IntegerField(null=True)
+    window_end_date = models.DateField(null=True)
+    type = models.TextField(null=True)
+    total_obligation = models.DecimalField(max_digits=23, decimal_places=2)
+    award_count = models.IntegerField()
+    award_sketch = ArrayField(base_field=models.SmallIntegerField())
+
+    class Meta:
+        managed = True
+        db_table = "state_award_rollup"
+        index_together = ("pop_state_code", "fiscal_year")
+
+
 class DUNS(models.Model):
     """
     Model representing DUNS data (imported from the broker)
@@ -95,16 +117,58 @@ class RecipientProfile(models.Model):
         managed = True
         db_table = "recipient_profile"
         unique_together = ("recipient_hash", "recipient_level")
-        # Note:  A custom index was added in the migration because there's
+        # Note:  Custom indexes were added in the migrations because there's
         # currently not a Django native means by which to add a GinIndex with
         # a specific Postgres operator class:
         #
         #     create index idx_recipient_profile_name on
         #         public.recipient_profile using gin (recipient_name public.gin_trgm_ops)
+        #     create index idx_recipient_profile_unique_id_trgm on
+        #         public.recipient_profile using gin (recipient_unique_id public.gin_trgm_ops)
         #
         indexes = [GinIndex(fields=["award_types"]), models.Index(fields=["recipient_unique_id"])]
 
 
+class RecipientProfileTransaction(models.Model):
+    """
+    The recipient attributes of every transaction recipient_profile is built from, kept by the update_recipient_profile
+    command so a delta run knows which recipients a changed or deleted transaction used to count towards.
+    """
+
+    transaction_id = models.BigIntegerField(primary_key=True)
+    recipient_hash = models.UUIDField()
+    recipient_unique_id = models.TextField(null=True, db_index=True)
+    parent_recipient_unique_id = models.TextField(null=True, db_index=True)
+    recipient_level = models.CharField(max_length=1)
+    award_category = models.TextField(null=True)
+    action_date = models.DateField()
+    generated_pragmatic_obligation = models.DecimalField(max_digits=23, decimal_places=2)
+
+    class Meta:
+        managed = True
+        db_table = "recipient_profile_transaction"
+        index_together = ("recipient_hash", "recipient_level")
+
+
+class RecipientProfileDailyObligation(models.Model):
+    """
+    Obligations per recipient profile, action date and award category for the 12 months the last_12_* columns of
+    recipient_profile cover.  Days that fall out of that window are subtracted from the profiles and dropped.
+    """
+
+    recipient_hash = models.UUIDField()
+    recipient_level = models.CharField(max_length=1)
+    action_date = models.DateField(db_index=True)
+    award_category = models.TextField(null=True)
+    obligation = models.DecimalField(max_digits=23, decimal_places=2)
+    transaction_count = models.IntegerField()
+
+    class Meta:
+        managed = True
+        db_table = "recipient_profile_daily_obligation"
+        index_together = ("recipient_hash", "recipient_level")
+
+
 class RecipientLookup(models.Model):
     recipient_hash = models.UUIDField(unique=True, null=True)
     legal_business_name = models.TextField(null=True, db_index=True)
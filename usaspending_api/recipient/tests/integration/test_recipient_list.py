@@ -1,5 +1,7 @@
 # Stdlib imports
+import base64
 import datetime
+import json
 import pytest
 
 # Core Django imports
@@ -193,3 +195,86 @@ def test_award_type_filter():
     assert results[0]["recipient_level"] == "C"
     assert float(results[0]["amount"]) == float(99.99)
     assert results[0]["id"] == "5770e860-0f7b-69f1-182f-4d6966ebaa62-C"
+
+
+@pytest.mark.django_db
+def test_cursor_pagination():
+    amounts = [500.00, 300.00, 300.00, 100.00, 300.00]
+    for i, amount in enumerate(amounts):
+        mommy.make(
+            RecipientProfile,
+            recipient_level="R",
+            recipient_hash=f"00000000-0000-0000-0000-00000000000{i}",
+            recipient_unique_id=f"00000000{i}",
+            recipient_name=f"RECIPIENT {i}",
+            last_12_months=amount,
+        )
+
+    filters = {"limit": 2, "page": 1, "order": "desc", "sort": "amount", "award_type": "all"}
+    offset_pages = [get_recipients(filters=dict(filters, page=page))[0] for page in (1, 2, 3)]
+
+    cursor_pages = []
+    cursor = None
+    for page in (1, 2, 3):
+        results, meta = get_recipients(filters=dict(filters, page=page, cursor=cursor))
+        cursor_pages.append(results)
+        cursor = meta["next_cursor"]
+
+    assert cursor_pages == offset_pages
+    assert [r["duns"] for page in cursor_pages for r in page] == [
+        "000000000",
+        "000000001",
+        "000000002",
+        "000000004",
+        "000000003",
+    ]
+    assert cursor is None
+    assert meta["total"] == 5
+
+
+@pytest.mark.django_db
+def test_cursor_must_match_sort(client):
+    mommy.make(RecipientProfile, recipient_level="R", recipient_hash="00077a9a-5a70-8919-fd19-330762af6b84")
+    mommy.make(RecipientProfile, recipient_level="R", recipient_hash="c8f79139-38b2-3063-b039-d48172abc710")
+
+    resp = client.post(list_recipients_endpoint(), {"limit": 1, "sort": "amount"}, content_type="application/json")
+    cursor = resp.data["page_metadata"]["next_cursor"]
+    assert cursor is not None
+
+    payload = {"limit": 1, "sort": "name", "cursor": cursor}
+    resp = client.post(list_recipients_endpoint(), payload, content_type="application/json")
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_malformed_cursor(client):
+    mommy.make(RecipientProfile, recipient_level="R", recipient_hash="00077a9a-5a70-8919-fd19-330762af6b84")
+
+    def encode(cursor):
+        return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+    valid = {
+        "sort": "amount",
+        "order": "desc",
+        "value": "10.00",
+        "hash": "00077a9a-5a70-8919-fd19-330762af6b84",
+        "level": "R",
+    }
+    payload = {"limit": 1, "sort": "amount", "order": "desc", "cursor": encode(valid)}
+    resp = client.post(list_recipients_endpoint(), payload, content_type="application/json")
+    assert resp.status_code == status.HTTP_200_OK
+
+    tampered = [
+        encode({"sort": "amount", "order": "desc"}),
+        encode(["amount"]),
+        encode({**valid, "value": "ten"}),
+        encode({**valid, "value": "NaN"}),
+        encode({**valid, "value": 10}),
+        encode({**valid, "hash": "not-a-hash"}),
+        encode({**valid, "hash": None}),
+        encode({**valid, "level": ["R"]}),
+    ]
+    for cursor in ["not a cursor"] + tampered:
+        payload = {"limit": 1, "sort": "amount", "order": "desc", "cursor": cursor}
+        resp = client.post(list_recipients_endpoint(), payload, content_type="application/json")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
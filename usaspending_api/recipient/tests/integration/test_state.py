@@ -5,12 +5,16 @@ import decimal
 # Core Django imports
 
 # Third-party app imports
+from django.core.management import call_command
 from rest_framework import status
 from model_mommy import mommy
 import pytest
 
 # Imports from your apps
+from usaspending_api.awards.models import TransactionNormalized
 from usaspending_api.common.helpers.fiscal_year_helpers import generate_fiscal_year
+from usaspending_api.common.helpers.hyperloglog_helpers import build_sketch
+from usaspending_api.recipient.models import StateAwardRollup
 from usaspending_api.recipient.v2.views.states import obtain_state_totals
 
 # Getting relative dates as the 'latest'/default argument returns results relative to when it gets called
@@ -164,6 +168,7 @@ def state_data(db):
         median_household_income=10000,
         mhi_source="Census 2010 MHI",
     )
+    call_command("restock_state_award_rollup")
 
 
 @pytest.fixture
@@ -198,6 +203,7 @@ def state_view_data(db, monkeypatch):
 
     mommy.make("awards.TransactionFPDS", transaction=trans_old)
     mommy.make("awards.TransactionFPDS", transaction=trans_cur)
+    call_command("restock_state_award_rollup")
 
 
 @pytest.fixture()
@@ -338,6 +344,37 @@ def test_obtain_state_totals(state_view_data):
     assert result == expected
 
 
+@pytest.mark.django_db
+def test_state_award_rollup(state_view_data):
+    rows = StateAwardRollup.objects.filter(pop_state_code="AB", fiscal_year__isnull=False).order_by("fiscal_year")
+    award_ids = TransactionNormalized.objects.order_by("fiscal_year").values_list("award_id", flat=True)
+
+    assert [(row.type, row.total_obligation, row.award_count) for row in rows] == [("A", 10, 1), ("B", 15, 1)]
+    # The registers built in SQL match the ones built in Python for the same awards
+    assert [row.award_sketch for row in rows] == [build_sketch([award_id]) for award_id in award_ids]
+
+    # Only the current transaction is in the trailing year
+    latest = StateAwardRollup.objects.get(pop_state_code="AB", fiscal_year__isnull=True)
+    assert (latest.type, latest.total_obligation, latest.award_count) == ("B", 15, 1)
+    assert latest.window_end_date == TODAY.date()
+
+
+@pytest.mark.django_db
+def test_obtain_state_totals_latest(state_view_data):
+    expected = {"pop_state_code": "AB", "total": 15, "count": 1}
+    assert obtain_state_totals("01", "latest") == expected
+
+    # Read from the rollup while its trailing year is current
+    StateAwardRollup.objects.filter(fiscal_year__isnull=True).update(award_count=7)
+    assert obtain_state_totals("01", "latest")["count"] == 7
+
+    # Counted from summary_state_view once it is out of date
+    StateAwardRollup.objects.filter(fiscal_year__isnull=True).update(
+        window_end_date=TODAY.date() - datetime.timedelta(days=3)
+    )
+    assert obtain_state_totals("01", "latest") == expected
+
+
 @pytest.mark.django_db
 def test_obtain_state_totals_none(state_view_data, monkeypatch):
     monkeypatch.setattr("usaspending_api.recipient.v2.views.states.VALID_FIPS", {"02": {"code": "No State"}})
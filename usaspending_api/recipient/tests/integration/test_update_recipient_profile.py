@@ -0,0 +1,153 @@
+import hashlib
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from django.core.management import call_command
+from model_mommy import mommy
+from uuid import UUID
+
+from usaspending_api.awards.models import TransactionFABS, TransactionNormalized
+from usaspending_api.recipient.models import (
+    RecipientLookup,
+    RecipientProfile,
+    RecipientProfileDailyObligation,
+    RecipientProfileTransaction,
+)
+
+
+LONG_AGO = datetime(2015, 1, 1, tzinfo=timezone.utc)
+RECENTLY = datetime.now(timezone.utc).date() - timedelta(days=30)
+TWO_YEARS_AGO = datetime.now(timezone.utc).date() - timedelta(days=730)
+
+
+def recipient_hash(value):
+    return UUID(hashlib.md5(value.upper().encode("utf-8")).hexdigest())
+
+
+PARENT_HASH = recipient_hash("duns-000000001")
+CHILD_HASH = recipient_hash("duns-000000002")
+OTHER_HASH = recipient_hash("duns-000000003")
+NAMED_HASH = recipient_hash("name-Named Recipient")
+
+
+def make_transaction(transaction_id, type, action_date, obligation, is_fpds=True, **recipient):
+    mommy.make("awards.Award", id=transaction_id, latest_transaction_id=transaction_id)
+    mommy.make(
+        "awards.TransactionNormalized",
+        id=transaction_id,
+        award_id=transaction_id,
+        type=type,
+        action_date=action_date,
+        federal_action_obligation=obligation if type not in ("07", "08") else None,
+        original_loan_subsidy_cost=obligation if type in ("07", "08") else None,
+        is_fpds=is_fpds,
+    )
+    mommy.make(
+        "awards.TransactionFPDS" if is_fpds else "awards.TransactionFABS", transaction_id=transaction_id, **recipient
+    )
+
+
+def profiles():
+    return {
+        (p["recipient_hash"], p["recipient_level"]): p
+        for p in RecipientProfile.objects.values(
+            "recipient_hash",
+            "recipient_level",
+            "recipient_name",
+            "recipient_affiliations",
+            "award_types",
+            "last_12_months",
+            "last_12_contracts",
+            "last_12_grants",
+            "last_12_direct_payments",
+            "last_12_loans",
+            "last_12_months_count",
+        )
+    }
+
+
+@pytest.fixture
+def recipient_data():
+    mommy.make("recipient.RecipientLookup", recipient_hash=PARENT_HASH, duns="000000001", legal_business_name="PARENT")
+    mommy.make(
+        "recipient.RecipientLookup",
+        recipient_hash=CHILD_HASH,
+        duns="000000002",
+        legal_business_name="CHILD",
+        parent_duns="000000001",
+    )
+    mommy.make("recipient.RecipientLookup", recipient_hash=OTHER_HASH, duns="000000003", legal_business_name="OTHER")
+    mommy.make("recipient.RecipientLookup", recipient_hash=NAMED_HASH, legal_business_name="Named Recipient")
+
+    child = {"awardee_or_recipient_uniqu": "000000002", "ultimate_parent_unique_ide": "000000001"}
+    make_transaction(1, "A", RECENTLY, 100, **child)
+    make_transaction(2, "02", RECENTLY, 50, is_fpds=False, **child)
+    make_transaction(3, "A", LONG_AGO.date(), 1000, **child)
+    make_transaction(4, "07", RECENTLY, 10, is_fpds=False, awardee_or_recipient_legal="Named Recipient")
+    make_transaction(5, "06", RECENTLY, 5, is_fpds=False, awardee_or_recipient_uniqu="000000003")
+    make_transaction(6, "06", RECENTLY - timedelta(days=1), 7, is_fpds=False, awardee_or_recipient_uniqu="000000003")
+
+    # Nothing has changed since the first run unless a test says so
+    TransactionNormalized.objects.update(update_date=LONG_AGO)
+    RecipientLookup.objects.update(update_date=LONG_AGO)
+
+
+@pytest.mark.django_db
+def test_full_build(recipient_data):
+    call_command("update_recipient_profile")
+
+    p = profiles()
+    assert set(p) == {(PARENT_HASH, "P"), (CHILD_HASH, "C"), (OTHER_HASH, "R"), (NAMED_HASH, "R")}
+
+    assert p[(CHILD_HASH, "C")]["recipient_affiliations"] == ["000000001"]
+    assert sorted(p[(CHILD_HASH, "C")]["award_types"]) == ["contract", "grant"]
+    assert p[(CHILD_HASH, "C")]["last_12_months"] == 150
+    assert p[(CHILD_HASH, "C")]["last_12_contracts"] == 100
+    assert p[(CHILD_HASH, "C")]["last_12_grants"] == 50
+    assert p[(CHILD_HASH, "C")]["last_12_months_count"] == 2
+
+    assert p[(PARENT_HASH, "P")]["recipient_affiliations"] == ["000000002"]
+    assert p[(PARENT_HASH, "P")]["last_12_months"] == 150
+    assert p[(PARENT_HASH, "P")]["last_12_months_count"] == 2
+
+    assert p[(NAMED_HASH, "R")]["award_types"] == ["loans"]
+    assert p[(NAMED_HASH, "R")]["last_12_loans"] == 10
+
+    assert RecipientProfileTransaction.objects.count() == 6
+    call_command("verify_recipient_profile")
+
+
+@pytest.mark.django_db
+def test_delta_update(recipient_data):
+    call_command("update_recipient_profile")
+
+    now = datetime.now(timezone.utc)
+    TransactionNormalized.objects.filter(id=2).update(federal_action_obligation=70, update_date=now)
+    TransactionFABS.objects.filter(transaction_id=4).delete()
+    TransactionNormalized.objects.filter(id=4).delete()
+    RecipientLookup.objects.filter(recipient_hash=CHILD_HASH).update(legal_business_name="CHILD 2", update_date=now)
+
+    # Let a year pass for transaction 5, which is otherwise unchanged
+    TransactionNormalized.objects.filter(id=5).update(action_date=TWO_YEARS_AGO)
+    RecipientProfileTransaction.objects.filter(transaction_id=5).update(action_date=TWO_YEARS_AGO)
+    RecipientProfileDailyObligation.objects.filter(recipient_hash=OTHER_HASH, obligation=5).update(
+        action_date=TWO_YEARS_AGO
+    )
+
+    call_command("update_recipient_profile")
+
+    p = profiles()
+    assert set(p) == {(PARENT_HASH, "P"), (CHILD_HASH, "C"), (OTHER_HASH, "R")}
+
+    assert p[(CHILD_HASH, "C")]["recipient_name"] == "CHILD 2"
+    assert p[(CHILD_HASH, "C")]["last_12_months"] == 170
+    assert p[(CHILD_HASH, "C")]["last_12_grants"] == 70
+    assert p[(PARENT_HASH, "P")]["last_12_months"] == 170
+
+    assert p[(OTHER_HASH, "R")]["award_types"] == ["direct payment"]
+    assert p[(OTHER_HASH, "R")]["last_12_direct_payments"] == 7
+    assert p[(OTHER_HASH, "R")]["last_12_months_count"] == 1
+    assert not RecipientProfileDailyObligation.objects.filter(action_date=TWO_YEARS_AGO).exists()
+
+    assert RecipientProfileTransaction.objects.count() == 5
+    call_command("verify_recipient_profile")
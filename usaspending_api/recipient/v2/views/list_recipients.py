@@ -1,12 +1,20 @@
-import logging
+import base64
 import copy
+import hashlib
+import json
+import logging
+import uuid
 
+from decimal import Decimal, InvalidOperation
+from django.core.cache import caches
+from django.db.models import F, Q
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import F, Q
 
 from usaspending_api.common.cache_decorator import cache_response
+from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.generic_helper import get_pagination_metadata
+from usaspending_api.common.request_instrumentation import record_cache_lookups
 from usaspending_api.common.validator.pagination import PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.common.validator.utils import update_model_in_list
@@ -26,12 +34,16 @@ AWARD_TYPES = {
 }
 
 
+RECIPIENT_COUNT_CACHE_TIMEOUT = 60 * 60
+
+
 def get_recipients(filters={}):
     lower_limit = (filters["page"] - 1) * filters["limit"]
     upper_limit = filters["page"] * filters["limit"]
 
     qs_filter = Q()
     if "keyword" in filters:
+        # Both columns have trigram indexes, which Postgres uses for these `LIKE '%...%'` lookups
         qs_filter |= Q(recipient_name__contains=filters["keyword"].upper())
         qs_filter |= Q(recipient_unique_id__contains=filters["keyword"])
 
@@ -47,14 +59,31 @@ def get_recipients(filters={}):
     )
 
     api_to_db_mapper = {"amount": amount_column, "duns": "recipient_unique_id", "name": "recipient_name"}
+    sort_column = api_to_db_mapper[filters["sort"]]
+
+    count = get_recipient_count(queryset, filters)
 
+    # The recipient hash and level are unique together, making the order (and so the cursor position) deterministic
     if filters["order"] == "desc":
-        queryset = queryset.order_by(F(api_to_db_mapper[filters["sort"]]).desc(nulls_last=True))
+        queryset = queryset.order_by(F(sort_column).desc(nulls_last=True), "recipient_hash", "recipient_level")
     else:
-        queryset = queryset.order_by(F(api_to_db_mapper[filters["sort"]]).asc(nulls_last=True))
+        queryset = queryset.order_by(F(sort_column).asc(nulls_last=True), "recipient_hash", "recipient_level")
+
+    if filters.get("cursor"):
+        cursor = decode_cursor(filters["cursor"], filters, sort_column)
+        queryset = queryset.filter(cursor_filter(sort_column, filters["order"], cursor))
+        rows = list(queryset[: filters["limit"] + 1])
+        page_metadata = get_pagination_metadata(count, filters["limit"], filters["page"])
+        page_metadata["hasNext"] = len(rows) > filters["limit"]
+        page_metadata["next"] = filters["page"] + 1 if page_metadata["hasNext"] else None
+        rows = rows[: filters["limit"]]
+    else:
+        rows = list(queryset[lower_limit:upper_limit])
+        page_metadata = get_pagination_metadata(count, filters["limit"], filters["page"])
 
-    count = queryset.count()
-    page_metadata = get_pagination_metadata(count, filters["limit"], filters["page"])
+    page_metadata["next_cursor"] = None
+    if page_metadata["hasNext"] and rows:
+        page_metadata["next_cursor"] = encode_cursor(rows[-1], sort_column, filters)
 
     results = [
         {
@@ -64,12 +93,88 @@ def get_recipients(filters={}):
             "recipient_level": row["recipient_level"],
             "amount": row[amount_column],
         }
-        for row in queryset[lower_limit:upper_limit]
+        for row in rows
     ]
 
     return results, page_metadata
 
 
+def get_recipient_count(queryset, filters):
+    """
+    Counting a broad keyword scans much of the table, and the count only changes when the recipient profiles are
+    rebuilt, so it is cached per (keyword, award_type) unless an exact count is requested.
+    """
+    if filters.get("exact_count"):
+        return queryset.count()
+
+    cache = caches["usaspending-cache"]
+    key_source = json.dumps([filters.get("keyword"), filters["award_type"]])
+    cache_key = f"recipient_list_count:{hashlib.md5(key_source.encode()).hexdigest()}"
+    count = cache.get(cache_key)
+    record_cache_lookups(hits=int(count is not None), misses=int(count is None))
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, RECIPIENT_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def encode_cursor(row, sort_column, filters):
+    value = row[sort_column]
+    cursor = {
+        "sort": filters["sort"],
+        "order": filters["order"],
+        "value": str(value) if value is not None else None,
+        "hash": str(row["recipient_hash"]),
+        "level": row["recipient_level"],
+    }
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+
+def decode_cursor(encoded_cursor, filters, sort_column):
+    """The cursor's values, checked and converted for cursor_filter; anything a client altered is rejected"""
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(encoded_cursor.encode()))
+    except Exception:
+        raise InvalidParameterException("Invalid value for 'cursor'")
+    if not isinstance(cursor, dict) or not {"sort", "order", "value", "hash", "level"} <= set(cursor):
+        raise InvalidParameterException("Invalid value for 'cursor'")
+    if cursor["sort"] != filters["sort"] or cursor["order"] != filters["order"]:
+        raise InvalidParameterException("'cursor' was created with a different 'sort' or 'order'")
+
+    value = cursor["value"]
+    if not isinstance(cursor["hash"], str) or not isinstance(cursor["level"], str):
+        raise InvalidParameterException("Invalid value for 'cursor'")
+    if value is not None and not isinstance(value, str):
+        raise InvalidParameterException("Invalid value for 'cursor'")
+    try:
+        cursor["hash"] = str(uuid.UUID(cursor["hash"]))
+        if value is not None and sort_column.startswith("last_12"):
+            value = Decimal(value)
+            if not value.is_finite():
+                raise InvalidOperation
+    except (ValueError, InvalidOperation):
+        raise InvalidParameterException("Invalid value for 'cursor'")
+    cursor["value"] = value
+    return cursor
+
+
+def cursor_filter(sort_column, order, cursor):
+    """Rows after the cursor in `<sort_column> NULLS LAST, recipient_hash, recipient_level` order"""
+    after_tie = Q(recipient_hash__gt=cursor["hash"])
+    after_tie |= Q(recipient_hash=cursor["hash"], recipient_level__gt=cursor["level"])
+
+    if cursor["value"] is None:
+        return Q(**{f"{sort_column}__isnull": True}) & after_tie
+
+    value = cursor["value"]
+    direction = "lt" if order == "desc" else "gt"
+    return (
+        Q(**{f"{sort_column}__{direction}": value})
+        | Q(**{f"{sort_column}__isnull": True})
+        | (Q(**{sort_column: value}) & after_tie)
+    )
+
+
 class ListRecipients(APIView):
     """
     This route takes a single keyword filter (and pagination filters), and returns a list of recipients
@@ -83,6 +188,8 @@ class ListRecipients(APIView):
         models = [
             {"name": "keyword", "key": "keyword", "type": "text", "text_type": "search"},
             {"name": "award_type", "key": "award_type", "type": "enum", "enum_values": award_types, "default": "all"},
+            {"name": "cursor", "key": "cursor", "type": "text", "text_type": "search"},
+            {"name": "exact_count", "key": "exact_count", "type": "boolean", "default": False},
         ]
         models.extend(copy.deepcopy(PAGINATION))  # page, limit, sort, order
 
@@ -2,10 +2,10 @@ import logging
 
 from collections import OrderedDict
 from copy import deepcopy
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from django.contrib.postgres.aggregates import StringAgg
-from django.db.models import Sum
+from django.db import connection
+from django.db.models import Max, Sum
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -15,7 +15,8 @@ from usaspending_api.awards.v2.lookups.lookups import all_award_types_mappings
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.fiscal_year_helpers import generate_fiscal_year
-from usaspending_api.recipient.models import StateData
+from usaspending_api.common.helpers.hyperloglog_helpers import estimate_cardinality
+from usaspending_api.recipient.models import StateAwardRollup, StateData
 from usaspending_api.recipient.v2.helpers import validate_year, reshape_filters
 
 logger = logging.getLogger(__name__)
@@ -46,52 +47,115 @@ def validate_fips(fips):
     return fips
 
 
-def obtain_state_totals(fips, year=None, award_type_codes=None, subawards=False):
-    filters = reshape_filters(state_code=VALID_FIPS[fips]["code"], year=year, award_type_codes=award_type_codes)
-
-    if not subawards:
-        queryset = (
-            matview_search_filter(filters, SummaryStateView)
-            .values("pop_state_code")
-            .annotate(total=Sum("generated_pragmatic_obligation"), distinct_awards=StringAgg("distinct_awards", ","))
-            .values("distinct_awards", "pop_state_code", "total")
+# The trailing year ("latest") rows of state_award_rollup are rebuilt with summary_state_view, normally every night.
+# Rows older than this are ignored and the trailing year is counted from summary_state_view instead.
+LATEST_ROLLUP_MAX_AGE = timedelta(days=1)
+
+LATEST_STATE_AGGREGATES_SQL = """
+SELECT totals.pop_state_code, totals.total, counts.count
+FROM (
+    SELECT pop_state_code, SUM(generated_pragmatic_obligation) AS total
+    FROM ({filtered_sql}) AS filtered
+    GROUP BY pop_state_code
+) AS totals
+INNER JOIN (
+    SELECT filtered.pop_state_code, COUNT(DISTINCT award_id) AS count
+    FROM ({filtered_sql}) AS filtered, UNNEST(STRING_TO_ARRAY(filtered.distinct_awards, ',')) AS award_id
+    GROUP BY filtered.pop_state_code
+) AS counts ON counts.pop_state_code = totals.pop_state_code
+"""
+
+MERGED_SKETCHES_SQL = """
+SELECT merged.pop_state_code, ARRAY_AGG(merged.register ORDER BY merged.n) AS sketch
+FROM (
+    SELECT filtered.pop_state_code, sketch.n, MAX(sketch.register) AS register
+    FROM ({filtered_sql}) AS filtered, UNNEST(filtered.award_sketch) WITH ORDINALITY AS sketch(register, n)
+    GROUP BY filtered.pop_state_code, sketch.n
+) AS merged
+GROUP BY merged.pop_state_code
+"""
+
+
+def get_state_aggregates(year=None, award_type_codes=None, state_code=None):
+    """
+    Return the obligation total and distinct award count of each state, read from the state_award_rollup table. The
+    trailing year ("latest") has rows of its own, rebuilt with summary_state_view; if they are missing or out of
+    date it is counted from summary_state_view in the database instead.
+    """
+    queryset = StateAwardRollup.objects.all()
+    if state_code:
+        queryset = queryset.filter(pop_state_code=state_code)
+    if award_type_codes:
+        queryset = queryset.filter(type__in=award_type_codes)
+
+    if year == "latest":
+        window_end_date = StateAwardRollup.objects.aggregate(window_end_date=Max("window_end_date"))["window_end_date"]
+        if window_end_date is None or window_end_date < (datetime.now() - LATEST_ROLLUP_MAX_AGE).date():
+            logger.warning("No current trailing year rows in state_award_rollup, counting from summary_state_view")
+            return _get_latest_state_aggregates(award_type_codes, state_code)
+        year_rows = queryset.filter(fiscal_year__isnull=True)
+    elif year and year.isdigit():
+        year_rows = queryset.filter(fiscal_year=int(year))
+    else:
+        year_rows = None
+
+    if year_rows is not None:
+        # Counts of a single year are exact. Each transaction type has its own row, so an award is counted once per
+        # type it was obligated under; in practice all transactions of an award share its type.
+        return list(
+            year_rows.values("pop_state_code").annotate(total=Sum("total_obligation"), count=Sum("award_count"))
         )
 
-    try:
-        row = list(queryset)[0]
-        result = {
+    queryset = queryset.filter(fiscal_year__isnull=False)
+    totals = queryset.values("pop_state_code").annotate(total=Sum("total_obligation"))
+    sketches = {
+        row["pop_state_code"]: row["sketch"]
+        for row in _fetch_rows(MERGED_SKETCHES_SQL, queryset.values("pop_state_code", "award_sketch"))
+    }
+    return [
+        {
             "pop_state_code": row["pop_state_code"],
             "total": row["total"],
-            "count": len(set(row["distinct_awards"].split(","))),
+            "count": estimate_cardinality(sketches[row["pop_state_code"]]),
         }
-        return result
-    except IndexError:
-        # would prefer to catch an index error gracefully if the SQL query produces 0 rows
-        logger.warning("No results found for FIPS {} with filters: {}".format(fips, filters))
-    return {"count": 0, "pop_state_code": None, "total": 0}
+        for row in totals
+    ]
 
 
-def get_all_states(year=None, award_type_codes=None, subawards=False):
-    filters = reshape_filters(year=year, award_type_codes=award_type_codes)
+def _get_latest_state_aggregates(award_type_codes=None, state_code=None):
+    filters = reshape_filters(state_code=state_code, year="latest", award_type_codes=award_type_codes)
+    queryset = (
+        matview_search_filter(filters, SummaryStateView)
+        .filter(pop_state_code__isnull=False, pop_country_code="USA")
+        .values("pop_state_code", "generated_pragmatic_obligation", "distinct_awards")
+    )
+    return _fetch_rows(LATEST_STATE_AGGREGATES_SQL, queryset)
+
+
+def _fetch_rows(sql_template, queryset):
+    filtered_sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql_template.format(filtered_sql=filtered_sql), params * sql_template.count("{filtered_sql}"))
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def obtain_state_totals(fips, year=None, award_type_codes=None, subawards=False):
+    state_code = VALID_FIPS[fips]["code"]
 
     if not subawards:
-        # calculate award total filtered by state
-        queryset = (
-            matview_search_filter(filters, SummaryStateView)
-            .filter(pop_state_code__isnull=False, pop_country_code="USA")
-            .values("pop_state_code")
-            .annotate(total=Sum("generated_pragmatic_obligation"), distinct_awards=StringAgg("distinct_awards", ","))
-            .values("pop_state_code", "total", "distinct_awards")
-        )
+        rows = get_state_aggregates(year=year, award_type_codes=award_type_codes, state_code=state_code)
+
+    if rows:
+        return {"pop_state_code": rows[0]["pop_state_code"], "total": rows[0]["total"], "count": rows[0]["count"]}
 
-        results = [
-            {
-                "pop_state_code": row["pop_state_code"],
-                "total": row["total"],
-                "count": len(set(row["distinct_awards"].split(","))),
-            }
-            for row in list(queryset)
-        ]
+    logger.warning("No results found for FIPS {} with year {} and types {}".format(fips, year, award_type_codes))
+    return {"count": 0, "pop_state_code": None, "total": 0}
+
+
+def get_all_states(year=None, award_type_codes=None, subawards=False):
+    if not subawards:
+        results = get_state_aggregates(year=year, award_type_codes=award_type_codes)
     return results
 
 
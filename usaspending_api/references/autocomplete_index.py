@@ -0,0 +1,132 @@
+import re
+
+from django.db.models import Count, Max, QuerySet
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set
+
+# Words are runs of letters and digits; everything else separates them
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+class PrefixTrie:
+    """Maps every prefix of the words added to it to the entries those words were added for"""
+
+    ENTRIES = None  # Node key of the entries below a node; never collides with a (one character) child key
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, word: str, entry: int) -> None:
+        node = self._root
+        for character in word:
+            node = node.setdefault(character, {})
+            node.setdefault(self.ENTRIES, set()).add(entry)
+
+    def entries_with_prefix(self, prefix: str) -> Set[int]:
+        node = self._root
+        for character in prefix:
+            node = node.get(character)
+            if node is None:
+                return set()
+        return node.get(self.ENTRIES, set())
+
+
+class _IndexState(NamedTuple):
+    version: tuple
+    rows: List[dict]
+    searchable: List[Dict[str, str]]
+    tries: Dict[str, PrefixTrie]
+
+
+def match_rank(value: str, text: str) -> Optional[int]:
+    """
+    How well text (both upper case) matches value: 0 for the whole value, 1 for its start, 2 for the start of a word
+    within it, 3 for anywhere else and None when value doesn't contain text at all (so not an icontains match).
+    """
+    position = value.find(text)
+    if position < 0:
+        return None
+    if position == 0:
+        return 0 if len(value) == len(text) else 1
+    while position >= 0:
+        if not value[position - 1].isalnum():
+            return 2
+        position = value.find(text, position + 1)
+    return 3
+
+
+class AutocompleteIndex:
+    """
+    In-process autocomplete over a small reference table.  The rows of queryset are loaded on first use with a prefix
+    trie of the words in each searchable field, and loaded again whenever the table's row count or latest
+    update_date changes, so every request costs one aggregate query rather than a scan with a leading-wildcard LIKE.
+
+    search() returns the same rows an icontains filter on the fields would, best matches first: whole values, then
+    values starting with the text, then words starting with it, then everything else, shorter values first.  Only
+    that last group needs a pass over every row, and only when the others don't fill the limit.
+    """
+
+    def __init__(self, queryset: QuerySet, values: Sequence[str], searchable_fields: Sequence[str]):
+        self.queryset = queryset
+        self.values = list(values)
+        self.searchable_fields = list(searchable_fields)
+        self._state = None
+        self._lock = Lock()
+
+    def search(self, search_text: str, fields: Sequence[str], limit: int) -> List[dict]:
+        state = self._current_state()
+        text = search_text.upper()
+        words = WORD_PATTERN.findall(text)
+
+        # Only rows with a word starting with the text's first word can match at the start of a word or value
+        if words and text.startswith(words[0]):
+            candidates = set.union(set(), *(state.tries[field].entries_with_prefix(words[0]) for field in fields))
+        else:
+            candidates = set(range(len(state.rows)))
+
+        ranked = self._rank(state, candidates, text, fields, max_rank=2)
+        if len(ranked) < limit:
+            others = set(range(len(state.rows))).difference(entry for _, entry in ranked)
+            ranked.extend(self._rank(state, others, text, fields, max_rank=3))
+
+        ranked.sort()
+        return [state.rows[entry] for _, entry in ranked[:limit]]
+
+    @staticmethod
+    def _rank(state: _IndexState, entries: Set[int], text: str, fields: Sequence[str], max_rank: int) -> list:
+        ranked = []
+        for entry in entries:
+            best = None
+            for field_order, field in enumerate(fields):
+                value = state.searchable[entry][field]
+                rank = match_rank(value, text)
+                if rank is not None and rank <= max_rank:
+                    key = (rank, field_order, len(value), value)
+                    best = key if best is None else min(best, key)
+            if best is not None:
+                ranked.append((best, entry))
+        return ranked
+
+    def _version(self) -> tuple:
+        version = self.queryset.aggregate(row_count=Count("*"), latest_update=Max("update_date"))
+        return version["row_count"], version["latest_update"]
+
+    def _current_state(self) -> _IndexState:
+        version = self._version()
+        state = self._state
+        if state is None or state.version != version:
+            with self._lock:
+                state = self._state
+                if state is None or state.version != version:
+                    state = self._state = self._load(version)
+        return state
+
+    def _load(self, version: tuple) -> _IndexState:
+        rows = list(self.queryset.all().values(*self.values))
+        searchable = [{field: (row[field] or "").upper() for field in self.searchable_fields} for row in rows]
+        tries = {field: PrefixTrie() for field in self.searchable_fields}
+        for entry, values in enumerate(searchable):
+            for field, value in values.items():
+                for word in WORD_PATTERN.findall(value):
+                    tries[field].add(word, entry)
+        return _IndexState(version, rows, searchable, tries)
@@ -0,0 +1,84 @@
+import logging
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from usaspending_api.references.models import Cfda, NAICS, PSC
+from usaspending_api.references.v2.views.autocomplete import search_cfda, search_naics, search_psc
+
+
+logger = logging.getLogger("script")
+
+DEFAULT_TERMS = ["Research and Development", "Construction", "Medical Equipment", "Agriculture", "10.5", "2361"]
+
+
+def icontains_cfda(search_text, limit):
+    """The CFDA autocomplete query as it was before it was indexed in process"""
+    if search_text.replace(".", "").isnumeric():
+        queryset = Cfda.objects.filter(program_number__icontains=search_text)
+    else:
+        queryset = Cfda.objects.filter(Q(program_title__icontains=search_text) | Q(popular_name__icontains=search_text))
+    return list(queryset.values("program_number", "program_title", "popular_name")[:limit])
+
+
+def icontains_naics(search_text, limit):
+    """The NAICS autocomplete query as it was before it was indexed in process"""
+    field = "code" if search_text.isnumeric() else "description"
+    queryset = NAICS.objects.filter(**{f"{field}__icontains": search_text}).extra(where=["CHAR_LENGTH(code) = 6"])
+    return list(queryset.values("code", "description")[:limit])
+
+
+def icontains_psc(search_text, limit):
+    """The PSC autocomplete query as it was before it was indexed in process"""
+    if len(search_text) == 4 and PSC.objects.filter(code=search_text.upper()).exists():
+        return list(PSC.objects.filter(code=search_text.upper()).values("code", "description"))
+    return list(PSC.objects.filter(description__icontains=search_text).values("code", "description")[:limit])
+
+
+VOCABULARIES = {
+    "cfda": (icontains_cfda, search_cfda),
+    "naics": (icontains_naics, search_naics),
+    "psc": (icontains_psc, search_psc),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays typing each search term one keystroke at a time against the CFDA, NAICS and PSC autocompletes and "
+        "reports the latency of each keystroke with the icontains queries the endpoints used to run (before) and "
+        "with the in-process prefix indexes they use now (after)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("terms", nargs="*", default=DEFAULT_TERMS, help="Search terms to type")
+        parser.add_argument("--vocabulary", choices=sorted(VOCABULARIES), nargs="+", default=sorted(VOCABULARIES))
+        parser.add_argument("--limit", type=int, default=10, help="Results requested per keystroke")
+        parser.add_argument("--repeat", type=int, default=3, help="Times to replay every term")
+
+    def handle(self, *args, **options):
+        keystrokes = [term[:length] for term in options["terms"] for length in range(1, len(term) + 1)]
+        keystrokes = [keystroke for keystroke in keystrokes if keystroke.strip()] * options["repeat"]
+
+        for vocabulary in options["vocabulary"]:
+            before, after = VOCABULARIES[vocabulary]
+            after("warm up", options["limit"])  # Loads the index so the first keystroke isn't charged for it
+            for label, search in (("before", before), ("after", after)):
+                timings = [self.time_keystroke(search, keystroke, options["limit"]) for keystroke in keystrokes]
+                logger.info(
+                    f"{vocabulary:>5} {label:>6}: {len(timings):,} keystrokes  "
+                    f"median {statistics.median(timings):.2f} ms  "
+                    f"p95 {self.percentile(timings, 95):.2f} ms  "
+                    f"max {max(timings):.2f} ms"
+                )
+
+    @staticmethod
+    def time_keystroke(search, keystroke, limit):
+        start = time.perf_counter()
+        search(keystroke, limit)
+        return (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def percentile(timings, percent):
+        ordered = sorted(timings)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
@@ -3,31 +3,56 @@ import logging
 import re
 
 from django.conf import settings
-from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.core.management.base import CommandError
 from openpyxl import load_workbook
+from psycopg2.sql import SQL
 
+from usaspending_api.common.etl.reference_loader import ReferenceLoaderCommand
 from usaspending_api.references.models import NAICS
 
 
-class Command(BaseCommand):
+class Command(ReferenceLoaderCommand):
     help = "Updates DB from Excel spreadsheets of USAspending terminology definitions into the naics model"
 
     logger = logging.getLogger("console")
 
     default_path = str(settings.APP_DIR / "data" / "naics_archive")
 
+    destination_table_name = NAICS._meta.db_table
+    natural_key_columns = ["code"]
+    source_columns = ["code", "description", "year"]
+    insert_overrides = {"update_date": SQL("now()")}
+    update_overrides = {"update_date": SQL("now()")}
+
+    path = None
+
     def add_arguments(self, parser):
         parser.add_argument(
             "-p", "--path", help="the path to the Excel spreadsheets to load", default=self.default_path
         )
         parser.add_argument("-a", "--append", help="Append to existing guide", action="store_true")
+        super().add_arguments(parser)
 
     def handle(self, *args, **options):
-        load_naics(path=options["path"], append=options["append"])
-
-
-def populate_naics_fields(ws, naics_year, path):
+        self.path = options["path"]
+        if options["append"]:
+            self.logger.info("Appending definitions to existing guide")
+            # Codes already described by a file at least as recent as the one loaded keep their descriptions
+            self.delete_missing_rows = False
+            self.merge_expressions = {
+                "description": SQL("case when d.year >= s.year then d.description else s.description end"),
+                "year": SQL("greatest(d.year, s.year)"),
+            }
+        else:
+            self.logger.info("Replacing existing definitions in guide")
+            self.delete_missing_rows = True
+        self.load(options["dry_run"])
+
+    def read_source(self):
+        return load_naics(self.path)
+
+
+def populate_naics_fields(ws, naics_year, path, naics):
     for current_row, row in enumerate(ws.rows):
         if not row[0].value:
             break  # Reads file only until a blank line
@@ -36,19 +61,19 @@ def populate_naics_fields(ws, naics_year, path):
 
         try:
             naics_code = int(row[0].value)
-            load_single_naics(naics_code, naics_year, naics_desc)
+            load_single_naics(naics_code, naics_year, naics_desc, naics)
         # Occasionally you will see more "creative" ways of listing naics. The following tries to account for common
         # patterns
         except ValueError:
-            load_naics_range(row[0].value, naics_year, naics_desc, path)
+            load_naics_range(row[0].value, naics_year, naics_desc, path, naics)
 
 
-def load_naics_range(naics_range_string, naics_year, naics_desc, path):
+def load_naics_range(naics_range_string, naics_year, naics_desc, path, naics):
     if "-" in naics_range_string:
         try:
             minmax = naics_range_string.split("-")
             for naics_code in range(int(minmax[0].strip()), int(minmax[1].strip()) + 1):
-                load_single_naics(naics_code, naics_year, naics_desc)
+                load_single_naics(naics_code, naics_year, naics_desc, naics)
         except ValueError:
             raise CommandError(
                 "Unparsable NAICS range value: {0}. Please review file {1}".format(naics_range_string, path)
@@ -57,37 +82,31 @@ def load_naics_range(naics_range_string, naics_year, naics_desc, path):
         raise CommandError("Unparsable NAICS range value: {0}. Please review file {1}".format(naics_range_string, path))
 
 
-def load_single_naics(naics_code, naics_year, naics_desc):
+def load_single_naics(naics_code, naics_year, naics_desc, naics):
 
     # crude way of ignoring naics of length 3 and 5
     if len(str(naics_code)) not in (2, 4, 6):
         return
 
-    obj, created = NAICS.objects.get_or_create(pk=naics_code, defaults={"description": naics_desc, "year": naics_year})
+    # Files are read newest first, so the first description found for a code is its most recent one
+    if str(naics_code) not in naics:
+        naics[str(naics_code)] = (naics_desc, int(naics_year))
 
-    if not created:
-        if int(naics_year) > int(obj.year):
-            NAICS.objects.filter(pk=naics_code).update(description=naics_desc, year=naics_year)
 
-
-@transaction.atomic
-def load_naics(path, append):
-    logger = logging.getLogger("console")
-
-    if append:
-        logger.info("Appending definitions to existing guide")
-    else:
-        logger.info("Deleting existing definitions from guide")
-        NAICS.objects.all().delete()
+def load_naics(path):
+    """ Reads every NAICS spreadsheet in path and returns the most recent description and year of each code. """
 
     # year regex object precompile
     p_year = re.compile("(20[0-9]{2})")
 
     dir_files = glob.glob(path + "/*.xlsx")
 
+    naics = {}
     for path in sorted(dir_files, reverse=True):
         wb = load_workbook(filename=path)
         ws = wb.active
 
         naics_year = p_year.search(path).group()
-        populate_naics_fields(ws, naics_year, path)
+        populate_naics_fields(ws, naics_year, path, naics)
+
+    return [(code, description, year) for code, (description, year) in naics.items()]
@@ -2,34 +2,15 @@ import logging
 import re
 
 from collections import namedtuple
-from django.core.management.base import BaseCommand
-from django.db import transaction
-from psycopg2.extras import execute_values
 from psycopg2.sql import SQL
 from usaspending_api.common.csv_helpers import read_csv_file_as_list_of_dictionaries
-from usaspending_api.common.etl import ETLTable, mixins, ETLTemporaryTable
-from usaspending_api.common.etl.operations import insert_missing_rows, update_changed_rows
-from usaspending_api.common.helpers.sql_helpers import get_connection
+from usaspending_api.common.etl.reference_loader import ReferenceLoaderCommand
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 from usaspending_api.references.models import ObjectClass
 
 
 OBJECT_CLASS_PATTERN = re.compile("[12]?[0-9]{3}")
 
-CREATE_TEMP_TABLE = """
-    drop table if exists temp_load_object_classes;
-
-    create temporary table temp_load_object_classes (
-        row_number int,
-        major_object_class text,
-        major_object_class_name text,
-        object_class text,
-        object_class_name text,
-        direct_reimbursable text,
-        direct_reimbursable_name text
-    );
-"""
-
 logger = logging.getLogger("console")
 
 RawObjectClass = namedtuple("RawObjectClass", ["row_number", "object_class", "object_class_name"])
@@ -48,17 +29,24 @@ FullObjectClass = namedtuple(
 )
 
 
-class Command(mixins.ETLMixin, BaseCommand):
+class Command(ReferenceLoaderCommand):
 
     help = "Load object class CSV file.  If anything fails, nothing gets saved.  DOES NOT DELETE RECORDS."
     object_class_file = None
-    etl_logger_function = logger.info
+
+    # NOT deleting object classes is intentional for historical reasons.
+    destination_table_name = ObjectClass._meta.db_table
+    natural_key_columns = ["object_class", "direct_reimbursable"]
+    source_columns = [f for f in FullObjectClass._fields if f != "row_number"]
+    insert_overrides = {"create_date": SQL("now()"), "update_date": SQL("now()")}
+    update_overrides = {"update_date": SQL("now()")}
 
     def add_arguments(self, parser):
 
         parser.add_argument(
             "object_class_file", metavar="FILE", help="Path or URI of the raw object class CSV file to be loaded."
         )
+        super().add_arguments(parser)
 
     def handle(self, *args, **options):
 
@@ -69,15 +57,14 @@ class Command(mixins.ETLMixin, BaseCommand):
         with Timer("Load object classes"):
 
             try:
-                with transaction.atomic():
-                    self._perform_load()
-                    t = Timer("Commit transaction")
-                    t.log_starting_message()
-                t.log_success_message()
+                report = self.load(options["dry_run"])
             except Exception:
                 logger.error("ALL CHANGES ROLLED BACK DUE TO EXCEPTION")
                 raise
 
+            if options["dry_run"] or report.change_count == 0:
+                return
+
             try:
                 self._vacuum_tables()
             except Exception:
@@ -182,52 +169,14 @@ class Command(mixins.ETLMixin, BaseCommand):
 
         self.full_object_classes = [derive_remaining_fields(roc) for roc in self.raw_object_classes]
 
-    def _import_object_classes(self):
-
-        with get_connection(read_only=False).cursor() as cursor:
-            execute_values(
-                cursor.cursor,
-                """
-                    insert into temp_load_object_classes (
-                        row_number,
-                        major_object_class,
-                        major_object_class_name,
-                        object_class,
-                        object_class_name,
-                        direct_reimbursable,
-                        direct_reimbursable_name
-                    ) values %s
-                """,
-                self.full_object_classes,
-                page_size=len(self.full_object_classes),
-            )
-            return cursor.rowcount
-
-    def _perform_load(self):
-
-        overrides = {
-            "insert_overrides": {"create_date": SQL("now()"), "update_date": SQL("now()")},
-            "update_overrides": {"update_date": SQL("now()")},
-            "key_overrides": ["object_class", "direct_reimbursable"],
-        }
-
-        object_class_table = ETLTable("object_class", **overrides)
-        temp_object_class_table = ETLTemporaryTable("temp_load_object_classes")
+    def read_source(self):
 
-        self._execute_dml_sql(CREATE_TEMP_TABLE, "Create object_class temp table")
         self._execute_function_and_log(self._read_raw_object_classes_csv, "Read raw object class csv")
         self._execute_function(self._validate_raw_object_classes, "Validate raw object classes")
         self._execute_function(self._add_unknown_object_classes, 'Add "unknown" object classes')
         self._execute_function(self._derive_remaining_fields, "Derive remaining fields")
-        self._execute_function_and_log(self._import_object_classes, "Import object classes")
 
-        # NOT deleting object classes is intentional for historical reasons.
-        self._execute_function_and_log(
-            update_changed_rows, "Update changed object classes", temp_object_class_table, object_class_table
-        )
-        self._execute_function_and_log(
-            insert_missing_rows, "Insert missing object classes", temp_object_class_table, object_class_table
-        )
+        return [full_object_class[1:] for full_object_class in self.full_object_classes]
 
     def _vacuum_tables(self):
         self._execute_dml_sql("vacuum (full, analyze) object_class", "Vacuum object_class table")
@@ -1,34 +1,49 @@
 import logging
-import boto3
 import os
 import csv
 
-from django.core.management.base import BaseCommand
-from django.db import transaction
 from django.db.models.functions import Upper
+from psycopg2.sql import SQL
 
-from usaspending_api.etl.csv_data_reader import CsvDataReader
+from usaspending_api.common.etl.reference_loader import ReferenceLoaderCommand
+from usaspending_api.common.helpers.s3_helpers import get_s3_bucket
 from usaspending_api.references.models import RefProgramActivity
 
 BUCKET_NAME = "gtas-sf133"
 FILE_NAME = "program_activity.csv"
 
 
-class Command(BaseCommand):
+class Command(ReferenceLoaderCommand):
     help = "Loads program activity codes."
     logger = logging.getLogger("console")
 
+    # Every column of the file is part of the natural key, so program activities are only ever added
+    destination_table_name = RefProgramActivity._meta.db_table
+    natural_key_columns = [
+        "program_activity_code",
+        "program_activity_name",
+        "responsible_agency_id",
+        "allocation_transfer_agency_id",
+        "main_account_code",
+        "budget_year",
+    ]
+    source_columns = natural_key_columns
+    insert_overrides = {"create_date": SQL("now()"), "update_date": SQL("now()")}
+
+    csv_file = None
+
     def add_arguments(self, parser):
         parser.add_argument("file", nargs="?", help="the file to load")
+        super().add_arguments(parser)
 
     def handle(self, *args, **options):
 
         # Create the csv reader
-        csv_file = options["file"]
-        if not csv_file:
+        self.csv_file = options["file"]
+        if not self.csv_file:
             # Get program activity csv from
             # moving it to self.bucket as it may be used in different cases
-            bucket = boto3.resource("s3").Bucket(BUCKET_NAME)
+            bucket = get_s3_bucket(BUCKET_NAME, region_name=None)
             keys = list(bucket.objects.filter(Prefix=FILE_NAME))
 
             if len(keys) == 0:
@@ -39,56 +54,42 @@ class Command(BaseCommand):
                 return
             else:
                 self.logger.info("Retrieving program activity file.")
-                csv_file = os.path.join("/", "tmp", FILE_NAME)
-                bucket.download_file(keys[0].key, csv_file)
-
-        # lower headers
-        with open(csv_file) as data:
-            data = csv.reader(data)
-            header = [row.lower() for row in next(data)]
-            updated_data = [header] + list(data)
-        with open(csv_file, "w") as data:
-            writer = csv.writer(data)
-            writer.writerows(updated_data)
-
-        reader = CsvDataReader(csv_file)
+                self.csv_file = os.path.join("/", "tmp", FILE_NAME)
+                bucket.download_file(keys[0].key, self.csv_file)
 
         try:
             self.logger.info("Processing {}".format(FILE_NAME))
-            with transaction.atomic():
-                # Upper case all existing program activity names to ensure consistent casing
-                RefProgramActivity.objects.update(program_activity_name=Upper("program_activity_name"))
-
-                # Load program activity file in a single transaction to ensure
-                # integrity and to speed things up a bit
-                for idx, row in enumerate(reader):
-                    get_or_create_program_activity(row)
+            self.load(options["dry_run"])
         except Exception as e:
             self.logger.exception(e)
         finally:
             if not options["file"]:
-                os.remove(csv_file)
+                os.remove(self.csv_file)
+
+    def before_merge(self):
+        # Upper case all existing program activity names to ensure consistent casing
+        RefProgramActivity.objects.update(program_activity_name=Upper("program_activity_name"))
 
+    def read_source(self):
+        with open(self.csv_file) as data:
+            reader = csv.DictReader(data)
+            reader.fieldnames = [field.lower() for field in reader.fieldnames]
+            return [program_activity_values(row) for row in reader]
 
-def get_or_create_program_activity(row):
+
+def program_activity_values(row):
     """
-    Create or update a program activity object.
+    The natural key of a program activity, in the order of natural_key_columns.
 
     Args:
-        row: a csv reader row
-
-    Returns:
-        True if a new program activity rows was created, False
-        if an existing row was updated
+        row: a csv reader row with lower cased headers
     """
 
-    obj, created = RefProgramActivity.objects.get_or_create(
-        program_activity_code=row["pa_code"].strip().zfill(4),
-        program_activity_name=row["pa_name"].strip().upper() if row["pa_name"] else None,
-        responsible_agency_id=row["agency_id"].strip().zfill(3),
-        allocation_transfer_agency_id=row["alloc_id"].strip().zfill(3),
-        main_account_code=row["account"].strip().zfill(4),
-        budget_year=row["year"],
+    return (
+        row["pa_code"].strip().zfill(4),
+        row["pa_name"].strip().upper() if row["pa_name"] else None,
+        row["agency_id"].strip().zfill(3),
+        row["alloc_id"].strip().zfill(3),
+        row["account"].strip().zfill(4),
+        row["year"],
     )
-
-    return created
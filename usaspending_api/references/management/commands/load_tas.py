@@ -4,14 +4,16 @@ import sys
 
 from datetime import datetime
 
-from django.core.management import call_command
-from django.core.management.base import BaseCommand
+from django.conf import settings
 from django.db import transaction
+from psycopg2.sql import SQL
 
 from usaspending_api.accounts.models import TreasuryAppropriationAccount
+from usaspending_api.common.etl import primatives
+from usaspending_api.common.etl.reference_loader import ReferenceLoaderCommand
+from usaspending_api.common.helpers.sql_helpers import execute_dml_sql
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
-from usaspending_api.etl.management.load_base import load_data_into_model
 from usaspending_api.etl.operations.federal_account.update_agency import update_federal_account_agency
 from usaspending_api.etl.operations.treasury_appropriation_account.update_agencies import (
     update_treasury_appropriation_account_agencies,
@@ -25,10 +27,48 @@ from usaspending_api.references.account_helpers import (
 
 logger = logging.getLogger("console")
 
-TAS_SQL_PATH = "usaspending_api/references/management/sql/restock_tas.sql"
-
-
-class Command(BaseCommand):
+BROKER_TAS_SQL_PATH = settings.APP_DIR / "references" / "management" / "sql" / "broker_tas.sql"
+
+# How columns loaded from a TAS file are read from its rows
+FIELD_MAP = {
+    "treasury_account_identifier": "ACCT_NUM",
+    "allocation_transfer_agency_id": "ATA",
+    "agency_id": "AID",
+    "beginning_period_of_availability": "BPOA",
+    "ending_period_of_availability": "EPOA",
+    "availability_type_code": "A",
+    "main_account_code": "MAIN",
+    "sub_account_code": "SUB",
+    "account_title": "GWA_TAS_NAME",
+    "reporting_agency_id": "Agency AID",
+    "reporting_agency_name": "Agency Name",
+    "budget_bureau_code": "ADMIN_ORG",
+    "budget_bureau_name": "Admin Org Name",
+    "fr_entity_code": "FR Entity Type",
+    "fr_entity_description": "FR Entity Description",
+    "budget_function_code": "Function Code",
+    "budget_function_title": "Function Description",
+    "budget_subfunction_code": "Sub Function Code",
+    "budget_subfunction_title": "Sub Function Description",
+}
+
+VALUE_MAP = {
+    "data_source": lambda row: "USA",
+    "tas_rendering_label": lambda row: TreasuryAppropriationAccount.generate_tas_rendering_label(
+        row["ATA"], row["Agency AID"], row["A"], row["BPOA"], row["EPOA"], row["MAIN"], row["SUB"]
+    ),
+    "internal_start_date": lambda row: datetime.strftime(
+        datetime.strptime(row["DT_TM_ESTAB"], "%m/%d/%Y  %H:%M:%S"), "%Y-%m-%d"
+    ),
+    "internal_end_date": lambda row: datetime.strftime(
+        datetime.strptime(row["DT_END"], "%m/%d/%Y  %H:%M:%S"), "%Y-%m-%d"
+    )
+    if row["DT_END"]
+    else None,
+}
+
+
+class Command(ReferenceLoaderCommand):
     """
     Used to load TAS either from Broker or a local tas_list file. There is a tas_list file inside
     of the project that can be found at: "usaspending_api/data/tas_list.csv"
@@ -40,39 +80,32 @@ class Command(BaseCommand):
         - ./manage.py load_tas --location="usaspending_api/data/tas_list.csv"
         - ./manage.py load_tas
     The second option requires that a dblink is setup between USAspending and Broker databases.
+
+    Neither deletes TAS missing from its source, but Financing TAS in a file are deleted.  Agency and federal account
+    links are derived afterwards and so are not loaded.
     """
 
     help = "Update TAS records using either DATA Broker or a TAS file if provided."
 
+    destination_table_name = TreasuryAppropriationAccount._meta.db_table
+    natural_key_columns = ["treasury_account_identifier"]
+    source_columns = list(FIELD_MAP) + list(VALUE_MAP)
+    insert_overrides = {"create_date": SQL("now()"), "update_date": SQL("now()")}
+    update_overrides = {"update_date": SQL("now()")}
+
+    location = None
+    financing_tas = None
+
     def add_arguments(self, parser):
         parser.add_argument("-l", "--location", dest="location", help="(OPTIONAL) location of the TAS file to load")
+        super().add_arguments(parser)
 
     @transaction.atomic()
     def handle(self, *args, **options):
+        self.location = options["location"]
         try:
-            with Timer("Loading TAS from {}".format(options["location"] or "Broker")):
-                if options["location"]:
-                    self.csv_tas_loader(options["location"])
-                else:
-                    call_command("run_sql", "-f", TAS_SQL_PATH)
-
-            # Update TAS agency links.
-            with Timer("Updating TAS agencies"):
-                count = update_treasury_appropriation_account_agencies()
-                logger.info(f"   Updated {count:,} TAS agency links")
-
-            # Update Federal Accounts from TAS.
-            with Timer("Updating Federal Accounts from TAS"):
-                deletes = remove_empty_federal_accounts()
-                logger.info(f"   Removed {deletes:,} Federal Account Rows")
-                updates = update_federal_accounts()
-                logger.info(f"   Updated {updates:,} Federal Account Rows")
-                inserts = insert_federal_accounts()
-                logger.info(f"   Created {inserts:,} Federal Account Rows")
-                links = link_treasury_accounts_to_federal_accounts()
-                logger.info(f"   Linked {links:,} Treasury Accounts to Federal Accounts")
-                agencies = update_federal_account_agency()
-                logger.info(f"   Updated {agencies:,} Federal Account agency links")
+            with Timer("Loading TAS from {}".format(self.location or "Broker")):
+                self.load(options["dry_run"])
 
             logger.info("=== TAS loader finished successfully! ===")
 
@@ -81,76 +114,51 @@ class Command(BaseCommand):
             logger.error("=== TAS loader failed ===")
             sys.exit(1)
 
-    def csv_tas_loader(self, file_path):
-        field_map = {
-            "treasury_account_identifier": "ACCT_NUM",
-            "allocation_transfer_agency_id": "ATA",
-            "agency_id": "AID",
-            "beginning_period_of_availability": "BPOA",
-            "ending_period_of_availability": "EPOA",
-            "availability_type_code": "A",
-            "main_account_code": "MAIN",
-            "sub_account_code": "SUB",
-            "account_title": "GWA_TAS_NAME",
-            "reporting_agency_id": "Agency AID",
-            "reporting_agency_name": "Agency Name",
-            "budget_bureau_code": "ADMIN_ORG",
-            "budget_bureau_name": "Admin Org Name",
-            "fr_entity_code": "FR Entity Type",
-            "fr_entity_description": "FR Entity Description",
-            "budget_function_code": "Function Code",
-            "budget_function_title": "Function Description",
-            "budget_subfunction_code": "Sub Function Code",
-            "budget_subfunction_title": "Sub Function Description",
-        }
-
-        value_map = {
-            "data_source": "USA",
-            "tas_rendering_label": self.generate_tas_rendering_label,
-            "awarding_toptier_agency": None,
-            "funding_toptier_agency": None,
-            "internal_start_date": lambda row: datetime.strftime(
-                datetime.strptime(row["DT_TM_ESTAB"], "%m/%d/%Y  %H:%M:%S"), "%Y-%m-%d"
-            ),
-            "internal_end_date": lambda row: datetime.strftime(
-                datetime.strptime(row["DT_END"], "%m/%d/%Y  %H:%M:%S"), "%Y-%m-%d"
-            )
-            if row["DT_END"]
-            else None,
-        }
-
-        with RetrieveFileFromUri(file_path).get_file_object(True) as tas_list_file_object:
-            # Get a total count for print out
-            tas_list_reader = csv.DictReader(tas_list_file_object)
-            total_count = len(list(tas_list_reader))
-
-            # Reset the reader back to the beginning of the file
-            tas_list_file_object.seek(0)
-            tas_list_reader = csv.DictReader(tas_list_file_object)
-
-            for count, row in enumerate(tas_list_reader, 1):
+    def stage_source(self, staging_table):
+        if self.location:
+            return super().stage_source(staging_table)
+        sql = SQL("insert into {table} ({columns}) select {columns} from ({broker_sql}) as broker_tas").format(
+            table=staging_table,
+            columns=primatives.make_column_list(self.source_columns),
+            broker_sql=SQL(BROKER_TAS_SQL_PATH.read_text()),
+        )
+        return execute_dml_sql(sql)
+
+    def read_source(self):
+        self.financing_tas = []
+        with RetrieveFileFromUri(self.location).get_file_object(True) as tas_list_file_object:
+            for row in csv.DictReader(tas_list_file_object):
                 for key, value in row.items():
                     row[key] = value.strip() or None
 
-                # Check to see if we need to update or create a TreasuryAppropriationAccount record
-                current_record = TreasuryAppropriationAccount.objects.filter(
-                    treasury_account_identifier=row["ACCT_NUM"]
-                ).first()
-                taa_instance = current_record or TreasuryAppropriationAccount()
-
                 # Don't load Financing TAS
                 if row["financial_indicator_type2"] == "F":
-                    if taa_instance.treasury_account_identifier:
-                        taa_instance.delete()
-                    logger.info("   Row contains Financing TAS, Skipping...")
+                    self.financing_tas.append((row["ACCT_NUM"],))
                     continue
 
-                load_data_into_model(taa_instance, row, field_map=field_map, value_map=value_map, save=True)
-
-                if count % 1000 == 0:
-                    logger.info("   Loaded {} rows of {}".format(count, total_count))
-
-    def generate_tas_rendering_label(self, row):
-        return TreasuryAppropriationAccount.generate_tas_rendering_label(
-            row["ATA"], row["Agency AID"], row["A"], row["BPOA"], row["EPOA"], row["MAIN"], row["SUB"]
-        )
+                yield [VALUE_MAP[c](row) if c in VALUE_MAP else row[FIELD_MAP[c]] for c in self.source_columns]
+
+        logger.info("   Skipped {:,} Financing TAS".format(len(self.financing_tas)))
+
+    def read_retired_keys(self):
+        # Read after the source, so these are the Financing TAS the file listed
+        return self.financing_tas or []
+
+    def after_merge(self, report):
+        # Update TAS agency links.
+        with Timer("Updating TAS agencies"):
+            count = update_treasury_appropriation_account_agencies()
+            logger.info(f"   Updated {count:,} TAS agency links")
+
+        # Update Federal Accounts from TAS.
+        with Timer("Updating Federal Accounts from TAS"):
+            deletes = remove_empty_federal_accounts()
+            logger.info(f"   Removed {deletes:,} Federal Account Rows")
+            updates = update_federal_accounts()
+            logger.info(f"   Updated {updates:,} Federal Account Rows")
+            inserts = insert_federal_accounts()
+            logger.info(f"   Created {inserts:,} Federal Account Rows")
+            links = link_treasury_accounts_to_federal_accounts()
+            logger.info(f"   Linked {links:,} Treasury Accounts to Federal Accounts")
+            agencies = update_federal_account_agency()
+            logger.info(f"   Updated {agencies:,} Federal Account agency links")
@@ -5,8 +5,9 @@ from datetime import datetime
 from datetime import timezone
 from time import perf_counter
 
-from django.core.management.base import BaseCommand
+from psycopg2.sql import SQL
 
+from usaspending_api.common.etl.reference_loader import ReferenceLoaderCommand
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 from usaspending_api.common.retrieve_file_from_uri import SCHEMA_HELP_TEXT
 from usaspending_api.common.operations_reporter import OpsReporter
@@ -61,26 +62,33 @@ DATA_CLEANING_MAP = {
 }
 
 
-class Command(BaseCommand):
+class Command(ReferenceLoaderCommand):
 
     help = "Load new CFDA data into references_cfda from the provided source CSV file"
 
+    destination_table_name = Cfda._meta.db_table
+    natural_key_columns = ["program_number"]
+    source_columns = list(DATA_CLEANING_MAP.values()) + ["data_source"]
+    insert_overrides = {"create_date": SQL("now()"), "update_date": SQL("now()")}
+    update_overrides = {"update_date": SQL("now()")}
+
+    cfda_data_uri = None
+
     def add_arguments(self, parser):
         arg_help = "A RFC URL to the CFDA data file. ({})"
         parser.add_argument("cfda-data-uri", type=str, help=arg_help.format(SCHEMA_HELP_TEXT))
+        super().add_arguments(parser)
 
     def handle(self, *args, **options):
-        logger.info("Loading data into pandas DataFrames")
         start = perf_counter()
-        external_data_df = load_from_url(options["cfda-data-uri"])
-        database_df = load_cfda_table_into_pandas()
+        self.cfda_data_uri = options["cfda-data-uri"]
+        report = self.load(options["dry_run"])
 
-        logger.info("Remodeling DataFrames for comparision")
-        external_data_df = fully_order_pandas_dataframe(external_data_df, "program_number")
-        database_df = fully_order_pandas_dataframe(database_df, "program_number")
-
-        logger.info("Comparing DataFrames")
-        raise_status_code_3 = not load_cfda(database_df, external_data_df)
+        # Programs are never deleted; programs missing from the file are kept
+        Reporter["new_record_count"], Reporter["updated_record_count"] = report.inserted, report.updated
+        raise_status_code_3 = report.change_count == 0
+        if raise_status_code_3:
+            logger.info("Skipping CFDA load, no new data")
 
         Reporter["duration"] = perf_counter() - start
         Reporter["end_status"] = 3 if raise_status_code_3 else 0
@@ -89,6 +97,11 @@ class Command(BaseCommand):
         if raise_status_code_3:
             raise SystemExit(3)
 
+    def read_source(self):
+        logger.info("Loading data into pandas DataFrame")
+        external_data_df = load_from_url(self.cfda_data_uri)
+        return external_data_df[self.source_columns].itertuples(index=False, name=None)
+
 
 def load_from_url(rfc_path_string):
     with RetrieveFileFromUri(rfc_path_string).get_file_object() as data_file_handle:
@@ -113,43 +126,3 @@ def clean_col_names(field):
     """Define some data-munging functions that can be applied to pandas
     dataframes as necessary"""
     return str(field).lower().strip().replace(" ", "_").replace(",", "_")
-
-
-def load_cfda_table_into_pandas():
-    database_records = list(Cfda.objects.all().values())
-    if not database_records:
-        return pd.DataFrame()
-    df = pd.DataFrame(database_records, dtype=str)
-    del df["id"]
-    del df["create_date"]
-    del df["update_date"]
-    return df
-
-
-def fully_order_pandas_dataframe(df, sort_column):
-    if df.empty:
-        return df
-    df.sort_values(sort_column, inplace=True)  # sort the rows using the provided column
-    df = df[sorted(df.columns.tolist())]  # order the dataframe columns
-    df.reset_index(drop=True, inplace=True)  # reset the pandas indexes so they match the new row order
-    return df
-
-
-def load_cfda(original_df, new_df):
-    if new_df.equals(original_df):
-        logger.info("Skipping CFDA load, no new data")
-        return False
-
-    Reporter["new_record_count"], Reporter["updated_record_count"] = 0, 0
-
-    logger.info("Inserting new CFDA data")
-    for row in new_df.itertuples():
-        record = row._asdict()
-        del record["Index"]
-        _, created = Cfda.objects.update_or_create(program_number=record["program_number"], defaults=record)
-        if created:
-            Reporter["new_record_count"] += 1
-        else:
-            Reporter["updated_record_count"] += 1
-    logger.info("Completed data load")
-    return True
@@ -0,0 +1,97 @@
+-- WARNING: This script is not meant to be run directly. Please use the "load_tas" management command, which stages
+-- these rows, merges them into treasury_appropriation_account, and then updates federal account relationships.
+-- The TAS rendering label is built as in TreasuryAppropriationAccount.generate_tas_rendering_label.
+SELECT
+    'USA' AS data_source,
+    broker_tas.account_num AS treasury_account_identifier,
+    CONCAT_WS(
+        '-',
+        NULLIF(broker_tas.allocation_transfer_agency, ''),
+        NULLIF(broker_tas.agency_identifier, ''),
+        COALESCE(
+            NULLIF(broker_tas.availability_type_code, ''),
+            NULLIF(
+                CONCAT_WS(
+                    '/',
+                    NULLIF(broker_tas.beginning_period_of_availa, ''),
+                    NULLIF(broker_tas.ending_period_of_availabil, '')
+                ),
+                ''
+            )
+        ),
+        NULLIF(broker_tas.main_account_code, ''),
+        NULLIF(broker_tas.sub_account_code, '')
+    ) AS tas_rendering_label,
+    broker_tas.allocation_transfer_agency AS allocation_transfer_agency_id,
+    broker_tas.agency_identifier AS agency_id,
+    broker_tas.beginning_period_of_availa AS beginning_period_of_availability,
+    broker_tas.ending_period_of_availabil AS ending_period_of_availability,
+    broker_tas.availability_type_code,
+    broker_tas.main_account_code,
+    broker_tas.sub_account_code,
+    broker_tas.account_title,
+    broker_tas.reporting_agency_aid AS reporting_agency_id,
+    broker_tas.reporting_agency_name,
+    broker_tas.budget_bureau_code,
+    broker_tas.budget_bureau_name,
+    broker_tas.fr_entity_type AS fr_entity_code,
+    broker_tas.fr_entity_description,
+    broker_tas.budget_function_code,
+    broker_tas.budget_function_title,
+    broker_tas.budget_subfunction_code,
+    broker_tas.budget_subfunction_title,
+    broker_tas.internal_start_date,
+    broker_tas.internal_end_date
+FROM
+    dblink ('broker_server', '(
+        SELECT
+            tas_lookup.account_num::INT,
+            tas_lookup.account_title,
+            tas_lookup.agency_identifier,
+            tas_lookup.allocation_transfer_agency,
+            tas_lookup.availability_type_code,
+            tas_lookup.beginning_period_of_availa,
+            tas_lookup.budget_bureau_code,
+            tas_lookup.budget_bureau_name,
+            tas_lookup.budget_function_code,
+            tas_lookup.budget_function_title,
+            tas_lookup.budget_subfunction_code,
+            tas_lookup.budget_subfunction_title,
+            tas_lookup.ending_period_of_availabil,
+            tas_lookup.financial_indicator2,
+            tas_lookup.fr_entity_description,
+            tas_lookup.fr_entity_type,
+            tas_lookup.internal_end_date,
+            tas_lookup.internal_start_date,
+            tas_lookup.main_account_code,
+            tas_lookup.reporting_agency_aid,
+            tas_lookup.reporting_agency_name,
+            tas_lookup.sub_account_code
+        FROM
+            tas_lookup
+        WHERE
+            UPPER(tas_lookup.financial_indicator2) IS DISTINCT FROM ''F'')') AS broker_tas
+        (
+            account_num INT,
+            account_title TEXT,
+            agency_identifier TEXT,
+            allocation_transfer_agency TEXT,
+            availability_type_code TEXT,
+            beginning_period_of_availa TEXT,
+            budget_bureau_code TEXT,
+            budget_bureau_name TEXT,
+            budget_function_code TEXT,
+            budget_function_title TEXT,
+            budget_subfunction_code TEXT,
+            budget_subfunction_title TEXT,
+            ending_period_of_availabil TEXT,
+            financial_indicator2 TEXT,
+            fr_entity_description TEXT,
+            fr_entity_type TEXT,
+            internal_end_date DATE,
+            internal_start_date DATE,
+            main_account_code TEXT,
+            reporting_agency_aid TEXT,
+            reporting_agency_name TEXT,
+            sub_account_code TEXT
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.13 on 2020-08-12 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('references', '0049_auto_20200727_1735'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='naics',
+            name='update_date',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='psc',
+            name='update_date',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
@@ -13,6 +13,7 @@ class PSC(models.Model):
     excludes = models.TextField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
     includes = models.TextField(blank=True, null=True)
+    update_date = models.DateTimeField(auto_now=True, null=True)
 
     class Meta:
         managed = True
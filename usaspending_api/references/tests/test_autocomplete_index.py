@@ -0,0 +1,57 @@
+import pytest
+
+from model_mommy import mommy
+from usaspending_api.references.autocomplete_index import AutocompleteIndex, PrefixTrie, match_rank
+from usaspending_api.references.models import PSC
+
+
+def test_prefix_trie():
+    trie = PrefixTrie()
+    trie.add("MINING", 1)
+    trie.add("MINE", 2)
+    trie.add("COAL", 2)
+
+    assert trie.entries_with_prefix("MIN") == {1, 2}
+    assert trie.entries_with_prefix("MINI") == {1}
+    assert trie.entries_with_prefix("COAL") == {2}
+    assert trie.entries_with_prefix("COALS") == set()
+
+
+def test_match_rank():
+    assert match_rank("ANTHRACITE MINING", "ANTHRACITE MINING") == 0
+    assert match_rank("ANTHRACITE MINING", "ANTH") == 1
+    assert match_rank("ANTHRACITE MINING", "MIN") == 2
+    assert match_rank("COAL (MINING)", "MIN") == 2
+    assert match_rank("ANTHRACITE MINING", "RACITE") == 3
+    assert match_rank("ANTHRACITE MINING", "QUARRY") is None
+
+
+@pytest.mark.django_db
+def test_search_ranks_icontains_matches():
+    mommy.make(PSC, code="6250", description="BALLASTS, FOOLPROOF LAMPHOLDERS")
+    mommy.make(PSC, code="3605", description="FOOD PRODUCTS MACHINE & EQ")
+    mommy.make(PSC, code="8435", description="FOOTWEAR, WOMEN'S")
+    mommy.make(PSC, code="8925", description="SEAFOOD")
+    mommy.make(PSC, code="1000", description="WEAPONS")
+    index = AutocompleteIndex(PSC.objects.all(), ["code", "description"], ["code", "description"])
+
+    assert [psc["code"] for psc in index.search("foo", ["description"], 10)] == ["8435", "3605", "6250", "8925"]
+    assert [psc["code"] for psc in index.search("foo", ["description"], 2)] == ["8435", "3605"]
+    assert index.search("8435", ["code"], 10) == [{"code": "8435", "description": "FOOTWEAR, WOMEN'S"}]
+    assert index.search("quarry", ["code", "description"], 10) == []
+
+
+@pytest.mark.django_db
+def test_search_reloads_when_table_changes():
+    index = AutocompleteIndex(PSC.objects.all(), ["code", "description"], ["code", "description"])
+    assert index.search("foo", ["description"], 10) == []
+
+    psc = mommy.make(PSC, code="3605", description="FOOD PRODUCTS MACHINE & EQ")
+    assert index.search("foo", ["description"], 10) == [{"code": "3605", "description": "FOOD PRODUCTS MACHINE & EQ"}]
+
+    psc.description = "DAIRY PRODUCTS MACHINE & EQ"
+    psc.save()
+    assert index.search("foo", ["description"], 10) == []
+    assert index.search("dairy", ["description"], 10) == [
+        {"code": "3605", "description": "DAIRY PRODUCTS MACHINE & EQ"}
+    ]
@@ -0,0 +1,85 @@
+import pytest
+
+from django.db import connection
+from hypothesis import given, settings, strategies as st
+from usaspending_api.broker.helpers.build_business_categories_boolean_dict import build_business_categories_boolean_dict
+from usaspending_api.broker.helpers.get_business_categories import get_business_categories
+from usaspending_api.broker.helpers.get_business_categories_batch import (
+    FABS_RULES,
+    FPDS_RULES,
+    get_business_categories_batch,
+)
+
+FPDS_FLAGS = sorted({flag for rule in FPDS_RULES for flag in rule.flags})
+FPDS_TEXT_COLUMNS = sorted({column for rule in FPDS_RULES for column, _ in rule.equals})
+FPDS_TEXT_VALUES = sorted({value for rule in FPDS_RULES for _, value in rule.equals}) + ["X"]
+FABS_BUSINESS_TYPES = sorted({value for rule in FABS_RULES for _, value in rule.equals}) + ["X", "r"]
+
+# Everything strtobool accepts, plus the nulls and blanks build_business_categories_boolean_dict treats as false
+flag_values = st.sampled_from([None, "", "t", "f", "true", "false", "T", "F", "Y", "N", "yes", "no", "1", "0"])
+text_values = st.one_of(st.none(), st.sampled_from(FPDS_TEXT_VALUES))
+
+fpds_rows = st.lists(
+    st.fixed_dictionaries(
+        {**{flag: flag_values for flag in FPDS_FLAGS}, **{column: text_values for column in FPDS_TEXT_COLUMNS}}
+    ),
+    min_size=1,
+    max_size=20,
+)
+fabs_rows = st.lists(
+    st.fixed_dictionaries({"business_types": st.one_of(st.none(), st.sampled_from(FABS_BUSINESS_TYPES))}),
+    min_size=1,
+    max_size=20,
+)
+
+
+def compile_fpds_business_categories(row):
+    flags = build_business_categories_boolean_dict(row)
+    arguments = {**{flag: flags[flag] for flag in FPDS_FLAGS}, **{column: row[column] for column in FPDS_TEXT_COLUMNS}}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "select compile_fpds_business_categories({})".format(
+                ", ".join(f"{argument} => %({argument})s" for argument in arguments)
+            ),
+            arguments,
+        )
+        return sorted(cursor.fetchone()[0])
+
+
+def compile_fabs_business_categories(row):
+    with connection.cursor() as cursor:
+        cursor.execute("select compile_fabs_business_categories(%s)", [row["business_types"]])
+        return sorted(cursor.fetchone()[0])
+
+
+@pytest.mark.django_db
+@settings(max_examples=25, deadline=None)
+@given(rows=fpds_rows)
+def test_fpds_batch_matches_row_and_sql_implementations(rows):
+    batch = get_business_categories_batch(rows, "fpds")
+    assert batch == [get_business_categories(row, "fpds") for row in rows]
+    assert batch == [compile_fpds_business_categories(row) for row in rows]
+
+
+@pytest.mark.django_db
+@settings(max_examples=25, deadline=None)
+@given(rows=fabs_rows)
+def test_fabs_batch_matches_row_and_sql_implementations(rows):
+    batch = get_business_categories_batch(rows, "fabs")
+    assert batch == [get_business_categories(row, "fabs") for row in rows]
+    assert batch == [compile_fabs_business_categories(row) for row in rows]
+
+
+def test_batch_accepts_columns():
+    batch = get_business_categories_batch({"business_types": ["P", None, "L"]}, "fabs")
+    assert batch == [["individuals"], [], ["authorities_and_commissions", "government"]]
+    assert get_business_categories_batch({"business_types": []}, "fabs") == []
+
+
+def test_batch_rejects_what_row_rejects():
+    with pytest.raises(ValueError):
+        get_business_categories({"foundation": "maybe"}, "fpds")
+    with pytest.raises(ValueError):
+        get_business_categories_batch([{"foundation": "maybe"}], "fpds")
+    with pytest.raises(ValueError):
+        get_business_categories_batch([{"business_types": "P"}], "fpd")
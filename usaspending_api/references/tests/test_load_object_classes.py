@@ -138,6 +138,18 @@ def test_updating_rows(disable_vacuuming, remove_csv_file):
     assert oc.object_class_name == "Test 1100 update"
 
 
+@pytest.mark.django_db
+def test_dry_run(disable_vacuuming, remove_csv_file):
+
+    assert ObjectClass.objects.count() == 0
+    mock_data(GOOD_SAMPLE)
+    call_command("load_object_classes", OBJECT_CLASS_FILE)
+    mock_data(UPDATE_SAMPLE + ADDITIONAL_SAMPLE)
+    call_command("load_object_classes", OBJECT_CLASS_FILE, "--dry-run")
+    assert ObjectClass.objects.count() == 6
+    assert ObjectClass.objects.get(object_class="100", direct_reimbursable="D").object_class_name == "Test 1100"
+
+
 @pytest.mark.django_db
 def test_leading_trailing_spaces(disable_vacuuming, remove_csv_file):
 
@@ -1,13 +1,65 @@
-from django.db.models import Case, F, IntegerField, Q, When
-from django.db.models.functions import Upper
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, IntegerField, Q, When
+from django.db.models.functions import Greatest, Upper
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.references.autocomplete_index import AutocompleteIndex
 from usaspending_api.references.models import Cfda, Definition, NAICS, PSC
 from usaspending_api.references.v2.views.glossary import DefinitionSerializer
 from usaspending_api.search.models import AgencyAutocompleteMatview
 
+CFDA_INDEX = AutocompleteIndex(
+    Cfda.objects.all(),
+    values=["program_number", "program_title", "popular_name"],
+    searchable_fields=["program_number", "program_title", "popular_name"],
+)
+
+# Only 6 digit NAICS codes are offered
+NAICS_INDEX = AutocompleteIndex(
+    NAICS.objects.extra(where=["CHAR_LENGTH(code) = 6"]),
+    values=["code", "description"],
+    searchable_fields=["code", "description"],
+)
+
+PSC_INDEX = AutocompleteIndex(
+    PSC.objects.all(), values=["code", "description"], searchable_fields=["code", "description"]
+)
+
+
+def search_cfda(search_text, limit):
+    """Return CFDA matches by number, title, or name"""
+
+    # Program numbers are 10.4839, 98.2718, etc...
+    if search_text.replace(".", "").isnumeric():
+        fields = ["program_number"]
+    else:
+        fields = ["program_title", "popular_name"]
+
+    return CFDA_INDEX.search(search_text, fields, limit)
+
+
+def search_naics(search_text, limit):
+    """Return 6 digit NAICS matches by code or description"""
+
+    # NAICS codes are 111150, 112310, and there are no numeric NAICS descriptions...
+    fields = ["code"] if search_text.isnumeric() else ["description"]
+
+    return NAICS_INDEX.search(search_text, fields, limit)
+
+
+def search_psc(search_text, limit):
+    """Return the PSC with the provided code or else PSC matches by description"""
+
+    # PSC codes are 4-digit, but we have some numeric PSC descriptions, so limit to 4...
+    if len(search_text) == 4:
+        matches = [psc for psc in PSC_INDEX.search(search_text, ["code"], 1) if psc["code"] == search_text.upper()]
+        if matches:
+            return matches
+
+    return PSC_INDEX.search(search_text, ["description"], limit)
+
 
 class BaseAutocompleteViewSet(APIView):
     @staticmethod
@@ -46,6 +98,7 @@ class BaseAutocompleteViewSet(APIView):
             Q(subtier_name__icontains=search_text) | Q(subtier_abbreviation__icontains=search_text)
         )
 
+        # The icontains filters are served by trigram indexes on the upper cased names and abbreviations
         agencies = (
             AgencyAutocompleteMatview.objects.filter(agency_filter)
             .annotate(
@@ -54,9 +107,13 @@ class BaseAutocompleteViewSet(APIView):
                     When(toptier_abbreviation="FEMA", then=2),
                     default=0,
                     output_field=IntegerField(),
-                )
+                ),
+                similarity=Greatest(
+                    TrigramSimilarity("subtier_name", search_text),
+                    TrigramSimilarity("subtier_abbreviation", search_text),
+                ),
             )
-            .order_by("fema_sort", "-toptier_flag", Upper("toptier_name"), Upper("subtier_name"))
+            .order_by("fema_sort", "-toptier_flag", "-similarity", Upper("toptier_name"), Upper("subtier_name"))
         ).values(
             "agency_autocomplete_id",
             "toptier_flag",
@@ -122,17 +179,7 @@ class CFDAAutocompleteViewSet(BaseAutocompleteViewSet):
         """Return CFDA matches by number, title, or name"""
         search_text, limit = self.get_request_payload(request)
 
-        queryset = Cfda.objects.all()
-
-        # Program numbers are 10.4839, 98.2718, etc...
-        if search_text.replace(".", "").isnumeric():
-            queryset = queryset.filter(program_number__icontains=search_text)
-        else:
-            title_filter = queryset.filter(program_title__icontains=search_text)
-            popular_name_filter = queryset.filter(popular_name__icontains=search_text)
-            queryset = title_filter | popular_name_filter
-
-        return Response({"results": list(queryset.values("program_number", "program_title", "popular_name")[:limit])})
+        return Response({"results": search_cfda(search_text, limit)})
 
 
 class NAICSAutocompleteViewSet(BaseAutocompleteViewSet):
@@ -147,21 +194,11 @@ class NAICSAutocompleteViewSet(BaseAutocompleteViewSet):
         """Return all NAICS table entries matching the provided search text"""
         search_text, limit = self.get_request_payload(request)
 
-        queryset = NAICS.objects.all()
-
-        # NAICS codes are 111150, 112310, and there are no numeric NAICS descriptions...
-        if search_text.isnumeric():
-            queryset = queryset.filter(code__icontains=search_text)
-        else:
-            queryset = queryset.filter(description__icontains=search_text)
-
-        # Only include 6 digit codes
-        queryset = queryset.extra(where=["CHAR_LENGTH(code) = 6"])
-
-        # rename columns...
-        queryset = queryset.annotate(naics=F("code"), naics_description=F("description"))
-
-        return Response({"results": list(queryset.values("naics", "naics_description")[:limit])})
+        results = [
+            {"naics": naics["code"], "naics_description": naics["description"]}
+            for naics in search_naics(search_text, limit)
+        ]
+        return Response({"results": results})
 
 
 class PSCAutocompleteViewSet(BaseAutocompleteViewSet):
@@ -177,18 +214,11 @@ class PSCAutocompleteViewSet(BaseAutocompleteViewSet):
         """Return all PSC table entries matching the provided search text"""
         search_text, limit = self.get_request_payload(request)
 
-        queryset = PSC.objects.all()
-
-        # PSC codes are 4-digit, but we have some numeric PSC descriptions, so limit to 4...
-        if len(search_text) == 4 and queryset.filter(code=search_text.upper()).exists():
-            queryset = queryset.filter(code=search_text.upper())
-        else:
-            queryset = queryset.filter(description__icontains=search_text)
-
-        # rename columns...
-        queryset = queryset.annotate(product_or_service_code=F("code"), psc_description=F("description"))
-
-        return Response({"results": list(queryset.values("product_or_service_code", "psc_description")[:limit])})
+        results = [
+            {"product_or_service_code": psc["code"], "psc_description": psc["description"]}
+            for psc in search_psc(search_text, limit)
+        ]
+        return Response({"results": results})
 
 
 class GlossaryAutocompleteViewSet(BaseAutocompleteViewSet):
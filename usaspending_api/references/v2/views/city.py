@@ -94,7 +94,9 @@ def create_es_search(scope, search_text, country=None, state=None):
             country: optional country selected by user
             state: optional state selected by user
     """
-    # The base query that will do a wildcard term-level query
+    # The base query that will do a wildcard term-level query.  With only a trailing wildcard on the keyword field this
+    # is a prefix lookup in the index's sorted term dictionary, so unlike the Postgres autocompletes it needs neither a
+    # trigram index nor an in-process prefix index to stay fast while typing
     query = {"must": [{"wildcard": {"{}_city_name.keyword".format(scope): search_text + "*"}}]}
     if country != "USA":
         # A non-USA selected country
@@ -5,6 +5,9 @@ def setup_elasticsearch_test(monkeypatch, index_fixture, **options):
     if index_fixture.index_type == "awards":
         search_wrapper = "AwardSearch"
         query_alias = settings.ES_AWARDS_QUERY_ALIAS_PREFIX
+    elif index_fixture.index_type == "subawards":
+        search_wrapper = "SubawardSearch"
+        query_alias = settings.ES_SUBAWARDS_QUERY_ALIAS_PREFIX
     else:
         search_wrapper = "TransactionSearch"
         query_alias = settings.ES_TRANSACTIONS_QUERY_ALIAS_PREFIX
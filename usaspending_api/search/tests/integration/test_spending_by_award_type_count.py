@@ -117,7 +117,7 @@ def test_spending_by_award_no_intersection(client, monkeypatch, elasticsearch_aw
 
 
 @pytest.mark.django_db
-def test_spending_by_award_subawards_no_intersection(client):
+def test_spending_by_award_subawards_no_intersection(client, monkeypatch, elasticsearch_subaward_index):
     mommy.make("awards.Award", id=90)
     mommy.make(
         "awards.Subaward",
@@ -130,6 +130,8 @@ def test_spending_by_award_subawards_no_intersection(client):
         amount=10,
     )
 
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     request = {
         "subawards": True,
         "fields": ["Sub-Award ID"],
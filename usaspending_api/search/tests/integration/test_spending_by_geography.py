@@ -23,7 +23,8 @@ def test_spending_by_geography_failure(client, monkeypatch, elasticsearch_transa
 
 
 @pytest.mark.django_db
-def test_spending_by_geography_subawards_success(client):
+def test_spending_by_geography_subawards_success(client, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
 
     resp = client.post(
         "/api/v2/search/spending_by_geography",
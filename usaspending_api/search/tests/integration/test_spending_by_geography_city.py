@@ -39,8 +39,11 @@ def award_data_fixture(db):
     mommy.make("references.RefCountryCode", country_code="USA", country_name="UNITED STATES")
 
 
-def test_geocode_filter_by_city(client, monkeypatch, elasticsearch_transaction_index, award_data_fixture):
+def test_geocode_filter_by_city(
+    client, monkeypatch, elasticsearch_transaction_index, elasticsearch_subaward_index, award_data_fixture
+):
     setup_elasticsearch_test(monkeypatch, elasticsearch_transaction_index)
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
 
     # Place of performance that does exist.
     resp = client.post(
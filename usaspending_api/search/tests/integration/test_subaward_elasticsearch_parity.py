@@ -0,0 +1,201 @@
+import pytest
+
+from model_mommy import mommy
+
+from usaspending_api.common.data_classes import Pagination
+from usaspending_api.common.query_with_filters import QueryWithFilters
+from usaspending_api.search.tests.data.utilities import setup_elasticsearch_test
+from usaspending_api.search.v2.views.spending_by_award_count import SpendingByAwardCountVisualizationViewSet
+from usaspending_api.search.v2.views.spending_by_category_views.spending_by_agency_types import (
+    AwardingAgencyViewSet,
+    AwardingSubagencyViewSet,
+    FundingAgencyViewSet,
+    FundingSubagencyViewSet,
+)
+from usaspending_api.search.v2.views.spending_by_category_views.spending_by_industry_codes import CfdaViewSet
+from usaspending_api.search.v2.views.spending_by_category_views.spending_by_locations import (
+    CountyViewSet,
+    CountryViewSet,
+    DistrictViewSet,
+    StateTerritoryViewSet,
+)
+from usaspending_api.search.v2.views.spending_by_category_views.spending_by_recipient_duns import RecipientDunsViewSet
+from usaspending_api.search.v2.views.spending_by_geography import GeoLayer, SpendingByGeographyVisualizationViewSet
+
+
+@pytest.fixture
+def subaward_data(db):
+    mommy.make("awards.Award", id=1, latest_transaction_id=1)
+    mommy.make("awards.Award", id=2, latest_transaction_id=2)
+
+    mommy.make("references.ToptierAgency", toptier_agency_id=2001, name="Toptier Agency 1", abbreviation="TA1")
+    mommy.make("references.SubtierAgency", subtier_agency_id=3001, name="Subtier Agency 1", abbreviation="SA1")
+    mommy.make("references.Agency", id=1001, toptier_agency_id=2001, subtier_agency_id=3001, toptier_flag=True)
+    mommy.make("references.Cfda", id=1, program_number="10.001", program_title="CFDA TITLE")
+    mommy.make("recipient.StateData", id="53-2020", fips="53", code="WA", name="Washington")
+    mommy.make("references.RefCountryCode", country_code="USA", country_name="UNITED STATES")
+    mommy.make(
+        "references.PopCounty", state_code="53", state_name="Washington", county_number="000", latest_population=1000
+    )
+    mommy.make("references.PopCounty", state_code="53", county_number="005", latest_population=100)
+    mommy.make(
+        "references.PopCongressionalDistrict", state_code="53", congressional_district="04", latest_population=10
+    )
+    mommy.make("recipient.RecipientLookup", duns="123456789", legal_business_name="RECIPIENT ONE")
+    mommy.make(
+        "recipient.RecipientProfile",
+        recipient_hash="c8c1a7fa-e88e-1e4c-a2cf-8cbb6f2bbb98",
+        recipient_unique_id="123456789",
+        recipient_level="R",
+        recipient_name="RECIPIENT ONE",
+    )
+
+    common = {
+        "awarding_agency_id": 1001,
+        "funding_agency_id": 1001,
+        "awarding_toptier_agency_name": "Toptier Agency 1",
+        "awarding_subtier_agency_name": "Subtier Agency 1",
+        "funding_toptier_agency_name": "Toptier Agency 1",
+        "funding_subtier_agency_name": "Subtier Agency 1",
+        "awarding_toptier_agency_abbreviation": "TA1",
+        "awarding_subtier_agency_abbreviation": "SA1",
+        "funding_toptier_agency_abbreviation": "TA1",
+        "funding_subtier_agency_abbreviation": "SA1",
+        "pop_country_code": "USA",
+        "pop_state_code": "WA",
+        "pop_county_code": "005",
+        "pop_county_name": "BENTON",
+        "pop_congressional_code": "04",
+        "recipient_location_country_code": "USA",
+        "recipient_location_state_code": "WA",
+        "recipient_location_county_code": "005",
+        "recipient_location_county_name": "BENTON",
+        "recipient_location_congressional_code": "04",
+    }
+    mommy.make(
+        "awards.Subaward",
+        id=1,
+        award_id=1,
+        award_type="grant",
+        prime_award_type="02",
+        amount=100.25,
+        action_date="2020-01-01",
+        cfda_number="10.001",
+        recipient_unique_id="123456789",
+        recipient_name="Recipient One",
+        **common,
+    )
+    mommy.make(
+        "awards.Subaward",
+        id=2,
+        award_id=2,
+        award_type="procurement",
+        prime_award_type="A",
+        amount=10.5,
+        action_date="2020-02-01",
+        recipient_unique_id=None,
+        recipient_name="MULTIPLE RECIPIENTS",
+        **common,
+    )
+    mommy.make(
+        "awards.Subaward",
+        id=3,
+        award_id=None,
+        award_type="grant",
+        prime_award_type="02",
+        amount=1,
+        action_date="2020-03-01",
+        recipient_unique_id="123456789",
+        recipient_name="Recipient One",
+        **common,
+    )
+
+
+def _build_category_view(view_class, filters):
+    view = view_class()
+    view.filters = filters
+    view.subawards = True
+    view.pagination = Pagination(page=1, limit=50, lower_limit=0, upper_limit=51)
+    return view
+
+
+def _sort_results(results):
+    return sorted(results, key=lambda result: (str(result.get("code")), str(result.get("name"))))
+
+
+@pytest.mark.parametrize(
+    "view_class",
+    [
+        AwardingAgencyViewSet,
+        AwardingSubagencyViewSet,
+        FundingAgencyViewSet,
+        FundingSubagencyViewSet,
+        CfdaViewSet,
+        RecipientDunsViewSet,
+        CountyViewSet,
+        DistrictViewSet,
+        StateTerritoryViewSet,
+        CountryViewSet,
+    ],
+)
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"award_type_codes": ["02"]},
+        {"time_period": [{"start_date": "2020-01-15", "end_date": "2020-12-31"}]},
+        {"prime_and_sub_award_types": {"sub_awards": ["procurement"]}},
+    ],
+)
+def test_category_subaward_parity(monkeypatch, elasticsearch_subaward_index, subaward_data, view_class, filters):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
+    payload = {"subawards": True, "page": 1, "limit": 50, "filters": dict(filters)}
+    elasticsearch_results = view_class().perform_search(payload, {})["results"]
+    postgres_results = _build_category_view(view_class, dict(filters)).query_postgres_for_subawards()
+
+    assert _sort_results(elasticsearch_results) == _sort_results(postgres_results)
+
+
+@pytest.mark.parametrize("geo_layer", [GeoLayer.STATE, GeoLayer.COUNTY, GeoLayer.DISTRICT])
+@pytest.mark.parametrize("scope_field_name", ["pop", "recipient_location"])
+def test_geography_subaward_parity(
+    monkeypatch, elasticsearch_subaward_index, subaward_data, geo_layer, scope_field_name
+):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
+    location_dict = {"county": "county_code", "district": "congressional_code", "state": "state_code"}
+    agg_key_dict = {"county": "county_agg_key", "district": "congressional_agg_key", "state": "state_agg_key"}
+    scope_filter_name = "place_of_performance_scope" if scope_field_name == "pop" else "recipient_scope"
+
+    def build_view():
+        view = SpendingByGeographyVisualizationViewSet()
+        view.subawards = True
+        view.geo_layer = geo_layer
+        view.geo_layer_filters = None
+        view.scope_field_name = scope_field_name
+        view.agg_key = f"{scope_field_name}_{agg_key_dict[geo_layer.value]}"
+        view.loc_field_name = location_dict[geo_layer.value]
+        view.loc_lookup = f"{scope_field_name}_{view.loc_field_name}"
+        view.filters = {scope_filter_name: "domestic"}
+        view.obligation_column = "amount"
+        return view
+
+    elasticsearch_view = build_view()
+    filter_query = QueryWithFilters.generate_subawards_elasticsearch_query(elasticsearch_view.filters)
+    elasticsearch_results = elasticsearch_view.query_elasticsearch(filter_query)
+    postgres_results = build_view().query_postgres_for_subawards()
+
+    assert sorted(elasticsearch_results, key=lambda r: r["shape_code"]) == sorted(
+        postgres_results, key=lambda r: r["shape_code"]
+    )
+
+
+@pytest.mark.parametrize("filters", [{}, {"award_type_codes": ["A"]}, {"award_amounts": [{"lower_bound": 50}]}])
+def test_award_count_subaward_parity(monkeypatch, elasticsearch_subaward_index, subaward_data, filters):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
+    elasticsearch_results = SpendingByAwardCountVisualizationViewSet.query_elasticsearch_for_subawards(dict(filters))
+    postgres_results = SpendingByAwardCountVisualizationViewSet.handle_subawards(dict(filters))
+
+    assert elasticsearch_results == postgres_results
@@ -618,7 +618,9 @@ def test_category_awarding_agency_awards(agency_test_data, monkeypatch, elastics
     assert expected_response == spending_by_category_logic
 
 
-def test_category_awarding_agency_subawards(agency_test_data):
+def test_category_awarding_agency_subawards(agency_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "awarding_agency", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = AwardingAgencyViewSet().perform_search(test_payload, {})
@@ -652,7 +654,9 @@ def test_category_awarding_subagency_awards(agency_test_data, monkeypatch, elast
     assert expected_response == spending_by_category_logic
 
 
-def test_category_awarding_subagency_subawards(agency_test_data):
+def test_category_awarding_subagency_subawards(agency_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "awarding_subagency", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = AwardingSubagencyViewSet().perform_search(test_payload, {})
@@ -686,7 +690,9 @@ def test_category_funding_agency_awards(agency_test_data, monkeypatch, elasticse
     assert expected_response == spending_by_category_logic
 
 
-def test_category_funding_agency_subawards(agency_test_data):
+def test_category_funding_agency_subawards(agency_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "funding_agency", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = FundingAgencyViewSet().perform_search(test_payload, {})
@@ -720,7 +726,9 @@ def test_category_funding_subagency_awards(agency_test_data, monkeypatch, elasti
     assert expected_response == spending_by_category_logic
 
 
-def test_category_funding_subagency_subawards(agency_test_data):
+def test_category_funding_subagency_subawards(agency_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "funding_subagency", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = FundingSubagencyViewSet().perform_search(test_payload, {})
@@ -770,7 +778,9 @@ def test_category_recipient_duns_awards(recipient_test_data, monkeypatch, elasti
 
 
 @pytest.mark.django_db
-def test_category_recipient_duns_subawards(recipient_test_data):
+def test_category_recipient_duns_subawards(recipient_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "recipient_duns", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = RecipientDunsViewSet().perform_search(test_payload, {})
@@ -818,7 +828,9 @@ def test_category_cfda_awards(cfda_test_data, monkeypatch, elasticsearch_transac
     assert expected_response == spending_by_category_logic
 
 
-def test_category_cfda_subawards(cfda_test_data):
+def test_category_cfda_subawards(cfda_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "cfda", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = CfdaViewSet().perform_search(test_payload, {})
@@ -897,7 +909,9 @@ def test_category_county_awards(geo_test_data, monkeypatch, elasticsearch_transa
     assert expected_response == spending_by_category_logic
 
 
-def test_category_county_subawards(geo_test_data):
+def test_category_county_subawards(geo_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "county", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = CountyViewSet().perform_search(test_payload, {})
@@ -937,7 +951,9 @@ def test_category_district_awards(geo_test_data, monkeypatch, elasticsearch_tran
     assert expected_response == spending_by_category_logic
 
 
-def test_category_district_subawards(geo_test_data):
+def test_category_district_subawards(geo_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "district", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = DistrictViewSet().perform_search(test_payload, {})
@@ -976,7 +992,9 @@ def test_category_state_territory(geo_test_data, monkeypatch, elasticsearch_tran
 
 
 @pytest.mark.django_db
-def test_category_state_territory_subawards(geo_test_data):
+def test_category_state_territory_subawards(geo_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "state_territory", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = StateTerritoryViewSet().perform_search(test_payload, {})
@@ -1012,7 +1030,9 @@ def test_category_country(geo_test_data, monkeypatch, elasticsearch_transaction_
 
 
 @pytest.mark.django_db
-def test_category_country_subawards(geo_test_data):
+def test_category_country_subawards(geo_test_data, monkeypatch, elasticsearch_subaward_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_subaward_index)
+
     test_payload = {"category": "country", "subawards": True, "page": 1, "limit": 50}
 
     spending_by_category_logic = CountryViewSet().perform_search(test_payload, {})
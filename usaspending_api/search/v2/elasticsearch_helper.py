@@ -9,7 +9,7 @@ from usaspending_api.awards.v2.lookups.elasticsearch_lookups import (
     INDEX_ALIASES_TO_AWARD_TYPES,
 )
 from usaspending_api.common.data_classes import Pagination
-from usaspending_api.common.elasticsearch.search_wrappers import TransactionSearch, AwardSearch
+from usaspending_api.common.elasticsearch.search_wrappers import AwardSearch, SubawardSearch, TransactionSearch
 from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.search.v2.es_sanitization import es_minimal_sanitize
 
@@ -176,6 +176,17 @@ def get_number_of_unique_terms_for_awards(filter_query: ES_Q, field: str) -> int
     return _get_number_of_unique_terms(AwardSearch().filter(filter_query), field)
 
 
+def get_number_of_unique_terms_for_subawards(filter_query: ES_Q, field: str) -> int:
+    """
+    Returns the count for a specific filter_query.
+    NOTE: Counts below the precision_threshold are expected to be close to accurate (per the Elasticsearch
+          documentation). Since aggregations do not support more than 10k buckets this value is hard coded to
+          11k to ensure that endpoints using Elasticsearch do not cross the 10k threshold. Elasticsearch endpoints
+          should be implemented with a safeguard in case this count is above 10k.
+    """
+    return _get_number_of_unique_terms(SubawardSearch().filter(filter_query), field)
+
+
 def _get_number_of_unique_terms(search, field: str) -> int:
     """
     Returns the count for a specific filter_query.
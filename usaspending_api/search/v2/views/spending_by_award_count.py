@@ -13,7 +13,7 @@ from usaspending_api.awards.v2.filters.sub_award import subaward_filter
 from usaspending_api.awards.v2.lookups.lookups import all_award_types_mappings
 from usaspending_api.common.api_versioning import api_transformations, API_TRANSFORM_FUNCTIONS
 from usaspending_api.common.cache_decorator import cache_response
-from usaspending_api.common.elasticsearch.search_wrappers import AwardSearch
+from usaspending_api.common.elasticsearch.search_wrappers import AwardSearch, SubawardSearch
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.generic_helper import get_generic_filters_message
 from usaspending_api.common.query_with_filters import QueryWithFilters
@@ -71,7 +71,7 @@ class SpendingByAwardCountVisualizationViewSet(APIView):
                 empty_results = {"subcontracts": 0, "subgrants": 0}
             results = empty_results
         elif subawards:
-            results = self.handle_subawards(filters)
+            results = self.query_elasticsearch_for_subawards(filters)
         else:
             results = self.query_elasticsearch_for_prime_awards(filters)
 
@@ -88,6 +88,9 @@ class SpendingByAwardCountVisualizationViewSet(APIView):
     def handle_subawards(filters: dict) -> dict:
         """Turn the filters into the result dictionary when dealing with Sub-Awards
 
+        Postgres implementation that is no longer used by the endpoint; kept as the reference for the
+        Elasticsearch sub-award counts.
+
         Note: Due to how the Django ORM joins to the awards table as an
         INNER JOIN, it is necessary to explicitly enforce the aggregations
         to only count Sub-Awards that are linked to a Prime Award.
@@ -107,6 +110,26 @@ class SpendingByAwardCountVisualizationViewSet(APIView):
 
         return results
 
+    @staticmethod
+    def query_elasticsearch_for_subawards(filters: dict) -> dict:
+        filter_query = QueryWithFilters.generate_subawards_elasticsearch_query(filters)
+        # Only count Sub-Awards that are linked to a Prime Award; see handle_subawards()
+        s = SubawardSearch().filter(filter_query).filter(Q("exists", field="award_id"))
+
+        s.aggs.bucket(
+            "types",
+            "filters",
+            filters={"subgrants": Q("term", award_type="grant"), "subcontracts": Q("term", award_type="procurement")},
+        )
+        s.update_from_dict({"size": 0})
+        results = s.handle_execute()
+
+        response = {
+            "subgrants": results.aggregations.types.buckets.subgrants.doc_count,
+            "subcontracts": results.aggregations.types.buckets.subcontracts.doc_count,
+        }
+        return response
+
     def query_elasticsearch_for_prime_awards(self, filters) -> list:
         filter_query = QueryWithFilters.generate_awards_elasticsearch_query(filters)
         s = AwardSearch().filter(filter_query)
@@ -2,7 +2,7 @@ import copy
 import logging
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from django.conf import settings
 from django.db.models import QuerySet, Sum
@@ -15,7 +15,7 @@ from usaspending_api.awards.v2.filters.sub_award import subaward_filter
 from usaspending_api.common.api_versioning import api_transformations, API_TRANSFORM_FUNCTIONS
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.data_classes import Pagination
-from usaspending_api.common.elasticsearch.search_wrappers import TransactionSearch
+from usaspending_api.common.elasticsearch.search_wrappers import SubawardSearch, TransactionSearch
 from usaspending_api.common.exceptions import ElasticsearchConnectionException, NotImplementedException
 from usaspending_api.common.helpers.generic_helper import get_simple_pagination_metadata, get_generic_filters_message
 from usaspending_api.common.query_with_filters import QueryWithFilters
@@ -23,6 +23,7 @@ from usaspending_api.common.validator.award_filter import AWARD_FILTER
 from usaspending_api.common.validator.pagination import PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.search.v2.elasticsearch_helper import (
+    get_number_of_unique_terms_for_subawards,
     get_number_of_unique_terms_for_transactions,
     get_scaled_sum_aggregations,
 )
@@ -69,9 +70,9 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
         self.pagination = self._get_pagination(validated_payload)
 
         if self.subawards:
-            base_queryset = subaward_filter(self.filters)
             self.obligation_column = "amount"
-            results = self.query_django_for_subawards(base_queryset)
+            filter_query = QueryWithFilters.generate_subawards_elasticsearch_query(self.filters)
+            results = self.query_elasticsearch_for_subawards(filter_query)
         else:
             filter_query = QueryWithFilters.generate_transactions_elasticsearch_query(self.filters)
             results = self.query_elasticsearch_for_prime_awards(filter_query)
@@ -118,14 +119,28 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
             .order_by("-amount")
         )
 
-    def build_elasticsearch_search_with_aggregations(self, filter_query: ES_Q) -> Optional[TransactionSearch]:
+    def query_postgres_for_subawards(self) -> List[dict]:
         """
-        Using the provided ES_Q object creates a TransactionSearch object with the necessary applied aggregations.
+        Postgres implementation of the sub-award results; no longer used by the endpoint but kept as the reference
+        that the Elasticsearch sub-award results are tested against.
         """
-        # Create the filtered Search Object
-        search = TransactionSearch().filter(filter_query)
+        self.obligation_column = "amount"
+        return self.query_django_for_subawards(subaward_filter(self.filters))
 
-        sum_aggregations = get_scaled_sum_aggregations("generated_pragmatic_obligation", self.pagination)
+    def build_elasticsearch_search_with_aggregations(
+        self, filter_query: ES_Q
+    ) -> Optional[Union[TransactionSearch, SubawardSearch]]:
+        """
+        Using the provided ES_Q object creates a TransactionSearch (or SubawardSearch when querying sub-awards)
+        object with the necessary applied aggregations.
+        """
+        # Create the filtered Search Object
+        if self.subawards:
+            search = SubawardSearch().filter(filter_query)
+            sum_aggregations = get_scaled_sum_aggregations("amount", self.pagination)
+        else:
+            search = TransactionSearch().filter(filter_query)
+            sum_aggregations = get_scaled_sum_aggregations("generated_pragmatic_obligation", self.pagination)
 
         # Need to handle high cardinality categories differently; this assumes that the Search object references
         # an Elasticsearch cluster that has a "routing" equal to "self.category.agg_key"
@@ -137,7 +152,12 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
             group_by_agg_key_values = {"order": {"sum_field": "desc"}}
         else:
             # Get count of unique buckets; terminate early if there are no buckets matching criteria
-            bucket_count = get_number_of_unique_terms_for_transactions(filter_query, f"{self.category.agg_key}.hash")
+            if self.subawards:
+                bucket_count = get_number_of_unique_terms_for_subawards(filter_query, f"{self.category.agg_key}.hash")
+            else:
+                bucket_count = get_number_of_unique_terms_for_transactions(
+                    filter_query, f"{self.category.agg_key}.hash"
+                )
             if bucket_count == 0:
                 return None
             else:
@@ -178,6 +198,9 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
         results = self.build_elasticsearch_result(response.aggs.to_dict())
         return results
 
+    def query_elasticsearch_for_subawards(self, filter_query: ES_Q) -> list:
+        return self.query_elasticsearch_for_prime_awards(filter_query)
+
     @abstractmethod
     def build_elasticsearch_result(self, response: dict) -> List[dict]:
         """
@@ -188,7 +211,7 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
     @abstractmethod
     def query_django_for_subawards(self, base_queryset: QuerySet) -> List[dict]:
         """
-        Sub-awards are still implemented with Postgres and thus this function is called when a request is received
-        to query a category for sub-awards.
+        Postgres implementation for a category of sub-awards. Requests are served from Elasticsearch; this is
+        used through query_postgres_for_subawards() to verify parity between the two.
         """
         pass
@@ -1,6 +1,7 @@
 from abc import ABCMeta
 from decimal import Decimal
 from django.db.models import QuerySet
+from elasticsearch_dsl import Q as ES_Q
 from enum import Enum
 from typing import List
 
@@ -38,6 +39,9 @@ class AbstractAccountViewSet(AbstractSpendingByCategoryViewSet, metaclass=ABCMet
 
         return results
 
+    def query_elasticsearch_for_subawards(self, filter_query: ES_Q) -> List[dict]:
+        self._raise_not_implemented()
+
     def query_django_for_subawards(self, base_queryset: QuerySet) -> List[dict]:
         self._raise_not_implemented()
 
@@ -1,6 +1,7 @@
 from abc import ABCMeta
 from decimal import Decimal
 from django.db.models import QuerySet, F
+from elasticsearch_dsl import Q as ES_Q
 from enum import Enum
 from typing import List
 
@@ -46,6 +47,11 @@ class AbstractIndustryCodeViewSet(AbstractSpendingByCategoryViewSet, metaclass=A
 
         return results
 
+    def query_elasticsearch_for_subawards(self, filter_query: ES_Q) -> List[dict]:
+        if self.industry_code_type == IndustryCodeType.PSC or self.industry_code_type == IndustryCodeType.NAICS:
+            self._raise_not_implemented()
+        return super().query_elasticsearch_for_subawards(filter_query)
+
     def query_django_for_subawards(self, base_queryset: QuerySet) -> List[dict]:
         if self.industry_code_type == IndustryCodeType.PSC or self.industry_code_type == IndustryCodeType.NAICS:
             self._raise_not_implemented()
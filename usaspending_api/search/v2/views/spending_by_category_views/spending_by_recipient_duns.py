@@ -65,12 +65,15 @@ class RecipientDunsViewSet(AbstractSpendingByCategoryViewSet):
         for bucket in location_info_buckets:
             recipient_info = json_str_to_dict(bucket.get("key"))
 
+            # Sub-awards have always reported a missing DUNS as null rather than a placeholder
+            missing_duns = None if self.subawards else "DUNS Number not provided"
+
             results.append(
                 {
                     "amount": int(bucket.get("sum_field", {"value": 0})["value"]) / Decimal("100"),
                     "recipient_id": recipient_info["hash_with_level"] or None,
                     "name": recipient_info["name"] or None,
-                    "code": recipient_info["unique_id"] or "DUNS Number not provided",
+                    "code": recipient_info["unique_id"] or missing_duns,
                 }
             )
 
@@ -11,14 +11,14 @@ from elasticsearch_dsl import A, Q as ES_Q
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union
 
 from usaspending_api.awards.v2.filters.location_filter_geocode import geocode_filter_locations
 from usaspending_api.awards.v2.filters.sub_award import subaward_filter
 from usaspending_api.common.api_versioning import api_transformations, API_TRANSFORM_FUNCTIONS
 from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.elasticsearch.json_helpers import json_str_to_dict
-from usaspending_api.common.elasticsearch.search_wrappers import TransactionSearch
+from usaspending_api.common.elasticsearch.search_wrappers import SubawardSearch, TransactionSearch
 from usaspending_api.common.helpers.generic_helper import get_generic_filters_message
 from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.common.validator.award_filter import AWARD_FILTER
@@ -28,6 +28,7 @@ from usaspending_api.references.models import PopCounty, PopCongressionalDistric
 from usaspending_api.search.models import SubawardView
 from usaspending_api.search.v2.elasticsearch_helper import (
     get_scaled_sum_aggregations,
+    get_number_of_unique_terms_for_subawards,
     get_number_of_unique_terms_for_transactions,
 )
 
@@ -113,25 +114,22 @@ class SpendingByGeographyVisualizationViewSet(APIView):
         self.loc_lookup = f"{self.scope_field_name}_{self.loc_field_name}"
         self.subawards = json_request["subawards"]
 
-        if self.subawards:
-            # We do not use matviews for Subaward filtering, just the Subaward download filters
-            self.model_name = SubawardView
-            self.queryset = subaward_filter(self.filters)
-            self.obligation_column = "amount"
-            result = self.query_django()
+        if self.scope_field_name == "pop":
+            scope_filter_name = "place_of_performance_scope"
         else:
-            if self.scope_field_name == "pop":
-                scope_filter_name = "place_of_performance_scope"
-            else:
-                scope_filter_name = "recipient_scope"
+            scope_filter_name = "recipient_scope"
 
-            # Only search for values within USA, but don't overwrite a user's search
-            if scope_filter_name not in self.filters:
-                self.filters[scope_filter_name] = "domestic"
+        # Only search for values within USA, but don't overwrite a user's search
+        if scope_filter_name not in self.filters:
+            self.filters[scope_filter_name] = "domestic"
 
+        if self.subawards:
+            self.obligation_column = "amount"
+            filter_query = QueryWithFilters.generate_subawards_elasticsearch_query(self.filters)
+        else:
             self.obligation_column = "generated_pragmatic_obligation"
             filter_query = QueryWithFilters.generate_transactions_elasticsearch_query(self.filters)
-            result = self.query_elasticsearch(filter_query)
+        result = self.query_elasticsearch(filter_query)
 
         return Response(
             {
@@ -144,6 +142,16 @@ class SpendingByGeographyVisualizationViewSet(APIView):
             }
         )
 
+    def query_postgres_for_subawards(self) -> List[dict]:
+        """
+        Postgres implementation of the sub-award results; no longer used by the endpoint but kept as the reference
+        that the Elasticsearch sub-award results are tested against.
+        """
+        self.model_name = SubawardView
+        self.queryset = subaward_filter(self.filters)
+        self.obligation_column = "amount"
+        return self.query_django()
+
     def query_django(self) -> dict:
         fields_list = []  # fields to include in the aggregate query
 
@@ -319,12 +327,17 @@ class SpendingByGeographyVisualizationViewSet(APIView):
 
         return results
 
-    def build_elasticsearch_search_with_aggregation(self, filter_query: ES_Q) -> Optional[TransactionSearch]:
-        # Create the initial search using filters
-        search = TransactionSearch().filter(filter_query)
-
-        # Check number of unique terms (buckets) for performance and restrictions on maximum buckets allowed
-        bucket_count = get_number_of_unique_terms_for_transactions(filter_query, f"{self.agg_key}.hash")
+    def build_elasticsearch_search_with_aggregation(
+        self, filter_query: ES_Q
+    ) -> Optional[Union[TransactionSearch, SubawardSearch]]:
+        # Create the initial search using filters; check number of unique terms (buckets) for performance
+        # and restrictions on maximum buckets allowed
+        if self.subawards:
+            search = SubawardSearch().filter(filter_query)
+            bucket_count = get_number_of_unique_terms_for_subawards(filter_query, f"{self.agg_key}.hash")
+        else:
+            search = TransactionSearch().filter(filter_query)
+            bucket_count = get_number_of_unique_terms_for_transactions(filter_query, f"{self.agg_key}.hash")
 
         if bucket_count == 0:
             return None
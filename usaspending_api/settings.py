@@ -55,6 +55,9 @@ USASPENDING_AWS_REGION = ""
 if not USASPENDING_AWS_REGION:
     USASPENDING_AWS_REGION = os.environ.get("USASPENDING_AWS_REGION")
 
+# Alternate S3 endpoint (e.g. a MinIO container); None uses AWS
+AWS_S3_ENDPOINT_URL = os.environ.get("AWS_S3_ENDPOINT_URL") or None
+
 # AWS locations for CSV files
 CSV_LOCAL_PATH = str(REPO_DIR / "csv_downloads") + "/"
 DOWNLOAD_ENV = ""
@@ -118,6 +121,12 @@ ES_AWARDS_MAX_RESULT_WINDOW = 50000
 ES_AWARDS_NAME_SUFFIX = "awards"
 ES_AWARDS_QUERY_ALIAS_PREFIX = "award-query"
 ES_AWARDS_WRITE_ALIAS = "award-load-alias"
+ES_SUBAWARDS_ETL_VIEW_NAME = "subaward_delta_view"
+ES_SUBAWARDS_MAX_RESULT_WINDOW = 50000
+# Singular so the "*awards" index template pattern does not also match subaward indexes
+ES_SUBAWARDS_NAME_SUFFIX = "subaward"
+ES_SUBAWARDS_QUERY_ALIAS_PREFIX = "subaward-query"
+ES_SUBAWARDS_WRITE_ALIAS = "subaward-load-alias"
 ES_TIMEOUT = 90
 ES_REPOSITORY = ""
 ES_ROUTING_FIELD = "recipient_agg_key"
@@ -374,6 +383,29 @@ CACHES = {
 # Cache environment - 'local', 'disabled', or 'elasticache'
 CACHE_ENVIRONMENT = "disabled"
 
+# Honor the X-Cache-Bypass request header so benchmarks (see benchmark_api) can time uncached responses
+ALLOW_CACHE_BYPASS = os.environ.get("ALLOW_CACHE_BYPASS", "").lower() in ["true", "1", "yes"]
+
+# Fraction of API requests whose SQL, Elasticsearch and cache time is added to the server log (see
+# common/request_instrumentation.py).  0 installs no instrumentation at all.
+REQUEST_INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get("REQUEST_INSTRUMENTATION_SAMPLE_RATE", 0))
+
+# Also instrument any request sent with an X-Instrument-Request: true header
+ALLOW_INSTRUMENTATION_HEADER = os.environ.get("ALLOW_INSTRUMENTATION_HEADER", "").lower() in ["true", "1", "yes"]
+
+# Return the timings of instrumented requests to the client in a Server-Timing header
+REQUEST_INSTRUMENTATION_SERVER_TIMING = os.environ.get("REQUEST_INSTRUMENTATION_SERVER_TIMING", "").lower() in [
+    "true",
+    "1",
+    "yes",
+]
+
+# Answer agency profile endpoints with live queries for dimensions agency_profile_rollup has nothing for
+AGENCY_PROFILE_ROLLUP_LIVE_FALLBACK = os.environ.get("AGENCY_PROFILE_ROLLUP_LIVE_FALLBACK", "").lower() != "false"
+
+# Answer disaster endpoints from financial_accounts_by_awards while disaster_file_c_spending has not been built
+DISASTER_FILE_C_SPENDING_LIVE_FALLBACK = os.environ.get("DISASTER_FILE_C_SPENDING_LIVE_FALLBACK", "").lower() != "false"
+
 # Set up the appropriate elasticache for our environment
 CACHE_ENVIRONMENTS = {
     # Elasticache settings are changed during deployment, or can be set manually
@@ -1,11 +1,15 @@
 import logging
 import psycopg2
+import threading
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from django.conf import settings
 from django.core.management import call_command
+from django.db import connection, connections, transaction
 from pathlib import Path
-from typing import Tuple
+from time import perf_counter
+from typing import Optional, Tuple
 
 from usaspending_api.broker.helpers.last_load_date import get_last_load_date, update_last_load_date
 from usaspending_api.common.etl import ETLDBLinkTable, ETLTable, operations
@@ -14,8 +18,8 @@ from usaspending_api.common.helpers.sql_helpers import get_broker_dsn_string
 from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
 from usaspending_api.common.retrieve_file_from_uri import SCHEMA_HELP_TEXT
 from usaspending_api.transactions.loader_functions import filepath_command_line_argument_type
-from usaspending_api.transactions.loader_functions import read_file_for_database_ids
 from usaspending_api.transactions.loader_functions import store_ids_in_file
+from usaspending_api.transactions.transfer_range_queue import MAX_RANGE_ATTEMPTS, TransferRangeQueue, next_chunk_size
 
 logger = logging.getLogger("script")
 
@@ -26,6 +30,7 @@ class AgnosticTransactionLoader:
     is_incremental = False
     successful_run = False
     upsert_records = 0
+    workers = 4
 
     def add_arguments(self, parser):
         mutually_exclusive_group = parser.add_mutually_exclusive_group(required=True)
@@ -70,6 +75,23 @@ class AgnosticTransactionLoader:
                 " This shouldn't be used with --file or --ids parameters"
             ),
         )
+        parser.add_argument(
+            "--discard-unfinished-run",
+            action="store_true",
+            help=(
+                "Drop the queue an interrupted --reload-all or --date run left behind instead of refusing to start a"
+                " run with different options."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=self.workers,
+            help=(
+                f"Number of ID ranges upserted concurrently, each on its own database connection. "
+                f"Default is {self.workers}."
+            ),
+        )
 
     def handle(self, *args, **options):
         with Timer(message="Script"):
@@ -110,13 +132,36 @@ class AgnosticTransactionLoader:
         return dt
 
     def process(self) -> None:
-        with Timer(message="Compiling IDs to process"):
-            self.file_path, self.total_ids_to_process = self.compile_transactions_to_process()
+        self.queue = TransferRangeQueue(self.queue_prefix())
+        if self.queue.resume(self.run_signature()):
+            # Keep the interrupted run's start time so the next incremental load still covers what it missed
+            self.start_time = self.queue.start_time
+            logger.info(f"Resuming the transfer of {self.queue.total_ids:,} IDs compiled at {self.start_time}")
+        else:
+            self.queue.check_replaceable(self.run_signature(), self.options["discard_unfinished_run"])
+            with Timer(message="Compiling IDs to process"):
+                self.file_path, total_ids_to_process = self.compile_transactions_to_process()
+                self.queue.create(self.run_signature(), self.start_time, self.file_path)
+            logger.info(f"{total_ids_to_process:,} IDs stored")
 
-        logger.info(f"{self.total_ids_to_process:,} IDs stored")
+        self.total_ids_to_process = self.queue.total_ids
         with Timer(message="Transfering Data"):
             self.copy_broker_table_data(self.broker_source_table_name, self.destination_table_name, self.shared_pk)
 
+    def run_signature(self) -> Optional[str]:
+        """Runs that compile their IDs from Broker can be resumed by a later run with the same parameters"""
+        if self.options["reload_all"]:
+            return "reload_all"
+        elif self.options["datetime"]:
+            return f"datetime {self.options['datetime']}"
+        return None
+
+    def queue_prefix(self) -> str:
+        """Runs that can't be resumed get tables of their own so they never touch a queue waiting to be resumed"""
+        if self.run_signature() is None:
+            return f"{self.working_file_prefix}_{self.start_time.strftime('%Y%m%d_%H%M%S_%f')}"
+        return self.working_file_prefix
+
     def cleanup(self) -> None:
         """Finalize the execution and cleanup for the next script run"""
         logger.info(f"Processed {self.upsert_records:,} transction records (insert/update)")
@@ -129,6 +174,10 @@ class AgnosticTransactionLoader:
             # If the file still exists, remove
             self.file_path.unlink()
 
+        if self.successful_run or self.run_signature() is None:
+            # A failed run that can be resumed leaves its queue behind so the next run can pick up where it stopped
+            self.queue.drop()
+
         if self.successful_run:
             logger.info(f"Loading {self.destination_table_name} completed successfully")
         else:
@@ -181,23 +230,63 @@ class AgnosticTransactionLoader:
         return sql.format(id=self.shared_pk, table=self.broker_source_table_name, optional_predicate=optional_predicate)
 
     def copy_broker_table_data(self, source_tablename, dest_tablename, primary_key):
-        """Loop through the batches of IDs and load using the ETL tables"""
+        """Upsert the queued IDs in ranges claimed by concurrent workers, each with its own connection"""
         destination = ETLTable(dest_tablename)
         source = ETLDBLinkTable(source_tablename, settings.DATA_BROKER_DBLINK_NAME, destination.data_types)
-        transactions_remaining_count = self.total_ids_to_process
 
-        for id_list in read_file_for_database_ids(str(self.file_path), self.chunk_size, is_numeric=False):
-            with Timer(message=f"Upsert {len(id_list):,} records"):
-                if len(id_list) != 0:
+        self.progress_lock = threading.Lock()
+        self.completed_ids, self.upsert_records, _ = self.queue.progress()
+        if self.total_ids_to_process == 0:
+            logger.warning("No records to load. Please check parameters and settings to confirm accuracy")
+
+        if connection.in_atomic_block:
+            # Other connections can't see what the caller's open transaction wrote (tests, mostly), so run in place
+            self.transfer_ranges(source, destination, primary_key)
+        else:
+            with ThreadPoolExecutor(max_workers=self.options["workers"], thread_name_prefix="transfer") as executor:
+                futures = [
+                    executor.submit(self.transfer_ranges_on_own_connection, source, destination, primary_key)
+                    for _ in range(self.options["workers"])
+                ]
+                for future in futures:
+                    future.result()
+
+        _, _, failed_ranges = self.queue.progress()
+        if failed_ranges:
+            raise RuntimeError(f"{failed_ranges:,} ID ranges failed {MAX_RANGE_ATTEMPTS} times.  Rerun to retry them.")
+
+    def transfer_ranges_on_own_connection(self, source, destination, primary_key):
+        try:
+            self.transfer_ranges(source, destination, primary_key)
+        finally:
+            connections.close_all()
+
+    def transfer_ranges(self, source, destination, primary_key):
+        """Claim and upsert ranges until none are left, sizing each from how fast the last one went"""
+        chunk_size = self.chunk_size
+        while True:
+            claimed = self.queue.claim(chunk_size)
+            if claimed is None:
+                return
+            range_id, first_position, last_position = claimed
+            range_size = last_position - first_position + 1
+
+            start = perf_counter()
+            try:
+                with Timer(message=f"Upsert {range_size:,} records"), transaction.atomic():
+                    id_list = self.queue.ids_in_range(first_position, last_position)
                     predicate = self.extra_predicate + [{"field": primary_key, "op": "IN", "values": tuple(id_list)}]
                     record_count = operations.upsert_records_with_predicate(source, destination, predicate, primary_key)
-                else:
-                    logger.warning("No records to load. Please check parameters and settings to confirm accuracy")
-                    record_count = 0
+                    # Recorded in the same transaction as the upsert so a range is never counted without its rows
+                    self.queue.mark_complete(range_id, record_count)
+            except Exception:
+                logger.exception(f"Upserting ID positions {first_position:,} to {last_position:,} failed")
+                self.queue.mark_failed(range_id)
+                continue
 
-            if transactions_remaining_count > len(id_list):
-                transactions_remaining_count -= len(id_list)
-            else:
-                transactions_remaining_count = 0
-            self.upsert_records += record_count
-            logger.info(f"{self.upsert_records:,} successful upserts, {transactions_remaining_count:,} remaining.")
+            chunk_size = next_chunk_size(range_size, perf_counter() - start)
+            with self.progress_lock:
+                self.completed_ids += range_size
+                self.upsert_records += record_count
+                remaining = max(self.total_ids_to_process - self.completed_ids, 0)
+            logger.info(f"{self.upsert_records:,} successful upserts, {remaining:,} remaining.")
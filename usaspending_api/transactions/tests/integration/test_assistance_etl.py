@@ -4,7 +4,9 @@ import datetime
 from django.core.management import call_command
 from django.db import connections, DEFAULT_DB_ALIAS
 from decimal import Decimal
+from usaspending_api.transactions.agnostic_transaction_loader import AgnosticTransactionLoader
 from usaspending_api.transactions.models import SourceAssistanceTransaction
+from usaspending_api.transactions.transfer_range_queue import TransferRangeQueue
 
 
 BROKER_TABLE = SourceAssistanceTransaction().broker_source_table
@@ -246,3 +248,64 @@ def test_data_transfer_from_broker(load_broker_data):
             datetime.datetime(2017, 9, 16, 22, 22, 42, 760993),
             None,
         )
+
+
+def test_interrupted_reload_resumes_remaining_ranges(load_broker_data, tmp_path):
+    ids_file = tmp_path / "ids"
+    ids_file.write_text("9100_P033A173267_-none-_84.033_3\n9100_P063P162482_-none-_84.063_0008\n")
+    queue = TransferRangeQueue("assistance_load_ids")
+    queue.create("reload_all", datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc), ids_file)
+
+    # The first ID's range completed before the interruption, so only the second one should be transferred
+    range_id, _, _ = queue.claim(1)
+    queue.mark_complete(range_id, 1)
+
+    call_command("transfer_assistance_records", "--reload-all")
+
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(f"SELECT afa_generated_unique FROM {SourceAssistanceTransaction().table_name}")
+        assert cursor.fetchall() == [("9100_P063P162482_-none-_84.063_0008",)]
+        cursor.execute("SELECT to_regclass('assistance_load_ids_ranges')")
+        assert cursor.fetchone()[0] is None
+
+
+def test_other_runs_leave_an_unfinished_reload_alone(load_broker_data, tmp_path):
+    ids_file = tmp_path / "ids"
+    ids_file.write_text("9100_P033A173267_-none-_84.033_3\n9100_P063P162482_-none-_84.063_0008\n")
+    queue = TransferRangeQueue("assistance_load_ids")
+    queue.create("reload_all", datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc), ids_file)
+
+    # A run with its own IDs uses tables of its own
+    call_command("transfer_assistance_records", "--ids", "9100_P033A173267_-none-_84.033_3")
+    assert queue.progress()[0] == 0
+
+    # A resumable run with other options refuses to replace the queue
+    with pytest.raises(SystemExit):
+        call_command("transfer_assistance_records", "--date", "2020-01-01")
+    assert queue.progress()[0] == 0
+
+    call_command("transfer_assistance_records", "--date", "2020-01-01", "--discard-unfinished-run")
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute("SELECT to_regclass('assistance_load_ids_ranges')")
+        assert cursor.fetchone()[0] is None
+        cursor.execute(
+            "SELECT count(*) FROM pg_tables WHERE tablename LIKE 'assistance\\_load\\_ids\\_%\\_ids' ESCAPE '\\'"
+        )
+        assert cursor.fetchone()[0] == 0
+
+
+def test_failed_run_with_its_own_ids_exits_with_an_error(load_broker_data, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("Broker went away")
+
+    monkeypatch.setattr(AgnosticTransactionLoader, "copy_broker_table_data", fail)
+    with pytest.raises(SystemExit) as exit_info:
+        call_command("transfer_assistance_records", "--ids", "9100_P033A173267_-none-_84.033_3")
+    assert exit_info.value.code == 1
+
+    # Its queue can't be resumed, so it is dropped all the same
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_tables WHERE tablename LIKE 'assistance\\_load\\_ids\\_%\\_ids' ESCAPE '\\'"
+        )
+        assert cursor.fetchone()[0] == 0
@@ -0,0 +1,17 @@
+from usaspending_api.transactions.transfer_range_queue import MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, next_chunk_size
+
+
+def test_chunk_size_follows_observed_rate():
+    # 25,000 IDs in 50 seconds is 500 IDs a second, or 30,000 in the 60 second target
+    assert next_chunk_size(25000, 50) == 30000
+
+
+def test_chunk_size_moves_at_most_a_factor_of_two():
+    assert next_chunk_size(25000, 1) == 50000
+    assert next_chunk_size(25000, 3600) == 12500
+
+
+def test_chunk_size_stays_within_bounds():
+    assert next_chunk_size(MAX_CHUNK_SIZE, 1) == MAX_CHUNK_SIZE
+    assert next_chunk_size(MIN_CHUNK_SIZE, 3600) == MIN_CHUNK_SIZE
+    assert next_chunk_size(25000, 0) == 25000
@@ -28,9 +28,13 @@ def retrieve_deleted_transactions(
     regex: str, start_datetime: datetime, end_datetime: Optional[datetime] = None
 ) -> dict:
     with Timer("Obtaining S3 Object list"):
-        objects = retrieve_s3_bucket_object_list(settings.DELETED_TRANSACTION_JOURNAL_FILES)
-        logger.info(f"{len(objects):,} files found in bucket '{settings.DELETED_TRANSACTION_JOURNAL_FILES}'.")
-        objects = [o for o in objects if re.fullmatch(regex, o.key) is not None]
+        # Filter the listing as it streams in rather than holding every object of the bucket
+        objects, object_count = [], 0
+        for obj in retrieve_s3_bucket_object_list(settings.DELETED_TRANSACTION_JOURNAL_FILES):
+            object_count += 1
+            if re.fullmatch(regex, obj["Key"]) is not None:
+                objects.append(obj)
+        logger.info(f"{object_count:,} files found in bucket '{settings.DELETED_TRANSACTION_JOURNAL_FILES}'.")
         logger.info(f"{len(objects):,} files match file pattern '{regex}'.")
         objects = limit_objects_to_date_range(objects, regex, start_datetime, end_datetime)
         logger.info(
@@ -39,30 +43,27 @@ def retrieve_deleted_transactions(
 
     deleted_records = defaultdict(list)
     for obj in objects:
-        object_data = access_s3_object(settings.DELETED_TRANSACTION_JOURNAL_FILES, obj)
+        object_data = access_s3_object(settings.DELETED_TRANSACTION_JOURNAL_FILES, obj["Key"])
         reader = csv.reader(object_data.read().decode("utf-8").splitlines())
         next(reader)  # skip the header
 
         transaction_id_list = [rows[0] for rows in reader]
-        logger.info(f"{len(transaction_id_list):,} delete ids found in {obj.key}")
+        logger.info(f"{len(transaction_id_list):,} delete ids found in {obj['Key']}")
 
         if transaction_id_list:
-            file_date = obj.key[: obj.key.find("_")]
+            file_date = obj["Key"][: obj["Key"].find("_")]
             deleted_records[file_date].extend(transaction_id_list)
 
     return deleted_records
 
 
 def limit_objects_to_date_range(
-    objects: List["boto3.resources.factory.s3.ObjectSummary"],
-    regex_pattern: str,
-    start_datetime: datetime,
-    end_datetime: Optional[datetime] = None,
-) -> List["boto3.resources.factory.s3.ObjectSummary"]:
+    objects: List[dict], regex_pattern: str, start_datetime: datetime, end_datetime: Optional[datetime] = None
+) -> List[dict]:
     results = []
     for obj in objects or []:
 
-        match = re.fullmatch(regex_pattern, obj.key)
+        match = re.fullmatch(regex_pattern, obj["Key"])
         file_datetime = datetime.utcfromtimestamp(int(match["epoch"]))
 
         # Only keep S3 objects that fall between the provided dates
@@ -0,0 +1,195 @@
+import logging
+
+from datetime import datetime
+from django.db import connection, transaction
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger("script")
+
+MAX_RANGE_ATTEMPTS = 3
+
+# Chunk sizes are adapted so each upsert takes about this long
+TARGET_CHUNK_SECONDS = 60
+MIN_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 250000
+
+
+def next_chunk_size(chunk_size: int, elapsed_seconds: float) -> int:
+    """
+    Size the next chunk from the IDs per second the last one (of chunk_size IDs) achieved, moving at most a factor of
+    two at a time so a single slow or fast chunk doesn't swing it too far.
+    """
+    if elapsed_seconds <= 0:
+        return chunk_size
+    target = int(chunk_size / elapsed_seconds * TARGET_CHUNK_SECONDS)
+    target = max(chunk_size // 2, min(chunk_size * 2, target))
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, target))
+
+
+class TransferRangeQueue:
+    """
+    Shared work queue for the transaction transfer commands, kept in three tables in the USAspending database:
+
+        <prefix>_ids      every ID to transfer, numbered by position
+        <prefix>_ranges   position ranges workers have claimed, with their status and attempts
+        <prefix>_run      what the IDs were compiled for and when that run started
+
+    Workers claim the next unclaimed range of positions (or a failed range to retry) under a table lock, so ranges are
+    disjoint and can be sized by each worker.  The tables outlive a failed or interrupted run; a later run with the
+    same signature picks up the remaining ranges instead of starting over, and a run with another signature refuses
+    to replace them unless asked to.
+    """
+
+    def __init__(self, prefix: str):
+        self.ids_table = f"{prefix}_ids"
+        self.ranges_table = f"{prefix}_ranges"
+        self.run_table = f"{prefix}_run"
+        self.total_ids = 0
+        self.start_time = None
+
+    def resume(self, signature: Optional[str]) -> bool:
+        """Attach to a previous run's queue if it was compiled for the same signature and never finished"""
+        if signature is None or not self._exists():
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(f"select signature, start_time, total_ids from {self.run_table}")
+            run = cursor.fetchone()
+            if run is None or run[0] != signature:
+                return False
+            # Ranges that were in flight or ran out of attempts last time get another go
+            cursor.execute(
+                f"update {self.ranges_table} set status = 'pending', attempts = 0 where status != 'complete'"
+            )
+        self.start_time, self.total_ids = run[1], run[2]
+        return True
+
+    def check_replaceable(self, signature: Optional[str], discard_unfinished: bool = False) -> None:
+        """Refuse to replace a queue another run is waiting to resume, unless told to discard it"""
+        unfinished_signature = self._unfinished_signature()
+        if unfinished_signature is None or unfinished_signature == signature:
+            return
+        if not discard_unfinished:
+            raise RuntimeError(
+                f"{self.ids_table} holds an unfinished run compiled for '{unfinished_signature}'.  Rerun with the same "
+                f"options to finish it, or discard it explicitly to start a different run."
+            )
+        logger.warning(f"Discarding the unfinished run compiled for '{unfinished_signature}'")
+
+    def create(self, signature: Optional[str], start_time: datetime, file_path: Path) -> None:
+        self.drop()
+        with connection.cursor() as cursor:
+            cursor.execute(f"create table {self.ids_table} (position bigserial primary key, id text not null)")
+            cursor.execute(
+                f"""
+                    create table {self.ranges_table} (
+                        range_id serial primary key,
+                        first_position bigint not null,
+                        last_position bigint not null,
+                        status text not null,
+                        attempts integer not null,
+                        record_count integer,
+                        claimed_at timestamptz,
+                        completed_at timestamptz
+                    )
+                """
+            )
+            cursor.execute(f"create table {self.run_table} (signature text, start_time timestamptz, total_ids bigint)")
+            with open(str(file_path)) as f:
+                cursor.cursor.copy_expert(f"copy {self.ids_table} (id) from stdin", f)
+            cursor.execute(f"select count(*) from {self.ids_table}")
+            self.total_ids = cursor.fetchone()[0]
+            cursor.execute(f"insert into {self.run_table} values (%s, %s, %s)", [signature, start_time, self.total_ids])
+        self.start_time = start_time
+
+    def drop(self) -> None:
+        with connection.cursor() as cursor:
+            for table in (self.ids_table, self.ranges_table, self.run_table):
+                cursor.execute(f"drop table if exists {table}")
+
+    def claim(self, chunk_size: int) -> Optional[Tuple[int, int, int]]:
+        """Claim a failed range to retry or else the next chunk_size positions.  None once there's nothing left."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"lock table {self.ranges_table} in exclusive mode")
+            cursor.execute(
+                f"""
+                    update  {self.ranges_table}
+                    set     status = 'claimed', attempts = attempts + 1, claimed_at = now()
+                    where   range_id = (
+                                select      range_id
+                                from        {self.ranges_table}
+                                where       status in ('pending', 'failed') and attempts < %s
+                                order by    range_id
+                                limit       1
+                            )
+                    returning range_id, first_position, last_position
+                """,
+                [MAX_RANGE_ATTEMPTS],
+            )
+            claimed = cursor.fetchone()
+            if claimed:
+                return claimed
+            cursor.execute(
+                f"""
+                    insert into {self.ranges_table} (first_position, last_position, status, attempts, claimed_at)
+                    select  next_position, least(next_position + %s - 1, %s), 'claimed', 1, now()
+                    from    (select coalesce(max(last_position), 0) + 1 as next_position from {self.ranges_table}) as n
+                    where   next_position <= %s
+                    returning range_id, first_position, last_position
+                """,
+                [chunk_size, self.total_ids, self.total_ids],
+            )
+            return cursor.fetchone()
+
+    def ids_in_range(self, first_position: int, last_position: int) -> List[str]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"select id from {self.ids_table} where position between %s and %s", [first_position, last_position],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def mark_complete(self, range_id: int, record_count: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                    update  {self.ranges_table}
+                    set     status = 'complete', record_count = %s, completed_at = now()
+                    where   range_id = %s
+                """,
+                [record_count, range_id],
+            )
+
+    def mark_failed(self, range_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"update {self.ranges_table} set status = 'failed' where range_id = %s", [range_id])
+
+    def progress(self) -> Tuple[int, int, int]:
+        """Positions completed, records upserted and ranges that failed for good"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                    select  coalesce(sum(last_position - first_position + 1) filter (where status = 'complete'), 0),
+                            coalesce(sum(record_count) filter (where status = 'complete'), 0),
+                            count(*) filter (where status = 'failed' and attempts >= %s)
+                    from    {self.ranges_table}
+                """,
+                [MAX_RANGE_ATTEMPTS],
+            )
+            return cursor.fetchone()
+
+    def _unfinished_signature(self) -> Optional[str]:
+        """Signature of the run whose queue is still waiting in these tables, if there is one"""
+        if not self._exists():
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(f"select signature from {self.run_table}")
+            run = cursor.fetchone()
+        return run[0] if run else None
+
+    def _exists(self) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "select to_regclass(%s), to_regclass(%s), to_regclass(%s)",
+                [self.ids_table, self.ranges_table, self.run_table],
+            )
+            return all(cursor.fetchone())